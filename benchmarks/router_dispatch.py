@@ -0,0 +1,64 @@
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.core.constants import CallbackPrefixes
+from bot.modules.central_router import CentralRouter
+
+SAMPLE_CALLBACKS = [
+    "home", "sec:12", "sec_back:3", "fpage:4:2", "file:88", "sr_sec:5", "search",
+    "adm_bc_txt", "adm_ban_block", "adm_maint_tog", "adm_fp:2", "adm_mtp:9:upload",
+    "adm_sub_rm:1", "back", "unknown_cb",
+]
+
+
+async def _noop(callback, kwargs):
+    return None
+
+
+def build_router() -> CentralRouter:
+    router = CentralRouter()
+    for name, prefix in vars(CallbackPrefixes).items():
+        if not name.startswith("_") and isinstance(prefix, str):
+            router.register(prefix, _noop)
+    router.compile()
+    return router
+
+
+def linear_resolve(prefixes, data):
+    # The pre-compilation dispatch: scan every prefix, longest first.
+    for prefix in prefixes:
+        if data.startswith(prefix):
+            return prefix
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time callback dispatch: compiled resolve vs a linear scan.")
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    router = build_router()
+    prefixes = sorted(router._routes, key=len, reverse=True)
+    per_round = len(SAMPLE_CALLBACKS)
+
+    def run_linear() -> None:
+        for data in SAMPLE_CALLBACKS:
+            linear_resolve(prefixes, data)
+
+    def run_compiled() -> None:
+        for data in SAMPLE_CALLBACKS:
+            router.resolve(data)
+
+    print(f"{len(prefixes)} registered prefixes, {per_round} sample callbacks")
+    for name, fn in (("linear", run_linear), ("compiled", run_compiled)):
+        best = min(timeit.repeat(fn, number=args.rounds, repeat=args.repeat))
+        print(f"{name}: {best / (args.rounds * per_round) * 1e9:.0f}ns per callback")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from bot.core.database import Database
+from bot.services.files import file_service
+from bot.services.sections import section_service
+
+BENCH_PREFIX = "bench-"
+WORDS = [
+    "كتاب", "محاضرة", "ملخص", "اختبار", "الفصل", "الأول", "الثاني", "رياضيات",
+    "فيزياء", "كيمياء", "أحياء", "تاريخ", "جغرافيا", "لغة", "عربية", "إنجليزية",
+    "مراجعة", "نهائي", "شرح", "تمارين", "حلول", "مذكرة", "الوحدة", "درس",
+]
+QUERIES = ["رياضيات", "الفصل الاول", "محاضره", "ملخص فيزياء", "تمارين", "مذكرة الوحدة", "اسئلة"]
+
+SEED_SQL = text(
+    """
+    INSERT INTO files (file_id, file_unique_id, name, file_type, status, uploaded_by, is_active)
+    SELECT
+        'bench',
+        :prefix || g,
+        (CAST(:words AS text[]))[1 + (g * 7) % :n] || ' ' || (CAST(:words AS text[]))[1 + (g * 13) % :n] || ' '
+            || (CAST(:words AS text[]))[1 + (g * 31) % :n] || ' ' || g,
+        'document',
+        'published',
+        0,
+        true
+    FROM generate_series(:start, :stop) AS g
+    """
+)
+
+
+async def seed(db: Database, rows: int, batch: int) -> None:
+    async for session in db.get_session():
+        existing = await session.scalar(
+            text("SELECT count(*) FROM files WHERE file_unique_id LIKE :p"), {"p": f"{BENCH_PREFIX}%"}
+        )
+    if existing >= rows:
+        print(f"{existing} benchmark rows already present")
+        return
+    for start in range(existing + 1, rows + 1, batch):
+        stop = min(start + batch - 1, rows)
+        async for session in db.get_session():
+            await session.execute(
+                SEED_SQL,
+                {"prefix": BENCH_PREFIX, "words": WORDS, "n": len(WORDS), "start": start, "stop": stop},
+            )
+        print(f"seeded {stop}/{rows}")
+    async for session in db.get_session():
+        await session.execute(text("ANALYZE files"))
+
+
+async def cleanup(db: Database) -> None:
+    async for session in db.get_session():
+        result = await session.execute(
+            text("DELETE FROM files WHERE file_unique_id LIKE :p"), {"p": f"{BENCH_PREFIX}%"}
+        )
+        print(f"removed {result.rowcount} benchmark rows")
+
+
+async def measure(db: Database, iterations: int) -> None:
+    timings = {"files": [], "sections": []}
+    for _ in range(iterations):
+        query = random.choice(QUERIES)
+        async for session in db.get_session():
+            started = time.perf_counter()
+            await file_service.search_files(session, query)
+            timings["files"].append(time.perf_counter() - started)
+            started = time.perf_counter()
+            await section_service.search_sections(session, query)
+            timings["sections"].append(time.perf_counter() - started)
+    for name, samples in timings.items():
+        samples.sort()
+        p50 = statistics.median(samples) * 1000
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+        print(f"{name}: n={len(samples)} p50={p50:.2f}ms p99={p99:.2f}ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed the files table and measure search latency.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    url = os.getenv("DATABASE_URL")
+    if not url:
+        sys.exit("DATABASE_URL is not set")
+    db = Database(url)
+    try:
+        if args.cleanup:
+            await cleanup(db)
+            return
+        if not args.skip_seed:
+            await seed(db, args.rows, args.batch)
+        await measure(db, args.iterations)
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
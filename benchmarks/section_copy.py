@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from bot.core.database import Database
+from bot.services.sections import section_service
+
+BENCH_ROOT_NAME = "bench-copy-root"
+
+SEED_ROOT = text(
+    """
+    INSERT INTO sections (name, parent_id, "order", is_active)
+    VALUES (:name, NULL, 0, true)
+    RETURNING id
+    """
+)
+SEED_LEVEL = text(
+    """
+    INSERT INTO sections (name, parent_id, "order", is_active)
+    SELECT 'bench-node', p.id, g, true
+    FROM sections p, generate_series(1, :fanout) AS g
+    WHERE p.id = ANY(:parents)
+    ORDER BY p.id, g
+    LIMIT :limit
+    RETURNING id
+    """
+)
+SEED_LINKS = text(
+    """
+    INSERT INTO file_sections (file_id, section_id)
+    SELECT f.id, s.id
+    FROM (SELECT id FROM files ORDER BY id LIMIT :per_section) AS f,
+         unnest(CAST(:section_ids AS bigint[])) AS s(id)
+    """
+)
+BENCH_ROOTS = text("SELECT id FROM sections WHERE name LIKE :pattern AND parent_id IS NULL")
+DELETE_SUBTREE = text(
+    """
+    WITH RECURSIVE subtree AS (
+        SELECT id FROM sections WHERE id = :root_id
+        UNION
+        SELECT s.id FROM sections s JOIN subtree t ON s.parent_id = t.id
+    )
+    DELETE FROM sections WHERE id IN (SELECT id FROM subtree)
+    """
+)
+
+
+async def seed(db: Database, nodes: int, fanout: int, links_per_section: int) -> int:
+    root_id = 0
+    async for session in db.get_session():
+        root_id = (await session.execute(SEED_ROOT, {"name": BENCH_ROOT_NAME})).scalar_one()
+        created = [root_id]
+        parents = [root_id]
+        while len(created) < nodes and parents:
+            result = await session.execute(
+                SEED_LEVEL, {"fanout": fanout, "parents": parents, "limit": nodes - len(created)}
+            )
+            parents = list(result.scalars().all())
+            created.extend(parents)
+        if links_per_section:
+            await session.execute(SEED_LINKS, {"per_section": links_per_section, "section_ids": created})
+    print(f"seeded a {nodes}-node tree under section {root_id}")
+    return root_id
+
+
+async def cleanup(db: Database) -> None:
+    async for session in db.get_session():
+        roots = (await session.execute(BENCH_ROOTS, {"pattern": f"{BENCH_ROOT_NAME}%"})).scalars().all()
+        for root_id in roots:
+            await session.execute(DELETE_SUBTREE, {"root_id": root_id})
+        print(f"removed {len(roots)} benchmark trees")
+
+
+async def measure(db: Database, root_id: int) -> None:
+    async def report(done: int, total: int) -> None:
+        print(f"  copied {done}/{total}")
+
+    async for session in db.get_session():
+        started = time.perf_counter()
+        copy = await section_service.copy_section_tree(session, root_id, progress=report)
+        elapsed = time.perf_counter() - started
+    print(f"copy of section {root_id} -> {copy.id if copy else None} took {elapsed * 1000:.1f}ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a synthetic section tree and time copy_section_tree.")
+    parser.add_argument("--nodes", type=int, default=10_000)
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--links-per-section", type=int, default=3)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    url = os.getenv("DATABASE_URL")
+    if not url:
+        sys.exit("DATABASE_URL is not set")
+    db = Database(url)
+    try:
+        if args.cleanup:
+            await cleanup(db)
+            return
+        root_id = await seed(db, args.nodes, args.fanout, args.links_per_section)
+        await measure(db, root_id)
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -16,17 +16,74 @@ class BotConfig:
 @dataclass
 class DatabaseConfig:
     url: str
+    pool_size: int = 10
+    max_overflow: int = 10
+    pool_timeout_seconds: float = 30.0
+    pool_recycle_seconds: int = 1800
+    pre_ping: str = "idle"
+    pre_ping_idle_seconds: float = 300.0
+    statement_cache_size: int = 100
+    statement_timeout_ms: int = 0
+    application_name: str = "telegram-bot"
+    replica_url: str = ""
+    replica_pin_seconds: float = 10.0
 
 
 @dataclass
 class SubscriptionConfig:
     enabled: bool
     channel_ids: List[int]
+    member_ttl_seconds: int = 600
+    non_member_ttl_seconds: int = 30
 
 
 @dataclass
 class StateConfig:
     timeout_seconds: int
+    backend: str = "memory"
+    sqlite_path: str = "data/state.sqlite3"
+    sweep_interval_seconds: int = 60
+    max_states: int = 100000
+    max_payload_bytes: int = 32768
+
+
+@dataclass
+class CacheConfig:
+    user_ttl_seconds: int = 300
+    user_max_size: int = 10000
+    settings_notify: bool = True
+    settings_refresh_seconds: int = 60
+    user_activity_flush_seconds: int = 10
+    section_tree_ttl_seconds: int = 300
+    section_counters_reconcile_seconds: int = 3600
+    list_count_ttl_seconds: int = 60
+
+
+@dataclass
+class OutboundConfig:
+    global_rate: float = 30.0
+    private_chat_rate: float = 1.0
+    private_chat_burst: float = 3.0
+    group_chat_per_minute: int = 20
+    max_retries: int = 3
+
+
+@dataclass
+class BroadcastConfig:
+    concurrency: int = 10
+    chunk_size: int = 500
+    progress_interval_seconds: int = 5
+
+
+@dataclass
+class SearchConfig:
+    index_enabled: bool = True
+    page_size: int = 10
+    max_results: int = 100
+    cache_size: int = 256
+    debounce_seconds: float = 0.3
+    inline_cache_time_seconds: int = 300
+    inline_page_size: int = 20
 
 
 @dataclass
@@ -35,6 +92,10 @@ class Config:
     database: DatabaseConfig
     subscription: SubscriptionConfig
     state: StateConfig
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    broadcast: BroadcastConfig = field(default_factory=BroadcastConfig)
+    outbound: OutboundConfig = field(default_factory=OutboundConfig)
+    search: SearchConfig = field(default_factory=SearchConfig)
     debug: bool = False
     default_language: str = "ar"
 
@@ -53,13 +114,62 @@ def load_config() -> Config:
         ),
         database=DatabaseConfig(
             url=os.getenv("DATABASE_URL", ""),
+            pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout_seconds=float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30")),
+            pool_recycle_seconds=int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800")),
+            pre_ping=os.getenv("DB_PRE_PING", "idle").lower(),
+            pre_ping_idle_seconds=float(os.getenv("DB_PRE_PING_IDLE_SECONDS", "300")),
+            statement_cache_size=int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100")),
+            statement_timeout_ms=int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0")),
+            application_name=os.getenv("DB_APPLICATION_NAME", "telegram-bot"),
+            replica_url=os.getenv("DATABASE_REPLICA_URL", ""),
+            replica_pin_seconds=float(os.getenv("DB_REPLICA_PIN_SECONDS", "10")),
         ),
         subscription=SubscriptionConfig(
             enabled=os.getenv("SUBSCRIPTION_ENABLED", "false").lower() == "true",
             channel_ids=channel_ids,
+            member_ttl_seconds=int(os.getenv("SUBSCRIPTION_MEMBER_TTL_SECONDS", "600")),
+            non_member_ttl_seconds=int(os.getenv("SUBSCRIPTION_NON_MEMBER_TTL_SECONDS", "30")),
         ),
         state=StateConfig(
             timeout_seconds=int(os.getenv("STATE_TIMEOUT_SECONDS", "300")),
+            backend=os.getenv("STATE_BACKEND", "memory").lower(),
+            sqlite_path=os.getenv("STATE_SQLITE_PATH", "data/state.sqlite3"),
+            sweep_interval_seconds=int(os.getenv("STATE_SWEEP_INTERVAL_SECONDS", "60")),
+            max_states=int(os.getenv("STATE_MAX_STATES", "100000")),
+            max_payload_bytes=int(os.getenv("STATE_MAX_PAYLOAD_BYTES", "32768")),
+        ),
+        cache=CacheConfig(
+            user_ttl_seconds=int(os.getenv("USER_CACHE_TTL_SECONDS", "300")),
+            user_max_size=int(os.getenv("USER_CACHE_MAX_SIZE", "10000")),
+            user_activity_flush_seconds=int(os.getenv("USER_ACTIVITY_FLUSH_SECONDS", "10")),
+            section_tree_ttl_seconds=int(os.getenv("SECTION_TREE_TTL_SECONDS", "300")),
+            section_counters_reconcile_seconds=int(os.getenv("SECTION_COUNTERS_RECONCILE_SECONDS", "3600")),
+            list_count_ttl_seconds=int(os.getenv("LIST_COUNT_TTL_SECONDS", "60")),
+            settings_notify=os.getenv("SETTINGS_NOTIFY_ENABLED", "true").lower() == "true",
+            settings_refresh_seconds=int(os.getenv("SETTINGS_REFRESH_SECONDS", "60")),
+        ),
+        broadcast=BroadcastConfig(
+            concurrency=int(os.getenv("BROADCAST_CONCURRENCY", "10")),
+            chunk_size=int(os.getenv("BROADCAST_CHUNK_SIZE", "500")),
+            progress_interval_seconds=int(os.getenv("BROADCAST_PROGRESS_INTERVAL_SECONDS", "5")),
+        ),
+        outbound=OutboundConfig(
+            global_rate=float(os.getenv("OUTBOUND_GLOBAL_RATE", "30")),
+            private_chat_rate=float(os.getenv("OUTBOUND_PRIVATE_CHAT_RATE", "1")),
+            private_chat_burst=float(os.getenv("OUTBOUND_PRIVATE_CHAT_BURST", "3")),
+            group_chat_per_minute=int(os.getenv("OUTBOUND_GROUP_CHAT_PER_MINUTE", "20")),
+            max_retries=int(os.getenv("OUTBOUND_MAX_RETRIES", "3")),
+        ),
+        search=SearchConfig(
+            index_enabled=os.getenv("SEARCH_INDEX_ENABLED", "true").lower() == "true",
+            page_size=int(os.getenv("SEARCH_PAGE_SIZE", "10")),
+            max_results=int(os.getenv("SEARCH_MAX_RESULTS", "100")),
+            cache_size=int(os.getenv("SEARCH_CACHE_SIZE", "256")),
+            debounce_seconds=float(os.getenv("SEARCH_DEBOUNCE_SECONDS", "0.3")),
+            inline_cache_time_seconds=int(os.getenv("INLINE_CACHE_TIME_SECONDS", "300")),
+            inline_page_size=int(os.getenv("INLINE_PAGE_SIZE", "20")),
         ),
         debug=os.getenv("DEBUG", "false").lower() == "true",
         default_language=os.getenv("DEFAULT_LANGUAGE", "ar"),
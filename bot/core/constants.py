@@ -16,14 +16,26 @@ class LogMessages:
     STATE_SET = "State set for user {user_id}: {state}"
     STATE_CLEARED = "State cleared for user {user_id}"
     STATES_CLEANUP = "Cleaned up {count} expired states"
+    STATE_SWEEP_FAIL = "State sweep failed: {error}"
+    STATE_PAYLOAD_REJECTED = "State for user {user_id} rejected: payload of {size} bytes exceeds {limit} bytes"
 
     USER_CREATED = "New user created: {user_id}"
     USER_LOGIN = "User login: {user_id}"
+    USER_LOGIN_NOTICE_DROPPED = "Login notice for {user_id} dropped: {pending} notices already pending"
     USER_BLOCKED = "Blocked user {user_id} attempted access"
+    USER_ACTIVITY_FLUSHED = "Flushed activity for {count} users"
+    USER_ACTIVITY_FLUSH_FAIL = "Failed to flush activity for {count} users: {error}"
 
     MIDDLEWARE_BAN_CHECK = "Ban check for user {user_id}"
     MIDDLEWARE_SUBSCRIPTION_CHECK = "Subscription check for user {user_id}"
+    SUBSCRIPTION_LOOKUP_FAIL = "Membership lookup failed for {user_id} in {channel_id}: {error}"
     MIDDLEWARE_ROLE_LOADED = "Role loaded for user {user_id}: {role}"
+    MIDDLEWARE_CONTEXT_LOADED = "Update context loaded for user {user_id}: registered={registered} role={role}"
+
+    SETTINGS_SNAPSHOT_LOADED = "Settings snapshot loaded: version={version} keys={count}"
+    SETTINGS_LISTENER_STARTED = "Listening for settings changes on channel {channel}"
+    SETTINGS_RELOAD_FAIL = "Settings snapshot reload failed: {error}"
+    SETTINGS_LISTENER_FAIL = "Settings change listener unavailable, relying on periodic reload: {error}"
 
     ERROR_HANDLER_TRIGGERED = "Error in handler: {error}"
     HEALTH_CHECK_OK = "Health check: OK"
@@ -32,6 +44,9 @@ class LogMessages:
     CENTRAL_ROUTER_REGISTERED = "Central router registered"
     CENTRAL_ROUTER_CALLBACK = "Callback received: {callback_data}"
     CENTRAL_ROUTER_NO_HANDLER = "No handler for callback: {callback_data}"
+    CENTRAL_ROUTER_MATCHED = "Matched prefix '{prefix}' -> {handler}"
+    CENTRAL_ROUTER_BAD_PAYLOAD = "Malformed callback payload: {callback_data}"
+    CENTRAL_ROUTER_COMPILED = "Central router compiled: {routes} routes, {lengths} prefix lengths"
 
     SERVICES_INITIALIZED = "All services initialized"
     MIDDLEWARES_REGISTERED = "All middlewares registered"
@@ -53,6 +68,7 @@ class LogMessages:
     SECTION_VIEWED = "Section viewed: id={section_id} by user {user_id}"
     SECTION_TOGGLED = "Section toggled: id={section_id} is_active={is_active}"
     SECTION_COPIED = "Section copied: source={source_id} new={new_id} by user {user_id}"
+    SECTION_COPY_STATUS_FAIL = "Failed to update section copy progress: {error}"
 
     FILE_CREATED = "File created: id={file_id} name={name} by user {user_id}"
     FILE_DUPLICATE = "Duplicate file detected: unique_id={file_unique_id}"
@@ -62,6 +78,8 @@ class LogMessages:
     FILE_FORWARDED = "File forwarded to storage channel: {file_id}"
     FILE_SOFT_DELETED = "File soft deleted: id={file_id} name={name}"
     FILE_SEND_FAILED = "Failed to send file {file_id}: {error}"
+    FILE_MEDIA_GROUP_FAILED = "Media group of {count} files failed, sending individually: {error}"
+    FILE_DELIVERY_STATUS_FAIL = "File delivery status update failed: {error}"
     FILE_STATUS_CHANGED = "File {file_id} status changed to {status} by user {user_id}"
     MEDIA_GROUP_RECEIVED = "Media group received: {count} files from user {user_id}"
     DEEP_LINK = "Deep link: user {user_id} requested file {file_id}"
@@ -71,6 +89,12 @@ class LogMessages:
     SEARCH_QUERY = "Search query from user {user_id}: {query}"
     SEARCH_RESULTS = "Search results for user {user_id}: {sections} sections, {files} files"
     SEARCH_RESULT_SELECTED = "Search result selected by user {user_id}: {type} {id}"
+    INLINE_QUERY = "Inline query from user {user_id}: {query} (offset {offset})"
+    SECTION_TREE_LOADED = "Section tree loaded: {count} sections in {ms}ms"
+    SECTION_COUNTERS_CORRECTED = "Section file counters reconciled: {count} sections corrected"
+    SECTION_COUNTERS_RECONCILE_FAIL = "Failed to reconcile section file counters: {error}"
+    SEARCH_INDEX_BUILT = "Search index built: {files} files, {sections} sections in {ms}ms"
+    SEARCH_INDEX_BUILD_FAIL = "Failed to build search index, falling back to database search: {error}"
 
     MODERATOR_ADDED = "Moderator added: user {target_id} by admin {admin_id}"
     MODERATOR_REMOVED = "Moderator removed: user {target_id} by admin {admin_id}"
@@ -81,11 +105,25 @@ class LogMessages:
     CONTRIBUTION_APPROVED = "Contribution approved: file {file_id} by admin {admin_id}"
     CONTRIBUTION_REJECTED = "Contribution rejected: file {file_id} by admin {admin_id}"
 
+    BROADCAST_STARTED = "Broadcast job {job_id} started by {admin_id} to {total} users"
+    BROADCAST_RESUMED = "Broadcast job {job_id} resumed after user {cursor}"
+    BROADCAST_FINISHED = "Broadcast job {job_id} finished: success={success} failed={failed} in {seconds}s"
+    BROADCAST_FAILED = "Broadcast job {job_id} aborted: {error}"
+    BROADCAST_RESUME_FAIL = "Failed to resume interrupted broadcast: {error}"
+    OUTBOUND_RETRY_AFTER = "Telegram flood limit for chat {chat_id}, retrying in {seconds}s"
+    BROADCAST_SEND_FAIL = "Broadcast delivery to {user_id} failed: {error}"
+    BROADCAST_PROGRESS_FAIL = "Broadcast progress update failed: {error}"
+
 
 class ErrorMessages:
     DATABASE_NOT_INITIALIZED = "Database not initialized"
     I18N_NOT_INITIALIZED = "I18n service not initialized"
     STATE_NOT_INITIALIZED = "State service not initialized"
+    ROUTE_PREFIX_EMPTY = "Callback prefix must not be empty"
+    ROUTE_PREFIX_CONFLICT = "Callback prefix '{prefix}' is already registered to {handler}"
+    ROUTE_NOT_FOUND = "No route registered for callback data: {data}"
+    CALLBACK_DATA_TOO_LONG = "Callback data exceeds {limit} bytes: {data}"
+    CALLBACK_ARGS_MISMATCH = "Expected {expected} callback args in: {data}"
 
 
 class AuditActions:
@@ -116,6 +154,13 @@ class AuditActions:
     BACKUP_RESTORED = "backup_restored"
 
 
+class SettingKeys:
+    SUBSCRIPTION_ENABLED = "subscription.enabled"
+    SUBSCRIPTION_CHANNELS = "subscription.channels"
+    MAINTENANCE_ENABLED = "maintenance.enabled"
+    MAINTENANCE_MESSAGE = "maintenance.message"
+
+
 class CallbackPrefixes:
     HOME = "home"
     SECTIONS = "sections"
@@ -141,10 +186,12 @@ class CallbackPrefixes:
     FILE_CANCEL = "f_cancel"
     FILE_DONE = "f_done"
     FILE_PUBLISH = "f_pub:"
+    FILE_DELIVERY_STOP = "f_stop"
     SEARCH = "search"
     SEARCH_RESULT_SECTION = "sr_sec:"
     SEARCH_RESULT_FILE = "sr_file:"
     SEARCH_BACK = "sr_back"
+    SEARCH_PAGE = "sr_pg:"
     CONTRIBUTE = "contribute"
     ABOUT = "about"
     CONTACT = "contact"
@@ -188,6 +235,9 @@ class CallbackPrefixes:
     ADMIN_BROADCAST_FILE = "adm_bc_file"
     ADMIN_BROADCAST_CONFIRM = "adm_bc_cf"
     ADMIN_BROADCAST_CANCEL = "adm_bc_cancel"
+    ADMIN_BROADCAST_PAUSE = "adm_bc_pause"
+    ADMIN_BROADCAST_RESUME = "adm_bc_resume"
+    ADMIN_BROADCAST_STOP = "adm_bc_stop"
     ADMIN_BAN = "adm_ban"
     ADMIN_BAN_BLOCK = "adm_ban_block"
     ADMIN_BAN_UNBLOCK = "adm_ban_unblock"
@@ -204,6 +254,7 @@ class I18nKeys:
     ERROR_SUBSCRIPTION_REQUIRED = "error.subscription_required"
     ERROR_PERMISSION_DENIED = "error.permission_denied"
     ERROR_STATE_EXPIRED = "error.state_expired"
+    ERROR_INPUT_TOO_LONG = "error.input_too_long"
 
     LOGIN_NOTIFICATION = "login.notification"
 
@@ -266,6 +317,7 @@ class I18nKeys:
     SECTION_ADMIN_TOGGLED_SHOWN = "section.admin.toggled_shown"
     SECTION_ADMIN_CONFIRM_COPY = "section.admin.confirm_copy"
     SECTION_ADMIN_COPIED = "section.admin.copied"
+    SECTION_ADMIN_COPY_PROGRESS = "section.admin.copy_progress"
 
     FILES_TITLE = "files.title"
     FILES_BTN_VIEW = "files.btn.view"
@@ -286,6 +338,10 @@ class I18nKeys:
     FILES_DELETED = "files.deleted"
     FILES_NOT_FOUND = "files.not_found"
     FILES_SENT = "files.sent"
+    FILES_DELIVERY_PROGRESS = "files.delivery.progress"
+    FILES_DELIVERY_DONE = "files.delivery.done"
+    FILES_DELIVERY_STOPPED = "files.delivery.stopped"
+    FILES_DELIVERY_BTN_STOP = "files.delivery.btn.stop"
     FILES_LINKED = "files.linked"
     FILES_UNLINKED = "files.unlinked"
     FILES_ALREADY_LINKED = "files.already_linked"
@@ -303,6 +359,7 @@ class I18nKeys:
     SEARCH_RESULT_FILE_LABEL = "search.result.file"
     SEARCH_BTN_BACK = "search.btn.back"
     SEARCH_QUERY_TOO_SHORT = "search.query_too_short"
+    SEARCH_EXPIRED = "search.expired"
 
     ADMIN_FILES_TITLE = "admin.files.title"
     ADMIN_FILES_EMPTY = "admin.files.empty"
@@ -388,6 +445,17 @@ class I18nKeys:
     ADMIN_BROADCAST_BTN_CANCEL = "admin.broadcast.btn.cancel"
     ADMIN_BROADCAST_CANCELLED = "admin.broadcast.cancelled"
     ADMIN_BROADCAST_DONE = "admin.broadcast.done"
+    ADMIN_BROADCAST_STARTED = "admin.broadcast.started"
+    ADMIN_BROADCAST_PROGRESS = "admin.broadcast.progress"
+    ADMIN_BROADCAST_BUSY = "admin.broadcast.busy"
+    ADMIN_BROADCAST_PAUSED = "admin.broadcast.paused"
+    ADMIN_BROADCAST_FAILED = "admin.broadcast.failed"
+    ADMIN_BROADCAST_STOPPED = "admin.broadcast.stopped"
+    ADMIN_BROADCAST_NOT_FOUND = "admin.broadcast.not_found"
+    ADMIN_BROADCAST_BTN_PAUSE = "admin.broadcast.btn.pause"
+    ADMIN_BROADCAST_BTN_RESUME = "admin.broadcast.btn.resume"
+    ADMIN_BROADCAST_BTN_STOP = "admin.broadcast.btn.stop"
+    ADMIN_BROADCAST_BTN_RESUME_JOB = "admin.broadcast.btn.resume_job"
 
     ADMIN_BAN_TITLE = "admin.ban.title"
     ADMIN_BAN_BTN_BLOCK = "admin.ban.btn.block"
@@ -422,6 +490,7 @@ class DefaultTexts:
         "error.subscription_required": "📢 يجب الاشتراك في القناة أولاً للاستمرار.",
         "error.permission_denied": "🔒 ليس لديك صلاحية للقيام بهذا الإجراء.",
         "error.state_expired": "⏱ انتهت مهلة العملية. يرجى المحاولة مرة أخرى.",
+        "error.input_too_long": "✂️ النص المُرسل طويل جداً. يرجى اختصاره والمحاولة مرة أخرى.",
         "login.notification": "تسجيل دخول جديد:\nالمعرف: {user_id}\nالاسم: {name}\nالوقت: {time}\nاسم المستخدم: {username}",
         "home.welcome": "👋 مرحباً <b>{name}</b>!\n\n📖 اختر من القائمة أدناه:",
         "home.btn.sections": "📚 الأقسام",
@@ -479,6 +548,7 @@ class DefaultTexts:
         "section.admin.toggled_shown": "👁 تم إظهار القسم «{name}» بنجاح.",
         "section.admin.confirm_copy": "📋 هل تريد نسخ القسم «{name}» مع جميع أقسامه الفرعية وروابط الملفات؟",
         "section.admin.copied": "✅ تم نسخ القسم بنجاح. القسم الجديد: «{name}»",
+        "section.admin.copy_progress": "⏳ جارٍ نسخ القسم... {done} / {total}",
         "files.title": "📄 <b>الملفات المتاحة</b>",
         "files.btn.view": "📄 الملفات",
         "files.empty": "📭 لا توجد ملفات في هذا القسم.",
@@ -498,6 +568,10 @@ class DefaultTexts:
         "files.deleted": "🗑 تم حذف الملف بنجاح.",
         "files.not_found": "⚠️ الملف غير موجود.",
         "files.sent": "تم إرسال الملف.",
+        "files.delivery.progress": "📤 جارٍ إرسال {count} ملف...",
+        "files.delivery.done": "✅ تم إرسال {sent} ملف.",
+        "files.delivery.stopped": "⏹ تم إيقاف الإرسال بعد {sent} ملف.",
+        "files.delivery.btn.stop": "⏹ إيقاف الإرسال",
         "files.linked": "✅ تم ربط الملف بالقسم بنجاح.",
         "files.unlinked": "✅ تم فك ربط الملف من القسم.",
         "files.already_linked": "🔄 الملف مربوط بهذا القسم مسبقاً.",
@@ -514,6 +588,7 @@ class DefaultTexts:
         "search.result.file": "📄 {name}",
         "search.btn.back": "🔙 رجوع من البحث",
         "search.query_too_short": "⚠️ يرجى إدخال حرفين على الأقل للبحث.",
+        "search.expired": "⌛ انتهت صلاحية نتائج البحث، يرجى البحث مجدداً.",
         "admin.files.title": "📄 <b>إدارة الملفات</b>\n\nجميع الملفات ({count}):",
         "admin.files.empty": "📭 لا توجد ملفات في النظام.",
         "admin.file.detail": "📄 <b>{name}</b>\n\nالنوع: {file_type}\nالحالة: {status}\nرفع بواسطة: {uploaded_by}\nالأقسام: {sections}",
@@ -586,6 +661,17 @@ class DefaultTexts:
         "admin.broadcast.btn.cancel": "❌ إلغاء",
         "admin.broadcast.cancelled": "تم إلغاء عملية البث.",
         "admin.broadcast.done": "✅ انتهى البث.\nنجح: {success}\nفشل: {failed}",
+        "admin.broadcast.started": "🚀 بدأ البث في الخلفية، سيتم تحديث هذه الرسالة بالتقدم.",
+        "admin.broadcast.progress": "📣 جارٍ البث... {processed}/{total}\nنجح: {success}\nفشل: {failed}",
+        "admin.broadcast.busy": "⏳ يوجد بث قيد التنفيذ حاليًا، انتظر حتى ينتهي.",
+        "admin.broadcast.paused": "⏸ البث متوقف مؤقتًا عند {processed}/{total}\nنجح: {success}\nفشل: {failed}",
+        "admin.broadcast.failed": "⚠️ توقف البث بسبب خطأ عند {processed}/{total}\nنجح: {success}\nفشل: {failed}\nيمكنك استئنافه من حيث توقف.",
+        "admin.broadcast.stopped": "⛔️ تم إيقاف البث نهائيًا.\nنجح: {success}\nفشل: {failed}",
+        "admin.broadcast.not_found": "لا يوجد بث بهذا المعرّف أو لا يمكن تنفيذ العملية عليه.",
+        "admin.broadcast.btn.pause": "⏸ إيقاف مؤقت",
+        "admin.broadcast.btn.resume": "▶️ استئناف",
+        "admin.broadcast.btn.stop": "⛔️ إيقاف نهائي",
+        "admin.broadcast.btn.resume_job": "▶️ استئناف البث #{job_id}",
         "admin.ban.title": "🚫 <b>إدارة الحظر</b>\n\nاختر العملية المطلوبة:",
         "admin.ban.btn.block": "🚫 حظر مستخدم",
         "admin.ban.btn.unblock": "✅ رفع الحظر",
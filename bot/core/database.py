@@ -1,52 +1,409 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
-from typing import AsyncGenerator
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DisconnectionError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from bot.core.config import DatabaseConfig
+
+PRE_PING_ALWAYS = "always"
+PRE_PING_IDLE = "idle"
+PRE_PING_NEVER = "never"
+
+LAST_CHECKIN_KEY = "last_checkin"
+REPLICA_BIND_KEY = "replica_bind"
+READ_ONLY_KEY = "read_only"
+WROTE_KEY = "wrote"
+MAX_PINNED_USERS = 10000
+READ_KEYWORDS = ("select", "show", "explain")
+LEADING_KEYWORD = re.compile(r"\s*(\w+)")
+
+_unit_of_work: ContextVar[Optional["UnitOfWork"]] = ContextVar("unit_of_work", default=None)
 
 
 class Base(DeclarativeBase):
     pass
 
 
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+            self.checkouts += 1
+            return connection
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            if waited >= 0.001:
+                self.waits += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(0, self.overflow()),
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "wait_ms_total": round(self.wait_seconds * 1000, 1),
+            "wait_ms_max": round(self.max_wait_seconds * 1000, 1),
+            "timeouts": self.timeouts,
+        }
+
+
+def _split_url(url: str) -> Tuple[str, Dict[str, Any]]:
+    """Turn a libpq-style DATABASE_URL into an asyncpg URL plus connect args.
+
+    ``sslmode`` becomes asyncpg's ``ssl``; ``application_name`` and
+    ``options=-c name=value`` become server settings; other libpq-only
+    query options are dropped.
+    """
+    async_url = url.replace("postgresql://", "postgresql+asyncpg://").replace(
+        "postgres://", "postgresql+asyncpg://"
+    )
+    if not async_url.startswith("postgresql+asyncpg://"):
+        async_url = f"postgresql+asyncpg://{url.split('://')[-1]}"
+
+    parsed = make_url(async_url)
+    query = dict(parsed.query)
+    connect_args: Dict[str, Any] = {}
+    server_settings: Dict[str, str] = {}
+
+    ssl = query.get("ssl") or query.get("sslmode")
+    if ssl:
+        connect_args["ssl"] = ssl if isinstance(ssl, str) else ssl[0]
+    application_name = query.get("application_name")
+    if application_name:
+        server_settings["application_name"] = str(application_name)
+    options = query.get("options")
+    if isinstance(options, str):
+        for option in options.split("-c")[1:]:
+            name, _, value = option.strip().partition("=")
+            if name and value:
+                server_settings[name.strip()] = value.strip()
+    if server_settings:
+        connect_args["server_settings"] = server_settings
+
+    return parsed.set(query={}).render_as_string(hide_password=False), connect_args
+
+
+def _install_idle_pre_ping(pool: Any, idle_seconds: float) -> None:
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection: Any, record: Any) -> None:
+        record.info[LAST_CHECKIN_KEY] = time.monotonic()
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+        last = record.info.get(LAST_CHECKIN_KEY)
+        if last is None or time.monotonic() - last < idle_seconds:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception as e:
+            raise DisconnectionError(str(e)) from e
+        finally:
+            cursor.close()
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Any:
+        replica = self.info.get(REPLICA_BIND_KEY)
+        if (
+            replica is not None
+            and self.info.get(READ_ONLY_KEY)
+            and not self.info.get(WROTE_KEY)
+            and not self._flushing
+            and (clause is None or getattr(clause, "is_select", False))
+        ):
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_written(session: Session, flush_context: Any) -> None:
+    session.info[WROTE_KEY] = True
+
+
+def _is_write(orm_execute_state: Any) -> bool:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        return True
+    sql = getattr(orm_execute_state.statement, "text", None)
+    if isinstance(sql, str):
+        # text() carries no statement type; anything that does not open with
+        # a read keyword (DDL, DML, CTE-wrapped DML) counts as a write.
+        keyword = LEADING_KEYWORD.match(sql)
+        return keyword is None or keyword.group(1).lower() not in READ_KEYWORDS
+    return False
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_written(orm_execute_state: Any) -> None:
+    if _is_write(orm_execute_state):
+        orm_execute_state.session.info[WROTE_KEY] = True
+
+
+class UnitOfWork:
+    """One lazily opened session shared by everything awaited in the owning task.
+
+    Session blocks share one transaction and connection. It is committed
+    when the scope ends, or earlier by ``release_unit_of_work`` just before
+    an outbound Telegram call, so no transaction waits on the Bot API.
+
+    Tasks spawned while it is active inherit the context variable but not the
+    session: an AsyncSession must not be used concurrently.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, user_id: Optional[int] = None):
+        self._session_factory = session_factory
+        self._owner = asyncio.current_task()
+        self._session: Optional[AsyncSession] = None
+        self.user_id = user_id
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    @property
+    def opened(self) -> bool:
+        return self._session is not None
+
+    @property
+    def wrote(self) -> bool:
+        return self._session is not None and bool(self._session.info.get(WROTE_KEY))
+
+    def owned_by_current_task(self) -> bool:
+        return self._owner is asyncio.current_task()
+
+    async def commit(self) -> bool:
+        if self._session is None or not self._session.in_transaction():
+            return False
+        await self._session.commit()
+        return True
+
+    async def rollback(self) -> bool:
+        if self._session is None or not self._session.in_transaction():
+            return False
+        await self._session.rollback()
+        return True
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    uow = _unit_of_work.get()
+    if uow is not None and uow.owned_by_current_task():
+        return uow
+    return None
+
+
+def _create_engine(url: str, options: DatabaseConfig) -> AsyncEngine:
+    async_url, connect_args = _split_url(url)
+
+    server_settings = connect_args.setdefault("server_settings", {})
+    if options.application_name:
+        server_settings.setdefault("application_name", options.application_name)
+    if options.statement_timeout_ms > 0:
+        server_settings.setdefault("statement_timeout", str(options.statement_timeout_ms))
+    if not server_settings:
+        del connect_args["server_settings"]
+    connect_args["statement_cache_size"] = options.statement_cache_size
+
+    engine = create_async_engine(
+        make_url(async_url).update_query_dict(
+            {"prepared_statement_cache_size": str(options.statement_cache_size)}
+        ),
+        echo=False,
+        poolclass=MeteredQueuePool,
+        pool_size=options.pool_size,
+        max_overflow=options.max_overflow,
+        pool_timeout=options.pool_timeout_seconds,
+        pool_recycle=options.pool_recycle_seconds,
+        pool_pre_ping=options.pre_ping == PRE_PING_ALWAYS,
+        connect_args=connect_args,
+    )
+    if options.pre_ping == PRE_PING_IDLE:
+        _install_idle_pre_ping(engine.sync_engine.pool, options.pre_ping_idle_seconds)
+    return engine
+
+
+def _pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    pool = engine.sync_engine.pool
+    if isinstance(pool, MeteredQueuePool):
+        return pool.stats()
+    return {"status": pool.status()}
+
+
 class Database:
-    def __init__(self, url: str):
-        async_url = url.replace("postgresql://", "postgresql+asyncpg://")
-        if not async_url.startswith("postgresql+asyncpg://"):
-            async_url = f"postgresql+asyncpg://{url.split('://')[-1]}"
-
-        if "?" in async_url:
-            async_url = async_url.split("?")[0]
-
-        self.engine = create_async_engine(
-            async_url,
-            echo=False,
-            pool_pre_ping=True,
-        )
+    def __init__(self, url: str, options: Optional[DatabaseConfig] = None):
+        options = options or DatabaseConfig(url=url)
+        self.engine = _create_engine(url, options)
+        self.replica_engine: Optional[AsyncEngine] = None
+        session_options: Dict[str, Any] = {}
+        if options.replica_url:
+            self.replica_engine = _create_engine(options.replica_url, options)
+            session_options = {
+                "sync_session_class": RoutingSession,
+                "info": {REPLICA_BIND_KEY: self.replica_engine.sync_engine},
+            }
         self.session_factory = async_sessionmaker(
             bind=self.engine,
             class_=AsyncSession,
             expire_on_commit=False,
             autoflush=False,
+            **session_options,
         )
-    
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+        self._replica_pin_seconds = options.replica_pin_seconds
+        self._pinned: Dict[int, float] = {}
+        self.replica_reads = 0
+        self.uow_scopes = 0
+        self.uow_sessions = 0
+        self.uow_commits = 0
+        self.uow_rollbacks = 0
+        self.uow_releases = 0
+
+    @asynccontextmanager
+    async def unit_of_work(self, user_id: Optional[int] = None) -> AsyncIterator[UnitOfWork]:
+        uow = UnitOfWork(self.session_factory, user_id)
+        token = _unit_of_work.set(uow)
+        self.uow_scopes += 1
+        try:
+            yield uow
+            await self._commit_unit_of_work(uow)
+        except BaseException:
+            await self._rollback_unit_of_work(uow)
+            raise
+        finally:
+            _unit_of_work.reset(token)
+            if uow.opened:
+                self.uow_sessions += 1
+            await uow.close()
+
+    async def _commit_unit_of_work(self, uow: UnitOfWork) -> bool:
+        if not await uow.commit():
+            return False
+        self.uow_commits += 1
+        if uow.wrote and uow.user_id is not None:
+            self._pin(uow.user_id)
+        return True
+
+    async def _rollback_unit_of_work(self, uow: UnitOfWork) -> None:
+        if await uow.rollback():
+            self.uow_rollbacks += 1
+
+    async def release_unit_of_work(self) -> None:
+        """Commit the current task's open transaction and return its connection."""
+        uow = current_unit_of_work()
+        if uow is not None and await self._commit_unit_of_work(uow):
+            self.uow_releases += 1
+
+    def _pin(self, user_id: int) -> None:
+        if self.replica_engine is None or self._replica_pin_seconds <= 0:
+            return
+        now = time.monotonic()
+        if len(self._pinned) >= MAX_PINNED_USERS:
+            self._pinned = {uid: until for uid, until in self._pinned.items() if until > now}
+        self._pinned[user_id] = now + self._replica_pin_seconds
+
+    def is_pinned(self, user_id: Optional[int]) -> bool:
+        if user_id is None:
+            return False
+        until = self._pinned.get(user_id)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            del self._pinned[user_id]
+            return False
+        return True
+
+    async def get_session(
+        self, standalone: bool = False, read_only: bool = False
+    ) -> AsyncGenerator[AsyncSession, None]:
+        uow = None if standalone else current_unit_of_work()
+        route = (
+            read_only
+            and self.replica_engine is not None
+            and not (uow is not None and uow.wrote)
+            and not self.is_pinned(uow.user_id if uow is not None else None)
+        )
+        if route:
+            self.replica_reads += 1
+        if uow is not None:
+            session = uow.session
+            session.info[READ_ONLY_KEY] = route
+            try:
+                yield session
+            finally:
+                session.info[READ_ONLY_KEY] = False
+            return
         async with self.session_factory() as session:
+            session.info[READ_ONLY_KEY] = route
             try:
                 yield session
                 await session.commit()
             except Exception:
                 await session.rollback()
                 raise
-    
+
+    def unit_of_work_stats(self) -> Dict[str, Any]:
+        return {
+            "scopes": self.uow_scopes,
+            "sessions": self.uow_sessions,
+            "commits": self.uow_commits,
+            "rollbacks": self.uow_rollbacks,
+            "releases": self.uow_releases,
+        }
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return _pool_stats(self.engine)
+
+    def replica_stats(self) -> Optional[Dict[str, Any]]:
+        if self.replica_engine is None:
+            return None
+        return {
+            **_pool_stats(self.replica_engine),
+            "routed_reads": self.replica_reads,
+            "pinned_users": len(self._pinned),
+        }
+
     async def close(self) -> None:
         await self.engine.dispose()
+        if self.replica_engine is not None:
+            await self.replica_engine.dispose()
 
 
 db: Database | None = None
 
 
-async def init_database(url: str) -> Database:
+async def init_database(url: str, options: Optional[DatabaseConfig] = None) -> Database:
     global db
-    db = Database(url)
+    db = Database(url, options)
     return db
 
 
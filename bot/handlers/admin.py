@@ -8,6 +8,8 @@ from aiogram import Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton, FSInputFile
 
 from bot.core.constants import LogMessages, I18nKeys, CallbackPrefixes, AuditActions
+from bot.modules.callback_codec import encode_callback
+from bot.modules.central_router import central_router, get_callback_args
 from bot.core.database import get_db
 from bot.services.i18n import get_i18n
 from bot.services.state import get_state_service
@@ -20,6 +22,12 @@ from bot.services.permissions import has_permission, check_permission_and_notify
 from bot.services.settings_manager import settings_manager
 from bot.services.stats import stats_service
 from bot.services.backup import backup_service
+from bot.services.broadcast import broadcast_engine
+from bot.services.broadcast_jobs import broadcast_job_service
+from bot.services.pagination import KeysetPage, SEEK_NEWER, SEEK_OLDER
+from bot.services.search_index import search_index
+from bot.services.section_counters import section_counters
+from bot.services.section_tree import section_tree
 from bot.models.user import UserRole
 from bot.models.file import File, FileStatus
 from bot.models.section import Section
@@ -29,6 +37,7 @@ logger = logging.getLogger("bot")
 ADMIN_FILES_PER_PAGE = 5
 ADMIN_AUDIT_PER_PAGE = 8
 ADMIN_CONTRIB_PER_PAGE = 5
+SECTION_COPY_PROGRESS_INTERVAL = 2.0
 
 STATES = {
     "MOD_ADD": "admin_mod_add",
@@ -43,6 +52,16 @@ STATES = {
     "BACKUP_RESTORE": "admin_backup_restore",
 }
 
+# Buttons carry the index, not the key: keys can exceed the 64-byte callback limit.
+EDITABLE_TEXT_KEYS = (
+    I18nKeys.HOME_WELCOME,
+    I18nKeys.HOME_ABOUT_TEXT,
+    I18nKeys.HOME_CONTACT_TEXT,
+    I18nKeys.SECTIONS_TITLE,
+    I18nKeys.FILES_UPLOAD_PROMPT,
+    I18nKeys.CONTRIBUTE_PROMPT,
+)
+
 
 def _admin_back_button() -> InlineKeyboardButton:
     i18n = get_i18n()
@@ -52,6 +71,27 @@ def _admin_back_button() -> InlineKeyboardButton:
     )
 
 
+def _keyset_nav_row(prefix: str, result: KeysetPage) -> List[InlineKeyboardButton]:
+    i18n = get_i18n()
+    nav_row: List[InlineKeyboardButton] = []
+    if result.has_prev:
+        nav_row.append(InlineKeyboardButton(
+            text=i18n.get(I18nKeys.FILES_PAGE_PREV),
+            callback_data=encode_callback(prefix, result.page - 1, result.first_id, SEEK_NEWER),
+        ))
+    if result.total_pages > 1:
+        nav_row.append(InlineKeyboardButton(
+            text=i18n.get(I18nKeys.FILES_PAGE_INFO, page=result.page, total=result.total_pages),
+            callback_data="noop",
+        ))
+    if result.has_next:
+        nav_row.append(InlineKeyboardButton(
+            text=i18n.get(I18nKeys.FILES_PAGE_NEXT),
+            callback_data=encode_callback(prefix, result.page + 1, result.last_id, SEEK_OLDER),
+        ))
+    return nav_row
+
+
 async def handle_admin_files(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
     role = kwargs.get("user_role", UserRole.USER)
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
@@ -59,20 +99,26 @@ async def handle_admin_files(callback: CallbackQuery, kwargs: Dict[str, Any]) ->
     await _show_admin_files(callback, page=1)
 
 
-async def _show_admin_files(callback: CallbackQuery, page: int = 1) -> None:
+async def _show_admin_files(
+    callback: CallbackQuery,
+    page: int = 1,
+    cursor: int = 0,
+    direction: int = SEEK_OLDER,
+) -> None:
     if not callback.message:
         return
 
     i18n = get_i18n()
     db = await get_db()
-    files: List[File] = []
-    total = 0
+    result: Optional[KeysetPage] = None
 
     async for session in db.get_session():
-        files, total = await file_service.list_all_files(
-            session, page=page, per_page=ADMIN_FILES_PER_PAGE
+        result = await file_service.list_all_files(
+            session, cursor=cursor, direction=direction, page=page, per_page=ADMIN_FILES_PER_PAGE
         )
 
+    files = result.items if result is not None else []
+
     if not files:
         keyboard = InlineKeyboardMarkup(inline_keyboard=[[_admin_back_button()]])
         await callback.message.edit_text(  # type: ignore[union-attr]
@@ -97,26 +143,10 @@ async def _show_admin_files(callback: CallbackQuery, page: int = 1) -> None:
             display_name = display_name[:32] + "..."
         buttons.append([InlineKeyboardButton(
             text=f"{emoji}{status_icon} {display_name}",
-            callback_data=f"{CallbackPrefixes.ADMIN_FILE_DETAIL}{f.id}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_FILE_DETAIL, f.id),
         )])
 
-    total_pages = max(1, (total + ADMIN_FILES_PER_PAGE - 1) // ADMIN_FILES_PER_PAGE)
-    nav_row: List[InlineKeyboardButton] = []
-    if page > 1:
-        nav_row.append(InlineKeyboardButton(
-            text=i18n.get(I18nKeys.FILES_PAGE_PREV),
-            callback_data=f"{CallbackPrefixes.ADMIN_FILES_PAGE}{page - 1}",
-        ))
-    if total_pages > 1:
-        nav_row.append(InlineKeyboardButton(
-            text=i18n.get(I18nKeys.FILES_PAGE_INFO, page=page, total=total_pages),
-            callback_data="noop",
-        ))
-    if page < total_pages:
-        nav_row.append(InlineKeyboardButton(
-            text=i18n.get(I18nKeys.FILES_PAGE_NEXT),
-            callback_data=f"{CallbackPrefixes.ADMIN_FILES_PAGE}{page + 1}",
-        ))
+    nav_row = _keyset_nav_row(CallbackPrefixes.ADMIN_FILES_PAGE, result)
     if nav_row:
         buttons.append(nav_row)
 
@@ -124,7 +154,7 @@ async def _show_admin_files(callback: CallbackQuery, page: int = 1) -> None:
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
     await callback.message.edit_text(  # type: ignore[union-attr]
-        i18n.get(I18nKeys.ADMIN_FILES_TITLE, count=total),
+        i18n.get(I18nKeys.ADMIN_FILES_TITLE, count=result.total),  # type: ignore[union-attr]
         reply_markup=keyboard,
     )  # type: ignore[union-attr]
     await callback.answer()
@@ -136,11 +166,8 @@ async def handle_admin_files_page(callback: CallbackQuery, kwargs: Dict[str, Any
     role = kwargs.get("user_role", UserRole.USER)
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
-    try:
-        page = int(callback.data.replace(CallbackPrefixes.ADMIN_FILES_PAGE, ""))
-    except (ValueError, IndexError):
-        return
-    await _show_admin_files(callback, page=page)
+    page, cursor, direction = get_callback_args(callback, kwargs)
+    await _show_admin_files(callback, page=page, cursor=cursor, direction=direction)
 
 
 async def handle_admin_file_detail(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
@@ -150,10 +177,7 @@ async def handle_admin_file_detail(callback: CallbackQuery, kwargs: Dict[str, An
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
 
-    try:
-        file_id = int(callback.data.replace(CallbackPrefixes.ADMIN_FILE_DETAIL, ""))
-    except (ValueError, IndexError):
-        return
+    file_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
@@ -164,13 +188,13 @@ async def handle_admin_file_detail(callback: CallbackQuery, kwargs: Dict[str, An
     async for session in db.get_session():
         file = await file_service.get_file(session, file_id)
         if file is None:
-            await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
-            return
+            break
         sections = await file_service.get_file_sections(session, file_id)
         uploader = await user_service.get_by_id(session, file.uploaded_by)
         uploader_name = uploader.first_name if uploader else str(file.uploaded_by)
 
     if file is None:
+        await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
         return
 
     section_names = ", ".join(s.name for s in sections) if sections else "-"
@@ -190,22 +214,22 @@ async def handle_admin_file_detail(callback: CallbackQuery, kwargs: Dict[str, An
     if file.status == FileStatus.PUBLISHED.value:
         buttons.append([InlineKeyboardButton(
             text=i18n.get(I18nKeys.ADMIN_FILE_BTN_DRAFT),
-            callback_data=f"{CallbackPrefixes.ADMIN_FILE_TOGGLE_STATUS}{file_id}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_FILE_TOGGLE_STATUS, file_id),
         )])
     else:
         buttons.append([InlineKeyboardButton(
             text=i18n.get(I18nKeys.ADMIN_FILE_BTN_PUBLISH),
-            callback_data=f"{CallbackPrefixes.ADMIN_FILE_TOGGLE_STATUS}{file_id}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_FILE_TOGGLE_STATUS, file_id),
         )])
 
     buttons.append([
         InlineKeyboardButton(
             text=i18n.get(I18nKeys.ADMIN_FILE_BTN_LINK),
-            callback_data=f"{CallbackPrefixes.ADMIN_FILE_LINK_PICK}{file_id}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_FILE_LINK_PICK, file_id),
         ),
         InlineKeyboardButton(
             text=i18n.get(I18nKeys.ADMIN_FILE_BTN_UNLINK),
-            callback_data=f"{CallbackPrefixes.ADMIN_FILE_UNLINK_PICK}{file_id}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_FILE_UNLINK_PICK, file_id),
         ),
     ])
 
@@ -223,10 +247,7 @@ async def handle_admin_file_toggle_status(callback: CallbackQuery, kwargs: Dict[
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
 
-    try:
-        file_id = int(callback.data.replace(CallbackPrefixes.ADMIN_FILE_TOGGLE_STATUS, ""))
-    except (ValueError, IndexError):
-        return
+    file_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
@@ -235,8 +256,7 @@ async def handle_admin_file_toggle_status(callback: CallbackQuery, kwargs: Dict[
     async for session in db.get_session():
         file = await file_service.get_file(session, file_id)
         if file is None:
-            await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
-            return
+            break
 
         if file.status == FileStatus.PUBLISHED.value:
             new_status = FileStatus.DRAFT.value
@@ -253,16 +273,17 @@ async def handle_admin_file_toggle_status(callback: CallbackQuery, kwargs: Dict[
             file_id=file_id, status=new_status, user_id=callback.from_user.id
         ))
 
+    if not new_status:
+        await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
+        return
+
     status_text = "✅" if new_status == FileStatus.PUBLISHED.value else "📝"
     await callback.answer(
         i18n.get(I18nKeys.ADMIN_FILE_STATUS_CHANGED, status=status_text),
         show_alert=True,
     )
 
-    cb_data = callback.data
-    object.__setattr__(callback, 'data', f"{CallbackPrefixes.ADMIN_FILE_DETAIL}{file_id}")
-    await handle_admin_file_detail(callback, kwargs)
-    object.__setattr__(callback, 'data', cb_data)
+    await central_router.redispatch(callback, CallbackPrefixes.ADMIN_FILE_DETAIL, kwargs, file_id)
 
 
 async def handle_admin_file_link_pick(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
@@ -272,10 +293,7 @@ async def handle_admin_file_link_pick(callback: CallbackQuery, kwargs: Dict[str,
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
 
-    try:
-        file_id = int(callback.data.replace(CallbackPrefixes.ADMIN_FILE_LINK_PICK, ""))
-    except (ValueError, IndexError):
-        return
+    file_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
@@ -292,11 +310,11 @@ async def handle_admin_file_link_pick(callback: CallbackQuery, kwargs: Dict[str,
     for sec in all_sections:
         buttons.append([InlineKeyboardButton(
             text=f"📁 {sec.name}",
-            callback_data=f"{CallbackPrefixes.ADMIN_FILE_LINK_SEC}{file_id}:{sec.id}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_FILE_LINK_SEC, file_id, sec.id),
         )])
     buttons.append([InlineKeyboardButton(
         text=i18n.get(I18nKeys.ADMIN_BTN_BACK),
-        callback_data=f"{CallbackPrefixes.ADMIN_FILE_DETAIL}{file_id}",
+        callback_data=encode_callback(CallbackPrefixes.ADMIN_FILE_DETAIL, file_id),
     )])
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
@@ -314,16 +332,13 @@ async def handle_admin_file_link_sec(callback: CallbackQuery, kwargs: Dict[str,
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
 
-    try:
-        parts = callback.data.replace(CallbackPrefixes.ADMIN_FILE_LINK_SEC, "").split(":")
-        file_id = int(parts[0])
-        section_id = int(parts[1])
-    except (ValueError, IndexError):
-        return
+    file_id, section_id = get_callback_args(callback, kwargs)
 
     i18n = get_i18n()
     db = await get_db()
 
+    linked = False
+
     async for session in db.get_session():
         linked = await file_service.link_file_to_section(session, file_id, section_id)
         if linked:
@@ -332,14 +347,13 @@ async def handle_admin_file_link_sec(callback: CallbackQuery, kwargs: Dict[str,
                 AuditActions.FILE_LINKED,
                 f"file_id={file_id} section_id={section_id}",
             )
-            await callback.answer(i18n.get(I18nKeys.ADMIN_FILE_LINKED), show_alert=True)
-        else:
-            await callback.answer(i18n.get(I18nKeys.FILES_ALREADY_LINKED), show_alert=True)
 
-    cb_data = callback.data
-    object.__setattr__(callback, 'data', f"{CallbackPrefixes.ADMIN_FILE_DETAIL}{file_id}")
-    await handle_admin_file_detail(callback, kwargs)
-    object.__setattr__(callback, 'data', cb_data)
+    if linked:
+        await callback.answer(i18n.get(I18nKeys.ADMIN_FILE_LINKED), show_alert=True)
+    else:
+        await callback.answer(i18n.get(I18nKeys.FILES_ALREADY_LINKED), show_alert=True)
+
+    await central_router.redispatch(callback, CallbackPrefixes.ADMIN_FILE_DETAIL, kwargs, file_id)
 
 
 async def handle_admin_file_unlink_pick(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
@@ -349,10 +363,7 @@ async def handle_admin_file_unlink_pick(callback: CallbackQuery, kwargs: Dict[st
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
 
-    try:
-        file_id = int(callback.data.replace(CallbackPrefixes.ADMIN_FILE_UNLINK_PICK, ""))
-    except (ValueError, IndexError):
-        return
+    file_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
@@ -369,11 +380,11 @@ async def handle_admin_file_unlink_pick(callback: CallbackQuery, kwargs: Dict[st
     for sec in sections:
         buttons.append([InlineKeyboardButton(
             text=f"📁 {sec.name}",
-            callback_data=f"{CallbackPrefixes.ADMIN_FILE_UNLINK_SEC}{file_id}:{sec.id}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_FILE_UNLINK_SEC, file_id, sec.id),
         )])
     buttons.append([InlineKeyboardButton(
         text=i18n.get(I18nKeys.ADMIN_BTN_BACK),
-        callback_data=f"{CallbackPrefixes.ADMIN_FILE_DETAIL}{file_id}",
+        callback_data=encode_callback(CallbackPrefixes.ADMIN_FILE_DETAIL, file_id),
     )])
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
@@ -391,16 +402,13 @@ async def handle_admin_file_unlink_sec(callback: CallbackQuery, kwargs: Dict[str
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
 
-    try:
-        parts = callback.data.replace(CallbackPrefixes.ADMIN_FILE_UNLINK_SEC, "").split(":")
-        file_id = int(parts[0])
-        section_id = int(parts[1])
-    except (ValueError, IndexError):
-        return
+    file_id, section_id = get_callback_args(callback, kwargs)
 
     i18n = get_i18n()
     db = await get_db()
 
+    unlinked = False
+
     async for session in db.get_session():
         unlinked = await file_service.unlink_file_from_section(session, file_id, section_id)
         if unlinked:
@@ -409,14 +417,13 @@ async def handle_admin_file_unlink_sec(callback: CallbackQuery, kwargs: Dict[str
                 AuditActions.FILE_UNLINKED,
                 f"file_id={file_id} section_id={section_id}",
             )
-            await callback.answer(i18n.get(I18nKeys.ADMIN_FILE_UNLINKED), show_alert=True)
-        else:
-            await callback.answer(i18n.get(I18nKeys.ADMIN_FILE_NO_SECTIONS), show_alert=True)
 
-    cb_data = callback.data
-    object.__setattr__(callback, 'data', f"{CallbackPrefixes.ADMIN_FILE_DETAIL}{file_id}")
-    await handle_admin_file_detail(callback, kwargs)
-    object.__setattr__(callback, 'data', cb_data)
+    if unlinked:
+        await callback.answer(i18n.get(I18nKeys.ADMIN_FILE_UNLINKED), show_alert=True)
+    else:
+        await callback.answer(i18n.get(I18nKeys.ADMIN_FILE_NO_SECTIONS), show_alert=True)
+
+    await central_router.redispatch(callback, CallbackPrefixes.ADMIN_FILE_DETAIL, kwargs, file_id)
 
 
 async def handle_admin_moderators(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
@@ -447,7 +454,7 @@ async def _show_moderators_list(callback: CallbackQuery) -> None:
             display = mod.first_name or str(mod.id)
             buttons.append([InlineKeyboardButton(
                 text=f"👤 {display}",
-                callback_data=f"{CallbackPrefixes.ADMIN_MOD_VIEW}{mod.id}",
+                callback_data=encode_callback(CallbackPrefixes.ADMIN_MOD_VIEW, mod.id),
             )])
 
     buttons.append([InlineKeyboardButton(
@@ -468,19 +475,17 @@ async def handle_admin_mod_view(callback: CallbackQuery, kwargs: Dict[str, Any])
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_USERS):
         return
 
-    try:
-        target_id = int(callback.data.replace(CallbackPrefixes.ADMIN_MOD_VIEW, ""))
-    except (ValueError, IndexError):
-        return
+    target_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
 
+    text = ""
+
     async for session in db.get_session():
         user = await user_service.get_by_id(session, target_id)
         if user is None:
-            await callback.answer(i18n.get(I18nKeys.ADMIN_MOD_NOT_FOUND), show_alert=True)
-            return
+            break
 
         perms = await moderator_service.get_permissions(session, target_id)
         perm_lines = []
@@ -498,14 +503,18 @@ async def handle_admin_mod_view(callback: CallbackQuery, kwargs: Dict[str, Any])
             permissions="\n".join(perm_lines) if perm_lines else "-",
         )
 
+    if not text:
+        await callback.answer(i18n.get(I18nKeys.ADMIN_MOD_NOT_FOUND), show_alert=True)
+        return
+
     buttons = [
         [InlineKeyboardButton(
             text=i18n.get(I18nKeys.ADMIN_MOD_BTN_PERMS),
-            callback_data=f"{CallbackPrefixes.ADMIN_MOD_PERMS}{target_id}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_MOD_PERMS, target_id),
         )],
         [InlineKeyboardButton(
             text=i18n.get(I18nKeys.ADMIN_MOD_BTN_REMOVE),
-            callback_data=f"{CallbackPrefixes.ADMIN_MOD_REMOVE}{target_id}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_MOD_REMOVE, target_id),
         )],
         [InlineKeyboardButton(
             text=i18n.get(I18nKeys.ADMIN_BTN_BACK),
@@ -527,7 +536,7 @@ async def handle_admin_mod_add(callback: CallbackQuery, kwargs: Dict[str, Any])
 
     i18n = get_i18n()
     state_service = get_state_service()
-    state_service.set_state(callback.from_user.id, STATES["MOD_ADD"])
+    await state_service.set_state(callback.from_user.id, STATES["MOD_ADD"])
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=[[
         InlineKeyboardButton(
@@ -550,10 +559,7 @@ async def handle_admin_mod_remove(callback: CallbackQuery, kwargs: Dict[str, Any
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_USERS):
         return
 
-    try:
-        target_id = int(callback.data.replace(CallbackPrefixes.ADMIN_MOD_REMOVE, ""))
-    except (ValueError, IndexError):
-        return
+    target_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
@@ -561,18 +567,19 @@ async def handle_admin_mod_remove(callback: CallbackQuery, kwargs: Dict[str, Any
 
     async for session in db.get_session():
         target_user = await user_service.get_by_id(session, target_id)
-        if target_user is None:
-            await callback.answer(i18n.get(I18nKeys.ADMIN_MOD_NOT_FOUND), show_alert=True)
-            return
+
+    if target_user is None:
+        await callback.answer(i18n.get(I18nKeys.ADMIN_MOD_NOT_FOUND), show_alert=True)
+        return
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(
             text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_CONFIRM),
-            callback_data=f"{CallbackPrefixes.ADMIN_MOD_CONFIRM_REMOVE}{target_id}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_MOD_CONFIRM_REMOVE, target_id),
         )],
         [InlineKeyboardButton(
             text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_CANCEL),
-            callback_data=f"{CallbackPrefixes.ADMIN_MOD_VIEW}{target_id}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_MOD_VIEW, target_id),
         )],
     ])
 
@@ -590,10 +597,7 @@ async def handle_admin_mod_confirm_remove(callback: CallbackQuery, kwargs: Dict[
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_USERS):
         return
 
-    try:
-        target_id = int(callback.data.replace(CallbackPrefixes.ADMIN_MOD_CONFIRM_REMOVE, ""))
-    except (ValueError, IndexError):
-        return
+    target_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
@@ -621,10 +625,7 @@ async def handle_admin_mod_perms(callback: CallbackQuery, kwargs: Dict[str, Any]
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_USERS):
         return
 
-    try:
-        target_id = int(callback.data.replace(CallbackPrefixes.ADMIN_MOD_PERMS, ""))
-    except (ValueError, IndexError):
-        return
+    target_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
@@ -651,12 +652,12 @@ async def handle_admin_mod_perms(callback: CallbackQuery, kwargs: Dict[str, Any]
         icon = "✅" if val else "❌"
         buttons.append([InlineKeyboardButton(
             text=f"{icon} {i18n.get(label_key)}",
-            callback_data=f"{CallbackPrefixes.ADMIN_MOD_TOGGLE_PERM}{target_id}:{field}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_MOD_TOGGLE_PERM, target_id, field),
         )])
 
     buttons.append([InlineKeyboardButton(
         text=i18n.get(I18nKeys.ADMIN_BTN_BACK),
-        callback_data=f"{CallbackPrefixes.ADMIN_MOD_VIEW}{target_id}",
+        callback_data=encode_callback(CallbackPrefixes.ADMIN_MOD_VIEW, target_id),
     )])
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
@@ -674,13 +675,7 @@ async def handle_admin_mod_toggle_perm(callback: CallbackQuery, kwargs: Dict[str
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_USERS):
         return
 
-    try:
-        data = callback.data.replace(CallbackPrefixes.ADMIN_MOD_TOGGLE_PERM, "")
-        parts = data.split(":")
-        target_id = int(parts[0])
-        field = parts[1]
-    except (ValueError, IndexError):
-        return
+    target_id, field = get_callback_args(callback, kwargs)
 
     valid_fields = {"can_upload", "can_link", "can_publish", "own_files_only"}
     if field not in valid_fields:
@@ -705,10 +700,7 @@ async def handle_admin_mod_toggle_perm(callback: CallbackQuery, kwargs: Dict[str
 
     await callback.answer(i18n.get(I18nKeys.ADMIN_MOD_PERMS_UPDATED), show_alert=True)
 
-    cb_data = callback.data
-    object.__setattr__(callback, 'data', f"{CallbackPrefixes.ADMIN_MOD_PERMS}{target_id}")
-    await handle_admin_mod_perms(callback, kwargs)
-    object.__setattr__(callback, 'data', cb_data)
+    await central_router.redispatch(callback, CallbackPrefixes.ADMIN_MOD_PERMS, kwargs, target_id)
 
 
 async def handle_admin_texts(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
@@ -719,21 +711,12 @@ async def handle_admin_texts(callback: CallbackQuery, kwargs: Dict[str, Any]) ->
         return
 
     i18n = get_i18n()
-    editable_keys = [
-        I18nKeys.HOME_WELCOME,
-        I18nKeys.HOME_ABOUT_TEXT,
-        I18nKeys.HOME_CONTACT_TEXT,
-        I18nKeys.SECTIONS_TITLE,
-        I18nKeys.FILES_UPLOAD_PROMPT,
-        I18nKeys.CONTRIBUTE_PROMPT,
-    ]
-
     buttons: List[List[InlineKeyboardButton]] = []
-    for key in editable_keys:
+    for index, key in enumerate(EDITABLE_TEXT_KEYS):
         short_label = key.split(".")[-1]
         buttons.append([InlineKeyboardButton(
             text=f"📝 {short_label}",
-            callback_data=f"{CallbackPrefixes.ADMIN_TEXT_EDIT}{key}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_TEXT_EDIT, index),
         )])
 
     buttons.append([_admin_back_button()])
@@ -753,13 +736,17 @@ async def handle_admin_text_edit(callback: CallbackQuery, kwargs: Dict[str, Any]
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SETTINGS):
         return
 
-    key = callback.data.replace(CallbackPrefixes.ADMIN_TEXT_EDIT, "")
+    index = get_callback_args(callback, kwargs)[0]
+    if not 0 <= index < len(EDITABLE_TEXT_KEYS):
+        await callback.answer()
+        return
+    key = EDITABLE_TEXT_KEYS[index]
 
     i18n = get_i18n()
     current_text = i18n.get(key)
 
     state_service = get_state_service()
-    state_service.set_state(callback.from_user.id, STATES["TEXT_EDIT"], data={"key": key})
+    await state_service.set_state(callback.from_user.id, STATES["TEXT_EDIT"], data={"key": key})
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=[[
         InlineKeyboardButton(
@@ -783,20 +770,26 @@ async def handle_admin_contributions(callback: CallbackQuery, kwargs: Dict[str,
     await _show_contributions(callback, page=1)
 
 
-async def _show_contributions(callback: CallbackQuery, page: int = 1) -> None:
+async def _show_contributions(
+    callback: CallbackQuery,
+    page: int = 1,
+    cursor: int = 0,
+    direction: int = SEEK_OLDER,
+) -> None:
     if not callback.message:
         return
 
     i18n = get_i18n()
     db = await get_db()
-    files: List[File] = []
-    total = 0
+    result: Optional[KeysetPage] = None
 
     async for session in db.get_session():
-        files, total = await file_service.get_pending_files(
-            session, page=page, per_page=ADMIN_CONTRIB_PER_PAGE
+        result = await file_service.get_pending_files(
+            session, cursor=cursor, direction=direction, page=page, per_page=ADMIN_CONTRIB_PER_PAGE
         )
 
+    files = result.items if result is not None else []
+
     if not files:
         keyboard = InlineKeyboardMarkup(inline_keyboard=[[_admin_back_button()]])
         await callback.message.edit_text(  # type: ignore[union-attr]
@@ -813,26 +806,10 @@ async def _show_contributions(callback: CallbackQuery, page: int = 1) -> None:
             display_name = display_name[:32] + "..."
         buttons.append([InlineKeyboardButton(
             text=f"📄 {display_name}",
-            callback_data=f"{CallbackPrefixes.ADMIN_CONTRIB_VIEW}{f.id}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_CONTRIB_VIEW, f.id),
         )])
 
-    total_pages = max(1, (total + ADMIN_CONTRIB_PER_PAGE - 1) // ADMIN_CONTRIB_PER_PAGE)
-    nav_row: List[InlineKeyboardButton] = []
-    if page > 1:
-        nav_row.append(InlineKeyboardButton(
-            text=i18n.get(I18nKeys.FILES_PAGE_PREV),
-            callback_data=f"{CallbackPrefixes.ADMIN_CONTRIB_PAGE}{page - 1}",
-        ))
-    if total_pages > 1:
-        nav_row.append(InlineKeyboardButton(
-            text=i18n.get(I18nKeys.FILES_PAGE_INFO, page=page, total=total_pages),
-            callback_data="noop",
-        ))
-    if page < total_pages:
-        nav_row.append(InlineKeyboardButton(
-            text=i18n.get(I18nKeys.FILES_PAGE_NEXT),
-            callback_data=f"{CallbackPrefixes.ADMIN_CONTRIB_PAGE}{page + 1}",
-        ))
+    nav_row = _keyset_nav_row(CallbackPrefixes.ADMIN_CONTRIB_PAGE, result)
     if nav_row:
         buttons.append(nav_row)
 
@@ -840,7 +817,7 @@ async def _show_contributions(callback: CallbackQuery, page: int = 1) -> None:
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
     await callback.message.edit_text(  # type: ignore[union-attr]
-        i18n.get(I18nKeys.ADMIN_CONTRIB_TITLE, count=total),
+        i18n.get(I18nKeys.ADMIN_CONTRIB_TITLE, count=result.total),  # type: ignore[union-attr]
         reply_markup=keyboard,
     )  # type: ignore[union-attr]
     await callback.answer()
@@ -852,11 +829,8 @@ async def handle_admin_contrib_page(callback: CallbackQuery, kwargs: Dict[str, A
     role = kwargs.get("user_role", UserRole.USER)
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
-    try:
-        page = int(callback.data.replace(CallbackPrefixes.ADMIN_CONTRIB_PAGE, ""))
-    except (ValueError, IndexError):
-        return
-    await _show_contributions(callback, page=page)
+    page, cursor, direction = get_callback_args(callback, kwargs)
+    await _show_contributions(callback, page=page, cursor=cursor, direction=direction)
 
 
 async def handle_admin_contrib_view(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
@@ -866,10 +840,7 @@ async def handle_admin_contrib_view(callback: CallbackQuery, kwargs: Dict[str, A
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
 
-    try:
-        file_id = int(callback.data.replace(CallbackPrefixes.ADMIN_CONTRIB_VIEW, ""))
-    except (ValueError, IndexError):
-        return
+    file_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
@@ -879,13 +850,13 @@ async def handle_admin_contrib_view(callback: CallbackQuery, kwargs: Dict[str, A
     async for session in db.get_session():
         file = await file_service.get_file(session, file_id)
         if file is None:
-            await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
-            return
+            break
 
         uploader = await user_service.get_by_id(session, file.uploaded_by)
         uploader_name = uploader.first_name if uploader else str(file.uploaded_by)
 
     if file is None:
+        await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
         return
 
     text = i18n.get(
@@ -899,11 +870,11 @@ async def handle_admin_contrib_view(callback: CallbackQuery, kwargs: Dict[str, A
         [
             InlineKeyboardButton(
                 text=i18n.get(I18nKeys.ADMIN_CONTRIB_BTN_APPROVE),
-                callback_data=f"{CallbackPrefixes.ADMIN_CONTRIB_APPROVE}{file_id}",
+                callback_data=encode_callback(CallbackPrefixes.ADMIN_CONTRIB_APPROVE, file_id),
             ),
             InlineKeyboardButton(
                 text=i18n.get(I18nKeys.ADMIN_CONTRIB_BTN_REJECT),
-                callback_data=f"{CallbackPrefixes.ADMIN_CONTRIB_REJECT}{file_id}",
+                callback_data=encode_callback(CallbackPrefixes.ADMIN_CONTRIB_REJECT, file_id),
             ),
         ],
         [InlineKeyboardButton(
@@ -924,21 +895,20 @@ async def handle_admin_contrib_approve(callback: CallbackQuery, kwargs: Dict[str
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
 
-    try:
-        file_id = int(callback.data.replace(CallbackPrefixes.ADMIN_CONTRIB_APPROVE, ""))
-    except (ValueError, IndexError):
-        return
+    file_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
     uploader_id = 0
     file_name: str = ""
 
+    found = False
+
     async for session in db.get_session():
         file = await file_service.get_file(session, file_id)
         if file is None:
-            await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
-            return
+            break
+        found = True
         uploader_id = file.uploaded_by
         file_name = file.name
         await file_service.set_file_status(session, file_id, FileStatus.PUBLISHED.value)
@@ -951,6 +921,10 @@ async def handle_admin_contrib_approve(callback: CallbackQuery, kwargs: Dict[str
             file_id=file_id, admin_id=callback.from_user.id
         ))
 
+    if not found:
+        await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
+        return
+
     await callback.answer(i18n.get(I18nKeys.ADMIN_CONTRIB_APPROVED), show_alert=True)
 
     bot = callback.bot
@@ -973,21 +947,20 @@ async def handle_admin_contrib_reject(callback: CallbackQuery, kwargs: Dict[str,
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
 
-    try:
-        file_id = int(callback.data.replace(CallbackPrefixes.ADMIN_CONTRIB_REJECT, ""))
-    except (ValueError, IndexError):
-        return
+    file_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
     uploader_id = 0
     file_name: str = ""
 
+    found = False
+
     async for session in db.get_session():
         file = await file_service.get_file(session, file_id)
         if file is None:
-            await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
-            return
+            break
+        found = True
         uploader_id = file.uploaded_by
         file_name = file.name
         await file_service.soft_delete_file(session, file_id)
@@ -1000,6 +973,10 @@ async def handle_admin_contrib_reject(callback: CallbackQuery, kwargs: Dict[str,
             file_id=file_id, admin_id=callback.from_user.id
         ))
 
+    if not found:
+        await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
+        return
+
     await callback.answer(i18n.get(I18nKeys.ADMIN_CONTRIB_REJECTED), show_alert=True)
 
     bot = callback.bot
@@ -1022,20 +999,26 @@ async def handle_admin_audit(callback: CallbackQuery, kwargs: Dict[str, Any]) ->
     await _show_audit_log(callback, page=1)
 
 
-async def _show_audit_log(callback: CallbackQuery, page: int = 1) -> None:
+async def _show_audit_log(
+    callback: CallbackQuery,
+    page: int = 1,
+    cursor: int = 0,
+    direction: int = SEEK_OLDER,
+) -> None:
     if not callback.message:
         return
 
     i18n = get_i18n()
     db = await get_db()
-    logs: List = []
-    total = 0
+    result: Optional[KeysetPage] = None
 
     async for session in db.get_session():
-        logs, total = await audit_service.list_logs(
-            session, page=page, per_page=ADMIN_AUDIT_PER_PAGE
+        result = await audit_service.list_logs(
+            session, cursor=cursor, direction=direction, page=page, per_page=ADMIN_AUDIT_PER_PAGE
         )
 
+    logs = result.items if result is not None else []
+
     if not logs:
         keyboard = InlineKeyboardMarkup(inline_keyboard=[[_admin_back_button()]])
         await callback.message.edit_text(  # type: ignore[union-attr]
@@ -1059,25 +1042,9 @@ async def _show_audit_log(callback: CallbackQuery, page: int = 1) -> None:
 
     text = i18n.get(I18nKeys.ADMIN_AUDIT_TITLE) + "\n\n" + "\n\n".join(entries)
 
-    total_pages = max(1, (total + ADMIN_AUDIT_PER_PAGE - 1) // ADMIN_AUDIT_PER_PAGE)
     buttons: List[List[InlineKeyboardButton]] = []
 
-    nav_row: List[InlineKeyboardButton] = []
-    if page > 1:
-        nav_row.append(InlineKeyboardButton(
-            text=i18n.get(I18nKeys.FILES_PAGE_PREV),
-            callback_data=f"{CallbackPrefixes.ADMIN_AUDIT_PAGE}{page - 1}",
-        ))
-    if total_pages > 1:
-        nav_row.append(InlineKeyboardButton(
-            text=i18n.get(I18nKeys.FILES_PAGE_INFO, page=page, total=total_pages),
-            callback_data="noop",
-        ))
-    if page < total_pages:
-        nav_row.append(InlineKeyboardButton(
-            text=i18n.get(I18nKeys.FILES_PAGE_NEXT),
-            callback_data=f"{CallbackPrefixes.ADMIN_AUDIT_PAGE}{page + 1}",
-        ))
+    nav_row = _keyset_nav_row(CallbackPrefixes.ADMIN_AUDIT_PAGE, result)
     if nav_row:
         buttons.append(nav_row)
 
@@ -1098,11 +1065,8 @@ async def handle_admin_audit_page(callback: CallbackQuery, kwargs: Dict[str, Any
     role = kwargs.get("user_role", UserRole.USER)
     if not await check_permission_and_notify(callback, role, Permission.VIEW_AUDIT_LOG):
         return
-    try:
-        page = int(callback.data.replace(CallbackPrefixes.ADMIN_AUDIT_PAGE, ""))
-    except (ValueError, IndexError):
-        return
-    await _show_audit_log(callback, page=page)
+    page, cursor, direction = get_callback_args(callback, kwargs)
+    await _show_audit_log(callback, page=page, cursor=cursor, direction=direction)
 
 
 async def handle_section_toggle(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
@@ -1112,10 +1076,7 @@ async def handle_section_toggle(callback: CallbackQuery, kwargs: Dict[str, Any])
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SECTIONS):
         return
 
-    try:
-        section_id = int(callback.data.replace(CallbackPrefixes.SECTION_ADMIN_TOGGLE, ""))
-    except (ValueError, IndexError):
-        return
+    section_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
@@ -1124,8 +1085,7 @@ async def handle_section_toggle(callback: CallbackQuery, kwargs: Dict[str, Any])
     async for session in db.get_session():
         section = await section_service.toggle_active(session, section_id)
         if section is None:
-            await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND), show_alert=True)
-            return
+            break
 
         await audit_service.log_action(
             session, callback.from_user.id,
@@ -1138,6 +1098,10 @@ async def handle_section_toggle(callback: CallbackQuery, kwargs: Dict[str, Any])
         else:
             msg = i18n.get(I18nKeys.SECTION_ADMIN_TOGGLED_HIDDEN, name=section.name)
 
+    if not msg:
+        await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND), show_alert=True)
+        return
+
     await callback.answer(msg, show_alert=True)
 
     from bot.handlers.sections import _show_section_detail
@@ -1151,10 +1115,7 @@ async def handle_section_copy(callback: CallbackQuery, kwargs: Dict[str, Any]) -
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SECTIONS):
         return
 
-    try:
-        section_id = int(callback.data.replace(CallbackPrefixes.SECTION_ADMIN_COPY, ""))
-    except (ValueError, IndexError):
-        return
+    section_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
@@ -1162,21 +1123,19 @@ async def handle_section_copy(callback: CallbackQuery, kwargs: Dict[str, Any]) -
 
     async for session in db.get_session():
         section = await section_service.get_section(session, section_id)
-        if section is None:
-            await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND), show_alert=True)
-            return
 
     if section is None:
+        await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND), show_alert=True)
         return
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(
             text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_CONFIRM),
-            callback_data=f"{CallbackPrefixes.SECTION_ADMIN_CONFIRM_COPY}{section_id}",
+            callback_data=encode_callback(CallbackPrefixes.SECTION_ADMIN_CONFIRM_COPY, section_id),
         )],
         [InlineKeyboardButton(
             text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_CANCEL),
-            callback_data=f"{CallbackPrefixes.SECTION_VIEW}{section_id}",
+            callback_data=encode_callback(CallbackPrefixes.SECTION_VIEW, section_id),
         )],
     ])
 
@@ -1194,34 +1153,59 @@ async def handle_section_confirm_copy(callback: CallbackQuery, kwargs: Dict[str,
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SECTIONS):
         return
 
-    try:
-        section_id = int(callback.data.replace(CallbackPrefixes.SECTION_ADMIN_CONFIRM_COPY, ""))
-    except (ValueError, IndexError):
-        return
+    section_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
     new_section = None
     section: Optional[Any] = None
+    copied = [0, 0]
+
+    async def report_progress(done: int, total: int) -> None:
+        copied[:] = [done, total]
+
+    # The copy runs in one transaction; progress edits go out from a side task
+    # so the transaction never waits on a Telegram round trip.
+    async def show_progress() -> None:
+        shown = 0
+        while True:
+            await asyncio.sleep(SECTION_COPY_PROGRESS_INTERVAL)
+            done, total = copied
+            if done == shown or done >= total:
+                continue
+            shown = done
+            try:
+                await callback.message.edit_text(  # type: ignore[union-attr]
+                    i18n.get(I18nKeys.SECTION_ADMIN_COPY_PROGRESS, done=done, total=total),
+                )
+            except Exception as e:
+                logger.debug(LogMessages.SECTION_COPY_STATUS_FAIL.format(error=str(e)))
+
+    reporter = asyncio.create_task(show_progress())
+    try:
+        async for session in db.get_session():
+            section = await section_service.get_section(session, section_id)
+            if section is None:
+                break
 
-    async for session in db.get_session():
-        section = await section_service.get_section(session, section_id)
-        if section is None:
-            await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND), show_alert=True)
-            return
-
-        new_section = await section_service.copy_section_tree(
-            session, section_id, target_parent_id=section.parent_id
-        )
-        if new_section:
-            await audit_service.log_action(
-                session, callback.from_user.id,
-                AuditActions.SECTION_COPIED,
-                f"source_id={section_id} new_id={new_section.id}",
+            new_section = await section_service.copy_section_tree(
+                session, section_id, target_parent_id=section.parent_id, progress=report_progress,
             )
-            logger.info(LogMessages.SECTION_COPIED.format(
-                source_id=section_id, new_id=new_section.id, user_id=callback.from_user.id
-            ))
+            if new_section:
+                await audit_service.log_action(
+                    session, callback.from_user.id,
+                    AuditActions.SECTION_COPIED,
+                    f"source_id={section_id} new_id={new_section.id}",
+                )
+                logger.info(LogMessages.SECTION_COPIED.format(
+                    source_id=section_id, new_id=new_section.id, user_id=callback.from_user.id
+                ))
+    finally:
+        reporter.cancel()
+
+    if section is None:
+        await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND), show_alert=True)
+        return
 
     if new_section:
         await callback.answer(
@@ -1248,7 +1232,7 @@ async def handle_contribute_upload(callback: CallbackQuery, kwargs: Dict[str, An
 
     i18n = get_i18n()
     state_service = get_state_service()
-    state_service.set_state(callback.from_user.id, STATES["CONTRIBUTE_UPLOAD"], data={
+    await state_service.set_state(callback.from_user.id, STATES["CONTRIBUTE_UPLOAD"], data={
         "uploaded_count": 0,
     })
 
@@ -1300,7 +1284,7 @@ async def _show_admin_subscription(callback: CallbackQuery) -> None:
     for idx, ch in enumerate(channels):
         buttons.append([InlineKeyboardButton(
             text=f"{i18n.get(I18nKeys.ADMIN_SUB_BTN_REMOVE)}: {ch}",
-            callback_data=f"{CallbackPrefixes.ADMIN_SUB_REMOVE}{idx}",
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_SUB_REMOVE, idx),
         )])
     buttons.append([_admin_back_button()])
 
@@ -1336,7 +1320,7 @@ async def handle_admin_sub_add(callback: CallbackQuery, kwargs: Dict[str, Any])
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SETTINGS):
         return
     i18n = get_i18n()
-    get_state_service().set_state(callback.from_user.id, STATES["SUB_ADD_CHANNEL"])
+    await get_state_service().set_state(callback.from_user.id, STATES["SUB_ADD_CHANNEL"])
     await callback.message.edit_text(i18n.get(I18nKeys.ADMIN_SUB_ENTER_CHANNEL), reply_markup=InlineKeyboardMarkup(inline_keyboard=[[_admin_back_button()]]))  # type: ignore[union-attr]
     await callback.answer()
 
@@ -1348,7 +1332,7 @@ async def handle_admin_sub_remove(callback: CallbackQuery, kwargs: Dict[str, Any
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SETTINGS):
         return
     try:
-        idx = int(callback.data.replace(CallbackPrefixes.ADMIN_SUB_REMOVE, ""))
+        idx = get_callback_args(callback, kwargs)[0]
     except Exception:
         return
     db = await get_db()
@@ -1379,11 +1363,21 @@ async def _show_admin_broadcast(callback: CallbackQuery) -> None:
     if not callback.message:
         return
     i18n = get_i18n()
-    kb = InlineKeyboardMarkup(inline_keyboard=[
+    db = await get_db()
+    resumable = None
+    async for session in db.get_session():
+        resumable = await broadcast_job_service.get_latest_resumable(session)
+    rows = [
         [InlineKeyboardButton(text=i18n.get(I18nKeys.ADMIN_BROADCAST_BTN_TEXT), callback_data=CallbackPrefixes.ADMIN_BROADCAST_TEXT)],
         [InlineKeyboardButton(text=i18n.get(I18nKeys.ADMIN_BROADCAST_BTN_FILE), callback_data=CallbackPrefixes.ADMIN_BROADCAST_FILE)],
-        [_admin_back_button()],
-    ])
+    ]
+    if resumable is not None and not broadcast_engine.is_running:
+        rows.append([InlineKeyboardButton(
+            text=i18n.get(I18nKeys.ADMIN_BROADCAST_BTN_RESUME_JOB, job_id=resumable.id),
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_BROADCAST_RESUME, resumable.id),
+        )])
+    rows.append([_admin_back_button()])
+    kb = InlineKeyboardMarkup(inline_keyboard=rows)
     await callback.message.edit_text(i18n.get(I18nKeys.ADMIN_BROADCAST_TITLE), reply_markup=kb)  # type: ignore[union-attr]
     await callback.answer()
 
@@ -1401,7 +1395,7 @@ async def handle_admin_broadcast_text(callback: CallbackQuery, kwargs: Dict[str,
     role = kwargs.get("user_role", UserRole.USER)
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SETTINGS):
         return
-    get_state_service().set_state(callback.from_user.id, STATES["BROADCAST_TEXT"])
+    await get_state_service().set_state(callback.from_user.id, STATES["BROADCAST_TEXT"])
     await callback.message.edit_text(get_i18n().get(I18nKeys.ADMIN_BROADCAST_ENTER_TEXT), reply_markup=InlineKeyboardMarkup(inline_keyboard=[[_admin_back_button()]]))  # type: ignore[union-attr]
     await callback.answer()
 
@@ -1412,42 +1406,27 @@ async def handle_admin_broadcast_file(callback: CallbackQuery, kwargs: Dict[str,
     role = kwargs.get("user_role", UserRole.USER)
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SETTINGS):
         return
-    get_state_service().set_state(callback.from_user.id, STATES["BROADCAST_FILE"])
+    await get_state_service().set_state(callback.from_user.id, STATES["BROADCAST_FILE"])
     await callback.message.edit_text(get_i18n().get(I18nKeys.ADMIN_BROADCAST_ENTER_FILE), reply_markup=InlineKeyboardMarkup(inline_keyboard=[[_admin_back_button()]]))  # type: ignore[union-attr]
     await callback.answer()
 
 
 async def _run_broadcast(callback: CallbackQuery, payload: Dict[str, Any]) -> None:
-    if not callback.from_user:
+    if not callback.from_user or not callback.message or callback.bot is None:
         return
     i18n = get_i18n()
-    bot = callback.bot
-    if bot is None:
+    job_id = await broadcast_engine.start(
+        callback.bot,
+        callback.from_user.id,
+        payload,
+        chat_id=callback.message.chat.id,
+        message_id=callback.message.message_id,
+    )
+    if job_id is None:
+        await callback.answer(i18n.get(I18nKeys.ADMIN_BROADCAST_BUSY), show_alert=True)
         return
-
-    db = await get_db()
-    user_ids: List[int] = []
-    async for session in db.get_session():
-        user_ids = await user_service.list_user_ids(session)
-
-    success = 0
-    failed = 0
-    for uid in user_ids:
-        try:
-            if payload.get("type") == "text":
-                await bot.send_message(uid, payload.get("text", ""))
-            else:
-                await bot.send_document(uid, document=payload.get("file_id", ""), caption=payload.get("caption"))
-            success += 1
-        except Exception:
-            failed += 1
-        await asyncio.sleep(0.05)
-
-    async for session in db.get_session():
-        await audit_service.log_action(session, callback.from_user.id, AuditActions.BROADCAST_SENT, f"type={payload.get('type')} success={success} failed={failed}")
-
-    await callback.answer(i18n.get(I18nKeys.ADMIN_BROADCAST_DONE, success=success, failed=failed), show_alert=True)
-    await _show_admin_broadcast(callback)
+    await callback.message.edit_text(i18n.get(I18nKeys.ADMIN_BROADCAST_STARTED))  # type: ignore[union-attr]
+    await callback.answer()
 
 
 async def handle_admin_broadcast_confirm(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
@@ -1456,20 +1435,64 @@ async def handle_admin_broadcast_confirm(callback: CallbackQuery, kwargs: Dict[s
     role = kwargs.get("user_role", UserRole.USER)
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SETTINGS):
         return
-    state = get_state_service().get_state(callback.from_user.id)
+    state = await get_state_service().get_state(callback.from_user.id)
     if state is None or state.name not in ("admin_broadcast_confirm_text", "admin_broadcast_confirm_file"):
         return
     payload = state.data.get("payload", {})
-    get_state_service().clear_state(callback.from_user.id)
+    await get_state_service().clear_state(callback.from_user.id)
     await _run_broadcast(callback, payload)
 
 
+async def handle_admin_broadcast_pause(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
+    role = kwargs.get("user_role", UserRole.USER)
+    if not await check_permission_and_notify(callback, role, Permission.MANAGE_SETTINGS):
+        return
+    job_id = get_callback_args(callback, kwargs)[0]
+    if not broadcast_engine.pause(job_id):
+        await callback.answer(get_i18n().get(I18nKeys.ADMIN_BROADCAST_NOT_FOUND), show_alert=True)
+        return
+    await callback.answer()
+
+
+async def handle_admin_broadcast_resume(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
+    role = kwargs.get("user_role", UserRole.USER)
+    if not await check_permission_and_notify(callback, role, Permission.MANAGE_SETTINGS):
+        return
+    if callback.bot is None:
+        return
+    job_id = get_callback_args(callback, kwargs)[0]
+    i18n = get_i18n()
+    if broadcast_engine.is_running:
+        await callback.answer(i18n.get(I18nKeys.ADMIN_BROADCAST_BUSY), show_alert=True)
+        return
+    if not await broadcast_engine.resume(callback.bot, job_id):
+        await callback.answer(i18n.get(I18nKeys.ADMIN_BROADCAST_NOT_FOUND), show_alert=True)
+        return
+    await callback.answer(i18n.get(I18nKeys.ADMIN_BROADCAST_STARTED))
+
+
+async def handle_admin_broadcast_stop(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
+    role = kwargs.get("user_role", UserRole.USER)
+    if not await check_permission_and_notify(callback, role, Permission.MANAGE_SETTINGS):
+        return
+    job_id = get_callback_args(callback, kwargs)[0]
+    i18n = get_i18n()
+    if not await broadcast_engine.cancel(job_id):
+        await callback.answer(i18n.get(I18nKeys.ADMIN_BROADCAST_NOT_FOUND), show_alert=True)
+        return
+    if broadcast_engine.is_running:
+        await callback.answer()
+        return
+    await callback.answer(i18n.get(I18nKeys.ADMIN_BROADCAST_CANCELLED), show_alert=True)
+    await _show_admin_broadcast(callback)
+
+
 async def handle_admin_broadcast_cancel(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
     role = kwargs.get("user_role", UserRole.USER)
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SETTINGS):
         return
     if callback.from_user:
-        get_state_service().clear_state(callback.from_user.id)
+        await get_state_service().clear_state(callback.from_user.id)
     await callback.answer(get_i18n().get(I18nKeys.ADMIN_BROADCAST_CANCELLED), show_alert=True)
     await _show_admin_broadcast(callback)
 
@@ -1500,7 +1523,7 @@ async def handle_admin_ban_block(callback: CallbackQuery, kwargs: Dict[str, Any]
     role = kwargs.get("user_role", UserRole.USER)
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_USERS):
         return
-    get_state_service().set_state(callback.from_user.id, STATES["BAN_BLOCK"])
+    await get_state_service().set_state(callback.from_user.id, STATES["BAN_BLOCK"])
     await callback.message.edit_text(get_i18n().get(I18nKeys.ADMIN_BAN_ENTER_ID_BLOCK), reply_markup=InlineKeyboardMarkup(inline_keyboard=[[_admin_back_button()]]))  # type: ignore[union-attr]
     await callback.answer()
 
@@ -1511,7 +1534,7 @@ async def handle_admin_ban_unblock(callback: CallbackQuery, kwargs: Dict[str, An
     role = kwargs.get("user_role", UserRole.USER)
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_USERS):
         return
-    get_state_service().set_state(callback.from_user.id, STATES["BAN_UNBLOCK"])
+    await get_state_service().set_state(callback.from_user.id, STATES["BAN_UNBLOCK"])
     await callback.message.edit_text(get_i18n().get(I18nKeys.ADMIN_BAN_ENTER_ID_UNBLOCK), reply_markup=InlineKeyboardMarkup(inline_keyboard=[[_admin_back_button()]]))  # type: ignore[union-attr]
     await callback.answer()
 
@@ -1566,7 +1589,7 @@ async def handle_admin_maint_set_message(callback: CallbackQuery, kwargs: Dict[s
     role = kwargs.get("user_role", UserRole.USER)
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SETTINGS):
         return
-    get_state_service().set_state(callback.from_user.id, STATES["MAINT_MESSAGE"])
+    await get_state_service().set_state(callback.from_user.id, STATES["MAINT_MESSAGE"])
     await callback.message.edit_text(get_i18n().get(I18nKeys.ADMIN_MAINT_ENTER_MESSAGE), reply_markup=InlineKeyboardMarkup(inline_keyboard=[[_admin_back_button()]]))  # type: ignore[union-attr]
     await callback.answer()
 
@@ -1593,16 +1616,16 @@ async def handle_admin_backup_restore(callback: CallbackQuery, kwargs: Dict[str,
     role = kwargs.get("user_role", UserRole.USER)
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SETTINGS):
         return
-    get_state_service().set_state(callback.from_user.id, STATES["BACKUP_RESTORE"])
+    await get_state_service().set_state(callback.from_user.id, STATES["BACKUP_RESTORE"])
     await callback.message.edit_text(get_i18n().get(I18nKeys.ADMIN_BACKUP_RESTORE_PROMPT), reply_markup=InlineKeyboardMarkup(inline_keyboard=[[_admin_back_button()]]))  # type: ignore[union-attr]
     await callback.answer()
 
 
-def _is_admin_text_state(message: Message) -> bool:
+async def _is_admin_text_state(message: Message) -> bool:
     if not message.from_user:
         return False
     state_service = get_state_service()
-    state = state_service.get_state(message.from_user.id)
+    state = await state_service.get_state(message.from_user.id)
     if state is None:
         return False
     return state.name in (
@@ -1631,7 +1654,7 @@ def create_admin_router() -> Router:
 
         user_id = message.from_user.id
         state_service = get_state_service()
-        state = state_service.get_state(user_id)
+        state = await state_service.get_state(user_id)
         if state is None:
             return
 
@@ -1668,7 +1691,7 @@ async def _handle_sub_add_channel_input(message: Message, kwargs: Dict[str, Any]
     async for session in db.get_session():
         await settings_manager.add_subscription_channel(session, channel)
         await audit_service.log_action(session, message.from_user.id, AuditActions.SUBSCRIPTION_UPDATED, f"add_channel={channel}")
-    get_state_service().clear_state(message.from_user.id)
+    await get_state_service().clear_state(message.from_user.id)
     await message.answer(get_i18n().get(I18nKeys.ADMIN_SUB_ADDED))
 
 
@@ -1679,9 +1702,12 @@ async def _handle_broadcast_text_input(message: Message, kwargs: Dict[str, Any])
     if not has_permission(role, Permission.MANAGE_SETTINGS):
         return
     i18n = get_i18n()
-    get_state_service().set_state(message.from_user.id, "admin_broadcast_confirm_text", data={
+    state = await get_state_service().set_state(message.from_user.id, "admin_broadcast_confirm_text", data={
         "payload": {"type": "text", "text": message.text},
     })
+    if state is None:
+        await message.answer(i18n.get(I18nKeys.ERROR_INPUT_TOO_LONG))
+        return
     kb = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text=i18n.get(I18nKeys.ADMIN_BROADCAST_BTN_CONFIRM), callback_data=CallbackPrefixes.ADMIN_BROADCAST_CONFIRM)],
         [InlineKeyboardButton(text=i18n.get(I18nKeys.ADMIN_BROADCAST_BTN_CANCEL), callback_data=CallbackPrefixes.ADMIN_BROADCAST_CANCEL)],
@@ -1700,7 +1726,7 @@ async def _handle_broadcast_file_input(message: Message, kwargs: Dict[str, Any])
     if info is None:
         return
     i18n = get_i18n()
-    get_state_service().set_state(message.from_user.id, "admin_broadcast_confirm_file", data={
+    state = await get_state_service().set_state(message.from_user.id, "admin_broadcast_confirm_file", data={
         "payload": {
             "type": "file",
             "file_id": info["file_id"],
@@ -1708,6 +1734,9 @@ async def _handle_broadcast_file_input(message: Message, kwargs: Dict[str, Any])
             "name": info.get("name", "file"),
         }
     })
+    if state is None:
+        await message.answer(i18n.get(I18nKeys.ERROR_INPUT_TOO_LONG))
+        return
     kb = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text=i18n.get(I18nKeys.ADMIN_BROADCAST_BTN_CONFIRM), callback_data=CallbackPrefixes.ADMIN_BROADCAST_CONFIRM)],
         [InlineKeyboardButton(text=i18n.get(I18nKeys.ADMIN_BROADCAST_BTN_CANCEL), callback_data=CallbackPrefixes.ADMIN_BROADCAST_CANCEL)],
@@ -1737,7 +1766,7 @@ async def _handle_ban_input(message: Message, state: Any, kwargs: Dict[str, Any]
             AuditActions.USER_BLOCKED if blocked else AuditActions.USER_UNBLOCKED,
             f"target_id={target_id}",
         )
-    get_state_service().clear_state(message.from_user.id)
+    await get_state_service().clear_state(message.from_user.id)
     await message.answer(i18n.get(I18nKeys.ADMIN_BAN_BLOCKED if blocked else I18nKeys.ADMIN_BAN_UNBLOCKED, user_id=target_id))
 
 
@@ -1751,7 +1780,7 @@ async def _handle_maintenance_message_input(message: Message, kwargs: Dict[str,
     async for session in db.get_session():
         await settings_manager.set_maintenance_message(session, message.text.strip())
         await audit_service.log_action(session, message.from_user.id, AuditActions.MAINTENANCE_TOGGLED, "maintenance_message_updated")
-    get_state_service().clear_state(message.from_user.id)
+    await get_state_service().clear_state(message.from_user.id)
     await message.answer(get_i18n().get(I18nKeys.ADMIN_MAINT_UPDATED))
 
 
@@ -1787,9 +1816,18 @@ async def _handle_backup_restore_input(message: Message, kwargs: Dict[str, Any])
     db = await get_db()
     async for session in db.get_session():
         await backup_service.restore_backup(session, data)
+        await section_counters.reconcile(session)
         await audit_service.log_action(session, message.from_user.id, AuditActions.BACKUP_RESTORED, "backup_restored")
+        settings_manager.reload_after_commit(session)
+        await settings_manager.notify_changed(session, "*")
+    user_service.cache.clear()
+    section_tree.invalidate()
+    try:
+        await search_index.rebuild(db)
+    except Exception as e:
+        logger.error(LogMessages.SEARCH_INDEX_BUILD_FAIL.format(error=str(e)))
 
-    get_state_service().clear_state(message.from_user.id)
+    await get_state_service().clear_state(message.from_user.id)
     await message.answer(i18n.get(I18nKeys.ADMIN_BACKUP_RESTORED))
 
 
@@ -1815,16 +1853,15 @@ async def _handle_mod_add_input(message: Message, state: Any, kwargs: Dict[str,
     db = await get_db()
     target_user: Optional[Any] = None
 
+    already_moderator = False
+
     async for session in db.get_session():
         target_user = await user_service.get_by_id(session, target_id)
         if target_user is None:
-            await message.answer(i18n.get(I18nKeys.ADMIN_MOD_NOT_FOUND))
-            return
-
-        if target_user.role == UserRole.MODERATOR:
-            await message.answer(i18n.get(I18nKeys.ADMIN_MOD_ALREADY_MOD))
-            state_service.clear_state(user_id)
-            return
+            break
+        already_moderator = target_user.role == UserRole.MODERATOR
+        if already_moderator:
+            break
 
         await user_service.set_role(session, target_id, UserRole.MODERATOR)
         await moderator_service.create_permissions(session, target_id)
@@ -1837,7 +1874,15 @@ async def _handle_mod_add_input(message: Message, state: Any, kwargs: Dict[str,
             target_id=target_id, admin_id=user_id
         ))
 
-    state_service.clear_state(user_id)
+    if target_user is None:
+        await message.answer(i18n.get(I18nKeys.ADMIN_MOD_NOT_FOUND))
+        return
+    if already_moderator:
+        await message.answer(i18n.get(I18nKeys.ADMIN_MOD_ALREADY_MOD))
+        await state_service.clear_state(user_id)
+        return
+
+    await state_service.clear_state(user_id)
     await message.answer(i18n.get(I18nKeys.ADMIN_MOD_ADDED, name=target_user.first_name if target_user else ""))
 
     if message.bot and target_user:
@@ -1864,7 +1909,7 @@ async def _handle_text_edit_input(message: Message, state: Any, kwargs: Dict[str
     key = state.data.get("key", "")
 
     if not key:
-        state_service.clear_state(user_id)
+        await state_service.clear_state(user_id)
         return
 
     db = await get_db()
@@ -1896,7 +1941,7 @@ async def _handle_text_edit_input(message: Message, state: Any, kwargs: Dict[str
 
         await i18n.reload(session)
 
-    state_service.clear_state(user_id)
+    await state_service.clear_state(user_id)
     await message.answer(i18n.get(I18nKeys.ADMIN_TEXT_UPDATED))
 
 
@@ -1946,7 +1991,7 @@ async def _handle_contribute_upload(message: Message, state: Any) -> None:
         )
 
     uploaded_count = state.data.get("uploaded_count", 0) + 1
-    state_service.set_state(user_id, STATES["CONTRIBUTE_UPLOAD"], data={
+    await state_service.set_state(user_id, STATES["CONTRIBUTE_UPLOAD"], data={
         "uploaded_count": uploaded_count,
     })
 
@@ -24,7 +24,7 @@ def create_fallback_router() -> Router:
         logger.debug(LogMessages.UNKNOWN_TEXT.format(user_id=user_id))
 
         state_service = get_state_service()
-        state_service.clear_state(user_id)
+        await state_service.clear_state(user_id)
 
         role = kwargs.get("user_role", UserRole.USER)
 
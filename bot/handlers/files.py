@@ -5,11 +5,14 @@ from aiogram import Bot, Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 
 from bot.core.constants import LogMessages, I18nKeys, CallbackPrefixes, AuditActions
+from bot.modules.callback_codec import encode_callback
+from bot.modules.central_router import get_callback_args
 from bot.core.database import get_db
 from bot.services.i18n import get_i18n
 from bot.services.state import get_state_service
 from bot.services.files import file_service, send_file_to_user, FILES_PER_PAGE
 from bot.services.audit import audit_service
+from bot.services.pagination import KeysetPage, SEEK_NEWER, SEEK_OLDER
 from bot.services.permissions import has_permission, check_permission_and_notify, Permission
 from bot.models.user import UserRole
 from bot.models.file import File, FileStatus
@@ -121,10 +124,8 @@ async def _send_file_to_user(bot: Bot, chat_id: int, file: File) -> bool:
 
 
 def _build_file_list_keyboard(
-    files: List[File],
+    result: KeysetPage,
     section_id: int,
-    page: int,
-    total_pages: int,
     role: UserRole,
 ) -> InlineKeyboardMarkup:
     i18n = get_i18n()
@@ -136,31 +137,35 @@ def _build_file_list_keyboard(
         "animation": "🎞", "sticker": "🏷",
     }
 
-    for f in files:
+    for f in result.items:
         emoji = file_type_emoji.get(f.file_type, "📄")
         display_name = f.name
         if len(display_name) > 40:
             display_name = display_name[:37] + "..."
         buttons.append([InlineKeyboardButton(
             text=f"{emoji} {display_name}",
-            callback_data=f"{CallbackPrefixes.FILE_VIEW}{f.id}",
+            callback_data=encode_callback(CallbackPrefixes.FILE_VIEW, f.id),
         )])
 
     nav_row: List[InlineKeyboardButton] = []
-    if page > 1:
+    if result.has_prev:
         nav_row.append(InlineKeyboardButton(
             text=i18n.get(I18nKeys.FILES_PAGE_PREV),
-            callback_data=f"{CallbackPrefixes.FILE_PAGE}{section_id}:{page - 1}",
+            callback_data=encode_callback(
+                CallbackPrefixes.FILE_PAGE, section_id, result.page - 1, result.first_id, SEEK_NEWER,
+            ),
         ))
-    if total_pages > 1:
+    if result.total_pages > 1:
         nav_row.append(InlineKeyboardButton(
-            text=i18n.get(I18nKeys.FILES_PAGE_INFO, page=page, total=total_pages),
+            text=i18n.get(I18nKeys.FILES_PAGE_INFO, page=result.page, total=result.total_pages),
             callback_data="noop",
         ))
-    if page < total_pages:
+    if result.has_next:
         nav_row.append(InlineKeyboardButton(
             text=i18n.get(I18nKeys.FILES_PAGE_NEXT),
-            callback_data=f"{CallbackPrefixes.FILE_PAGE}{section_id}:{page + 1}",
+            callback_data=encode_callback(
+                CallbackPrefixes.FILE_PAGE, section_id, result.page + 1, result.last_id, SEEK_OLDER,
+            ),
         ))
     if nav_row:
         buttons.append(nav_row)
@@ -168,12 +173,12 @@ def _build_file_list_keyboard(
     if has_permission(role, Permission.UPLOAD_FILE):
         buttons.append([InlineKeyboardButton(
             text=i18n.get(I18nKeys.FILES_BTN_UPLOAD),
-            callback_data=f"{CallbackPrefixes.FILE_UPLOAD}{section_id}",
+            callback_data=encode_callback(CallbackPrefixes.FILE_UPLOAD, section_id),
         )])
 
     buttons.append([InlineKeyboardButton(
         text=i18n.get(I18nKeys.SECTIONS_BTN_BACK),
-        callback_data=f"{CallbackPrefixes.SECTION_VIEW}{section_id}",
+        callback_data=encode_callback(CallbackPrefixes.SECTION_VIEW, section_id),
     )])
 
     return InlineKeyboardMarkup(inline_keyboard=buttons)
@@ -193,13 +198,10 @@ async def handle_file_upload_start(callback: CallbackQuery, kwargs: Dict[str, An
         await callback.answer(i18n.get(I18nKeys.FILES_STORAGE_NOT_SET), show_alert=True)
         return
 
-    try:
-        section_id = int(callback.data.replace(CallbackPrefixes.FILE_UPLOAD, ""))
-    except (ValueError, IndexError):
-        return
+    section_id = get_callback_args(callback, kwargs)[0]
 
     state_service = get_state_service()
-    state_service.set_state(callback.from_user.id, STATES["UPLOAD"], {
+    await state_service.set_state(callback.from_user.id, STATES["UPLOAD"], {
         "section_id": section_id,
         "uploaded_count": 0,
     })
@@ -227,14 +229,14 @@ async def handle_file_done(callback: CallbackQuery, kwargs: Dict[str, Any]) -> N
         return
 
     state_service = get_state_service()
-    state = state_service.get_state(callback.from_user.id)
+    state = await state_service.get_state(callback.from_user.id)
 
     section_id = None
     uploaded_count = 0
     if state and state.name == STATES["UPLOAD"]:
         section_id = state.data.get("section_id")
         uploaded_count = state.data.get("uploaded_count", 0)
-        state_service.clear_state(callback.from_user.id)
+        await state_service.clear_state(callback.from_user.id)
 
     i18n = get_i18n()
     if uploaded_count > 0:
@@ -257,13 +259,13 @@ async def handle_file_cancel(callback: CallbackQuery, kwargs: Dict[str, Any]) ->
         return
 
     state_service = get_state_service()
-    state = state_service.get_state(callback.from_user.id)
+    state = await state_service.get_state(callback.from_user.id)
 
     section_id = None
     if state and state.name == STATES["UPLOAD"]:
         section_id = state.data.get("section_id")
 
-    state_service.clear_state(callback.from_user.id)
+    await state_service.clear_state(callback.from_user.id)
 
     i18n = get_i18n()
     await callback.answer(i18n.get(I18nKeys.FILES_CANCELLED))
@@ -277,10 +279,7 @@ async def handle_file_view(callback: CallbackQuery, kwargs: Dict[str, Any]) -> N
     if not callback.from_user or not callback.message or not callback.data:
         return
 
-    try:
-        file_id = int(callback.data.replace(CallbackPrefixes.FILE_VIEW, ""))
-    except (ValueError, IndexError):
-        return
+    file_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
@@ -313,7 +312,7 @@ async def handle_file_view(callback: CallbackQuery, kwargs: Dict[str, Any]) -> N
         admin_buttons.append([
             InlineKeyboardButton(
                 text=i18n.get(I18nKeys.FILES_BTN_DELETE),
-                callback_data=f"{CallbackPrefixes.FILE_DELETE}{file_id}",
+                callback_data=encode_callback(CallbackPrefixes.FILE_DELETE, file_id),
             ),
         ])
 
@@ -321,7 +320,7 @@ async def handle_file_view(callback: CallbackQuery, kwargs: Dict[str, Any]) -> N
         back_section = section_ids[0]
         admin_buttons.append([InlineKeyboardButton(
             text=i18n.get(I18nKeys.SECTIONS_BTN_BACK),
-            callback_data=f"{CallbackPrefixes.SECTION_VIEW}{back_section}",
+            callback_data=encode_callback(CallbackPrefixes.SECTION_VIEW, back_section),
         )])
 
     if admin_buttons:
@@ -339,39 +338,40 @@ async def handle_file_delete(callback: CallbackQuery, kwargs: Dict[str, Any]) ->
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
 
-    try:
-        file_id = int(callback.data.replace(CallbackPrefixes.FILE_DELETE, ""))
-    except (ValueError, IndexError):
-        return
+    file_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
     section_ids: List[int] = []
+    file: Optional[File] = None
 
     async for session in db.get_session():
         file = await file_service.get_file(session, file_id)
         if file is None:
-            await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
-            return
+            break
         section_ids = await file_service.get_file_section_ids(session, file_id)
 
-        back_section = section_ids[0] if section_ids else 0
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(
-                text=i18n.get(I18nKeys.FILES_BTN_CONFIRM_DELETE),
-                callback_data=f"{CallbackPrefixes.FILE_CONFIRM_DELETE}{file_id}",
-            )],
-            [InlineKeyboardButton(
-                text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_CANCEL),
-                callback_data=f"{CallbackPrefixes.SECTION_VIEW}{back_section}" if back_section else CallbackPrefixes.HOME,
-            )],
-        ])
+    if file is None:
+        await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
+        return
 
-        await callback.message.edit_text(
-            i18n.get(I18nKeys.FILES_DELETE_CONFIRM, name=file.name),
-            reply_markup=keyboard,
-        )  # type: ignore[union-attr]
-        await callback.answer()
+    back_section = section_ids[0] if section_ids else 0
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(
+            text=i18n.get(I18nKeys.FILES_BTN_CONFIRM_DELETE),
+            callback_data=encode_callback(CallbackPrefixes.FILE_CONFIRM_DELETE, file_id),
+        )],
+        [InlineKeyboardButton(
+            text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_CANCEL),
+            callback_data=encode_callback(CallbackPrefixes.SECTION_VIEW, back_section) if back_section else CallbackPrefixes.HOME,
+        )],
+    ])
+
+    await callback.message.edit_text(
+        i18n.get(I18nKeys.FILES_DELETE_CONFIRM, name=file.name),
+        reply_markup=keyboard,
+    )  # type: ignore[union-attr]
+    await callback.answer()
 
 
 async def handle_file_confirm_delete(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
@@ -382,21 +382,19 @@ async def handle_file_confirm_delete(callback: CallbackQuery, kwargs: Dict[str,
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_FILES):
         return
 
-    try:
-        file_id = int(callback.data.replace(CallbackPrefixes.FILE_CONFIRM_DELETE, ""))
-    except (ValueError, IndexError):
-        return
+    file_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
     section_ids: List[int] = []
 
+    deleted: Optional[File] = None
+
     async for session in db.get_session():
         section_ids = await file_service.get_file_section_ids(session, file_id)
         deleted = await file_service.soft_delete_file(session, file_id)
         if deleted is None:
-            await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
-            return
+            break
 
         await audit_service.log_action(
             session, callback.from_user.id,
@@ -404,6 +402,10 @@ async def handle_file_confirm_delete(callback: CallbackQuery, kwargs: Dict[str,
             f"file_id={file_id} name={deleted.name}",
         )
 
+    if deleted is None:
+        await callback.answer(i18n.get(I18nKeys.FILES_NOT_FOUND), show_alert=True)
+        return
+
     await callback.answer(i18n.get(I18nKeys.FILES_DELETED), show_alert=True)
 
     if section_ids:
@@ -414,22 +416,20 @@ async def handle_file_page(callback: CallbackQuery, kwargs: Dict[str, Any]) -> N
     if not callback.data or not callback.message:
         return
 
-    try:
-        data = callback.data.replace(CallbackPrefixes.FILE_PAGE, "")
-        parts = data.split(":")
-        section_id = int(parts[0])
-        page = int(parts[1])
-    except (ValueError, IndexError):
-        return
+    section_id, page, cursor, direction = get_callback_args(callback, kwargs)
 
     role = kwargs.get("user_role", UserRole.USER)
-    await _show_section_files(callback, section_id, page=page, role=role)
+    await _show_section_files(
+        callback, section_id, page=page, cursor=cursor, direction=direction, role=role,
+    )
 
 
 async def _show_section_files(
     callback: CallbackQuery,
     section_id: int,
     page: int = 1,
+    cursor: int = 0,
+    direction: int = SEEK_OLDER,
     role: UserRole = UserRole.USER,
 ) -> None:
     if not callback.message:
@@ -437,37 +437,36 @@ async def _show_section_files(
 
     i18n = get_i18n()
     db = await get_db()
-    files: List[File] = []
-    total_pages = 1
+    result = KeysetPage([], 1, 1, False, False, 0)
 
-    async for session in db.get_session():
-        files, total_pages = await file_service.list_files_by_section(
-            session, section_id, page=page,
+    async for session in db.get_session(read_only=True):
+        result = await file_service.list_files_by_section(
+            session, section_id, cursor=cursor, direction=direction, page=page,
         )
 
     from bot.services.sections import section_service
     section_name = ""
-    async for session in db.get_session():
+    async for session in db.get_session(read_only=True):
         section = await section_service.get_section(session, section_id)
         if section:
             section_name = section.name
 
-    if files:
+    if result.items:
         title = f"<b>{section_name}</b>\n{i18n.get(I18nKeys.FILES_TITLE)}"
     else:
         title = f"<b>{section_name}</b>\n{i18n.get(I18nKeys.FILES_EMPTY)}"
 
-    keyboard = _build_file_list_keyboard(files, section_id, page, total_pages, role)
+    keyboard = _build_file_list_keyboard(result, section_id, role)
 
     await callback.message.edit_text(title, reply_markup=keyboard)  # type: ignore[union-attr]
     await callback.answer()
 
 
-def _is_file_upload_state(message: Message) -> bool:
+async def _is_file_upload_state(message: Message) -> bool:
     if not message.from_user:
         return False
     state_service = get_state_service()
-    state = state_service.get_state(message.from_user.id)
+    state = await state_service.get_state(message.from_user.id)
     if state is None:
         return False
     return state.name == STATES["UPLOAD"]
@@ -536,13 +535,13 @@ def create_files_router() -> Router:
 
         if not has_permission(role, Permission.UPLOAD_FILE):
             state_service = get_state_service()
-            state_service.clear_state(user_id)
+            await state_service.clear_state(user_id)
             i18n = get_i18n()
             await message.answer(i18n.get(I18nKeys.ERROR_PERMISSION_DENIED))
             return
 
         state_service = get_state_service()
-        state = state_service.get_state(user_id)
+        state = await state_service.get_state(user_id)
         if state is None:
             return
 
@@ -567,7 +566,7 @@ def create_files_router() -> Router:
         elif result:
             await message.reply(i18n.get(I18nKeys.FILES_UPLOAD_SUCCESS, name=result))
             uploaded_count = state.data.get("uploaded_count", 0) + 1
-            state_service.set_state(user_id, STATES["UPLOAD"], {
+            await state_service.set_state(user_id, STATES["UPLOAD"], {
                 "section_id": section_id,
                 "uploaded_count": uploaded_count,
             })
@@ -584,11 +583,8 @@ async def handle_deep_link_file(bot: Bot, message: Message, file_id: int) -> boo
 
     async for session in db.get_session():
         file = await file_service.get_file(session, file_id)
-        if file is None or file.status != FileStatus.PUBLISHED.value:
-            await message.answer(i18n.get(I18nKeys.FILES_DEEP_LINK_NOT_FOUND))
-            return False
 
-    if file is None:
+    if file is None or file.status != FileStatus.PUBLISHED.value:
         await message.answer(i18n.get(I18nKeys.FILES_DEEP_LINK_NOT_FOUND))
         return False
 
@@ -69,7 +69,7 @@ async def _send_home(callback: CallbackQuery, role: UserRole = UserRole.USER) ->
         return
     user_id = callback.from_user.id
     state_service = get_state_service()
-    state_service.clear_state(user_id)
+    await state_service.clear_state(user_id)
 
     i18n = get_i18n()
     name = callback.from_user.first_name or ""
@@ -87,7 +87,7 @@ async def _send_placeholder(callback: CallbackQuery, button_name: str, state_nam
     logger.info(LogMessages.BUTTON_PRESSED.format(button=button_name, user_id=user_id))
 
     state_service = get_state_service()
-    state_service.set_state(user_id, state_name)
+    await state_service.set_state(user_id, state_name)
 
     i18n = get_i18n()
     await callback.message.edit_text(  # type: ignore[union-attr]
@@ -104,7 +104,7 @@ async def _send_text_page(callback: CallbackQuery, button_name: str, state_name:
     logger.info(LogMessages.BUTTON_PRESSED.format(button=button_name, user_id=user_id))
 
     state_service = get_state_service()
-    state_service.set_state(user_id, state_name)
+    await state_service.set_state(user_id, state_name)
 
     i18n = get_i18n()
     await callback.message.edit_text(  # type: ignore[union-attr]
@@ -125,7 +125,7 @@ def create_home_router() -> Router:
         logger.info(LogMessages.START_COMMAND.format(user_id=user_id))
 
         state_service = get_state_service()
-        state_service.clear_state(user_id)
+        await state_service.clear_state(user_id)
 
         role = kwargs.get("user_role", UserRole.USER)
 
@@ -258,7 +258,7 @@ async def handle_admin_panel_callback(callback: CallbackQuery, kwargs: Dict[str,
 
     i18n = get_i18n()
     state_service = get_state_service()
-    state_service.set_state(callback.from_user.id, "admin_panel")
+    await state_service.set_state(callback.from_user.id, "admin_panel")
 
     await callback.message.edit_text(  # type: ignore[union-attr]
         i18n.get(I18nKeys.ADMIN_PANEL_TEXT),
@@ -0,0 +1,108 @@
+import logging
+from typing import Any, Callable, Dict, List
+
+from aiogram import Router
+from aiogram.types import (
+    InlineQuery,
+    InlineQueryResultCachedAudio,
+    InlineQueryResultCachedDocument,
+    InlineQueryResultCachedMpeg4Gif,
+    InlineQueryResultCachedPhoto,
+    InlineQueryResultCachedSticker,
+    InlineQueryResultCachedVideo,
+    InlineQueryResultCachedVoice,
+)
+
+from bot.core.constants import LogMessages
+from bot.core.database import get_db
+from bot.models.file import File
+from bot.services.files import file_service
+from bot.services.search import HIT_FILE, search_service
+
+logger = logging.getLogger("bot")
+
+MIN_QUERY_LENGTH = 2
+INLINE_RESULTS_MAX = 50
+INLINE_UNSUPPORTED_TYPES = {"video_note"}
+
+_cache_time: int = 300
+_page_size: int = 20
+
+
+def configure_inline_search(cache_time: int, page_size: int) -> None:
+    global _cache_time, _page_size
+    _cache_time = cache_time
+    _page_size = max(1, min(page_size, INLINE_RESULTS_MAX))
+
+
+INLINE_RESULT_BUILDERS: Dict[str, Callable[[File], Any]] = {
+    "photo": lambda f: InlineQueryResultCachedPhoto(
+        id=str(f.id), photo_file_id=f.file_id, title=f.name, caption=f.caption,
+    ),
+    "video": lambda f: InlineQueryResultCachedVideo(
+        id=str(f.id), video_file_id=f.file_id, title=f.name, caption=f.caption,
+    ),
+    "audio": lambda f: InlineQueryResultCachedAudio(
+        id=str(f.id), audio_file_id=f.file_id, caption=f.caption,
+    ),
+    "voice": lambda f: InlineQueryResultCachedVoice(
+        id=str(f.id), voice_file_id=f.file_id, title=f.name, caption=f.caption,
+    ),
+    "animation": lambda f: InlineQueryResultCachedMpeg4Gif(
+        id=str(f.id), mpeg4_file_id=f.file_id, title=f.name, caption=f.caption,
+    ),
+    "sticker": lambda f: InlineQueryResultCachedSticker(
+        id=str(f.id), sticker_file_id=f.file_id,
+    ),
+    "document": lambda f: InlineQueryResultCachedDocument(
+        id=str(f.id), document_file_id=f.file_id, title=f.name, caption=f.caption,
+    ),
+}
+
+
+def build_inline_result(f: File) -> Any:
+    if f.file_type in INLINE_UNSUPPORTED_TYPES:
+        return None
+    return INLINE_RESULT_BUILDERS.get(f.file_type, INLINE_RESULT_BUILDERS["document"])(f)
+
+
+async def handle_inline_query(inline_query: InlineQuery) -> None:
+    query = inline_query.query.strip()
+    if len(query) < MIN_QUERY_LENGTH:
+        await inline_query.answer([], cache_time=_cache_time, is_personal=True)
+        return
+
+    try:
+        offset = max(0, int(inline_query.offset or 0))
+    except ValueError:
+        offset = 0
+
+    logger.info(LogMessages.INLINE_QUERY.format(
+        user_id=inline_query.from_user.id, query=query, offset=offset
+    ))
+
+    results = await search_service.search(query)
+    file_ids = [hit.id for hit in results.hits if hit.kind == HIT_FILE]
+    page_ids = file_ids[offset:offset + _page_size]
+
+    files: List[File] = []
+    if page_ids:
+        db = await get_db()
+        async for session in db.get_session(read_only=True):
+            files = await file_service.get_published_files_by_ids(session, page_ids)
+
+    items = [item for item in (build_inline_result(f) for f in files) if item is not None]
+    next_offset = str(offset + _page_size) if offset + _page_size < len(file_ids) else ""
+    # Results are personal: ban, subscription and maintenance gates differ
+    # per user, so Telegram must not serve one user's answer to another.
+    await inline_query.answer(items, cache_time=_cache_time, is_personal=True, next_offset=next_offset)
+
+
+def create_inline_router() -> Router:
+    router = Router(name="inline")
+
+    @router.inline_query()
+    async def inline_query_handler(inline_query: InlineQuery, **kwargs: Any) -> None:
+        await handle_inline_query(inline_query)
+
+    return router
@@ -5,24 +5,25 @@ from aiogram import Router, Bot
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 
 from bot.core.constants import LogMessages, I18nKeys, CallbackPrefixes
+from bot.modules.callback_codec import encode_callback
+from bot.modules.central_router import get_callback_args
 from bot.core.database import get_db
 from bot.services.i18n import get_i18n
 from bot.services.state import get_state_service
-from bot.services.sections import section_service
 from bot.services.files import file_service, send_file_to_user
+from bot.services.search import HIT_SECTION, SearchResults, search_service
 from bot.models.user import UserRole
 
 logger = logging.getLogger("bot")
 
 SEARCH_STATE = "search_input"
-MAX_RESULTS = 20
 
 
-def _is_search_state(message: Message) -> bool:
+async def _is_search_state(message: Message) -> bool:
     if not message.from_user or not message.text:
         return False
     state_service = get_state_service()
-    state = state_service.get_state(message.from_user.id)
+    state = await state_service.get_state(message.from_user.id)
     if state is None:
         return False
     return state.name == SEARCH_STATE
@@ -38,24 +39,41 @@ def _build_search_back_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
-def _build_results_keyboard(
-    sections: list,
-    files: list,
-) -> InlineKeyboardMarkup:
+def _build_results_keyboard(results: SearchResults, page: int) -> InlineKeyboardMarkup:
     i18n = get_i18n()
     buttons: List[List[InlineKeyboardButton]] = []
 
-    for sec in sections:
-        buttons.append([InlineKeyboardButton(
-            text=i18n.get(I18nKeys.SEARCH_RESULT_SECTION_LABEL, name=sec.name),
-            callback_data=f"{CallbackPrefixes.SEARCH_RESULT_SECTION}{sec.id}",
-        )])
-
-    for f in files:
-        buttons.append([InlineKeyboardButton(
-            text=i18n.get(I18nKeys.SEARCH_RESULT_FILE_LABEL, name=f.name),
-            callback_data=f"{CallbackPrefixes.SEARCH_RESULT_FILE}{f.id}",
-        )])
+    for hit in results.page(page, search_service.page_size):
+        if hit.kind == HIT_SECTION:
+            buttons.append([InlineKeyboardButton(
+                text=i18n.get(I18nKeys.SEARCH_RESULT_SECTION_LABEL, name=hit.name),
+                callback_data=encode_callback(CallbackPrefixes.SEARCH_RESULT_SECTION, hit.id),
+            )])
+        else:
+            buttons.append([InlineKeyboardButton(
+                text=i18n.get(I18nKeys.SEARCH_RESULT_FILE_LABEL, name=hit.name),
+                callback_data=encode_callback(CallbackPrefixes.SEARCH_RESULT_FILE, hit.id),
+            )])
+
+    total_pages = results.page_count(search_service.page_size)
+    nav_row: List[InlineKeyboardButton] = []
+    if page > 1:
+        nav_row.append(InlineKeyboardButton(
+            text=i18n.get(I18nKeys.FILES_PAGE_PREV),
+            callback_data=encode_callback(CallbackPrefixes.SEARCH_PAGE, results.token, page - 1),
+        ))
+    if total_pages > 1:
+        nav_row.append(InlineKeyboardButton(
+            text=i18n.get(I18nKeys.FILES_PAGE_INFO, page=page, total=total_pages),
+            callback_data="noop",
+        ))
+    if page < total_pages:
+        nav_row.append(InlineKeyboardButton(
+            text=i18n.get(I18nKeys.FILES_PAGE_NEXT),
+            callback_data=encode_callback(CallbackPrefixes.SEARCH_PAGE, results.token, page + 1),
+        ))
+    if nav_row:
+        buttons.append(nav_row)
 
     buttons.append([InlineKeyboardButton(
         text=i18n.get(I18nKeys.SEARCH_BTN_BACK),
@@ -72,7 +90,7 @@ async def handle_search_callback(callback: CallbackQuery, kwargs: Dict[str, Any]
     logger.info(LogMessages.SEARCH_STARTED.format(user_id=user_id))
 
     state_service = get_state_service()
-    state_service.set_state(user_id, SEARCH_STATE)
+    await state_service.set_state(user_id, SEARCH_STATE)
 
     i18n = get_i18n()
     await callback.message.edit_text(  # type: ignore[union-attr]
@@ -87,7 +105,7 @@ async def handle_search_back_callback(callback: CallbackQuery, kwargs: Dict[str,
         return
 
     state_service = get_state_service()
-    state_service.clear_state(callback.from_user.id)
+    await state_service.clear_state(callback.from_user.id)
 
     from bot.handlers.home import build_home_keyboard
     role = kwargs.get("user_role", UserRole.USER)
@@ -104,19 +122,14 @@ async def handle_search_result_section(callback: CallbackQuery, kwargs: Dict[str
     if not callback.from_user or not callback.message or not callback.data:
         return
 
-    section_id_str = callback.data.replace(CallbackPrefixes.SEARCH_RESULT_SECTION, "")
-    try:
-        section_id = int(section_id_str)
-    except ValueError:
-        await callback.answer()
-        return
+    section_id = get_callback_args(callback, kwargs)[0]
 
     logger.info(LogMessages.SEARCH_RESULT_SELECTED.format(
         user_id=callback.from_user.id, type="section", id=section_id
     ))
 
     state_service = get_state_service()
-    state_service.clear_state(callback.from_user.id)
+    await state_service.clear_state(callback.from_user.id)
 
     from bot.handlers.sections import _show_section_detail
     role = kwargs.get("user_role", UserRole.USER)
@@ -127,19 +140,14 @@ async def handle_search_result_file(callback: CallbackQuery, kwargs: Dict[str, A
     if not callback.from_user or not callback.message or not callback.data:
         return
 
-    file_id_str = callback.data.replace(CallbackPrefixes.SEARCH_RESULT_FILE, "")
-    try:
-        file_id = int(file_id_str)
-    except ValueError:
-        await callback.answer()
-        return
+    file_id = get_callback_args(callback, kwargs)[0]
 
     logger.info(LogMessages.SEARCH_RESULT_SELECTED.format(
         user_id=callback.from_user.id, type="file", id=file_id
     ))
 
     state_service = get_state_service()
-    state_service.clear_state(callback.from_user.id)
+    await state_service.clear_state(callback.from_user.id)
 
     bot = callback.message.bot
     if not bot:
@@ -149,16 +157,38 @@ async def handle_search_result_file(callback: CallbackQuery, kwargs: Dict[str, A
     from bot.models.file import FileStatus
     db = await get_db()
     i18n = get_i18n()
+    file = None
     async for session in db.get_session():
         file = await file_service.get_file(session, file_id)
-        if file and file.status == FileStatus.PUBLISHED.value:
-            await send_file_to_user(bot, callback.from_user.id, file)
-        else:
-            await callback.message.answer(i18n.get(I18nKeys.FILES_NOT_FOUND))
+
+    if file and file.status == FileStatus.PUBLISHED.value:
+        await send_file_to_user(bot, callback.from_user.id, file)
+    else:
+        await callback.message.answer(i18n.get(I18nKeys.FILES_NOT_FOUND))
 
     await callback.answer()
 
 
+async def handle_search_page(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
+    if not callback.from_user or not callback.message or not callback.data:
+        return
+
+    token, page = get_callback_args(callback, kwargs)
+
+    i18n = get_i18n()
+    results = await search_service.results_for_token(token)
+    if results is None or not results.hits:
+        await callback.answer(i18n.get(I18nKeys.SEARCH_EXPIRED), show_alert=True)
+        return
+
+    page = max(1, min(page, results.page_count(search_service.page_size)))
+    await callback.message.edit_text(  # type: ignore[union-attr]
+        i18n.get(I18nKeys.SEARCH_RESULTS_TITLE, query=results.query, count=results.total),
+        reply_markup=_build_results_keyboard(results, page),
+    )
+    await callback.answer()
+
+
 def create_search_router() -> Router:
     router = Router(name="search")
 
@@ -178,29 +208,24 @@ def create_search_router() -> Router:
             )
             return
 
-        logger.info(LogMessages.SEARCH_QUERY.format(user_id=user_id, query=query))
-
-        sections = []
-        files = []
-        db = await get_db()
-        async for session in db.get_session():
-            sections = await section_service.search_sections(session, query, limit=MAX_RESULTS)
-            files = await file_service.search_files(session, query, limit=MAX_RESULTS)
+        results = search_service.cached(query)
+        if not await search_service.settle(user_id, immediate=results is not None):
+            return
 
-        total = len(sections) + len(files)
+        logger.info(LogMessages.SEARCH_QUERY.format(user_id=user_id, query=query))
+        results = await search_service.search(query)
         logger.info(LogMessages.SEARCH_RESULTS.format(
-            user_id=user_id, sections=len(sections), files=len(files)
+            user_id=user_id, sections=results.sections, files=results.files
         ))
 
-        if total == 0:
+        if not results.hits:
             await message.answer(
                 i18n.get(I18nKeys.SEARCH_NO_RESULTS),
                 reply_markup=_build_search_back_keyboard(),
             )
             return
 
-        title = i18n.get(I18nKeys.SEARCH_RESULTS_TITLE, query=query, count=total)
-        keyboard = _build_results_keyboard(sections, files)
-        await message.answer(title, reply_markup=keyboard)
+        title = i18n.get(I18nKeys.SEARCH_RESULTS_TITLE, query=query, count=results.total)
+        await message.answer(title, reply_markup=_build_results_keyboard(results, 1))
 
     return router
@@ -1,21 +1,22 @@
-import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
-from aiogram import Bot, Router
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 
 from bot.core.constants import LogMessages, I18nKeys, CallbackPrefixes, AuditActions
+from bot.modules.callback_codec import encode_callback
+from bot.modules.central_router import get_callback_args
 from bot.core.database import get_db
 from bot.services.i18n import get_i18n
 from bot.services.state import get_state_service
 from bot.services.sections import section_service
-from bot.services.files import file_service, send_file_to_user
+from bot.services.section_tree import SectionNode, section_tree
+from bot.services.file_delivery import file_delivery, MEDIA_GROUP_MAX
+from bot.services.pagination import SEEK_OLDER
 from bot.services.audit import audit_service
 from bot.services.permissions import has_permission, check_permission_and_notify, Permission
 from bot.models.user import UserRole
-from bot.models.section import Section
-from bot.models.file import File
 
 logger = logging.getLogger("bot")
 
@@ -28,7 +29,7 @@ STATES = {
 
 
 def _build_sections_keyboard(
-    sections: List[Section],
+    sections: List[SectionNode],
     parent_id: Optional[int],
     role: UserRole,
 ) -> InlineKeyboardMarkup:
@@ -38,20 +39,20 @@ def _build_sections_keyboard(
     for sec in sections:
         buttons.append([InlineKeyboardButton(
             text=f"📁 {sec.name}",
-            callback_data=f"{CallbackPrefixes.SECTION_VIEW}{sec.id}",
+            callback_data=encode_callback(CallbackPrefixes.SECTION_VIEW, sec.id),
         )])
 
     if has_permission(role, Permission.MANAGE_SECTIONS):
         pid = parent_id if parent_id is not None else 0
         buttons.append([InlineKeyboardButton(
             text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_ADD),
-            callback_data=f"{CallbackPrefixes.SECTION_ADMIN_ADD}{pid}",
+            callback_data=encode_callback(CallbackPrefixes.SECTION_ADMIN_ADD, pid),
         )])
 
     if parent_id is not None:
         buttons.append([InlineKeyboardButton(
             text=i18n.get(I18nKeys.SECTIONS_BTN_BACK),
-            callback_data=f"{CallbackPrefixes.SECTION_BACK}{parent_id}",
+            callback_data=encode_callback(CallbackPrefixes.SECTION_BACK, parent_id),
         )])
     else:
         buttons.append([InlineKeyboardButton(
@@ -63,8 +64,8 @@ def _build_sections_keyboard(
 
 
 def _build_section_detail_keyboard(
-    section: Section,
-    children: List[Section],
+    section: SectionNode,
+    children: List[SectionNode],
     role: UserRole,
     file_count: int = 0,
 ) -> InlineKeyboardMarkup:
@@ -74,7 +75,7 @@ def _build_section_detail_keyboard(
     for child in children:
         buttons.append([InlineKeyboardButton(
             text=f"📁 {child.name}",
-            callback_data=f"{CallbackPrefixes.SECTION_VIEW}{child.id}",
+            callback_data=encode_callback(CallbackPrefixes.SECTION_VIEW, child.id),
         )])
 
     files_label = i18n.get(I18nKeys.FILES_BTN_VIEW)
@@ -82,7 +83,7 @@ def _build_section_detail_keyboard(
         files_label = f"{files_label} ({file_count})"
     buttons.append([InlineKeyboardButton(
         text=files_label,
-        callback_data=f"{CallbackPrefixes.FILE_PAGE}{section.id}:1",
+        callback_data=encode_callback(CallbackPrefixes.FILE_PAGE, section.id, 1, 0, SEEK_OLDER),
     )])
 
     if has_permission(role, Permission.MANAGE_SECTIONS):
@@ -90,7 +91,7 @@ def _build_section_detail_keyboard(
         admin_row = [
             InlineKeyboardButton(
                 text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_ADD),
-                callback_data=f"{CallbackPrefixes.SECTION_ADMIN_ADD}{pid}",
+                callback_data=encode_callback(CallbackPrefixes.SECTION_ADMIN_ADD, pid),
             ),
         ]
         buttons.append(admin_row)
@@ -98,15 +99,15 @@ def _build_section_detail_keyboard(
         edit_row = [
             InlineKeyboardButton(
                 text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_EDIT),
-                callback_data=f"{CallbackPrefixes.SECTION_ADMIN_EDIT}{section.id}",
+                callback_data=encode_callback(CallbackPrefixes.SECTION_ADMIN_EDIT, section.id),
             ),
             InlineKeyboardButton(
                 text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_ORDER),
-                callback_data=f"{CallbackPrefixes.SECTION_ADMIN_SET_ORDER}{section.id}",
+                callback_data=encode_callback(CallbackPrefixes.SECTION_ADMIN_SET_ORDER, section.id),
             ),
             InlineKeyboardButton(
                 text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_DELETE),
-                callback_data=f"{CallbackPrefixes.SECTION_ADMIN_DELETE}{section.id}",
+                callback_data=encode_callback(CallbackPrefixes.SECTION_ADMIN_DELETE, section.id),
             ),
         ]
         buttons.append(edit_row)
@@ -115,11 +116,11 @@ def _build_section_detail_keyboard(
         extra_row = [
             InlineKeyboardButton(
                 text=toggle_text,
-                callback_data=f"{CallbackPrefixes.SECTION_ADMIN_TOGGLE}{section.id}",
+                callback_data=encode_callback(CallbackPrefixes.SECTION_ADMIN_TOGGLE, section.id),
             ),
             InlineKeyboardButton(
                 text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_COPY),
-                callback_data=f"{CallbackPrefixes.SECTION_ADMIN_COPY}{section.id}",
+                callback_data=encode_callback(CallbackPrefixes.SECTION_ADMIN_COPY, section.id),
             ),
         ]
         buttons.append(extra_row)
@@ -127,7 +128,7 @@ def _build_section_detail_keyboard(
     back_target = section.parent_id if section.parent_id is not None else 0
     buttons.append([InlineKeyboardButton(
         text=i18n.get(I18nKeys.SECTIONS_BTN_BACK),
-        callback_data=f"{CallbackPrefixes.SECTION_BACK}{back_target}",
+        callback_data=encode_callback(CallbackPrefixes.SECTION_BACK, back_target),
     )])
 
     return InlineKeyboardMarkup(inline_keyboard=buttons)
@@ -142,11 +143,8 @@ async def _show_sections_list(
         return
 
     i18n = get_i18n()
-    db = await get_db()
-    sections: List[Section] = []
-
-    async for session in db.get_session():
-        sections = await section_service.list_sections(session, parent_id=parent_id)
+    tree = await section_tree.get()
+    sections = tree.children(parent_id)
 
     if not sections:
         title = i18n.get(I18nKeys.SECTIONS_EMPTY)
@@ -159,21 +157,6 @@ async def _show_sections_list(
     await callback.answer()
 
 
-async def _send_section_files(
-    bot: Bot,
-    chat_id: int,
-    files: List[File],
-) -> int:
-    sent = 0
-    for i, f in enumerate(files):
-        success = await send_file_to_user(bot, chat_id, f)
-        if success:
-            sent += 1
-        if i < len(files) - 1:
-            await asyncio.sleep(0.15)
-    return sent
-
-
 async def _show_section_detail(
     callback: CallbackQuery,
     section_id: int,
@@ -183,24 +166,13 @@ async def _show_section_detail(
         return
 
     i18n = get_i18n()
-    db = await get_db()
-    section: Optional[Section] = None
-    children: List[Section] = []
-    file_count = 0
-    all_files: List[File] = []
-
-    async for session in db.get_session():
-        section = await section_service.get_section(session, section_id)
-        if section is None or not section.is_active:
-            await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND), show_alert=True)
-            return
-        children = await section_service.list_sections(session, parent_id=section_id)
-        file_count = await file_service.count_files_by_section(session, section_id)
-        if file_count > 0:
-            all_files = await file_service.list_all_files_by_section(session, section_id)
-
-    if section is None:
+    tree = await section_tree.get()
+    section = tree.get(section_id)
+    if section is None or not section.is_active:
+        await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND), show_alert=True)
         return
+    children = tree.children(section_id)
+    file_count = section.file_count
 
     text = f"📂 <b>{section.name}</b>"
     if section.description:
@@ -219,8 +191,19 @@ async def _show_section_detail(
     if bot is None:
         return
 
-    if all_files:
-        await _send_section_files(bot, callback.from_user.id, all_files)
+    if file_count > 0:
+        status_message_id: Optional[int] = None
+        if file_count > MEDIA_GROUP_MAX:
+            status = await bot.send_message(
+                callback.from_user.id,
+                i18n.get(I18nKeys.FILES_DELIVERY_PROGRESS, count=file_count),
+                reply_markup=InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(
+                    text=i18n.get(I18nKeys.FILES_DELIVERY_BTN_STOP),
+                    callback_data=CallbackPrefixes.FILE_DELIVERY_STOP,
+                )]]),
+            )
+            status_message_id = status.message_id
+        file_delivery.start(bot, callback.from_user.id, section_id, status_message_id=status_message_id)
     elif file_count == 0 and not children:
         await bot.send_message(callback.from_user.id, i18n.get(I18nKeys.FILES_EMPTY))
 
@@ -234,21 +217,22 @@ async def handle_section_view_callback(callback: CallbackQuery, kwargs: Dict[str
     if not callback.data:
         return
     role = kwargs.get("user_role", UserRole.USER)
-    try:
-        section_id = int(callback.data.replace(CallbackPrefixes.SECTION_VIEW, ""))
-    except (ValueError, IndexError):
-        return
+    section_id = get_callback_args(callback, kwargs)[0]
     await _show_section_detail(callback, section_id, role)
 
 
+async def handle_file_delivery_stop_callback(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
+    if not callback.from_user:
+        return
+    file_delivery.cancel(callback.from_user.id)
+    await callback.answer()
+
+
 async def handle_section_back_callback(callback: CallbackQuery, kwargs: Dict[str, Any]) -> None:
     if not callback.data:
         return
     role = kwargs.get("user_role", UserRole.USER)
-    try:
-        target_id = int(callback.data.replace(CallbackPrefixes.SECTION_BACK, ""))
-    except (ValueError, IndexError):
-        return
+    target_id = get_callback_args(callback, kwargs)[0]
 
     if target_id == 0:
         await _show_sections_list(callback, parent_id=None, role=role)
@@ -263,14 +247,11 @@ async def handle_section_admin_add(callback: CallbackQuery, kwargs: Dict[str, An
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SECTIONS):
         return
 
-    try:
-        parent_id = int(callback.data.replace(CallbackPrefixes.SECTION_ADMIN_ADD, ""))
-    except (ValueError, IndexError):
-        return
+    parent_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     state_service = get_state_service()
-    state_service.set_state(callback.from_user.id, STATES["ADD_NAME"], data={
+    await state_service.set_state(callback.from_user.id, STATES["ADD_NAME"], data={
         "parent_id": parent_id if parent_id != 0 else None,
     })
 
@@ -295,10 +276,7 @@ async def handle_section_admin_edit(callback: CallbackQuery, kwargs: Dict[str, A
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SECTIONS):
         return
 
-    try:
-        section_id = int(callback.data.replace(CallbackPrefixes.SECTION_ADMIN_EDIT, ""))
-    except (ValueError, IndexError):
-        return
+    section_id = get_callback_args(callback, kwargs)[0]
 
     db = await get_db()
     parent_id = None
@@ -309,7 +287,7 @@ async def handle_section_admin_edit(callback: CallbackQuery, kwargs: Dict[str, A
 
     i18n = get_i18n()
     state_service = get_state_service()
-    state_service.set_state(callback.from_user.id, STATES["EDIT_NAME"], data={
+    await state_service.set_state(callback.from_user.id, STATES["EDIT_NAME"], data={
         "section_id": section_id,
         "parent_id": parent_id,
     })
@@ -335,10 +313,7 @@ async def handle_section_admin_set_order(callback: CallbackQuery, kwargs: Dict[s
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SECTIONS):
         return
 
-    try:
-        section_id = int(callback.data.replace(CallbackPrefixes.SECTION_ADMIN_SET_ORDER, ""))
-    except (ValueError, IndexError):
-        return
+    section_id = get_callback_args(callback, kwargs)[0]
 
     db = await get_db()
     parent_id = None
@@ -349,7 +324,7 @@ async def handle_section_admin_set_order(callback: CallbackQuery, kwargs: Dict[s
 
     i18n = get_i18n()
     state_service = get_state_service()
-    state_service.set_state(callback.from_user.id, STATES["EDIT_ORDER"], data={
+    await state_service.set_state(callback.from_user.id, STATES["EDIT_ORDER"], data={
         "section_id": section_id,
         "parent_id": parent_id,
     })
@@ -375,32 +350,31 @@ async def handle_section_admin_delete(callback: CallbackQuery, kwargs: Dict[str,
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SECTIONS):
         return
 
-    try:
-        section_id = int(callback.data.replace(CallbackPrefixes.SECTION_ADMIN_DELETE, ""))
-    except (ValueError, IndexError):
-        return
+    section_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
     section_name = ""
+    children_exist = False
 
     async for session in db.get_session():
         section = await section_service.get_section(session, section_id)
         if section is None:
-            await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND), show_alert=True)
-            return
-
+            break
         children_exist = await section_service.has_children(session, section_id)
-        if children_exist:
-            await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_HAS_CHILDREN), show_alert=True)
-            return
-
         section_name = section.name
 
+    if not section_name:
+        await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND), show_alert=True)
+        return
+    if children_exist:
+        await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_HAS_CHILDREN), show_alert=True)
+        return
+
     confirm_kb = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(
             text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_CONFIRM),
-            callback_data=f"{CallbackPrefixes.SECTION_ADMIN_CONFIRM_DELETE}{section_id}",
+            callback_data=encode_callback(CallbackPrefixes.SECTION_ADMIN_CONFIRM_DELETE, section_id),
         )],
         [InlineKeyboardButton(
             text=i18n.get(I18nKeys.SECTION_ADMIN_BTN_CANCEL),
@@ -422,21 +396,19 @@ async def handle_section_admin_confirm_delete(callback: CallbackQuery, kwargs: D
     if not await check_permission_and_notify(callback, role, Permission.MANAGE_SECTIONS):
         return
 
-    try:
-        section_id = int(callback.data.replace(CallbackPrefixes.SECTION_ADMIN_CONFIRM_DELETE, ""))
-    except (ValueError, IndexError):
-        return
+    section_id = get_callback_args(callback, kwargs)[0]
 
     i18n = get_i18n()
     db = await get_db()
     parent_id = None
+    deleted = False
 
     async for session in db.get_session():
         section = await section_service.get_section(session, section_id)
         if section is None:
-            await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND), show_alert=True)
-            return
+            break
 
+        deleted = True
         parent_id = section.parent_id
         await section_service.soft_delete_section(session, section_id)
         await audit_service.log_action(
@@ -445,6 +417,10 @@ async def handle_section_admin_confirm_delete(callback: CallbackQuery, kwargs: D
             f"section_id={section_id} name={section.name}",
         )
 
+    if not deleted:
+        await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND), show_alert=True)
+        return
+
     await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_DELETED), show_alert=True)
     await _show_sections_list(callback, parent_id=parent_id, role=role)
 
@@ -454,13 +430,13 @@ async def handle_section_admin_cancel(callback: CallbackQuery, kwargs: Dict[str,
         return
 
     state_service = get_state_service()
-    state = state_service.get_state(callback.from_user.id)
+    state = await state_service.get_state(callback.from_user.id)
 
     parent_id = None
     if state and state.data:
         parent_id = state.data.get("parent_id")
 
-    state_service.clear_state(callback.from_user.id)
+    await state_service.clear_state(callback.from_user.id)
 
     i18n = get_i18n()
     await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_CANCELLED))
@@ -481,7 +457,7 @@ async def handle_section_skip_desc(callback: CallbackQuery, kwargs: Dict[str, An
         return
 
     state_service = get_state_service()
-    state = state_service.get_state(callback.from_user.id)
+    state = await state_service.get_state(callback.from_user.id)
     if state is None or state.name != STATES["ADD_DESC"]:
         return
 
@@ -502,16 +478,16 @@ async def handle_section_skip_desc(callback: CallbackQuery, kwargs: Dict[str, An
             f"section_id={section.id} name={name} parent_id={parent_id}",
         )
 
-    state_service.clear_state(callback.from_user.id)
+    await state_service.clear_state(callback.from_user.id)
     await callback.answer(i18n.get(I18nKeys.SECTION_ADMIN_SAVED), show_alert=True)
     await _show_sections_list(callback, parent_id=parent_id, role=role)
 
 
-def _is_section_state(message: Message) -> bool:
+async def _is_section_state(message: Message) -> bool:
     if not message.from_user or not message.text:
         return False
     state_service = get_state_service()
-    state = state_service.get_state(message.from_user.id)
+    state = await state_service.get_state(message.from_user.id)
     if state is None:
         return False
     return state.name in STATES.values()
@@ -527,7 +503,7 @@ def create_sections_router() -> Router:
 
         user_id = message.from_user.id
         state_service = get_state_service()
-        state = state_service.get_state(user_id)
+        state = await state_service.get_state(user_id)
 
         if state is None:
             return
@@ -535,7 +511,7 @@ def create_sections_router() -> Router:
         role = kwargs.get("user_role", UserRole.USER)
 
         if not has_permission(role, Permission.MANAGE_SECTIONS):
-            state_service.clear_state(user_id)
+            await state_service.clear_state(user_id)
             i18n = get_i18n()
             await message.answer(i18n.get(I18nKeys.ERROR_PERMISSION_DENIED))
             return
@@ -559,10 +535,13 @@ async def _handle_add_name(message: Message, state: Any, role: UserRole, i18n: A
     name = message.text.strip()
     state_service = get_state_service()
 
-    state_service.set_state(user_id, STATES["ADD_DESC"], data={
+    next_state = await state_service.set_state(user_id, STATES["ADD_DESC"], data={
         "parent_id": state.data.get("parent_id"),
         "name": name,
     })
+    if next_state is None:
+        await message.answer(i18n.get(I18nKeys.ERROR_INPUT_TOO_LONG))
+        return
 
     skip_kb = InlineKeyboardMarkup(inline_keyboard=[[
         InlineKeyboardButton(
@@ -602,7 +581,7 @@ async def _handle_add_desc(message: Message, state: Any, role: UserRole, i18n: A
             f"section_id={section.id} name={name} parent_id={parent_id}",
         )
 
-    state_service.clear_state(user_id)
+    await state_service.clear_state(user_id)
     await message.answer(i18n.get(I18nKeys.SECTION_ADMIN_SAVED))
 
 
@@ -613,16 +592,15 @@ async def _handle_edit_name(message: Message, state: Any, role: UserRole, i18n:
 
     section_id = state.data.get("section_id")
     if section_id is None:
-        state_service.clear_state(user_id)
+        await state_service.clear_state(user_id)
         return
 
     db = await get_db()
+    section = None
     async for session in db.get_session():
         section = await section_service.update_section(session, section_id, name=new_name)
         if section is None:
-            await message.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND))
-            state_service.clear_state(user_id)
-            return
+            break
 
         await audit_service.log_action(
             session, user_id,
@@ -630,7 +608,10 @@ async def _handle_edit_name(message: Message, state: Any, role: UserRole, i18n:
             f"section_id={section_id} new_name={new_name}",
         )
 
-    state_service.clear_state(user_id)
+    await state_service.clear_state(user_id)
+    if section is None:
+        await message.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND))
+        return
     await message.answer(i18n.get(I18nKeys.SECTION_ADMIN_UPDATED))
 
 
@@ -646,16 +627,15 @@ async def _handle_edit_order(message: Message, state: Any, role: UserRole, i18n:
 
     section_id = state.data.get("section_id")
     if section_id is None:
-        state_service.clear_state(user_id)
+        await state_service.clear_state(user_id)
         return
 
     db = await get_db()
+    section = None
     async for session in db.get_session():
         section = await section_service.update_section(session, section_id, order=new_order)
         if section is None:
-            await message.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND))
-            state_service.clear_state(user_id)
-            return
+            break
 
         await audit_service.log_action(
             session, user_id,
@@ -663,5 +643,8 @@ async def _handle_edit_order(message: Message, state: Any, role: UserRole, i18n:
             f"section_id={section_id} new_order={new_order}",
         )
 
-    state_service.clear_state(user_id)
+    await state_service.clear_state(user_id)
+    if section is None:
+        await message.answer(i18n.get(I18nKeys.SECTION_ADMIN_NOT_FOUND))
+        return
     await message.answer(i18n.get(I18nKeys.SECTION_ADMIN_UPDATED))
@@ -11,7 +11,22 @@ from bot.core.database import init_database
 from bot.core.constants import LogMessages
 from bot.services.i18n import init_i18n
 from bot.services.state import init_state_service
+from bot.services.state_backends import create_state_backend
+from bot.services.user import user_service
+from bot.services.settings_manager import settings_manager
+from bot.services.membership import membership_service
+from bot.services.user_activity import user_activity
+from bot.services.broadcast import broadcast_engine
+from bot.services.file_delivery import file_delivery
+from bot.services.send_scheduler import send_scheduler
+from bot.services.search_index import search_index
+from bot.services.search import search_service
+from bot.services.section_tree import section_tree
+from bot.services.pagination import list_counts
+from bot.services.section_counters import section_counters
 from bot.services.seeder import seed_default_texts
+from bot.middlewares.unit_of_work import UnitOfWorkMiddleware, UnitOfWorkReleaseMiddleware
+from bot.middlewares.update_context import UpdateContextMiddleware
 from bot.middlewares.ban_check import BanCheckMiddleware
 from bot.middlewares.subscription_check import SubscriptionCheckMiddleware
 from bot.middlewares.maintenance_check import MaintenanceCheckMiddleware
@@ -38,12 +53,14 @@ from bot.handlers.search import (
     handle_search_back_callback,
     handle_search_result_section,
     handle_search_result_file,
+    handle_search_page,
 )
 from bot.handlers.sections import (
     create_sections_router,
     handle_sections_callback,
     handle_section_view_callback,
     handle_section_back_callback,
+    handle_file_delivery_stop_callback,
     handle_section_admin_add,
     handle_section_admin_edit,
     handle_section_admin_set_order,
@@ -104,6 +121,9 @@ from bot.handlers.admin import (
     handle_admin_broadcast_file,
     handle_admin_broadcast_confirm,
     handle_admin_broadcast_cancel,
+    handle_admin_broadcast_pause,
+    handle_admin_broadcast_resume,
+    handle_admin_broadcast_stop,
     handle_admin_ban,
     handle_admin_ban_block,
     handle_admin_ban_unblock,
@@ -113,6 +133,7 @@ from bot.handlers.admin import (
     handle_admin_backup_export,
     handle_admin_backup_restore,
 )
+from bot.handlers.inline import configure_inline_search, create_inline_router
 from bot.handlers.fallback import create_fallback_router
 from bot.core.constants import CallbackPrefixes
 
@@ -128,7 +149,7 @@ async def main() -> None:
         return
 
     logger.info(LogMessages.CONNECTING_TO_DATABASE)
-    db = await init_database(config.database.url)
+    db = await init_database(config.database.url, config.database)
     logger.info(LogMessages.DATABASE_CONNECTED)
 
     i18n = init_i18n(default_language=config.default_language)
@@ -136,8 +157,61 @@ async def main() -> None:
         await seed_default_texts(session, language=config.default_language)
     async for session in db.get_session():
         await i18n.load_texts(session)
+    async for session in db.get_session():
+        await settings_manager.load_snapshot(session)
+    if config.cache.settings_notify:
+        try:
+            await settings_manager.start_listener(db)
+        except Exception as e:
+            logger.error(LogMessages.SETTINGS_LISTENER_FAIL.format(error=str(e)))
+    settings_manager.start_refresh(config.cache.settings_refresh_seconds)
 
-    init_state_service(timeout_seconds=config.state.timeout_seconds)
+    state_service = init_state_service(
+        timeout_seconds=config.state.timeout_seconds,
+        backend=create_state_backend(
+            config.state.backend,
+            path=config.state.sqlite_path,
+            max_states=config.state.max_states,
+        ),
+        max_payload_bytes=config.state.max_payload_bytes,
+    )
+    user_service.configure_cache(
+        max_size=config.cache.user_max_size,
+        ttl_seconds=config.cache.user_ttl_seconds,
+    )
+    section_tree.configure(ttl_seconds=config.cache.section_tree_ttl_seconds)
+    list_counts.configure(ttl_seconds=config.cache.list_count_ttl_seconds)
+    membership_service.configure(
+        positive_ttl=config.subscription.member_ttl_seconds,
+        negative_ttl=config.subscription.non_member_ttl_seconds,
+    )
+    send_scheduler.configure(
+        global_rate=config.outbound.global_rate,
+        private_chat_rate=config.outbound.private_chat_rate,
+        private_chat_burst=config.outbound.private_chat_burst,
+        group_chat_rate=config.outbound.group_chat_per_minute / 60.0,
+        max_retries=config.outbound.max_retries,
+    )
+    broadcast_engine.configure(
+        concurrency=config.broadcast.concurrency,
+        chunk_size=config.broadcast.chunk_size,
+        progress_interval=config.broadcast.progress_interval_seconds,
+    )
+    search_index.configure(enabled=config.search.index_enabled)
+    search_service.configure(
+        page_size=config.search.page_size,
+        max_results=config.search.max_results,
+        cache_size=config.search.cache_size,
+        debounce_seconds=config.search.debounce_seconds,
+    )
+    configure_inline_search(
+        cache_time=config.search.inline_cache_time_seconds,
+        page_size=config.search.inline_page_size,
+    )
+    try:
+        await search_index.rebuild(db)
+    except Exception as e:
+        logger.error(LogMessages.SEARCH_INDEX_BUILD_FAIL.format(error=str(e)))
 
     if config.bot.storage_channel_id != 0:
         set_storage_channel_id(config.bot.storage_channel_id)
@@ -150,6 +224,7 @@ async def main() -> None:
         logger.warning(LogMessages.BOT_TOKEN_NOT_SET)
         health = await check_health()
         logger.info(LogMessages.INFRASTRUCTURE_READY)
+        await settings_manager.stop()
         await db.close()
         return
 
@@ -157,8 +232,15 @@ async def main() -> None:
         token=config.bot.token,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
+    bot.session.middleware(UnitOfWorkReleaseMiddleware())
+    bot.session.middleware(send_scheduler)
     dp = Dispatcher()
+    user_activity.start(flush_interval=config.cache.user_activity_flush_seconds)
+    state_service.start_sweeper(config.state.sweep_interval_seconds)
+    section_counters.start(config.cache.section_counters_reconcile_seconds)
 
+    dp.update.outer_middleware(UnitOfWorkMiddleware())
+    dp.update.outer_middleware(UpdateContextMiddleware())
     dp.update.outer_middleware(BanCheckMiddleware())
     dp.update.outer_middleware(SubscriptionCheckMiddleware(
         enabled=config.subscription.enabled,
@@ -174,27 +256,29 @@ async def main() -> None:
 
     central_router.register(CallbackPrefixes.HOME, handle_home_callback)
     central_router.register(CallbackPrefixes.SECTIONS, handle_sections_callback)
-    central_router.register(CallbackPrefixes.SECTION_VIEW, handle_section_view_callback)
-    central_router.register(CallbackPrefixes.SECTION_BACK, handle_section_back_callback)
-    central_router.register(CallbackPrefixes.SECTION_ADMIN_ADD, handle_section_admin_add)
-    central_router.register(CallbackPrefixes.SECTION_ADMIN_EDIT, handle_section_admin_edit)
-    central_router.register(CallbackPrefixes.SECTION_ADMIN_SET_ORDER, handle_section_admin_set_order)
-    central_router.register(CallbackPrefixes.SECTION_ADMIN_DELETE, handle_section_admin_delete)
-    central_router.register(CallbackPrefixes.SECTION_ADMIN_CONFIRM_DELETE, handle_section_admin_confirm_delete)
+    central_router.register(CallbackPrefixes.SECTION_VIEW, handle_section_view_callback, args=(int,))
+    central_router.register(CallbackPrefixes.SECTION_BACK, handle_section_back_callback, args=(int,))
+    central_router.register(CallbackPrefixes.FILE_DELIVERY_STOP, handle_file_delivery_stop_callback)
+    central_router.register(CallbackPrefixes.SECTION_ADMIN_ADD, handle_section_admin_add, args=(int,))
+    central_router.register(CallbackPrefixes.SECTION_ADMIN_EDIT, handle_section_admin_edit, args=(int,))
+    central_router.register(CallbackPrefixes.SECTION_ADMIN_SET_ORDER, handle_section_admin_set_order, args=(int,))
+    central_router.register(CallbackPrefixes.SECTION_ADMIN_DELETE, handle_section_admin_delete, args=(int,))
+    central_router.register(CallbackPrefixes.SECTION_ADMIN_CONFIRM_DELETE, handle_section_admin_confirm_delete, args=(int,))
     central_router.register(CallbackPrefixes.SECTION_ADMIN_CANCEL, handle_section_admin_cancel)
     central_router.register(CallbackPrefixes.SECTION_ADMIN_SKIP_DESC, handle_section_skip_desc)
-    central_router.register(CallbackPrefixes.SECTION_ADMIN_TOGGLE, handle_section_toggle)
-    central_router.register(CallbackPrefixes.SECTION_ADMIN_COPY, handle_section_copy)
-    central_router.register(CallbackPrefixes.SECTION_ADMIN_CONFIRM_COPY, handle_section_confirm_copy)
-    central_router.register(CallbackPrefixes.FILE_VIEW, handle_file_view)
-    central_router.register(CallbackPrefixes.FILE_PAGE, handle_file_page)
-    central_router.register(CallbackPrefixes.FILE_UPLOAD, handle_file_upload_start)
-    central_router.register(CallbackPrefixes.FILE_DELETE, handle_file_delete)
-    central_router.register(CallbackPrefixes.FILE_CONFIRM_DELETE, handle_file_confirm_delete)
+    central_router.register(CallbackPrefixes.SECTION_ADMIN_TOGGLE, handle_section_toggle, args=(int,))
+    central_router.register(CallbackPrefixes.SECTION_ADMIN_COPY, handle_section_copy, args=(int,))
+    central_router.register(CallbackPrefixes.SECTION_ADMIN_CONFIRM_COPY, handle_section_confirm_copy, args=(int,))
+    central_router.register(CallbackPrefixes.FILE_VIEW, handle_file_view, args=(int,))
+    central_router.register(CallbackPrefixes.FILE_PAGE, handle_file_page, args=(int, int, int, int))
+    central_router.register(CallbackPrefixes.FILE_UPLOAD, handle_file_upload_start, args=(int,))
+    central_router.register(CallbackPrefixes.FILE_DELETE, handle_file_delete, args=(int,))
+    central_router.register(CallbackPrefixes.FILE_CONFIRM_DELETE, handle_file_confirm_delete, args=(int,))
     central_router.register(CallbackPrefixes.FILE_DONE, handle_file_done)
     central_router.register(CallbackPrefixes.FILE_CANCEL, handle_file_cancel)
-    central_router.register(CallbackPrefixes.SEARCH_RESULT_SECTION, handle_search_result_section)
-    central_router.register(CallbackPrefixes.SEARCH_RESULT_FILE, handle_search_result_file)
+    central_router.register(CallbackPrefixes.SEARCH_RESULT_SECTION, handle_search_result_section, args=(int,))
+    central_router.register(CallbackPrefixes.SEARCH_RESULT_FILE, handle_search_result_file, args=(int,))
+    central_router.register(CallbackPrefixes.SEARCH_PAGE, handle_search_page, args=(int, int))
     central_router.register(CallbackPrefixes.SEARCH_BACK, handle_search_back_callback)
     central_router.register(CallbackPrefixes.SEARCH, handle_search_callback)
     central_router.register(CallbackPrefixes.CONTRIBUTE, handle_contribute_callback)
@@ -204,40 +288,43 @@ async def main() -> None:
     central_router.register(CallbackPrefixes.ADMIN_PANEL, handle_admin_panel_callback)
     central_router.register(CallbackPrefixes.ADMIN_SECTIONS, handle_admin_sections_callback)
     central_router.register(CallbackPrefixes.ADMIN_FILES, handle_admin_files)
-    central_router.register(CallbackPrefixes.ADMIN_FILES_PAGE, handle_admin_files_page)
-    central_router.register(CallbackPrefixes.ADMIN_FILE_DETAIL, handle_admin_file_detail)
-    central_router.register(CallbackPrefixes.ADMIN_FILE_TOGGLE_STATUS, handle_admin_file_toggle_status)
-    central_router.register(CallbackPrefixes.ADMIN_FILE_LINK_PICK, handle_admin_file_link_pick)
-    central_router.register(CallbackPrefixes.ADMIN_FILE_LINK_SEC, handle_admin_file_link_sec)
-    central_router.register(CallbackPrefixes.ADMIN_FILE_UNLINK_PICK, handle_admin_file_unlink_pick)
-    central_router.register(CallbackPrefixes.ADMIN_FILE_UNLINK_SEC, handle_admin_file_unlink_sec)
+    central_router.register(CallbackPrefixes.ADMIN_FILES_PAGE, handle_admin_files_page, args=(int, int, int))
+    central_router.register(CallbackPrefixes.ADMIN_FILE_DETAIL, handle_admin_file_detail, args=(int,))
+    central_router.register(CallbackPrefixes.ADMIN_FILE_TOGGLE_STATUS, handle_admin_file_toggle_status, args=(int,))
+    central_router.register(CallbackPrefixes.ADMIN_FILE_LINK_PICK, handle_admin_file_link_pick, args=(int,))
+    central_router.register(CallbackPrefixes.ADMIN_FILE_LINK_SEC, handle_admin_file_link_sec, args=(int, int))
+    central_router.register(CallbackPrefixes.ADMIN_FILE_UNLINK_PICK, handle_admin_file_unlink_pick, args=(int,))
+    central_router.register(CallbackPrefixes.ADMIN_FILE_UNLINK_SEC, handle_admin_file_unlink_sec, args=(int, int))
     central_router.register(CallbackPrefixes.ADMIN_MODERATORS, handle_admin_moderators)
-    central_router.register(CallbackPrefixes.ADMIN_MOD_VIEW, handle_admin_mod_view)
+    central_router.register(CallbackPrefixes.ADMIN_MOD_VIEW, handle_admin_mod_view, args=(int,))
     central_router.register(CallbackPrefixes.ADMIN_MOD_ADD, handle_admin_mod_add)
-    central_router.register(CallbackPrefixes.ADMIN_MOD_REMOVE, handle_admin_mod_remove)
-    central_router.register(CallbackPrefixes.ADMIN_MOD_CONFIRM_REMOVE, handle_admin_mod_confirm_remove)
-    central_router.register(CallbackPrefixes.ADMIN_MOD_PERMS, handle_admin_mod_perms)
-    central_router.register(CallbackPrefixes.ADMIN_MOD_TOGGLE_PERM, handle_admin_mod_toggle_perm)
+    central_router.register(CallbackPrefixes.ADMIN_MOD_REMOVE, handle_admin_mod_remove, args=(int,))
+    central_router.register(CallbackPrefixes.ADMIN_MOD_CONFIRM_REMOVE, handle_admin_mod_confirm_remove, args=(int,))
+    central_router.register(CallbackPrefixes.ADMIN_MOD_PERMS, handle_admin_mod_perms, args=(int,))
+    central_router.register(CallbackPrefixes.ADMIN_MOD_TOGGLE_PERM, handle_admin_mod_toggle_perm, args=(int, str))
     central_router.register(CallbackPrefixes.ADMIN_TEXTS, handle_admin_texts)
-    central_router.register(CallbackPrefixes.ADMIN_TEXT_EDIT, handle_admin_text_edit)
+    central_router.register(CallbackPrefixes.ADMIN_TEXT_EDIT, handle_admin_text_edit, args=(int,))
     central_router.register(CallbackPrefixes.ADMIN_CONTRIBUTIONS, handle_admin_contributions)
-    central_router.register(CallbackPrefixes.ADMIN_CONTRIB_PAGE, handle_admin_contrib_page)
-    central_router.register(CallbackPrefixes.ADMIN_CONTRIB_VIEW, handle_admin_contrib_view)
-    central_router.register(CallbackPrefixes.ADMIN_CONTRIB_APPROVE, handle_admin_contrib_approve)
-    central_router.register(CallbackPrefixes.ADMIN_CONTRIB_REJECT, handle_admin_contrib_reject)
+    central_router.register(CallbackPrefixes.ADMIN_CONTRIB_PAGE, handle_admin_contrib_page, args=(int, int, int))
+    central_router.register(CallbackPrefixes.ADMIN_CONTRIB_VIEW, handle_admin_contrib_view, args=(int,))
+    central_router.register(CallbackPrefixes.ADMIN_CONTRIB_APPROVE, handle_admin_contrib_approve, args=(int,))
+    central_router.register(CallbackPrefixes.ADMIN_CONTRIB_REJECT, handle_admin_contrib_reject, args=(int,))
     central_router.register(CallbackPrefixes.ADMIN_AUDIT, handle_admin_audit)
-    central_router.register(CallbackPrefixes.ADMIN_AUDIT_PAGE, handle_admin_audit_page)
+    central_router.register(CallbackPrefixes.ADMIN_AUDIT_PAGE, handle_admin_audit_page, args=(int, int, int))
     central_router.register(CallbackPrefixes.SUB_VERIFY, handle_subscription_verify)
     central_router.register(CallbackPrefixes.ADMIN_SUBSCRIPTION, handle_admin_subscription)
     central_router.register(CallbackPrefixes.ADMIN_SUB_TOGGLE, handle_admin_sub_toggle)
     central_router.register(CallbackPrefixes.ADMIN_SUB_ADD, handle_admin_sub_add)
-    central_router.register(CallbackPrefixes.ADMIN_SUB_REMOVE, handle_admin_sub_remove)
+    central_router.register(CallbackPrefixes.ADMIN_SUB_REMOVE, handle_admin_sub_remove, args=(int,))
     central_router.register(CallbackPrefixes.ADMIN_STATS, handle_admin_stats)
     central_router.register(CallbackPrefixes.ADMIN_BROADCAST, handle_admin_broadcast)
     central_router.register(CallbackPrefixes.ADMIN_BROADCAST_TEXT, handle_admin_broadcast_text)
     central_router.register(CallbackPrefixes.ADMIN_BROADCAST_FILE, handle_admin_broadcast_file)
     central_router.register(CallbackPrefixes.ADMIN_BROADCAST_CONFIRM, handle_admin_broadcast_confirm)
     central_router.register(CallbackPrefixes.ADMIN_BROADCAST_CANCEL, handle_admin_broadcast_cancel)
+    central_router.register(CallbackPrefixes.ADMIN_BROADCAST_PAUSE, handle_admin_broadcast_pause, args=(int,))
+    central_router.register(CallbackPrefixes.ADMIN_BROADCAST_RESUME, handle_admin_broadcast_resume, args=(int,))
+    central_router.register(CallbackPrefixes.ADMIN_BROADCAST_STOP, handle_admin_broadcast_stop, args=(int,))
     central_router.register(CallbackPrefixes.ADMIN_BAN, handle_admin_ban)
     central_router.register(CallbackPrefixes.ADMIN_BAN_BLOCK, handle_admin_ban_block)
     central_router.register(CallbackPrefixes.ADMIN_BAN_UNBLOCK, handle_admin_ban_unblock)
@@ -248,11 +335,13 @@ async def main() -> None:
     central_router.register(CallbackPrefixes.ADMIN_BACKUP_RESTORE, handle_admin_backup_restore)
     central_router.register(CallbackPrefixes.ADMIN_BACK, handle_admin_back)
     central_router.register(CallbackPrefixes.BACK, handle_back_callback)
+    central_router.compile()
 
     dp.include_router(create_error_handler())
     dp.include_router(create_home_router())
     dp.include_router(create_files_router())
     dp.include_router(create_search_router())
+    dp.include_router(create_inline_router())
     dp.include_router(create_admin_router())
     dp.include_router(create_sections_router())
     dp.include_router(central_router.router)
@@ -261,10 +350,21 @@ async def main() -> None:
 
     logger.info(LogMessages.BOT_READY)
 
+    try:
+        await broadcast_engine.resume_interrupted(bot)
+    except Exception as e:
+        logger.error(LogMessages.BROADCAST_RESUME_FAIL.format(error=str(e)))
+
     try:
         await dp.start_polling(bot)
     finally:
         logger.info(LogMessages.BOT_STOPPED)
+        await broadcast_engine.stop()
+        await file_delivery.stop()
+        await user_activity.stop()
+        await section_counters.stop()
+        await state_service.stop_sweeper()
+        await settings_manager.stop()
         await db.close()
         await bot.session.close()
 
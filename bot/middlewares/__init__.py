@@ -1,3 +1,5 @@
+from bot.middlewares.unit_of_work import UnitOfWorkMiddleware, UnitOfWorkReleaseMiddleware
+from bot.middlewares.update_context import UpdateContextMiddleware
 from bot.middlewares.ban_check import BanCheckMiddleware
 from bot.middlewares.subscription_check import SubscriptionCheckMiddleware
 from bot.middlewares.role_check import RoleMiddleware
@@ -5,6 +7,9 @@ from bot.middlewares.i18n_middleware import I18nMiddleware
 from bot.middlewares.user_tracking import UserTrackingMiddleware
 
 __all__ = [
+    "UnitOfWorkMiddleware",
+    "UnitOfWorkReleaseMiddleware",
+    "UpdateContextMiddleware",
     "BanCheckMiddleware",
     "SubscriptionCheckMiddleware",
     "RoleMiddleware",
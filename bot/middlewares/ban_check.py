@@ -23,10 +23,14 @@ class BanCheckMiddleware(BaseMiddleware):
         if user is None:
             return await handler(event, data)
 
-        is_blocked = False
-        db = await get_db()
-        async for session in db.get_session():
-            is_blocked = await user_service.is_blocked(session, user.id)
+        context = data.get("update_context")
+        if context is not None:
+            is_blocked = context.is_blocked
+        else:
+            is_blocked = False
+            db = await get_db()
+            async for session in db.get_session():
+                is_blocked = await user_service.is_blocked(session, user.id)
 
         if is_blocked:
             logger.info(LogMessages.USER_BLOCKED.format(user_id=user.id))
@@ -38,6 +42,8 @@ class BanCheckMiddleware(BaseMiddleware):
                     await event.message.answer(text)
                 elif event.callback_query:
                     await event.callback_query.answer(text, show_alert=True)
+                elif event.inline_query:
+                    await event.inline_query.answer([], cache_time=0, is_personal=True)
             return None
 
         return await handler(event, data)
@@ -25,18 +25,24 @@ class MaintenanceCheckMiddleware(BaseMiddleware):
         if role == UserRole.ADMIN:
             return await handler(event, data)
 
-        db = await get_db()
         i18n = get_i18n()
         enabled = False
         message = i18n.get(I18nKeys.MAINTENANCE_DEFAULT_MESSAGE)
 
-        async for session in db.get_session():
-            enabled = await settings_manager.get_maintenance_enabled(session)
-            if enabled:
-                message = await settings_manager.get_maintenance_message(
-                    session,
-                    default=i18n.get(I18nKeys.MAINTENANCE_DEFAULT_MESSAGE),
-                )
+        context = data.get("update_context")
+        if context is not None:
+            enabled = context.maintenance_enabled
+            if context.maintenance_message:
+                message = context.maintenance_message
+        else:
+            db = await get_db()
+            async for session in db.get_session():
+                enabled = await settings_manager.get_maintenance_enabled(session)
+                if enabled:
+                    message = await settings_manager.get_maintenance_message(
+                        session,
+                        default=i18n.get(I18nKeys.MAINTENANCE_DEFAULT_MESSAGE),
+                    )
 
         if not enabled:
             return await handler(event, data)
@@ -46,4 +52,6 @@ class MaintenanceCheckMiddleware(BaseMiddleware):
                 await event.message.answer(message)
             elif event.callback_query:
                 await event.callback_query.answer(message, show_alert=True)
+            elif event.inline_query:
+                await event.inline_query.answer([], cache_time=0, is_personal=True)
         return None
@@ -23,10 +23,14 @@ class RoleMiddleware(BaseMiddleware):
         if user is None:
             return await handler(event, data)
 
-        role = None
-        db = await get_db()
-        async for session in db.get_session():
-            role = await user_service.get_role(session, user.id)
+        context = data.get("update_context")
+        if context is not None:
+            role = context.role
+        else:
+            role = None
+            db = await get_db()
+            async for session in db.get_session():
+                role = await user_service.get_role(session, user.id)
 
         user_role = role if role else UserRole.USER
         data["user_role"] = user_role
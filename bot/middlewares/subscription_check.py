@@ -2,12 +2,12 @@ import logging
 from typing import Callable, Dict, Any, Awaitable, List, Optional
 
 from aiogram import BaseMiddleware, Bot
-from aiogram.enums import ChatMemberStatus
 from aiogram.types import TelegramObject, Update, InlineKeyboardMarkup, InlineKeyboardButton
 
 from bot.core.constants import LogMessages, I18nKeys, CallbackPrefixes
 from bot.core.database import get_db
 from bot.services.i18n import get_i18n
+from bot.services.membership import membership_service
 from bot.services.settings_manager import settings_manager
 
 logger = logging.getLogger("bot")
@@ -30,27 +30,33 @@ class SubscriptionCheckMiddleware(BaseMiddleware):
 
         logger.debug(LogMessages.MIDDLEWARE_SUBSCRIPTION_CHECK.format(user_id=user.id))
 
-        db = await get_db()
         dynamic_enabled = self._enabled
         dynamic_channels: List[str] = [str(c) for c in self._channel_ids]
-        async for session in db.get_session():
-            dynamic_enabled = await settings_manager.get_subscription_enabled(session)
-            db_channels = await settings_manager.get_subscription_channels(session)
-            if db_channels:
-                dynamic_channels = db_channels
+        context = data.get("update_context")
+        if context is not None:
+            dynamic_enabled = context.subscription_enabled
+            if context.subscription_channels:
+                dynamic_channels = context.subscription_channels
+        else:
+            db = await get_db()
+            async for session in db.get_session():
+                dynamic_enabled = await settings_manager.get_subscription_enabled(session)
+                db_channels = await settings_manager.get_subscription_channels(session)
+                if db_channels:
+                    dynamic_channels = db_channels
 
         if not dynamic_enabled or not dynamic_channels:
             return await handler(event, data)
 
+        if (
+            isinstance(event, Update)
+            and event.callback_query
+            and event.callback_query.data == CallbackPrefixes.SUB_VERIFY
+        ):
+            membership_service.invalidate(user.id, dynamic_channels)
+
         bot: Bot = data["bot"]
-        missing: List[str] = []
-        for channel_id in dynamic_channels:
-            try:
-                member = await bot.get_chat_member(channel_id, user.id)
-                if member.status in (ChatMemberStatus.LEFT, ChatMemberStatus.KICKED):
-                    missing.append(channel_id)
-            except Exception:
-                missing.append(channel_id)
+        missing = await membership_service.get_missing_channels(bot, user.id, dynamic_channels)
 
         if not missing:
             return await handler(event, data)
@@ -74,4 +80,6 @@ class SubscriptionCheckMiddleware(BaseMiddleware):
                 if event.callback_query.message:
                     await event.callback_query.message.answer(text, reply_markup=keyboard)
                 await event.callback_query.answer(text, show_alert=True)
+            elif event.inline_query:
+                await event.inline_query.answer([], cache_time=0, is_personal=True)
         return None
@@ -0,0 +1,37 @@
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods.base import Response, TelegramMethod, TelegramType
+from aiogram.types import TelegramObject
+
+from bot.core.database import get_db
+
+
+class UnitOfWorkMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        db = await get_db()
+        async with db.unit_of_work(user.id if user is not None else None) as uow:
+            data["uow"] = uow
+            return await handler(event, data)
+
+
+class UnitOfWorkReleaseMiddleware(BaseRequestMiddleware):
+    """Bot API middleware: commits the calling update's transaction before
+    the request goes out, so the connection is not held across the call."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        db = await get_db()
+        await db.release_unit_of_work()
+        return await make_request(bot, method)
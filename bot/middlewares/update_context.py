@@ -0,0 +1,37 @@
+import logging
+from typing import Callable, Dict, Any, Awaitable, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from bot.core.constants import LogMessages
+from bot.core.database import get_db
+from bot.services.update_context import UpdateContext, get_cached_update_context, load_update_context
+
+logger = logging.getLogger("bot")
+
+
+class UpdateContextMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None:
+            return await handler(event, data)
+
+        context: Optional[UpdateContext] = get_cached_update_context(user.id)
+        if context is None:
+            db = await get_db()
+            async for session in db.get_session():
+                context = await load_update_context(session, user.id)
+
+        if context is not None:
+            data["update_context"] = context
+            logger.debug(LogMessages.MIDDLEWARE_CONTEXT_LOADED.format(
+                user_id=user.id, registered=context.registered, role=context.role.value,
+            ))
+
+        return await handler(event, data)
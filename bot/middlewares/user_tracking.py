@@ -1,21 +1,27 @@
+import asyncio
 import logging
-from typing import Callable, Dict, Any, Awaitable, Optional
+from typing import Callable, Dict, Any, Awaitable, Optional, Set
 
 from aiogram import BaseMiddleware, Bot
 from aiogram.types import TelegramObject
 
 from bot.core.constants import LogMessages
 from bot.services.user import user_service
+from bot.services.user_activity import user_activity
 from bot.core.database import get_db
 from bot.modules.login_logger import LoginLogger
+from bot.services.send_scheduler import bulk_priority
 
 logger = logging.getLogger("bot")
 
 
 class UserTrackingMiddleware(BaseMiddleware):
-    def __init__(self, log_channel_id: int = 0):
+    def __init__(self, log_channel_id: int = 0, max_pending: int = 100):
         self._log_channel_id = log_channel_id
         self._login_logger: Optional[LoginLogger] = None
+        self._max_pending = max_pending
+        self._pending: Set[asyncio.Task] = set()
+        self.dropped = 0
 
     async def __call__(
         self,
@@ -27,26 +33,44 @@ class UserTrackingMiddleware(BaseMiddleware):
         if user is None:
             return await handler(event, data)
 
-        db = await get_db()
+        context = data.get("update_context")
         is_new = False
-        async for session in db.get_session():
-            db_user, is_new = await user_service.get_or_create(
-                session,
-                user_id=user.id,
-                first_name=user.first_name,
-                last_name=user.last_name,
-                username=user.username,
-            )
+        if context is not None and context.registered:
+            user_activity.record(user.id, user.first_name, user.last_name, user.username)
+        else:
+            db = await get_db()
+            async for session in db.get_session():
+                row = await user_service.upsert_and_load(
+                    session,
+                    user_id=user.id,
+                    first_name=user.first_name,
+                    last_name=user.last_name,
+                    username=user.username,
+                )
+                is_new = bool(row.inserted)
 
         if is_new and self._log_channel_id != 0:
-            bot: Bot = data["bot"]
-            if self._login_logger is None:
-                self._login_logger = LoginLogger(bot, self._log_channel_id)
-            await self._login_logger.log_login(
+            self._notify_login(data["bot"], user)
+
+        return await handler(event, data)
+
+    def _notify_login(self, bot: Bot, user: Any) -> None:
+        # Notices run at bulk priority behind the send scheduler; during a
+        # join burst, shed them rather than queue one task per new user.
+        if len(self._pending) >= self._max_pending:
+            self.dropped += 1
+            logger.warning(LogMessages.USER_LOGIN_NOTICE_DROPPED.format(
+                user_id=user.id, pending=len(self._pending),
+            ))
+            return
+        if self._login_logger is None:
+            self._login_logger = LoginLogger(bot, self._log_channel_id)
+        with bulk_priority():
+            task = asyncio.create_task(self._login_logger.log_login(
                 user_id=user.id,
                 first_name=user.first_name,
                 last_name=user.last_name,
                 username=user.username,
-            )
-
-        return await handler(event, data)
+            ))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
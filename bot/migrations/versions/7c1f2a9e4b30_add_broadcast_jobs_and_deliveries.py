@@ -0,0 +1,65 @@
+"""add broadcast_jobs, broadcast_deliveries and users.bot_blocked
+
+Revision ID: 7c1f2a9e4b30
+Revises: 4d6e3c17e7b8
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '7c1f2a9e4b30'
+down_revision: Union[str, None] = '4d6e3c17e7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('bot_blocked', sa.Boolean(), nullable=False, server_default=sa.text('false')))
+
+    op.create_table(
+        'broadcast_jobs',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('admin_id', sa.BigInteger(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='running'),
+        sa.Column('cursor', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sent', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('failed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('chat_id', sa.BigInteger(), nullable=True),
+        sa.Column('message_id', sa.BigInteger(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_broadcast_jobs_admin_id', 'broadcast_jobs', ['admin_id'])
+    op.create_index('ix_broadcast_jobs_status', 'broadcast_jobs', ['status'])
+
+    op.create_table(
+        'broadcast_deliveries',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('job_id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('error', sa.String(255), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['job_id'], ['broadcast_jobs.id'], ondelete='CASCADE'),
+    )
+    op.create_unique_constraint('uq_broadcast_delivery', 'broadcast_deliveries', ['job_id', 'user_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_broadcast_delivery', 'broadcast_deliveries', type_='unique')
+    op.drop_table('broadcast_deliveries')
+
+    op.drop_index('ix_broadcast_jobs_status', table_name='broadcast_jobs')
+    op.drop_index('ix_broadcast_jobs_admin_id', table_name='broadcast_jobs')
+    op.drop_table('broadcast_jobs')
+
+    op.drop_column('users', 'bot_blocked')
@@ -0,0 +1,49 @@
+"""add pg_trgm search indexes on normalised file and section names
+
+Revision ID: 9e4b7d2c1a58
+Revises: 7c1f2a9e4b30
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '9e4b7d2c1a58'
+down_revision: Union[str, None] = '7c1f2a9e4b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION normalize_ar(value text) RETURNS text
+        LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+            SELECT btrim(regexp_replace(
+                translate(
+                    regexp_replace(lower(value), '[\\u064b-\\u0652\\u0670\\u0640]', '', 'g'),
+                    'أإآٱىةؤئ',
+                    'اااايهوي'
+                ),
+                '\\s+', ' ', 'g'
+            ))
+        $$
+        """
+    )
+    op.execute(
+        "CREATE INDEX ix_files_name_trgm ON files USING gin (normalize_ar(name) gin_trgm_ops) "
+        "WHERE is_active AND status = 'published'"
+    )
+    op.execute(
+        "CREATE INDEX ix_sections_name_trgm ON sections USING gin (normalize_ar(name) gin_trgm_ops) "
+        "WHERE is_active"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_sections_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_files_name_trgm")
+    op.execute("DROP FUNCTION IF EXISTS normalize_ar(text)")
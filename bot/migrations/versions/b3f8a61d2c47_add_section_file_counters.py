@@ -0,0 +1,59 @@
+"""add sections.file_count and sections.subtree_file_count
+
+Revision ID: b3f8a61d2c47
+Revises: 9e4b7d2c1a58
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b3f8a61d2c47'
+down_revision: Union[str, None] = '9e4b7d2c1a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sections', sa.Column('file_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('sections', sa.Column('subtree_file_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute(
+        """
+        WITH RECURSIVE own AS (
+            SELECT fs.section_id AS id, count(*) AS n
+            FROM file_sections fs
+            JOIN files f ON f.id = fs.file_id
+            WHERE f.is_active AND f.status = 'published'
+            GROUP BY fs.section_id
+        ),
+        closure(ancestor, descendant, path) AS (
+            SELECT id, id, ARRAY[id] FROM sections
+            UNION ALL
+            SELECT c.ancestor, s.id, c.path || s.id
+            FROM closure c
+            JOIN sections s ON s.parent_id = c.descendant
+            WHERE NOT s.id = ANY(c.path)
+        ),
+        expected AS (
+            SELECT c.ancestor AS id,
+                   COALESCE(sum(o.n) FILTER (WHERE c.descendant = c.ancestor), 0) AS file_count,
+                   COALESCE(sum(o.n), 0) AS subtree_file_count
+            FROM closure c
+            LEFT JOIN own o ON o.id = c.descendant
+            GROUP BY c.ancestor
+        )
+        UPDATE sections s
+        SET file_count = e.file_count,
+            subtree_file_count = e.subtree_file_count
+        FROM expected e
+        WHERE s.id = e.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('sections', 'subtree_file_count')
+    op.drop_column('sections', 'file_count')
@@ -0,0 +1,42 @@
+"""add composite and partial indexes for file and section listings
+
+Revision ID: c5d2e8f17a93
+Revises: b3f8a61d2c47
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c5d2e8f17a93'
+down_revision: Union[str, None] = 'b3f8a61d2c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_file_sections_section_file', 'file_sections', ['section_id', 'file_id'])
+    op.drop_index('ix_file_sections_section_id', table_name='file_sections')
+    op.create_index(
+        'ix_files_published_id', 'files', ['id'],
+        postgresql_where=sa.text("is_active AND status = 'published'"),
+    )
+    op.create_index(
+        'ix_files_pending_id', 'files', ['id'],
+        postgresql_where=sa.text("is_active AND status = 'pending'"),
+    )
+    op.create_index(
+        'ix_sections_active_parent_order', 'sections', ['parent_id', 'order', 'id'],
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sections_active_parent_order', table_name='sections')
+    op.drop_index('ix_files_pending_id', table_name='files')
+    op.drop_index('ix_files_published_id', table_name='files')
+    op.create_index('ix_file_sections_section_id', 'file_sections', ['section_id'])
+    op.drop_index('ix_file_sections_section_file', table_name='file_sections')
@@ -6,8 +6,10 @@ from bot.models.section import Section
 from bot.models.file import File, FileStatus
 from bot.models.file_section import FileSection
 from bot.models.moderator_permission import ModeratorPermission
+from bot.models.broadcast import BroadcastJob, BroadcastDelivery, BroadcastStatus, DeliveryStatus
 
 __all__ = [
     "User", "UserRole", "TextEntry", "Setting", "AuditLog",
     "Section", "File", "FileStatus", "FileSection", "ModeratorPermission",
+    "BroadcastJob", "BroadcastDelivery", "BroadcastStatus", "DeliveryStatus",
 ]
@@ -2,7 +2,7 @@ import enum
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import BigInteger, Integer, String, Text, Boolean, DateTime, Enum as SAEnum, ForeignKey
+from sqlalchemy import BigInteger, Integer, String, Text, Boolean, DateTime, Enum as SAEnum, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -34,3 +34,8 @@ class File(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+
+    __table_args__ = (
+        Index("ix_files_published_id", "id", postgresql_where=text("is_active AND status = 'published'")),
+        Index("ix_files_pending_id", "id", postgresql_where=text("is_active AND status = 'pending'")),
+    )
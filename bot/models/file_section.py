@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import BigInteger, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -19,7 +19,6 @@ class FileSection(Base):
     section_id: Mapped[int] = mapped_column(
         BigInteger,
         ForeignKey("sections.id", ondelete="CASCADE"),
-        index=True,
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -27,4 +26,5 @@ class FileSection(Base):
 
     __table_args__ = (
         UniqueConstraint("file_id", "section_id", name="uq_file_section"),
+        Index("ix_file_sections_section_file", "section_id", "file_id"),
     )
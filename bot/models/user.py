@@ -23,6 +23,7 @@ class User(Base):
     username: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     role: Mapped[UserRole] = mapped_column(SAEnum(UserRole, name="user_role", create_constraint=False, values_callable=lambda x: [e.value for e in x]), default=UserRole.USER)
     is_blocked: Mapped[bool] = mapped_column(Boolean, default=False)
+    bot_blocked: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false")
     language: Mapped[str] = mapped_column(String(10), default="ar")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     last_active_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
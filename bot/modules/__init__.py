@@ -1,10 +1,12 @@
-from bot.modules.central_router import CentralRouter, central_router
+from bot.modules.callback_codec import encode_callback, decode_args
+from bot.modules.central_router import CentralRouter, central_router, get_callback_args
 from bot.modules.error_handler import create_error_handler
 from bot.modules.health_check import check_health
 from bot.modules.login_logger import LoginLogger
 
 __all__ = [
-    "CentralRouter", "central_router",
+    "encode_callback", "decode_args",
+    "CentralRouter", "central_router", "get_callback_args",
     "create_error_handler",
     "check_health",
     "LoginLogger",
@@ -0,0 +1,28 @@
+from typing import Any, Callable, Sequence, Tuple
+
+from bot.core.constants import ErrorMessages
+
+CALLBACK_DATA_MAX_BYTES = 64
+CALLBACK_ARG_SEPARATOR = ":"
+
+ArgType = Callable[[str], Any]
+
+
+def encode_callback(prefix: str, *args: Any) -> str:
+    data = prefix + CALLBACK_ARG_SEPARATOR.join(str(arg) for arg in args)
+    if len(data.encode("utf-8")) > CALLBACK_DATA_MAX_BYTES:
+        raise ValueError(ErrorMessages.CALLBACK_DATA_TOO_LONG.format(
+            data=data, limit=CALLBACK_DATA_MAX_BYTES,
+        ))
+    return data
+
+
+def decode_args(raw: str, arg_types: Sequence[ArgType]) -> Tuple[Any, ...]:
+    if not arg_types:
+        return ()
+    parts = raw.split(CALLBACK_ARG_SEPARATOR, len(arg_types) - 1)
+    if len(parts) != len(arg_types):
+        raise ValueError(ErrorMessages.CALLBACK_ARGS_MISMATCH.format(
+            expected=len(arg_types), data=raw,
+        ))
+    return tuple(arg_type(part) for arg_type, part in zip(arg_types, parts))
@@ -1,10 +1,11 @@
 import logging
-from typing import Dict, Callable, Awaitable, Any
+from typing import Dict, Callable, Awaitable, Any, List, Optional, Sequence, Tuple
 
 from aiogram import Router
 from aiogram.types import CallbackQuery
 
-from bot.core.constants import LogMessages
+from bot.core.constants import ErrorMessages, LogMessages
+from bot.modules.callback_codec import ArgType, decode_args
 
 logger = logging.getLogger("bot")
 
@@ -16,14 +17,64 @@ class CentralRouter:
     def __init__(self):
         self._router = Router(name="central")
         self._routes: Dict[str, RouteHandler] = {}
+        self._arg_types: Dict[str, Tuple[ArgType, ...]] = {}
+        self._lengths: Optional[List[int]] = None
         self._router.callback_query.register(self._handle_callback)
 
     @property
     def router(self) -> Router:
         return self._router
 
-    def register(self, prefix: str, handler: RouteHandler) -> None:
+    def register(self, prefix: str, handler: RouteHandler, args: Sequence[ArgType] = ()) -> None:
+        if not prefix:
+            raise ValueError(ErrorMessages.ROUTE_PREFIX_EMPTY)
+        if prefix in self._routes:
+            raise ValueError(ErrorMessages.ROUTE_PREFIX_CONFLICT.format(
+                prefix=prefix, handler=self._routes[prefix].__name__,
+            ))
         self._routes[prefix] = handler
+        self._arg_types[prefix] = tuple(args)
+        self._lengths = None
+
+    def compile(self) -> None:
+        self._lengths = sorted({len(prefix) for prefix in self._routes}, reverse=True)
+        logger.info(LogMessages.CENTRAL_ROUTER_COMPILED.format(
+            routes=len(self._routes), lengths=len(self._lengths),
+        ))
+
+    def resolve(self, data: str) -> Optional[Tuple[str, RouteHandler]]:
+        if self._lengths is None:
+            self.compile()
+
+        routes = self._routes
+        handler = routes.get(data)
+        if handler is not None:
+            return data, handler
+
+        size = len(data)
+        for length in self._lengths:  # type: ignore[union-attr]
+            if length >= size:
+                continue
+            prefix = data[:length]
+            handler = routes.get(prefix)
+            if handler is not None:
+                return prefix, handler
+        return None
+
+    def decode(self, data: str) -> Tuple[Any, ...]:
+        match = self.resolve(data)
+        if match is None:
+            raise ValueError(ErrorMessages.ROUTE_NOT_FOUND.format(data=data))
+        prefix = match[0]
+        return decode_args(data[len(prefix):], self._arg_types[prefix])
+
+    async def redispatch(
+        self, callback: CallbackQuery, prefix: str, kwargs: Dict[str, Any], *args: Any
+    ) -> Any:
+        handler = self._routes.get(prefix)
+        if handler is None:
+            raise ValueError(ErrorMessages.ROUTE_NOT_FOUND.format(data=prefix))
+        return await handler(callback, {**kwargs, "callback_args": args})
 
     async def _handle_callback(self, callback: CallbackQuery, **kwargs: Any) -> None:
         if callback.data is None:
@@ -33,15 +84,30 @@ class CentralRouter:
             await callback.answer()
             return
 
-        logger.info(LogMessages.CENTRAL_ROUTER_CALLBACK.format(callback_data=callback.data))
+        match = self.resolve(callback.data)
+        if match is None:
+            logger.info(LogMessages.CENTRAL_ROUTER_NO_HANDLER.format(callback_data=callback.data))
+            return
+
+        prefix, handler = match
+        try:
+            kwargs["callback_args"] = decode_args(callback.data[len(prefix):], self._arg_types[prefix])
+        except ValueError:
+            logger.warning(LogMessages.CENTRAL_ROUTER_BAD_PAYLOAD.format(callback_data=callback.data))
+            await callback.answer()
+            return
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(LogMessages.CENTRAL_ROUTER_CALLBACK.format(callback_data=callback.data))
+            logger.debug(LogMessages.CENTRAL_ROUTER_MATCHED.format(prefix=prefix, handler=handler.__name__))
+        await handler(callback, kwargs)
 
-        for prefix, handler in self._routes.items():
-            if callback.data.startswith(prefix):
-                logger.info(f"Matched prefix '{prefix}' -> {handler.__name__}")
-                await handler(callback, kwargs)
-                return
 
-        logger.info(LogMessages.CENTRAL_ROUTER_NO_HANDLER.format(callback_data=callback.data))
+def get_callback_args(callback: CallbackQuery, kwargs: Dict[str, Any]) -> Tuple[Any, ...]:
+    args = kwargs.get("callback_args")
+    if args is None:
+        args = central_router.decode(callback.data or "")
+    return args
 
 
 central_router = CentralRouter()
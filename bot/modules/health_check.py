@@ -4,6 +4,16 @@ from typing import Dict, Any
 from bot.core.constants import LogMessages
 from bot.core.database import get_db
 from bot.services.i18n import get_i18n
+from bot.services.state import get_state_service
+from bot.services.membership import membership_service
+from bot.services.search import search_service
+from bot.services.search_index import search_index
+from bot.services.pagination import list_counts
+from bot.services.section_counters import section_counters
+from bot.services.section_tree import section_tree
+from bot.services.send_scheduler import send_scheduler
+from bot.services.user import user_service
+from bot.services.user_activity import user_activity
 
 logger = logging.getLogger("bot")
 
@@ -12,6 +22,7 @@ async def check_health() -> Dict[str, Any]:
     status: Dict[str, Any] = {
         "healthy": True,
         "checks": {},
+        "metrics": {},
     }
 
     try:
@@ -20,6 +31,9 @@ async def check_health() -> Dict[str, Any]:
             from sqlalchemy import text
             await session.execute(text("SELECT 1"))
         status["checks"]["database"] = True
+        status["metrics"]["db_pool"] = db.pool_stats()
+        status["metrics"]["unit_of_work"] = db.unit_of_work_stats()
+        status["metrics"]["db_replica"] = db.replica_stats()
     except Exception as e:
         status["healthy"] = False
         status["checks"]["database"] = False
@@ -34,6 +48,20 @@ async def check_health() -> Dict[str, Any]:
         status["healthy"] = False
         status["checks"]["i18n"] = False
 
+    status["metrics"]["user_cache"] = user_service.cache.stats()
+    status["metrics"]["membership_cache"] = membership_service.stats()
+    status["metrics"]["user_activity"] = user_activity.stats()
+    status["metrics"]["outbound"] = send_scheduler.stats()
+    status["metrics"]["search_index"] = search_index.stats()
+    status["metrics"]["search_cache"] = search_service.stats()
+    status["metrics"]["section_tree"] = section_tree.stats()
+    status["metrics"]["section_counters"] = section_counters.stats()
+    status["metrics"]["list_counts"] = list_counts.stats()
+    try:
+        status["metrics"]["state"] = await get_state_service().memory_report()
+    except RuntimeError:
+        status["metrics"]["state"] = None
+
     if status["healthy"]:
         logger.info(LogMessages.HEALTH_CHECK_OK)
     
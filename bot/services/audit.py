@@ -1,11 +1,12 @@
 import logging
-from typing import List, Optional, Tuple
+from typing import Optional
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.models.audit_log import AuditLog
 from bot.core.constants import LogMessages
+from bot.services.pagination import KeysetPage, SEEK_OLDER, list_counts, seek_page
 
 logger = logging.getLogger("bot")
 
@@ -31,23 +32,19 @@ class AuditService:
     async def list_logs(
         self,
         session: AsyncSession,
+        cursor: int = 0,
+        direction: int = SEEK_OLDER,
         page: int = 1,
         per_page: int = 10,
-    ) -> Tuple[List[AuditLog], int]:
-        count_stmt = select(func.count()).select_from(AuditLog)
-        total_result = await session.execute(count_stmt)
-        total = total_result.scalar() or 0
-
-        offset = (page - 1) * per_page
-        stmt = (
-            select(AuditLog)
-            .order_by(AuditLog.created_at.desc())
-            .offset(offset)
-            .limit(per_page)
+    ) -> KeysetPage:
+        async def count() -> int:
+            result = await session.execute(select(func.count()).select_from(AuditLog))
+            return result.scalar() or 0
+
+        total = await list_counts.get("audit_logs", count)
+        return await seek_page(
+            session, select(AuditLog), AuditLog.id, total, cursor, direction, page, per_page
         )
-        result = await session.execute(stmt)
-        logs = list(result.scalars().all())
-        return logs, total
 
 
 audit_service = AuditService()
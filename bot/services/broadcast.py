@@ -0,0 +1,342 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from bot.core.constants import AuditActions, CallbackPrefixes, I18nKeys, LogMessages
+from bot.core.database import get_db
+from bot.models.broadcast import BroadcastJob, BroadcastStatus, DeliveryStatus
+from bot.modules.callback_codec import encode_callback
+from bot.services.audit import audit_service
+from bot.services.broadcast_jobs import FINISHED_STATUSES, RESUMABLE_STATUSES, broadcast_job_service
+from bot.services.i18n import get_i18n
+from bot.services.send_scheduler import bulk_priority
+from bot.services.user import user_service
+
+logger = logging.getLogger("bot")
+
+
+@dataclass
+class BroadcastProgress:
+    job_id: int
+    admin_id: int
+    total: int = 0
+    sent: int = 0
+    failed: int = 0
+    cursor: int = 0
+    status: str = BroadcastStatus.RUNNING.value
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.failed
+
+    @property
+    def done(self) -> bool:
+        return self.status != BroadcastStatus.RUNNING.value
+
+
+class BroadcastEngine:
+    def __init__(self, concurrency: int = 10, chunk_size: int = 500, progress_interval: float = 5.0):
+        self._concurrency = concurrency
+        self._chunk_size = chunk_size
+        self._progress_interval = progress_interval
+        self._task: Optional[asyncio.Task] = None
+        self._progress: Optional[BroadcastProgress] = None
+        self._requested_status: Optional[str] = None
+
+    def configure(self, concurrency: int, chunk_size: int, progress_interval: float) -> None:
+        self._concurrency = concurrency
+        self._chunk_size = chunk_size
+        self._progress_interval = progress_interval
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def progress(self) -> Optional[BroadcastProgress]:
+        return self._progress
+
+    def _launch(self, bot: Bot, job: BroadcastJob) -> None:
+        self._requested_status = None
+        self._progress = BroadcastProgress(
+            job_id=job.id,
+            admin_id=job.admin_id,
+            total=job.total,
+            sent=job.sent,
+            failed=job.failed,
+            cursor=job.cursor,
+        )
+        with bulk_priority():
+            self._task = asyncio.create_task(self._run(
+                bot, json.loads(job.payload), self._progress, job.chat_id, job.message_id,
+            ))
+
+    async def start(
+        self,
+        bot: Bot,
+        admin_id: int,
+        payload: Dict[str, Any],
+        chat_id: Optional[int] = None,
+        message_id: Optional[int] = None,
+    ) -> Optional[int]:
+        if self.is_running:
+            return None
+        db = await get_db()
+        job: Optional[BroadcastJob] = None
+        async for session in db.get_session(standalone=True):
+            total = await user_service.count_recipients(session)
+            job = await broadcast_job_service.create(session, admin_id, payload, total, chat_id, message_id)
+        if job is None:
+            return None
+        self._launch(bot, job)
+        return job.id
+
+    async def resume(self, bot: Bot, job_id: int) -> bool:
+        if self.is_running:
+            return False
+        db = await get_db()
+        job: Optional[BroadcastJob] = None
+        async for session in db.get_session(standalone=True):
+            job = await broadcast_job_service.get(session, job_id)
+            if job is not None and job.status not in FINISHED_STATUSES:
+                await broadcast_job_service.set_status(session, job_id, BroadcastStatus.RUNNING.value)
+        if job is None or job.status in FINISHED_STATUSES:
+            return False
+        logger.info(LogMessages.BROADCAST_RESUMED.format(job_id=job.id, cursor=job.cursor))
+        self._launch(bot, job)
+        return True
+
+    async def resume_interrupted(self, bot: Bot) -> Optional[int]:
+        db = await get_db()
+        jobs: List[BroadcastJob] = []
+        async for session in db.get_session():
+            jobs = await broadcast_job_service.list_by_status(session, BroadcastStatus.RUNNING.value)
+        if not jobs or self.is_running:
+            return None
+        job = jobs[0]
+        logger.info(LogMessages.BROADCAST_RESUMED.format(job_id=job.id, cursor=job.cursor))
+        self._launch(bot, job)
+        return job.id
+
+    def pause(self, job_id: int) -> bool:
+        if not self.is_running or self._progress is None or self._progress.job_id != job_id:
+            return False
+        self._requested_status = BroadcastStatus.PAUSED.value
+        return True
+
+    async def cancel(self, job_id: int) -> bool:
+        if self.is_running and self._progress is not None and self._progress.job_id == job_id:
+            self._requested_status = BroadcastStatus.CANCELLED.value
+            return True
+        db = await get_db()
+        cancelled = False
+        async for session in db.get_session():
+            job = await broadcast_job_service.get(session, job_id)
+            if job is not None and job.status in RESUMABLE_STATUSES:
+                await broadcast_job_service.set_status(session, job_id, BroadcastStatus.CANCELLED.value)
+                cancelled = True
+        return cancelled
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _iter_recipients(self, after_id: int) -> AsyncIterator[List[int]]:
+        db = await get_db()
+        while True:
+            chunk: List[int] = []
+            async for session in db.get_session():
+                chunk = await user_service.list_recipient_ids_after(session, after_id, self._chunk_size)
+            if not chunk:
+                return
+            yield chunk
+            after_id = chunk[-1]
+
+    async def _send(self, bot: Bot, user_id: int, payload: Dict[str, Any]) -> None:
+        if payload.get("type") == "text":
+            await bot.send_message(user_id, payload.get("text", ""))
+        else:
+            await bot.send_document(user_id, document=payload.get("file_id", ""), caption=payload.get("caption"))
+
+    async def _deliver(
+        self,
+        bot: Bot,
+        user_id: int,
+        payload: Dict[str, Any],
+        progress: BroadcastProgress,
+    ) -> Dict[str, Any]:
+        try:
+            await self._send(bot, user_id, payload)
+            progress.sent += 1
+            return {"job_id": progress.job_id, "user_id": user_id, "status": DeliveryStatus.SENT.value, "error": None}
+        except TelegramForbiddenError as e:
+            status = DeliveryStatus.BLOCKED.value
+            error = str(e)
+        except Exception as e:
+            logger.debug(LogMessages.BROADCAST_SEND_FAIL.format(user_id=user_id, error=str(e)))
+            status = DeliveryStatus.FAILED.value
+            error = str(e)
+        progress.failed += 1
+        return {"job_id": progress.job_id, "user_id": user_id, "status": status, "error": error[:255]}
+
+    def _markup(self, progress: BroadcastProgress) -> Optional[InlineKeyboardMarkup]:
+        i18n = get_i18n()
+        stop = InlineKeyboardButton(
+            text=i18n.get(I18nKeys.ADMIN_BROADCAST_BTN_STOP),
+            callback_data=encode_callback(CallbackPrefixes.ADMIN_BROADCAST_STOP, progress.job_id),
+        )
+        if progress.status == BroadcastStatus.RUNNING.value:
+            toggle = InlineKeyboardButton(
+                text=i18n.get(I18nKeys.ADMIN_BROADCAST_BTN_PAUSE),
+                callback_data=encode_callback(CallbackPrefixes.ADMIN_BROADCAST_PAUSE, progress.job_id),
+            )
+        elif progress.status in RESUMABLE_STATUSES:
+            toggle = InlineKeyboardButton(
+                text=i18n.get(I18nKeys.ADMIN_BROADCAST_BTN_RESUME),
+                callback_data=encode_callback(CallbackPrefixes.ADMIN_BROADCAST_RESUME, progress.job_id),
+            )
+        else:
+            return None
+        return InlineKeyboardMarkup(inline_keyboard=[[toggle, stop]])
+
+    async def _report(
+        self, bot: Bot, progress: BroadcastProgress, chat_id: Optional[int], message_id: Optional[int]
+    ) -> None:
+        if chat_id is None or message_id is None:
+            return
+        i18n = get_i18n()
+        counters = {
+            "processed": progress.processed,
+            "total": progress.total,
+            "success": progress.sent,
+            "failed": progress.failed,
+        }
+        keys = {
+            BroadcastStatus.RUNNING.value: I18nKeys.ADMIN_BROADCAST_PROGRESS,
+            BroadcastStatus.PAUSED.value: I18nKeys.ADMIN_BROADCAST_PAUSED,
+            BroadcastStatus.FAILED.value: I18nKeys.ADMIN_BROADCAST_FAILED,
+            BroadcastStatus.CANCELLED.value: I18nKeys.ADMIN_BROADCAST_STOPPED,
+            BroadcastStatus.COMPLETED.value: I18nKeys.ADMIN_BROADCAST_DONE,
+        }
+        text = i18n.get(keys[progress.status], **counters)
+        try:
+            await bot.edit_message_text(
+                text, chat_id=chat_id, message_id=message_id, reply_markup=self._markup(progress),
+            )
+        except Exception as e:
+            logger.debug(LogMessages.BROADCAST_PROGRESS_FAIL.format(error=str(e)))
+
+    async def _report_periodically(
+        self, bot: Bot, progress: BroadcastProgress, chat_id: Optional[int], message_id: Optional[int]
+    ) -> None:
+        last = -1
+        while True:
+            await asyncio.sleep(self._progress_interval)
+            if progress.processed != last:
+                last = progress.processed
+                await self._report(bot, progress, chat_id, message_id)
+
+    async def _checkpoint(
+        self, progress: BroadcastProgress, ledger: List[Dict[str, Any]], status: Optional[str] = None
+    ) -> None:
+        deliveries = ledger[:]
+        db = await get_db()
+        async for session in db.get_session():
+            await broadcast_job_service.checkpoint(
+                session, progress.job_id, progress.cursor, progress.sent, progress.failed, deliveries, status,
+            )
+        del ledger[:len(deliveries)]
+
+    async def _run(
+        self,
+        bot: Bot,
+        payload: Dict[str, Any],
+        progress: BroadcastProgress,
+        chat_id: Optional[int],
+        message_id: Optional[int],
+    ) -> None:
+        db = await get_db()
+        skip: Set[int] = set()
+        async for session in db.get_session():
+            skip = await broadcast_job_service.delivered_user_ids(session, progress.job_id, progress.cursor)
+        logger.info(LogMessages.BROADCAST_STARTED.format(
+            job_id=progress.job_id, admin_id=progress.admin_id, total=progress.total,
+        ))
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+        ledger: List[Dict[str, Any]] = []
+        pending: Set[asyncio.Task] = set()
+        reporter = asyncio.create_task(self._report_periodically(bot, progress, chat_id, message_id))
+        status = BroadcastStatus.COMPLETED.value
+
+        async def deliver(user_id: int) -> None:
+            try:
+                ledger.append(await self._deliver(bot, user_id, payload, progress))
+            finally:
+                semaphore.release()
+
+        try:
+            async for chunk in self._iter_recipients(progress.cursor):
+                for user_id in chunk:
+                    if self._requested_status is not None:
+                        break
+                    if user_id in skip:
+                        continue
+                    await semaphore.acquire()
+                    task = asyncio.create_task(deliver(user_id))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                if pending:
+                    await asyncio.gather(*pending)
+                if self._requested_status is not None:
+                    status = self._requested_status
+                    break
+                progress.cursor = chunk[-1]
+                await self._checkpoint(progress, ledger)
+        except asyncio.CancelledError:
+            for task in pending:
+                task.cancel()
+            reporter.cancel()
+            await self._checkpoint(progress, ledger)
+            raise
+        except Exception as e:
+            logger.error(LogMessages.BROADCAST_FAILED.format(job_id=progress.job_id, error=str(e)))
+            status = BroadcastStatus.FAILED.value
+        finally:
+            reporter.cancel()
+            for task in pending:
+                task.cancel()
+
+        progress.status = status
+        try:
+            await self._checkpoint(progress, ledger, status)
+        except Exception as e:
+            logger.error(LogMessages.BROADCAST_FAILED.format(job_id=progress.job_id, error=str(e)))
+
+        if status == BroadcastStatus.COMPLETED.value:
+            elapsed = time.monotonic() - progress.started_at
+            logger.info(LogMessages.BROADCAST_FINISHED.format(
+                job_id=progress.job_id, success=progress.sent, failed=progress.failed, seconds=round(elapsed, 1),
+            ))
+            async for session in db.get_session():
+                await audit_service.log_action(
+                    session, progress.admin_id, AuditActions.BROADCAST_SENT,
+                    f"job={progress.job_id} type={payload.get('type')} "
+                    f"success={progress.sent} failed={progress.failed}",
+                )
+        await self._report(bot, progress, chat_id, message_id)
+
+
+broadcast_engine = BroadcastEngine()
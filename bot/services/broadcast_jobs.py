@@ -0,0 +1,108 @@
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.models.broadcast import BroadcastJob, BroadcastDelivery, BroadcastStatus, DeliveryStatus
+from bot.services.user import user_service
+
+RESUMABLE_STATUSES = (BroadcastStatus.PAUSED.value, BroadcastStatus.FAILED.value)
+FINISHED_STATUSES = (
+    BroadcastStatus.COMPLETED.value,
+    BroadcastStatus.CANCELLED.value,
+)
+
+
+class BroadcastJobService:
+    async def create(
+        self,
+        session: AsyncSession,
+        admin_id: int,
+        payload: Dict[str, Any],
+        total: int,
+        chat_id: Optional[int] = None,
+        message_id: Optional[int] = None,
+    ) -> BroadcastJob:
+        job = BroadcastJob(
+            admin_id=admin_id,
+            payload=json.dumps(payload, ensure_ascii=False),
+            status=BroadcastStatus.RUNNING.value,
+            cursor=0,
+            total=total,
+            sent=0,
+            failed=0,
+            chat_id=chat_id,
+            message_id=message_id,
+        )
+        session.add(job)
+        await session.flush()
+        return job
+
+    async def get(self, session: AsyncSession, job_id: int) -> Optional[BroadcastJob]:
+        result = await session.execute(select(BroadcastJob).where(BroadcastJob.id == job_id))
+        return result.scalar_one_or_none()
+
+    async def list_by_status(self, session: AsyncSession, status: str) -> List[BroadcastJob]:
+        stmt = select(BroadcastJob).where(BroadcastJob.status == status).order_by(BroadcastJob.id.asc())
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_latest_resumable(self, session: AsyncSession) -> Optional[BroadcastJob]:
+        stmt = (
+            select(BroadcastJob)
+            .where(BroadcastJob.status.in_(RESUMABLE_STATUSES))
+            .order_by(BroadcastJob.id.desc())
+            .limit(1)
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def set_status(self, session: AsyncSession, job_id: int, status: str) -> None:
+        values: Dict[str, Any] = {"status": status}
+        if status in FINISHED_STATUSES:
+            values["finished_at"] = datetime.now(timezone.utc)
+        await session.execute(update(BroadcastJob).where(BroadcastJob.id == job_id).values(**values))
+
+    async def delivered_user_ids(self, session: AsyncSession, job_id: int, after_id: int) -> Set[int]:
+        stmt = select(BroadcastDelivery.user_id).where(
+            BroadcastDelivery.job_id == job_id,
+            BroadcastDelivery.user_id > after_id,
+        )
+        result = await session.execute(stmt)
+        return {int(v) for v in result.scalars().all()}
+
+    async def checkpoint(
+        self,
+        session: AsyncSession,
+        job_id: int,
+        cursor: int,
+        sent: int,
+        failed: int,
+        deliveries: List[Dict[str, Any]],
+        status: Optional[str] = None,
+    ) -> None:
+        if deliveries:
+            stmt = pg_insert(BroadcastDelivery).values(deliveries)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_broadcast_delivery",
+                set_={"status": stmt.excluded.status, "error": stmt.excluded.error},
+            )
+            await session.execute(stmt)
+            await user_service.mark_bot_blocked(
+                session,
+                [d["user_id"] for d in deliveries if d["status"] == DeliveryStatus.BLOCKED.value],
+            )
+
+        await session.execute(
+            update(BroadcastJob)
+            .where(BroadcastJob.id == job_id)
+            .values(cursor=cursor, sent=sent, failed=failed)
+        )
+        if status is not None:
+            await self.set_status(session, job_id, status)
+
+
+broadcast_job_service = BroadcastJobService()
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import (
+    InputMediaAudio,
+    InputMediaDocument,
+    InputMediaPhoto,
+    InputMediaVideo,
+)
+
+from bot.core.constants import I18nKeys, LogMessages
+from bot.core.database import get_db
+from bot.models.file import File
+from bot.services.files import file_service, send_file
+from bot.services.i18n import get_i18n
+from bot.services.send_scheduler import bulk_priority
+
+logger = logging.getLogger("bot")
+
+MEDIA_GROUP_MAX = 10
+FILE_PAGE_SIZE = 50
+
+MEDIA_GROUP_KINDS = {
+    "photo": "visual",
+    "video": "visual",
+    "document": "document",
+    "audio": "audio",
+}
+
+INPUT_MEDIA = {
+    "photo": InputMediaPhoto,
+    "video": InputMediaVideo,
+    "document": InputMediaDocument,
+    "audio": InputMediaAudio,
+}
+
+
+def plan_batches(files: Sequence[File]) -> List[List[File]]:
+    batches: List[List[File]] = []
+    current: List[File] = []
+    current_kind: Optional[str] = None
+    for f in files:
+        kind = MEDIA_GROUP_KINDS.get(f.file_type)
+        if current and (kind != current_kind or len(current) >= MEDIA_GROUP_MAX):
+            batches.append(current)
+            current = []
+        if kind is None:
+            batches.append([f])
+            current_kind = None
+            continue
+        current.append(f)
+        current_kind = kind
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _is_open_group(batch: List[File]) -> bool:
+    return MEDIA_GROUP_KINDS.get(batch[0].file_type) is not None and len(batch) < MEDIA_GROUP_MAX
+
+
+class FileDeliveryService:
+    def __init__(self, page_size: int = FILE_PAGE_SIZE):
+        self._page_size = page_size
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def is_active(self, chat_id: int) -> bool:
+        task = self._tasks.get(chat_id)
+        return task is not None and not task.done()
+
+    def start(self, bot: Bot, chat_id: int, section_id: int, status_message_id: Optional[int] = None) -> None:
+        self.cancel(chat_id)
+        with bulk_priority():
+            task = asyncio.create_task(self._run(bot, chat_id, section_id, status_message_id))
+        self._tasks[chat_id] = task
+
+        def forget(finished: asyncio.Task) -> None:
+            if self._tasks.get(chat_id) is finished:
+                del self._tasks[chat_id]
+
+        task.add_done_callback(forget)
+
+    def cancel(self, chat_id: int) -> bool:
+        task = self._tasks.pop(chat_id, None)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _send_batch(self, bot: Bot, chat_id: int, batch: List[File]) -> int:
+        try:
+            if len(batch) == 1:
+                await send_file(bot, chat_id, batch[0])
+            else:
+                media = [INPUT_MEDIA[f.file_type](media=f.file_id, caption=f.caption) for f in batch]
+                await bot.send_media_group(chat_id=chat_id, media=media)
+            return len(batch)
+        except TelegramRetryAfter as e:
+            logger.error(LogMessages.FILE_SEND_FAILED.format(file_id=batch[0].id, error=str(e)))
+            return 0
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(LogMessages.FILE_SEND_FAILED.format(file_id=batch[0].id, error=str(e)))
+                return 0
+            logger.warning(LogMessages.FILE_MEDIA_GROUP_FAILED.format(count=len(batch), error=str(e)))
+            sent = 0
+            for f in batch:
+                sent += await self._send_batch(bot, chat_id, [f])
+            return sent
+
+    async def _set_status(self, bot: Bot, chat_id: int, message_id: Optional[int], text: str) -> None:
+        if message_id is None:
+            return
+        try:
+            await bot.edit_message_text(text, chat_id=chat_id, message_id=message_id)
+        except Exception as e:
+            logger.debug(LogMessages.FILE_DELIVERY_STATUS_FAIL.format(error=str(e)))
+
+    async def _run(self, bot: Bot, chat_id: int, section_id: int, status_message_id: Optional[int]) -> int:
+        db = await get_db()
+        sent = 0
+        after_id = 0
+        carry: List[File] = []
+        try:
+            while True:
+                page: List[File] = []
+                async for session in db.get_session(read_only=True):
+                    page = await file_service.list_files_by_section_after(
+                        session, section_id, after_id, self._page_size,
+                    )
+                more = len(page) == self._page_size
+                batches = plan_batches(carry + page)
+                carry = []
+                if more and batches and _is_open_group(batches[-1]):
+                    carry = batches.pop()
+                for batch in batches:
+                    sent += await self._send_batch(bot, chat_id, batch)
+                if not more:
+                    break
+                after_id = page[-1].id
+        except asyncio.CancelledError:
+            await self._set_status(
+                bot, chat_id, status_message_id,
+                get_i18n().get(I18nKeys.FILES_DELIVERY_STOPPED, sent=sent),
+            )
+            raise
+        await self._set_status(
+            bot, chat_id, status_message_id,
+            get_i18n().get(I18nKeys.FILES_DELIVERY_DONE, sent=sent),
+        )
+        return sent
+
+
+file_delivery = FileDeliveryService()
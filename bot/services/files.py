@@ -1,5 +1,5 @@
 import logging
-from typing import List, Optional, Tuple
+from typing import List, Optional
 
 from aiogram import Bot
 from sqlalchemy import select, func
@@ -9,10 +9,15 @@ from bot.core.constants import LogMessages
 from bot.models.file import File, FileStatus
 from bot.models.file_section import FileSection
 from bot.models.section import Section
+from bot.services.pagination import KeysetPage, SEEK_OLDER, list_counts, seek_page
+from bot.services.search_index import search_index
+from bot.services.section_counters import section_counters
+from bot.utils.text import normalize_arabic
 
 logger = logging.getLogger("bot")
 
 FILES_PER_PAGE = 5
+FILE_COUNT_KEYS = ("files_all", "files_active", "files_pending")
 
 
 class FileService:
@@ -40,6 +45,8 @@ class FileService:
         )
         session.add(f)
         await session.flush()
+        search_index.queue_file(session, f)
+        list_counts.invalidate(*FILE_COUNT_KEYS)
         logger.info(LogMessages.FILE_CREATED.format(
             file_id=f.id, name=name, user_id=uploaded_by
         ))
@@ -52,6 +59,20 @@ class FileService:
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_published_files_by_ids(
+        self, session: AsyncSession, file_ids: List[int]
+    ) -> List[File]:
+        if not file_ids:
+            return []
+        stmt = select(File).where(
+            File.id.in_(file_ids),
+            File.is_active == True,
+            File.status == FileStatus.PUBLISHED.value,
+        )
+        result = await session.execute(stmt)
+        by_id = {f.id: f for f in result.scalars().all()}
+        return [by_id[file_id] for file_id in file_ids if file_id in by_id]
+
     async def get_file_by_unique_id(
         self, session: AsyncSession, file_unique_id: str
     ) -> Optional[File]:
@@ -65,17 +86,8 @@ class FileService:
     async def count_files_by_section(
         self, session: AsyncSession, section_id: int
     ) -> int:
-        count_stmt = (
-            select(func.count())
-            .select_from(FileSection)
-            .join(File, File.id == FileSection.file_id)
-            .where(
-                FileSection.section_id == section_id,
-                File.is_active == True,
-                File.status == FileStatus.PUBLISHED.value,
-            )
-        )
-        result = await session.execute(count_stmt)
+        stmt = select(Section.file_count).where(Section.id == section_id)
+        result = await session.execute(stmt)
         return result.scalar() or 0
 
     async def check_duplicate(
@@ -92,23 +104,12 @@ class FileService:
         self,
         session: AsyncSession,
         section_id: int,
+        cursor: int = 0,
+        direction: int = SEEK_OLDER,
         page: int = 1,
         per_page: int = FILES_PER_PAGE,
-    ) -> Tuple[List[File], int]:
-        count_stmt = (
-            select(func.count())
-            .select_from(FileSection)
-            .join(File, File.id == FileSection.file_id)
-            .where(
-                FileSection.section_id == section_id,
-                File.is_active == True,
-                File.status == FileStatus.PUBLISHED.value,
-            )
-        )
-        total_result = await session.execute(count_stmt)
-        total = total_result.scalar() or 0
-
-        offset = (page - 1) * per_page
+    ) -> KeysetPage:
+        total = await self.count_files_by_section(session, section_id)
         stmt = (
             select(File)
             .join(FileSection, File.id == FileSection.file_id)
@@ -117,19 +118,15 @@ class FileService:
                 File.is_active == True,
                 File.status == FileStatus.PUBLISHED.value,
             )
-            .order_by(File.id.desc())
-            .offset(offset)
-            .limit(per_page)
         )
-        result = await session.execute(stmt)
-        files = list(result.scalars().all())
-        total_pages = max(1, (total + per_page - 1) // per_page)
-        return files, total_pages
+        return await seek_page(session, stmt, File.id, total, cursor, direction, page, per_page)
 
-    async def list_all_files_by_section(
+    async def list_files_by_section_after(
         self,
         session: AsyncSession,
         section_id: int,
+        after_id: int,
+        limit: int,
     ) -> List[File]:
         stmt = (
             select(File)
@@ -138,8 +135,10 @@ class FileService:
                 FileSection.section_id == section_id,
                 File.is_active == True,
                 File.status == FileStatus.PUBLISHED.value,
+                File.id > after_id,
             )
             .order_by(File.id.asc())
+            .limit(limit)
         )
         result = await session.execute(stmt)
         return list(result.scalars().all())
@@ -159,6 +158,8 @@ class FileService:
         fs = FileSection(file_id=file_id, section_id=section_id)
         session.add(fs)
         await session.flush()
+        if await self._is_published(session, file_id):
+            await section_counters.adjust(session, {section_id: 1})
         logger.info(LogMessages.FILE_LINKED.format(
             file_id=file_id, section_id=section_id
         ))
@@ -178,6 +179,8 @@ class FileService:
 
         await session.delete(fs)
         await session.flush()
+        if await self._is_published(session, file_id):
+            await section_counters.adjust(session, {section_id: -1})
         logger.info(LogMessages.FILE_UNLINKED.format(
             file_id=file_id, section_id=section_id
         ))
@@ -190,13 +193,32 @@ class FileService:
         if f is None:
             return None
 
+        was_published = self._counts(f)
         f.is_active = False
         await session.flush()
+        if was_published:
+            await self._adjust_section_counters(session, file_id, -1)
+        search_index.queue_file(session, f)
+        list_counts.invalidate(*FILE_COUNT_KEYS)
         logger.info(LogMessages.FILE_SOFT_DELETED.format(
             file_id=file_id, name=f.name
         ))
         return f
 
+    @staticmethod
+    def _counts(f: File) -> bool:
+        return f.is_active and f.status == FileStatus.PUBLISHED.value
+
+    async def _is_published(self, session: AsyncSession, file_id: int) -> bool:
+        f = await self.get_file(session, file_id)
+        return f is not None and self._counts(f)
+
+    async def _adjust_section_counters(
+        self, session: AsyncSession, file_id: int, amount: int
+    ) -> None:
+        section_ids = await self.get_file_section_ids(session, file_id)
+        await section_counters.adjust(session, {section_id: amount for section_id in section_ids})
+
     async def get_file_section_ids(
         self, session: AsyncSession, file_id: int
     ) -> List[int]:
@@ -211,23 +233,22 @@ class FileService:
         self,
         session: AsyncSession,
         include_inactive: bool = False,
+        cursor: int = 0,
+        direction: int = SEEK_OLDER,
         page: int = 1,
         per_page: int = 10,
-    ) -> Tuple[List[File], int]:
-        count_stmt = select(func.count()).select_from(File)
-        if not include_inactive:
-            count_stmt = count_stmt.where(File.is_active == True)
-        total_result = await session.execute(count_stmt)
-        total = total_result.scalar() or 0
-
-        offset = (page - 1) * per_page
+    ) -> KeysetPage:
         stmt = select(File)
         if not include_inactive:
             stmt = stmt.where(File.is_active == True)
-        stmt = stmt.order_by(File.id.desc()).offset(offset).limit(per_page)
-        result = await session.execute(stmt)
-        files = list(result.scalars().all())
-        return files, total
+
+        async def count() -> int:
+            result = await session.execute(select(func.count()).select_from(stmt.subquery()))
+            return result.scalar() or 0
+
+        key = "files_all" if include_inactive else "files_active"
+        total = await list_counts.get(key, count)
+        return await seek_page(session, stmt, File.id, total, cursor, direction, page, per_page)
 
     async def set_file_status(
         self, session: AsyncSession, file_id: int, status: str
@@ -236,41 +257,35 @@ class FileService:
         if f is None:
             return None
 
+        was_published = self._counts(f)
         f.status = status
         await session.flush()
+        is_published = self._counts(f)
+        if was_published != is_published:
+            await self._adjust_section_counters(session, file_id, 1 if is_published else -1)
+        search_index.queue_file(session, f)
+        list_counts.invalidate(*FILE_COUNT_KEYS)
         return f
 
     async def get_pending_files(
         self,
         session: AsyncSession,
+        cursor: int = 0,
+        direction: int = SEEK_OLDER,
         page: int = 1,
         per_page: int = 10,
-    ) -> Tuple[List[File], int]:
-        count_stmt = (
-            select(func.count())
-            .select_from(File)
-            .where(
-                File.is_active == True,
-                File.status == FileStatus.PENDING.value,
-            )
+    ) -> KeysetPage:
+        stmt = select(File).where(
+            File.is_active == True,
+            File.status == FileStatus.PENDING.value,
         )
-        total_result = await session.execute(count_stmt)
-        total = total_result.scalar() or 0
 
-        offset = (page - 1) * per_page
-        stmt = (
-            select(File)
-            .where(
-                File.is_active == True,
-                File.status == FileStatus.PENDING.value,
-            )
-            .order_by(File.id.desc())
-            .offset(offset)
-            .limit(per_page)
-        )
-        result = await session.execute(stmt)
-        files = list(result.scalars().all())
-        return files, total
+        async def count() -> int:
+            result = await session.execute(select(func.count()).select_from(stmt.subquery()))
+            return result.scalar() or 0
+
+        total = await list_counts.get("files_pending", count)
+        return await seek_page(session, stmt, File.id, total, cursor, direction, page, per_page)
 
     async def get_file_sections(
         self, session: AsyncSession, file_id: int
@@ -290,14 +305,16 @@ class FileService:
         query: str,
         limit: int = 20,
     ) -> List[File]:
+        normalized = normalize_arabic(query)
+        name = func.normalize_ar(File.name)
         stmt = (
             select(File)
             .where(
                 File.is_active == True,
                 File.status == FileStatus.PUBLISHED.value,
-                func.lower(File.name).contains(query.lower()),
+                name.contains(normalized, autoescape=True),
             )
-            .order_by(File.id.desc())
+            .order_by(func.word_similarity(normalized, name).desc(), File.id.desc())
             .limit(limit)
         )
         result = await session.execute(stmt)
@@ -307,24 +324,28 @@ class FileService:
 file_service = FileService()
 
 
+async def send_file(bot: Bot, chat_id: int, file: File) -> None:
+    if file.file_type == "photo":
+        await bot.send_photo(chat_id=chat_id, photo=file.file_id, caption=file.caption)
+    elif file.file_type == "video":
+        await bot.send_video(chat_id=chat_id, video=file.file_id, caption=file.caption)
+    elif file.file_type == "audio":
+        await bot.send_audio(chat_id=chat_id, audio=file.file_id, caption=file.caption)
+    elif file.file_type == "voice":
+        await bot.send_voice(chat_id=chat_id, voice=file.file_id, caption=file.caption)
+    elif file.file_type == "video_note":
+        await bot.send_video_note(chat_id=chat_id, video_note=file.file_id)
+    elif file.file_type == "animation":
+        await bot.send_animation(chat_id=chat_id, animation=file.file_id, caption=file.caption)
+    elif file.file_type == "sticker":
+        await bot.send_sticker(chat_id=chat_id, sticker=file.file_id)
+    else:
+        await bot.send_document(chat_id=chat_id, document=file.file_id, caption=file.caption)
+
+
 async def send_file_to_user(bot: Bot, chat_id: int, file: File) -> bool:
     try:
-        if file.file_type == "photo":
-            await bot.send_photo(chat_id=chat_id, photo=file.file_id, caption=file.caption)
-        elif file.file_type == "video":
-            await bot.send_video(chat_id=chat_id, video=file.file_id, caption=file.caption)
-        elif file.file_type == "audio":
-            await bot.send_audio(chat_id=chat_id, audio=file.file_id, caption=file.caption)
-        elif file.file_type == "voice":
-            await bot.send_voice(chat_id=chat_id, voice=file.file_id, caption=file.caption)
-        elif file.file_type == "video_note":
-            await bot.send_video_note(chat_id=chat_id, video_note=file.file_id)
-        elif file.file_type == "animation":
-            await bot.send_animation(chat_id=chat_id, animation=file.file_id, caption=file.caption)
-        elif file.file_type == "sticker":
-            await bot.send_sticker(chat_id=chat_id, sticker=file.file_id)
-        else:
-            await bot.send_document(chat_id=chat_id, document=file.file_id, caption=file.caption)
+        await send_file(bot, chat_id, file)
         return True
     except Exception as e:
         logger.error(LogMessages.FILE_SEND_FAILED.format(file_id=file.id, error=str(e)))
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from aiogram import Bot
+from aiogram.enums import ChatMemberStatus
+
+from bot.core.constants import LogMessages
+
+logger = logging.getLogger("bot")
+
+MembershipKey = Tuple[int, str]
+
+
+class MembershipService:
+    def __init__(self, positive_ttl: float = 600.0, negative_ttl: float = 30.0, max_size: int = 50000):
+        self._positive_ttl = positive_ttl
+        self._negative_ttl = negative_ttl
+        self._max_size = max_size
+        self._entries: "OrderedDict[MembershipKey, Tuple[float, bool]]" = OrderedDict()
+        self._inflight: Dict[MembershipKey, "asyncio.Task[bool]"] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def configure(self, positive_ttl: float, negative_ttl: float) -> None:
+        self._positive_ttl = positive_ttl
+        self._negative_ttl = negative_ttl
+        self._entries.clear()
+
+    def _get_cached(self, key: MembershipKey) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, is_member = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return is_member
+
+    def _store(self, key: MembershipKey, is_member: bool) -> None:
+        ttl = self._positive_ttl if is_member else self._negative_ttl
+        self._entries[key] = (time.monotonic() + ttl, is_member)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    async def _fetch(self, bot: Bot, key: MembershipKey) -> bool:
+        user_id, channel_id = key
+        generation = self._generation
+        try:
+            member = await bot.get_chat_member(channel_id, user_id)
+        except Exception as e:
+            logger.warning(LogMessages.SUBSCRIPTION_LOOKUP_FAIL.format(
+                channel_id=channel_id, user_id=user_id, error=str(e),
+            ))
+            return False
+        is_member = member.status not in (ChatMemberStatus.LEFT, ChatMemberStatus.KICKED)
+        if generation == self._generation:
+            self._store(key, is_member)
+        return is_member
+
+    def _forget(self, key: MembershipKey, task: "asyncio.Task[bool]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def is_member(self, bot: Bot, user_id: int, channel_id: str) -> bool:
+        key = (user_id, str(channel_id))
+        cached = self._get_cached(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        task = asyncio.ensure_future(self._fetch(bot, key))
+        self._inflight[key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._forget(key, task)
+            else:
+                task.add_done_callback(lambda _: self._forget(key, task))
+
+    async def get_missing_channels(self, bot: Bot, user_id: int, channel_ids: Iterable[str]) -> List[str]:
+        channels = list(channel_ids)
+        results = await asyncio.gather(*(self.is_member(bot, user_id, ch) for ch in channels))
+        return [ch for ch, is_member in zip(channels, results) if not is_member]
+
+    def invalidate(self, user_id: int, channel_ids: Iterable[str]) -> None:
+        # Lookups already in flight may predate the change; they must not
+        # repopulate the cache.
+        self._generation += 1
+        for channel_id in channel_ids:
+            key = (user_id, str(channel_id))
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+        }
+
+
+membership_service = MembershipService()
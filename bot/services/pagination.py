@@ -0,0 +1,123 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Tuple, TypeVar
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+SEEK_OLDER = 0
+SEEK_NEWER = 1
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    items: List[T]
+    page: int
+    total_pages: int
+    has_prev: bool
+    has_next: bool
+    total: int
+
+    @property
+    def first_id(self) -> int:
+        return self.items[0].id if self.items else 0
+
+    @property
+    def last_id(self) -> int:
+        return self.items[-1].id if self.items else 0
+
+
+async def _seek(
+    session: AsyncSession,
+    stmt: Select,
+    id_column: Any,
+    cursor: int,
+    direction: int,
+    per_page: int,
+) -> Tuple[List[Any], bool]:
+    if direction == SEEK_NEWER:
+        stmt = stmt.where(id_column > cursor).order_by(id_column.asc())
+    else:
+        if cursor:
+            stmt = stmt.where(id_column < cursor)
+        stmt = stmt.order_by(id_column.desc())
+    result = await session.execute(stmt.limit(per_page + 1))
+    items = list(result.scalars().all())
+    more = len(items) > per_page
+    items = items[:per_page]
+    if direction == SEEK_NEWER:
+        items.reverse()
+    return items, more
+
+
+async def seek_page(
+    session: AsyncSession,
+    stmt: Select,
+    id_column: Any,
+    total: int,
+    cursor: int = 0,
+    direction: int = SEEK_OLDER,
+    page: int = 1,
+    per_page: int = 10,
+) -> KeysetPage:
+    """Newest-first page of ``stmt`` after (or before) the row ``cursor``.
+
+    ``page`` is only carried for display; ``total`` may be approximate.
+    """
+    if direction == SEEK_NEWER and not cursor:
+        direction = SEEK_OLDER
+    items, more = await _seek(session, stmt, id_column, cursor, direction, per_page)
+    if not items and cursor:
+        cursor, direction, page = 0, SEEK_OLDER, 1
+        items, more = await _seek(session, stmt, id_column, cursor, direction, per_page)
+
+    if direction == SEEK_NEWER:
+        has_prev, has_next = more, True
+        if not more:
+            page = 1
+    else:
+        has_prev, has_next = bool(cursor), more
+        if not cursor:
+            page = 1
+    page = max(1, page)
+    total_pages = max(1, (total + per_page - 1) // per_page, page + (1 if has_next else 0))
+    if not has_next:
+        total_pages = page
+    return KeysetPage(items, page, total_pages, has_prev, has_next, total)
+
+
+class CountCache:
+    def __init__(self, ttl_seconds: float = 60.0):
+        self._ttl = ttl_seconds
+        self._values: Dict[str, Tuple[int, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, ttl_seconds: float) -> None:
+        self._ttl = ttl_seconds
+        self._values.clear()
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[int]]) -> int:
+        entry = self._values.get(key)
+        now = time.monotonic()
+        if entry is not None and entry[1] > now:
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        value = await loader()
+        self._values[key] = (value, now + self._ttl)
+        return value
+
+    def invalidate(self, *keys: str) -> None:
+        if not keys:
+            self._values.clear()
+        for key in keys:
+            self._values.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cached": len(self._values), "hits": self.hits, "misses": self.misses}
+
+
+list_counts = CountCache()
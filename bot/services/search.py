@@ -0,0 +1,151 @@
+import asyncio
+import itertools
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from bot.core.database import get_db
+from bot.services.files import file_service
+from bot.services.search_index import search_index
+from bot.services.sections import section_service
+from bot.utils.text import normalize_arabic
+
+HIT_SECTION = "section"
+HIT_FILE = "file"
+
+
+class SearchHit(NamedTuple):
+    kind: str
+    id: int
+    name: str
+
+
+@dataclass
+class SearchResults:
+    token: int
+    query: str
+    generation: int
+    hits: List[SearchHit]
+    sections: int
+    files: int
+
+    @property
+    def total(self) -> int:
+        return len(self.hits)
+
+    def page_count(self, page_size: int) -> int:
+        return max(1, (len(self.hits) + page_size - 1) // page_size)
+
+    def page(self, page: int, page_size: int) -> List[SearchHit]:
+        start = (page - 1) * page_size
+        return self.hits[start:start + page_size]
+
+
+class SearchService:
+    def __init__(
+        self,
+        page_size: int = 10,
+        max_results: int = 100,
+        cache_size: int = 256,
+        debounce_seconds: float = 0.3,
+    ):
+        self.configure(page_size, max_results, cache_size, debounce_seconds)
+
+    def configure(
+        self,
+        page_size: int,
+        max_results: int,
+        cache_size: int,
+        debounce_seconds: float,
+    ) -> None:
+        self.page_size = page_size
+        self._max_results = max_results
+        self._cache_size = cache_size
+        self._debounce_seconds = debounce_seconds
+        self._cache: "OrderedDict[str, SearchResults]" = OrderedDict()
+        self._tokens: Dict[int, str] = {}
+        self._next_token = itertools.count(1)
+        self._pending: Dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.debounced = 0
+
+    async def settle(self, user_id: int, immediate: bool = False) -> bool:
+        seq = self._pending.get(user_id, 0) + 1
+        self._pending[user_id] = seq
+        if self._debounce_seconds > 0 and not immediate:
+            await asyncio.sleep(self._debounce_seconds)
+        if self._pending.get(user_id) != seq:
+            self.debounced += 1
+            return False
+        del self._pending[user_id]
+        return True
+
+    def cached(self, query: str) -> Optional[SearchResults]:
+        results = self._cache.get(normalize_arabic(query))
+        if results is None or results.generation != search_index.generation:
+            return None
+        return results
+
+    async def search(self, query: str) -> SearchResults:
+        key = normalize_arabic(query)
+        results = self._cache.get(key)
+        if results is not None and results.generation == search_index.generation:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return results
+
+        self.misses += 1
+        generation = search_index.generation
+        hits = await self._run(query)
+        token = results.token if results is not None else next(self._next_token)
+        results = SearchResults(
+            token=token,
+            query=query,
+            generation=generation,
+            hits=hits,
+            sections=sum(1 for hit in hits if hit.kind == HIT_SECTION),
+            files=sum(1 for hit in hits if hit.kind == HIT_FILE),
+        )
+        self._cache[key] = results
+        self._cache.move_to_end(key)
+        self._tokens[token] = key
+        while len(self._cache) > self._cache_size:
+            _, evicted = self._cache.popitem(last=False)
+            self._tokens.pop(evicted.token, None)
+        return results
+
+    async def results_for_token(self, token: int) -> Optional[SearchResults]:
+        key = self._tokens.get(token)
+        results = self._cache.get(key) if key is not None else None
+        if results is None:
+            self._tokens.pop(token, None)
+            return None
+        return await self.search(results.query)
+
+    async def _run(self, query: str) -> List[SearchHit]:
+        sections: List[Any] = []
+        files: List[Any] = []
+        if search_index.ready:
+            sections, _ = search_index.search_sections(query, limit=self._max_results)
+            files, _ = search_index.search_files(query, limit=self._max_results)
+        else:
+            db = await get_db()
+            async for session in db.get_session(read_only=True):
+                sections = await section_service.search_sections(session, query, limit=self._max_results)
+                files = await file_service.search_files(session, query, limit=self._max_results)
+        return (
+            [SearchHit(HIT_SECTION, s.id, s.name) for s in sections]
+            + [SearchHit(HIT_FILE, f.id, f.name) for f in files]
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cached_queries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "debounced": self.debounced,
+        }
+
+
+search_service = SearchService()
@@ -0,0 +1,276 @@
+import heapq
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from bot.core.constants import LogMessages
+from bot.core.database import Database
+from bot.models.file import File, FileStatus
+from bot.models.section import Section
+from bot.utils.text import normalize_arabic
+
+logger = logging.getLogger("bot")
+
+MIN_GRAM = 2
+MAX_GRAM = 3
+LOAD_PAGE_SIZE = 5000
+
+PENDING_SYNC = "search_index_pending"
+
+SortKey = Tuple[int, ...]
+DocKey = Tuple[str, int]
+DocFields = Optional[Tuple[str, Optional[str], SortKey]]
+
+
+def ngrams(text: str, size: int) -> Set[str]:
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def _all_grams(text: str) -> Set[str]:
+    grams: Set[str] = set()
+    for size in range(MIN_GRAM, MAX_GRAM + 1):
+        grams |= ngrams(text, size)
+    return grams
+
+
+class SearchDoc:
+    __slots__ = ("id", "name", "text", "extra", "sort_key")
+
+    def __init__(self, doc_id: int, name: str, extra: Optional[str], sort_key: SortKey):
+        self.id = doc_id
+        self.name = name
+        self.text = normalize_arabic(name)
+        self.extra = normalize_arabic(extra) if extra else ""
+        self.sort_key = sort_key
+
+    def grams(self) -> Set[str]:
+        return _all_grams(self.text) | _all_grams(self.extra)
+
+    def match_tier(self, query: str) -> Optional[int]:
+        pos = self.text.find(query)
+        if pos == 0:
+            return 0 if len(self.text) == len(query) else 1
+        if pos > 0:
+            return 2 if self.text[pos - 1] == " " else 3
+        if query in self.extra:
+            return 4
+        return None
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        self._docs: Dict[int, SearchDoc] = {}
+        self._postings: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def gram_count(self) -> int:
+        return len(self._postings)
+
+    def upsert(self, doc_id: int, name: str, extra: Optional[str] = None, sort_key: SortKey = ()) -> None:
+        self.remove(doc_id)
+        doc = SearchDoc(doc_id, name, extra, sort_key)
+        self._docs[doc_id] = doc
+        for gram in doc.grams():
+            self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for gram in doc.grams():
+            postings = self._postings.get(gram)
+            if postings is None:
+                continue
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[gram]
+
+    def _candidates(self, query: str) -> Set[int]:
+        size = min(MAX_GRAM, len(query))
+        if size < MIN_GRAM:
+            return set(self._docs)
+        lists = sorted((self._postings.get(g, set()) for g in ngrams(query, size)), key=len)
+        if not lists or not lists[0]:
+            return set()
+        candidates = set(lists[0])
+        for postings in lists[1:]:
+            candidates &= postings
+            if not candidates:
+                break
+        return candidates
+
+    def search(self, query: str, offset: int = 0, limit: int = 20) -> Tuple[List[SearchDoc], int]:
+        normalized = normalize_arabic(query)
+        if not normalized:
+            return [], 0
+        hits = []
+        for doc_id in self._candidates(normalized):
+            doc = self._docs[doc_id]
+            tier = doc.match_tier(normalized)
+            if tier is not None:
+                hits.append((tier, len(doc.text), doc.sort_key, doc_id))
+        page = heapq.nsmallest(offset + limit, hits)[offset:]
+        return [self._docs[hit[-1]] for hit in page], len(hits)
+
+
+class SearchIndexService:
+    def __init__(self) -> None:
+        self.files = SearchIndex()
+        self.sections = SearchIndex()
+        self.enabled = True
+        self.ready = False
+        self.generation = 0
+        self.last_build_ms = 0.0
+        # One buffer per rebuild in progress: changes committed while it
+        # loads are replayed onto the new indexes before they are swapped in.
+        self._build_buffers: List[List[Dict[DocKey, DocFields]]] = []
+
+    def configure(self, enabled: bool) -> None:
+        self.enabled = enabled
+        if not enabled:
+            self.ready = False
+
+    @staticmethod
+    def _file_key(file_id: int) -> SortKey:
+        return (-file_id,)
+
+    @staticmethod
+    def _section_key(section_id: int, order: int) -> SortKey:
+        return (order, section_id)
+
+    async def rebuild(self, db: Database) -> None:
+        self.generation += 1
+        if not self.enabled:
+            return
+        started = time.perf_counter()
+        buffered: List[Dict[DocKey, DocFields]] = []
+        self._build_buffers.append(buffered)
+        try:
+            files, sections = await self._load(db)
+        except Exception:
+            self.ready = False
+            raise
+        finally:
+            self._build_buffers.remove(buffered)
+        for docs in buffered:
+            self._write(files, sections, docs)
+        self.files = files
+        self.sections = sections
+        self.ready = True
+        self.generation += 1
+        self.last_build_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(LogMessages.SEARCH_INDEX_BUILT.format(
+            files=len(files), sections=len(sections), ms=self.last_build_ms
+        ))
+
+    async def _load(self, db: Database) -> Tuple[SearchIndex, SearchIndex]:
+        files = SearchIndex()
+        sections = SearchIndex()
+        async for session in db.get_session():
+            result = await session.execute(
+                select(Section.id, Section.name, Section.order).where(Section.is_active == True)
+            )
+            for section_id, name, order in result.all():
+                sections.upsert(section_id, name, sort_key=self._section_key(section_id, order))
+
+        after_id = 0
+        while True:
+            rows = []
+            async for session in db.get_session():
+                result = await session.execute(
+                    select(File.id, File.name, File.caption)
+                    .where(
+                        File.is_active == True,
+                        File.status == FileStatus.PUBLISHED.value,
+                        File.id > after_id,
+                    )
+                    .order_by(File.id.asc())
+                    .limit(LOAD_PAGE_SIZE)
+                )
+                rows = result.all()
+            for file_id, name, caption in rows:
+                files.upsert(file_id, name, caption, sort_key=self._file_key(file_id))
+            if len(rows) < LOAD_PAGE_SIZE:
+                break
+            after_id = rows[-1][0]
+        return files, sections
+
+    def _file_doc(self, f: Any) -> DocFields:
+        if f.is_active is not False and f.status == FileStatus.PUBLISHED.value:
+            return (f.name, f.caption, self._file_key(f.id))
+        return None
+
+    def _section_doc(self, section: Any) -> DocFields:
+        if section.is_active is not False:
+            return (section.name, None, self._section_key(section.id, section.order or 0))
+        return None
+
+    def _apply(self, docs: Dict[DocKey, DocFields]) -> None:
+        self.generation += 1
+        if not self.enabled:
+            return
+        for buffer in self._build_buffers:
+            buffer.append(docs)
+        self._write(self.files, self.sections, docs)
+
+    @staticmethod
+    def _write(files: SearchIndex, sections: SearchIndex, docs: Dict[DocKey, DocFields]) -> None:
+        for (kind, doc_id), fields in docs.items():
+            index = files if kind == "file" else sections
+            if fields is None:
+                index.remove(doc_id)
+            else:
+                name, extra, sort_key = fields
+                index.upsert(doc_id, name, extra, sort_key=sort_key)
+
+    def sync_file(self, f: File) -> None:
+        self._apply({("file", f.id): self._file_doc(f)})
+
+    def sync_section(self, section: Section) -> None:
+        self._apply({("section", section.id): self._section_doc(section)})
+
+    # Writers queue their changes on the session; they reach the index only
+    # once the transaction commits, so searches never see rolled-back rows.
+    def queue_file(self, session: AsyncSession, f: Any) -> None:
+        session.info.setdefault(PENDING_SYNC, {})[("file", f.id)] = self._file_doc(f)
+
+    def queue_section(self, session: AsyncSession, section: Any) -> None:
+        session.info.setdefault(PENDING_SYNC, {})[("section", section.id)] = self._section_doc(section)
+
+    def search_files(self, query: str, offset: int = 0, limit: int = 20) -> Tuple[List[SearchDoc], int]:
+        return self.files.search(query, offset, limit)
+
+    def search_sections(self, query: str, offset: int = 0, limit: int = 20) -> Tuple[List[SearchDoc], int]:
+        return self.sections.search(query, offset, limit)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "ready": self.ready,
+            "files": len(self.files),
+            "sections": len(self.sections),
+            "grams": self.files.gram_count + self.sections.gram_count,
+            "generation": self.generation,
+            "last_build_ms": self.last_build_ms,
+        }
+
+
+search_index = SearchIndexService()
+
+
+@event.listens_for(Session, "after_commit")
+def _sync_after_commit(session: Session) -> None:
+    pending = session.info.pop(PENDING_SYNC, None)
+    if pending:
+        search_index._apply(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(PENDING_SYNC, None)
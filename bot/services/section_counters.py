@@ -0,0 +1,151 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.core.constants import LogMessages
+from bot.core.database import get_db
+from bot.models.file import FileStatus
+from bot.services.section_tree import section_tree
+
+logger = logging.getLogger("bot")
+
+ADJUST_COUNTERS = text(
+    """
+    WITH RECURSIVE delta(section_id, amount) AS (
+        SELECT * FROM unnest(CAST(:section_ids AS BIGINT[]), CAST(:amounts AS INTEGER[]))
+    ),
+    chain(id, parent_id, amount, path) AS (
+        SELECT s.id, s.parent_id, d.amount, ARRAY[s.id]
+        FROM sections s
+        JOIN delta d ON s.id = d.section_id
+        UNION ALL
+        SELECT s.id, s.parent_id, c.amount, c.path || s.id
+        FROM sections s
+        JOIN chain c ON s.id = c.parent_id
+        WHERE NOT s.id = ANY(c.path)
+    ),
+    totals AS (
+        SELECT id, sum(amount) AS amount FROM chain GROUP BY id
+    ),
+    own AS (
+        SELECT section_id AS id, sum(amount) AS amount FROM delta GROUP BY section_id
+    )
+    UPDATE sections s
+    SET subtree_file_count = s.subtree_file_count + t.amount,
+        file_count = s.file_count + CASE WHEN :own THEN COALESCE(o.amount, 0) ELSE 0 END
+    FROM totals t
+    LEFT JOIN own o ON o.id = t.id
+    WHERE s.id = t.id
+    """
+)
+
+RECONCILE_COUNTERS = text(
+    """
+    WITH RECURSIVE own AS (
+        SELECT fs.section_id AS id, count(*) AS n
+        FROM file_sections fs
+        JOIN files f ON f.id = fs.file_id
+        WHERE f.is_active AND f.status = :published
+        GROUP BY fs.section_id
+    ),
+    closure(ancestor, descendant, path) AS (
+        SELECT id, id, ARRAY[id] FROM sections
+        UNION ALL
+        SELECT c.ancestor, s.id, c.path || s.id
+        FROM closure c
+        JOIN sections s ON s.parent_id = c.descendant
+        WHERE NOT s.id = ANY(c.path)
+    ),
+    expected AS (
+        SELECT c.ancestor AS id,
+               COALESCE(sum(o.n) FILTER (WHERE c.descendant = c.ancestor), 0) AS file_count,
+               COALESCE(sum(o.n), 0) AS subtree_file_count
+        FROM closure c
+        LEFT JOIN own o ON o.id = c.descendant
+        GROUP BY c.ancestor
+    )
+    UPDATE sections s
+    SET file_count = e.file_count,
+        subtree_file_count = e.subtree_file_count
+    FROM expected e
+    WHERE s.id = e.id
+      AND (s.file_count <> e.file_count OR s.subtree_file_count <> e.subtree_file_count)
+    """
+)
+
+
+class SectionCounterService:
+    def __init__(self, reconcile_interval: float = 3600.0):
+        self._reconcile_interval = reconcile_interval
+        self._task: Optional[asyncio.Task] = None
+        self.adjustments = 0
+        self.reconciles = 0
+        self.corrected = 0
+
+    async def adjust(self, session: AsyncSession, deltas: Dict[int, int], own: bool = True) -> None:
+        deltas = {section_id: amount for section_id, amount in deltas.items() if amount}
+        if not deltas:
+            return
+        await session.execute(ADJUST_COUNTERS, {
+            "section_ids": list(deltas),
+            "amounts": list(deltas.values()),
+            "own": own,
+        })
+        self.adjustments += 1
+        section_tree.mark_dirty(session)
+
+    async def reconcile(self, session: AsyncSession) -> int:
+        result = await session.execute(RECONCILE_COUNTERS, {"published": FileStatus.PUBLISHED.value})
+        corrected = result.rowcount or 0
+        self.reconciles += 1
+        self.corrected += corrected
+        if corrected:
+            section_tree.mark_dirty(session)
+            logger.warning(LogMessages.SECTION_COUNTERS_CORRECTED.format(count=corrected))
+        return corrected
+
+    async def reconcile_all(self) -> int:
+        try:
+            db = await get_db()
+            corrected = 0
+            async for session in db.get_session():
+                corrected = await self.reconcile(session)
+            return corrected
+        except Exception as e:
+            logger.error(LogMessages.SECTION_COUNTERS_RECONCILE_FAIL.format(error=str(e)))
+            return 0
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._reconcile_interval)
+            await self.reconcile_all()
+
+    def start(self, reconcile_interval: Optional[float] = None) -> None:
+        if reconcile_interval is not None:
+            self._reconcile_interval = reconcile_interval
+        if self._reconcile_interval <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "adjustments": self.adjustments,
+            "reconciles": self.reconciles,
+            "corrected": self.corrected,
+        }
+
+
+section_counters = SectionCounterService()
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from bot.core.constants import LogMessages
+from bot.core.database import get_db
+from bot.models.section import Section
+
+logger = logging.getLogger("bot")
+
+DIRTY_FLAG = "section_tree_dirty"
+
+
+class SectionNode:
+    __slots__ = (
+        "id", "name", "description", "parent_id", "order", "is_active",
+        "file_count", "subtree_file_count", "children",
+    )
+
+    def __init__(
+        self,
+        section_id: int,
+        name: str,
+        description: Optional[str],
+        parent_id: Optional[int],
+        order: int,
+        is_active: bool,
+        file_count: int = 0,
+        subtree_file_count: int = 0,
+    ):
+        self.id = section_id
+        self.name = name
+        self.description = description
+        self.parent_id = parent_id
+        self.order = order
+        self.is_active = is_active
+        self.file_count = file_count
+        self.subtree_file_count = subtree_file_count
+        self.children: List["SectionNode"] = []
+
+
+class SectionTree:
+    def __init__(self, nodes: Dict[int, SectionNode]):
+        self._nodes = nodes
+        self._roots: List[SectionNode] = []
+        for node in nodes.values():
+            parent = nodes.get(node.parent_id) if node.parent_id is not None else None
+            if parent is not None:
+                parent.children.append(node)
+            else:
+                self._roots.append(node)
+        key = lambda n: (n.order, n.id)
+        self._roots.sort(key=key)
+        for node in nodes.values():
+            node.children.sort(key=key)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def get(self, section_id: int) -> Optional[SectionNode]:
+        return self._nodes.get(section_id)
+
+    def children(self, parent_id: Optional[int], include_inactive: bool = False) -> List[SectionNode]:
+        if parent_id is None:
+            nodes = self._roots
+        else:
+            parent = self._nodes.get(parent_id)
+            nodes = parent.children if parent is not None else []
+        if include_inactive:
+            return list(nodes)
+        return [n for n in nodes if n.is_active]
+
+    def has_children(self, section_id: int) -> bool:
+        node = self._nodes.get(section_id)
+        return node is not None and any(child.is_active for child in node.children)
+
+    def breadcrumb(self, section_id: int) -> List[SectionNode]:
+        path: List[SectionNode] = []
+        node = self._nodes.get(section_id)
+        while node is not None and len(path) <= len(self._nodes):
+            path.append(node)
+            node = self._nodes.get(node.parent_id) if node.parent_id is not None else None
+        path.reverse()
+        return path
+
+    def subtree_ids(self, section_id: int) -> List[int]:
+        root = self._nodes.get(section_id)
+        if root is None:
+            return []
+        ids: List[int] = []
+        seen = set()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.id in seen:
+                continue
+            seen.add(node.id)
+            ids.append(node.id)
+            stack.extend(reversed(node.children))
+        return ids
+
+
+class SectionTreeCache:
+    def __init__(self, ttl_seconds: float = 300.0):
+        self._ttl = ttl_seconds
+        self._tree: Optional[SectionTree] = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self.loads = 0
+
+    def configure(self, ttl_seconds: float) -> None:
+        self._ttl = ttl_seconds
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._tree = None
+
+    def mark_dirty(self, session: AsyncSession) -> None:
+        self.invalidate()
+        session.info[DIRTY_FLAG] = True
+
+    def _fresh(self) -> Optional[SectionTree]:
+        if self._tree is not None and time.monotonic() - self._loaded_at < self._ttl:
+            return self._tree
+        return None
+
+    async def get(self) -> SectionTree:
+        tree = self._fresh()
+        if tree is not None:
+            return tree
+        async with self._lock:
+            tree = self._fresh()
+            if tree is not None:
+                return tree
+            generation = self._generation
+            tree = await self._load()
+            if generation == self._generation:
+                self._tree = tree
+                self._loaded_at = time.monotonic()
+            return tree
+
+    async def _load(self) -> SectionTree:
+        started = time.perf_counter()
+        nodes: Dict[int, SectionNode] = {}
+        db = await get_db()
+        async for session in db.get_session():
+            result = await session.execute(select(
+                Section.id, Section.name, Section.description, Section.parent_id,
+                Section.order, Section.is_active, Section.file_count, Section.subtree_file_count,
+            ))
+            for row in result.all():
+                nodes[row[0]] = SectionNode(*row)
+        self.loads += 1
+        logger.debug(LogMessages.SECTION_TREE_LOADED.format(
+            count=len(nodes), ms=round((time.perf_counter() - started) * 1000, 1)
+        ))
+        return SectionTree(nodes)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cached": self._tree is not None,
+            "sections": len(self._tree) if self._tree is not None else 0,
+            "loads": self.loads,
+        }
+
+
+section_tree = SectionTreeCache()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(DIRTY_FLAG, False):
+        section_tree.invalidate()
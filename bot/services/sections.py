@@ -1,15 +1,78 @@
 import logging
-from typing import List, Optional
+from typing import Awaitable, Callable, List, Optional
 
-from sqlalchemy import select, update, func
+from sqlalchemy import select, update, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.models.section import Section
-from bot.models.file_section import FileSection
 from bot.core.constants import LogMessages
+from bot.services.search_index import search_index
+from bot.services.section_counters import section_counters
+from bot.services.section_tree import SectionNode, section_tree
+from bot.utils.text import normalize_arabic
 
 logger = logging.getLogger("bot")
 
+COPY_SUFFIX = " (نسخة)"
+COPY_BATCH_SIZE = 500
+
+CopyProgress = Callable[[int, int], Awaitable[None]]
+
+COPY_MAP_DROP = text("DROP TABLE IF EXISTS section_copy_map")
+COPY_MAP_CREATE = text(
+    """
+    CREATE TEMPORARY TABLE section_copy_map (
+        seq BIGINT PRIMARY KEY,
+        old_id BIGINT NOT NULL UNIQUE,
+        old_parent_id BIGINT,
+        new_id BIGINT NOT NULL
+    ) ON COMMIT DROP
+    """
+)
+COPY_MAP_FILL = text(
+    """
+    INSERT INTO section_copy_map (seq, old_id, old_parent_id, new_id)
+    WITH RECURSIVE subtree AS (
+        SELECT id, parent_id, 0 AS depth, ARRAY[id] AS path
+        FROM sections
+        WHERE id = :source_id
+        UNION ALL
+        SELECT s.id, s.parent_id, t.depth + 1, t.path || s.id
+        FROM sections s
+        JOIN subtree t ON s.parent_id = t.id
+        WHERE NOT s.id = ANY(t.path)
+    )
+    SELECT row_number() OVER (ORDER BY depth, id), id, parent_id,
+           nextval(pg_get_serial_sequence('sections', 'id'))
+    FROM subtree
+    """
+)
+COPY_MAP_ROOT = text("SELECT new_id FROM section_copy_map WHERE seq = 1")
+COPY_SECTIONS_BATCH = text(
+    """
+    INSERT INTO sections (
+        id, name, description, parent_id, "order", is_active, file_count, subtree_file_count
+    )
+    SELECT m.new_id, s.name || :suffix, s.description,
+           COALESCE(p.new_id, CAST(:target_parent_id AS BIGINT)), s."order", s.is_active,
+           s.file_count, s.subtree_file_count
+    FROM section_copy_map m
+    JOIN sections s ON s.id = m.old_id
+    LEFT JOIN section_copy_map p ON p.old_id = m.old_parent_id
+    WHERE m.seq BETWEEN :first AND :last
+    RETURNING id, name, "order", is_active
+    """
+)
+COPY_FILE_LINKS_BATCH = text(
+    """
+    INSERT INTO file_sections (file_id, section_id)
+    SELECT fs.file_id, m.new_id
+    FROM file_sections fs
+    JOIN section_copy_map m ON m.old_id = fs.section_id
+    WHERE m.seq BETWEEN :first AND :last
+    """
+)
+
 
 class SectionService:
     async def list_sections(
@@ -48,6 +111,8 @@ class SectionService:
         )
         session.add(section)
         await session.flush()
+        search_index.queue_section(session, section)
+        section_tree.mark_dirty(session)
         logger.info(LogMessages.SECTION_CREATED.format(
             section_id=section.id, name=name
         ))
@@ -73,6 +138,8 @@ class SectionService:
             section.order = order
 
         await session.flush()
+        search_index.queue_section(session, section)
+        section_tree.mark_dirty(session)
         logger.info(LogMessages.SECTION_UPDATED.format(
             section_id=section_id, name=section.name
         ))
@@ -87,6 +154,8 @@ class SectionService:
 
         section.is_active = False
         await session.flush()
+        search_index.queue_section(session, section)
+        section_tree.mark_dirty(session)
         logger.info(LogMessages.SECTION_SOFT_DELETED.format(
             section_id=section_id, name=section.name
         ))
@@ -116,19 +185,9 @@ class SectionService:
         result = await session.execute(stmt)
         return result.scalar_one_or_none() is not None
 
-    async def get_breadcrumb(
-        self, session: AsyncSession, section_id: int
-    ) -> List[Section]:
-        breadcrumb = []
-        current_id: Optional[int] = section_id
-        while current_id is not None:
-            section = await self.get_section(session, current_id)
-            if section is None:
-                break
-            breadcrumb.insert(0, section)
-            current_id = section.parent_id
-        return breadcrumb
-
+    async def get_breadcrumb(self, section_id: int) -> List[SectionNode]:
+        tree = await section_tree.get()
+        return tree.breadcrumb(section_id)
 
     async def search_sections(
         self,
@@ -136,13 +195,19 @@ class SectionService:
         query: str,
         limit: int = 20,
     ) -> List[Section]:
+        normalized = normalize_arabic(query)
+        name = func.normalize_ar(Section.name)
         stmt = (
             select(Section)
             .where(
                 Section.is_active == True,
-                func.lower(Section.name).contains(query.lower()),
+                name.contains(normalized, autoescape=True),
+            )
+            .order_by(
+                func.word_similarity(normalized, name).desc(),
+                Section.order.asc(),
+                Section.id.asc(),
             )
-            .order_by(Section.order.asc(), Section.id.asc())
             .limit(limit)
         )
         result = await session.execute(stmt)
@@ -158,6 +223,8 @@ class SectionService:
 
         section.is_active = not section.is_active
         await session.flush()
+        search_index.queue_section(session, section)
+        section_tree.mark_dirty(session)
         logger.info(LogMessages.SECTION_TOGGLED.format(
             section_id=section_id, is_active=section.is_active
         ))
@@ -168,39 +235,39 @@ class SectionService:
         session: AsyncSession,
         source_id: int,
         target_parent_id: Optional[int] = None,
+        progress: Optional[CopyProgress] = None,
     ) -> Optional[Section]:
         source = await self.get_section(session, source_id)
         if source is None:
             return None
 
-        new_section = Section(
-            name=f"{source.name} (نسخة)",
-            description=source.description,
-            parent_id=target_parent_id,
-            order=source.order,
-            is_active=source.is_active,
-        )
-        session.add(new_section)
-        await session.flush()
+        await session.execute(COPY_MAP_DROP)
+        await session.execute(COPY_MAP_CREATE)
+        filled = await session.execute(COPY_MAP_FILL, {"source_id": source_id})
+        total = filled.rowcount
+        new_root_id = (await session.execute(COPY_MAP_ROOT)).scalar_one()
 
-        stmt = select(FileSection).where(FileSection.section_id == source_id)
-        result = await session.execute(stmt)
-        file_sections = list(result.scalars().all())
-        for fs in file_sections:
-            new_fs = FileSection(
-                file_id=fs.file_id,
-                section_id=new_section.id,
+        done = 0
+        while done < total:
+            bounds = {"first": done + 1, "last": min(done + COPY_BATCH_SIZE, total)}
+            inserted = await session.execute(
+                COPY_SECTIONS_BATCH,
+                {**bounds, "suffix": COPY_SUFFIX, "target_parent_id": target_parent_id},
             )
-            session.add(new_fs)
-        await session.flush()
-
-        children_stmt = select(Section).where(Section.parent_id == source_id)
-        children_result = await session.execute(children_stmt)
-        children = list(children_result.scalars().all())
-        for child in children:
-            await self.copy_section_tree(session, child.id, new_section.id)
+            for row in inserted.all():
+                search_index.queue_section(session, row)
+            await session.execute(COPY_FILE_LINKS_BATCH, bounds)
+            done = bounds["last"]
+            if progress is not None:
+                await progress(done, total)
 
-        return new_section
+        section_tree.mark_dirty(session)
+        new_root = await self.get_section(session, new_root_id)
+        if new_root is not None and target_parent_id is not None:
+            await section_counters.adjust(
+                session, {target_parent_id: new_root.subtree_file_count}, own=False,
+            )
+        return new_root
 
 
 section_service = SectionService()
@@ -0,0 +1,239 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods.base import Response, TelegramMethod, TelegramType
+
+from bot.core.constants import LogMessages
+
+logger = logging.getLogger("bot")
+
+RATE_LIMITED_PREFIXES = ("send", "copy", "forward", "edit")
+MAX_TRACKED_CHATS = 10000
+
+ChatKey = Union[int, str]
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BULK = 1
+
+
+_priority: ContextVar[Priority] = ContextVar("outbound_priority", default=Priority.INTERACTIVE)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+@contextmanager
+def bulk_priority() -> Iterator[None]:
+    token = _priority.set(Priority.BULK)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class PriorityTokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._bulk_blocked_until = 0.0
+        self._waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._pump_task: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._waiters)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def _blocked_for(self, priority: int, now: float) -> float:
+        until = self._blocked_until
+        if priority >= Priority.BULK:
+            until = max(until, self._bulk_blocked_until)
+        return until - now
+
+    def pause(self, seconds: float, bulk_only: bool = False) -> None:
+        until = time.monotonic() + seconds
+        if bulk_only:
+            self._bulk_blocked_until = max(self._bulk_blocked_until, until)
+        else:
+            self._blocked_until = max(self._blocked_until, until)
+            self._tokens = 0.0
+        self._wakeup.set()
+
+    async def acquire(self, priority: int = Priority.INTERACTIVE) -> None:
+        now = time.monotonic()
+        self._refill(now)
+        if not self._waiters and self._tokens >= 1.0 and self._blocked_for(priority, now) <= 0:
+            self._tokens -= 1.0
+            return
+
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), future))
+        self._wakeup.set()
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.create_task(self._pump())
+        await future
+
+    async def _pump(self) -> None:
+        while self._waiters:
+            self._wakeup.clear()
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            now = time.monotonic()
+            self._refill(now)
+            delay = self._blocked_for(priority, now)
+            if delay <= 0 and self._tokens < 1.0:
+                delay = (1.0 - self._tokens) / self._rate
+            if delay <= 0:
+                heapq.heappop(self._waiters)
+                self._tokens -= 1.0
+                future.set_result(None)
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+@dataclass
+class WaitStats:
+    count: int = 0
+    total: float = 0.0
+    peak: float = 0.0
+
+    def record(self, waited: float) -> None:
+        self.count += 1
+        self.total += waited
+        self.peak = max(self.peak, waited)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            "max_ms": round(self.peak * 1000, 1),
+        }
+
+
+class SendScheduler(BaseRequestMiddleware):
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        private_chat_rate: float = 1.0,
+        private_chat_burst: float = 3.0,
+        group_chat_rate: float = 20.0 / 60.0,
+        max_retries: int = 3,
+    ):
+        self.configure(global_rate, private_chat_rate, private_chat_burst, group_chat_rate, max_retries)
+
+    def configure(
+        self,
+        global_rate: float,
+        private_chat_rate: float,
+        private_chat_burst: float,
+        group_chat_rate: float,
+        max_retries: int,
+    ) -> None:
+        self._private_chat_rate = private_chat_rate
+        self._private_chat_burst = private_chat_burst
+        self._group_chat_rate = group_chat_rate
+        self._max_retries = max_retries
+        self._global = PriorityTokenBucket(global_rate)
+        self._chats: "OrderedDict[ChatKey, PriorityTokenBucket]" = OrderedDict()
+        self.requests = 0
+        self.retry_after = 0
+        self._waits: Dict[Priority, WaitStats] = {p: WaitStats() for p in Priority}
+
+    def _chat_bucket(self, chat_id: ChatKey) -> PriorityTokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is not None:
+            self._chats.move_to_end(chat_id)
+            return bucket
+        is_private = isinstance(chat_id, int) and chat_id > 0
+        if is_private:
+            bucket = PriorityTokenBucket(self._private_chat_rate, self._private_chat_burst)
+        else:
+            bucket = PriorityTokenBucket(self._group_chat_rate, 1.0)
+        self._chats[chat_id] = bucket
+        while len(self._chats) > MAX_TRACKED_CHATS:
+            oldest = next(iter(self._chats.values()))
+            if oldest.depth:
+                break
+            self._chats.popitem(last=False)
+        return bucket
+
+    async def acquire(self, chat_id: Optional[ChatKey], priority: Priority) -> float:
+        started = time.monotonic()
+        if chat_id is not None:
+            await self._chat_bucket(chat_id).acquire(priority)
+        await self._global.acquire(priority)
+        waited = time.monotonic() - started
+        self._waits[priority].record(waited)
+        return waited
+
+    def on_retry_after(self, chat_id: Optional[ChatKey], seconds: float) -> None:
+        self.retry_after += 1
+        logger.warning(LogMessages.OUTBOUND_RETRY_AFTER.format(chat_id=chat_id, seconds=seconds))
+        if chat_id is not None:
+            self._chat_bucket(chat_id).pause(seconds)
+        self._global.pause(seconds, bulk_only=chat_id is not None)
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        api_method = getattr(method, "__api_method__", "")
+        if not api_method.startswith(RATE_LIMITED_PREFIXES):
+            return await make_request(bot, method)
+
+        chat_id = getattr(method, "chat_id", None)
+        priority = current_priority()
+        attempt = 0
+        while True:
+            await self.acquire(chat_id, priority)
+            self.requests += 1
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                self.on_retry_after(chat_id, e.retry_after)
+                attempt += 1
+                if attempt > self._max_retries:
+                    raise
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retry_after": self.retry_after,
+            "queued_global": self._global.depth,
+            "queued_chats": sum(bucket.depth for bucket in self._chats.values()),
+            "tracked_chats": len(self._chats),
+            "wait": {priority.name.lower(): stats.as_dict() for priority, stats in self._waits.items()},
+        }
+
+
+send_scheduler = SendScheduler()
@@ -1,20 +1,110 @@
+import asyncio
 import json
-from typing import Any, List, Optional
+import logging
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import event, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from bot.core.constants import LogMessages, SettingKeys
 from bot.models.setting import Setting
 
+logger = logging.getLogger("bot")
+
+SETTINGS_NOTIFY_CHANNEL = "settings_changed"
+PENDING_SETTINGS = "settings_pending"
+RELOAD_SETTINGS = "settings_reload"
+
+
+def parse_bool(value: Optional[str], default: bool = False) -> bool:
+    if value is None:
+        return default
+    return value.lower() in {"1", "true", "yes", "on"}
+
+
+def parse_json(value: Optional[str], default: Any) -> Any:
+    if value is None:
+        return default
+    try:
+        return json.loads(value)
+    except Exception:
+        return default
+
+
+def parse_channels(value: Optional[str]) -> List[str]:
+    channels = parse_json(value, default=[])
+    cleaned: List[str] = []
+    for ch in channels if isinstance(channels, list) else []:
+        chs = str(ch).strip()
+        if chs:
+            cleaned.append(chs)
+    return cleaned
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    version: int = 0
+    values: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    subscription_enabled: bool = False
+    subscription_channels: Tuple[str, ...] = ()
+    maintenance_enabled: bool = False
+    maintenance_message: Optional[str] = None
+
+    @classmethod
+    def build(cls, values: Dict[str, str], version: int) -> "SettingsSnapshot":
+        return cls(
+            version=version,
+            values=MappingProxyType(dict(values)),
+            subscription_enabled=parse_bool(values.get(SettingKeys.SUBSCRIPTION_ENABLED)),
+            subscription_channels=tuple(parse_channels(values.get(SettingKeys.SUBSCRIPTION_CHANNELS))),
+            maintenance_enabled=parse_bool(values.get(SettingKeys.MAINTENANCE_ENABLED)),
+            maintenance_message=values.get(SettingKeys.MAINTENANCE_MESSAGE) or None,
+        )
+
 
 class SettingsManager:
+    def __init__(self):
+        self._snapshot: Optional[SettingsSnapshot] = None
+        self._version = 0
+        self._notify_enabled = False
+        self._listener_connection: Any = None
+        self._reload_task: Optional[asyncio.Task] = None
+        self._reload_requested = False
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_interval = 60.0
+
+    @property
+    def snapshot(self) -> Optional[SettingsSnapshot]:
+        return self._snapshot
+
+    def _swap(self, values: Dict[str, str]) -> SettingsSnapshot:
+        self._version += 1
+        self._snapshot = SettingsSnapshot.build(values, self._version)
+        return self._snapshot
+
+    async def load_snapshot(self, session: AsyncSession) -> SettingsSnapshot:
+        result = await session.execute(select(Setting.key, Setting.value))
+        snapshot = self._swap({row.key: row.value for row in result.all()})
+        logger.debug(LogMessages.SETTINGS_SNAPSHOT_LOADED.format(
+            version=snapshot.version, count=len(snapshot.values),
+        ))
+        return snapshot
+
+    async def get_snapshot(self, session: AsyncSession) -> SettingsSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = await self.load_snapshot(session)
+        pending = session.info.get(PENDING_SETTINGS)
+        if pending:
+            return SettingsSnapshot.build({**snapshot.values, **pending}, snapshot.version)
+        return snapshot
+
     async def get_raw(self, session: AsyncSession, key: str, default: Optional[str] = None) -> Optional[str]:
-        stmt = select(Setting).where(Setting.key == key)
-        result = await session.execute(stmt)
-        row = result.scalar_one_or_none()
-        if row is None:
-            return default
-        return row.value
+        snapshot = await self.get_snapshot(session)
+        return snapshot.values.get(key, default)
 
     async def set_raw(self, session: AsyncSession, key: str, value: str) -> None:
         stmt = select(Setting).where(Setting.key == key)
@@ -27,41 +117,101 @@ class SettingsManager:
             row.value = value
         await session.flush()
 
+        session.info.setdefault(PENDING_SETTINGS, {})[key] = value
+        await self.notify_changed(session, key)
+
+    def reload_after_commit(self, session: AsyncSession) -> None:
+        session.info[RELOAD_SETTINGS] = True
+
+    def _apply_committed(self, pending: Dict[str, str]) -> None:
+        values = dict(self._snapshot.values) if self._snapshot is not None else {}
+        values.update(pending)
+        self._swap(values)
+
+    async def notify_changed(self, session: AsyncSession, key: str) -> None:
+        if not self._notify_enabled:
+            return
+        await session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": SETTINGS_NOTIFY_CHANNEL, "payload": key},
+        )
+
+    async def start_listener(self, db: Any) -> None:
+        connection = await db.engine.connect()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.add_listener(SETTINGS_NOTIFY_CHANNEL, self._on_notify)
+        self._listener_connection = connection
+        self._notify_enabled = True
+        logger.info(LogMessages.SETTINGS_LISTENER_STARTED.format(channel=SETTINGS_NOTIFY_CHANNEL))
+
+    def start_refresh(self, interval: float) -> None:
+        if interval <= 0:
+            return
+        self._refresh_interval = interval
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._run_refresh())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        if self._listener_connection is not None:
+            await self._listener_connection.close()
+            self._listener_connection = None
+            self._notify_enabled = False
+
+    async def _run_refresh(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            self.request_reload()
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self.request_reload()
+
+    def request_reload(self) -> None:
+        self._reload_requested = True
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.get_running_loop().create_task(self._reload())
+
+    async def _reload(self) -> None:
+        from bot.core.database import get_db
+        while self._reload_requested:
+            self._reload_requested = False
+            try:
+                db = await get_db()
+                async for session in db.get_session(standalone=True):
+                    await self.load_snapshot(session)
+            except Exception as e:
+                logger.error(LogMessages.SETTINGS_RELOAD_FAIL.format(error=str(e)))
+
     async def get_bool(self, session: AsyncSession, key: str, default: bool = False) -> bool:
         value = await self.get_raw(session, key)
-        if value is None:
-            return default
-        return value.lower() in {"1", "true", "yes", "on"}
+        return parse_bool(value, default)
 
     async def set_bool(self, session: AsyncSession, key: str, value: bool) -> None:
         await self.set_raw(session, key, "true" if value else "false")
 
     async def get_json(self, session: AsyncSession, key: str, default: Any) -> Any:
         value = await self.get_raw(session, key)
-        if value is None:
-            return default
-        try:
-            return json.loads(value)
-        except Exception:
-            return default
+        return parse_json(value, default)
 
     async def set_json(self, session: AsyncSession, key: str, value: Any) -> None:
         await self.set_raw(session, key, json.dumps(value, ensure_ascii=False))
 
     async def get_subscription_enabled(self, session: AsyncSession) -> bool:
-        return await self.get_bool(session, "subscription.enabled", default=False)
+        snapshot = await self.get_snapshot(session)
+        return snapshot.subscription_enabled
 
     async def set_subscription_enabled(self, session: AsyncSession, enabled: bool) -> None:
-        await self.set_bool(session, "subscription.enabled", enabled)
+        await self.set_bool(session, SettingKeys.SUBSCRIPTION_ENABLED, enabled)
 
     async def get_subscription_channels(self, session: AsyncSession) -> List[str]:
-        channels = await self.get_json(session, "subscription.channels", default=[])
-        cleaned: List[str] = []
-        for ch in channels if isinstance(channels, list) else []:
-            chs = str(ch).strip()
-            if chs:
-                cleaned.append(chs)
-        return cleaned
+        snapshot = await self.get_snapshot(session)
+        return list(snapshot.subscription_channels)
 
     async def set_subscription_channels(self, session: AsyncSession, channels: List[str]) -> None:
         unique = []
@@ -72,7 +222,7 @@ class SettingsManager:
                 continue
             seen.add(value)
             unique.append(value)
-        await self.set_json(session, "subscription.channels", unique)
+        await self.set_json(session, SettingKeys.SUBSCRIPTION_CHANNELS, unique)
 
     async def add_subscription_channel(self, session: AsyncSession, channel: str) -> List[str]:
         channels = await self.get_subscription_channels(session)
@@ -90,17 +240,33 @@ class SettingsManager:
         return channels
 
     async def get_maintenance_enabled(self, session: AsyncSession) -> bool:
-        return await self.get_bool(session, "maintenance.enabled", default=False)
+        snapshot = await self.get_snapshot(session)
+        return snapshot.maintenance_enabled
 
     async def set_maintenance_enabled(self, session: AsyncSession, enabled: bool) -> None:
-        await self.set_bool(session, "maintenance.enabled", enabled)
+        await self.set_bool(session, SettingKeys.MAINTENANCE_ENABLED, enabled)
 
     async def get_maintenance_message(self, session: AsyncSession, default: str) -> str:
-        value = await self.get_raw(session, "maintenance.message")
-        return value if value else default
+        snapshot = await self.get_snapshot(session)
+        return snapshot.maintenance_message or default
 
     async def set_maintenance_message(self, session: AsyncSession, message: str) -> None:
-        await self.set_raw(session, "maintenance.message", message)
+        await self.set_raw(session, SettingKeys.MAINTENANCE_MESSAGE, message)
 
 
 settings_manager = SettingsManager()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session: Session) -> None:
+    pending = session.info.pop(PENDING_SETTINGS, None)
+    if pending:
+        settings_manager._apply_committed(pending)
+    if session.info.pop(RELOAD_SETTINGS, False):
+        settings_manager.request_reload()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(PENDING_SETTINGS, None)
+    session.info.pop(RELOAD_SETTINGS, None)
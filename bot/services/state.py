@@ -1,14 +1,19 @@
+import asyncio
+import json
 import logging
 import time
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, TYPE_CHECKING
 from dataclasses import dataclass, field
 
 from bot.core.constants import LogMessages
 
+if TYPE_CHECKING:
+    from bot.services.state_backends import StateBackend
+
 logger = logging.getLogger("bot")
 
 
-@dataclass
+@dataclass(slots=True)
 class UserState:
     name: str
     data: Dict[str, Any] = field(default_factory=dict)
@@ -17,79 +22,133 @@ class UserState:
 
 
 class StateService:
-    def __init__(self, timeout_seconds: int = 300):
-        self._states: Dict[int, UserState] = {}
+    def __init__(
+        self,
+        timeout_seconds: int = 300,
+        backend: Optional["StateBackend"] = None,
+        max_payload_bytes: int = 32768,
+    ):
+        if backend is None:
+            from bot.services.state_backends import MemoryStateBackend
+            backend = MemoryStateBackend()
+        self._backend = backend
         self._timeout = timeout_seconds
-
-    def get_state(self, user_id: int) -> Optional[UserState]:
-        state = self._states.get(user_id)
+        self._max_payload_bytes = max_payload_bytes
+        self._sweeper: Optional[asyncio.Task] = None
+
+    @property
+    def backend(self) -> "StateBackend":
+        return self._backend
+
+    async def _store(self, user_id: int, state: UserState) -> bool:
+        if state.data:
+            size = len(json.dumps(state.data, ensure_ascii=False).encode("utf-8"))
+            if size > self._max_payload_bytes:
+                logger.warning(LogMessages.STATE_PAYLOAD_REJECTED.format(
+                    user_id=user_id, size=size, limit=self._max_payload_bytes,
+                ))
+                return False
+        await self._backend.put(user_id, state, state.created_at + self._timeout)
+        return True
+
+    async def get_state(self, user_id: int) -> Optional[UserState]:
+        state = await self._backend.get(user_id)
         if state is None:
             return None
 
         if time.time() - state.created_at > self._timeout:
-            self.clear_state(user_id)
+            await self.clear_state(user_id)
             logger.info(LogMessages.STATE_EXPIRED.format(user_id=user_id))
             return None
 
         return state
 
-    def set_state(self, user_id: int, state_name: str, data: Optional[Dict[str, Any]] = None) -> UserState:
-        current = self._states.get(user_id)
+    async def set_state(
+        self, user_id: int, state_name: str, data: Optional[Dict[str, Any]] = None
+    ) -> Optional[UserState]:
+        current = await self._backend.get(user_id)
         previous = current.name if current else None
 
         new_state = UserState(
             name=state_name,
             data=data or {},
+            created_at=time.time(),
             previous_state=previous,
         )
-        self._states[user_id] = new_state
+        if not await self._store(user_id, new_state):
+            return None
         logger.debug(LogMessages.STATE_SET.format(user_id=user_id, state=state_name))
         return new_state
 
-    def clear_state(self, user_id: int) -> None:
-        if user_id in self._states:
-            del self._states[user_id]
+    async def clear_state(self, user_id: int) -> None:
+        if await self._backend.delete(user_id):
             logger.debug(LogMessages.STATE_CLEARED.format(user_id=user_id))
 
-    def go_back(self, user_id: int) -> Optional[str]:
-        current = self._states.get(user_id)
+    async def go_back(self, user_id: int) -> Optional[str]:
+        current = await self._backend.get(user_id)
         if current is None:
             return None
 
         previous = current.previous_state
         if previous is None:
-            self.clear_state(user_id)
+            await self.clear_state(user_id)
             return None
 
-        self._states[user_id] = UserState(name=previous)
+        await self._store(user_id, UserState(name=previous, created_at=time.time()))
         return previous
 
-    def has_state(self, user_id: int) -> bool:
-        return self.get_state(user_id) is not None
+    async def has_state(self, user_id: int) -> bool:
+        return await self.get_state(user_id) is not None
 
-    def get_state_data(self, user_id: int, key: str, default: Any = None) -> Any:
-        state = self.get_state(user_id)
+    async def get_state_data(self, user_id: int, key: str, default: Any = None) -> Any:
+        state = await self.get_state(user_id)
         if state is None:
             return default
         return state.data.get(key, default)
 
-    def update_state_data(self, user_id: int, key: str, value: Any) -> None:
-        state = self.get_state(user_id)
-        if state is not None:
-            state.data[key] = value
-
-    def cleanup_expired(self) -> int:
-        now = time.time()
-        expired = [
-            uid for uid, state in self._states.items()
-            if now - state.created_at > self._timeout
-        ]
-        for uid in expired:
-            del self._states[uid]
-
-        if expired:
-            logger.info(LogMessages.STATES_CLEANUP.format(count=len(expired)))
-        return len(expired)
+    async def update_state_data(self, user_id: int, key: str, value: Any) -> bool:
+        state = await self.get_state(user_id)
+        if state is None:
+            return False
+        data = dict(state.data)
+        data[key] = value
+        return await self._store(user_id, UserState(
+            name=state.name,
+            data=data,
+            created_at=state.created_at,
+            previous_state=state.previous_state,
+        ))
+
+    async def cleanup_expired(self) -> int:
+        removed = await self._backend.sweep(time.time())
+        if removed:
+            logger.info(LogMessages.STATES_CLEANUP.format(count=removed))
+        return removed
+
+    async def memory_report(self) -> Dict[str, Any]:
+        return await self._backend.stats()
+
+    async def _run_sweeper(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.cleanup_expired()
+            except Exception as e:
+                logger.error(LogMessages.STATE_SWEEP_FAIL.format(error=str(e)))
+
+    def start_sweeper(self, interval: float) -> None:
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._run_sweeper(interval))
+
+    async def stop_sweeper(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        await self._backend.close()
 
 
 state_service: Optional[StateService] = None
@@ -102,7 +161,15 @@ def get_state_service() -> StateService:
     return state_service
 
 
-def init_state_service(timeout_seconds: int = 300) -> StateService:
+def init_state_service(
+    timeout_seconds: int = 300,
+    backend: Optional["StateBackend"] = None,
+    max_payload_bytes: int = 32768,
+) -> StateService:
     global state_service
-    state_service = StateService(timeout_seconds=timeout_seconds)
+    state_service = StateService(
+        timeout_seconds=timeout_seconds,
+        backend=backend,
+        max_payload_bytes=max_payload_bytes,
+    )
     return state_service
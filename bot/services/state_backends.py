@@ -0,0 +1,192 @@
+import asyncio
+import heapq
+import json
+import os
+import sqlite3
+import sys
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from bot.services.state import UserState
+
+T = TypeVar("T")
+
+
+class StateBackend(ABC):
+    @abstractmethod
+    async def get(self, user_id: int) -> Optional[UserState]:
+        ...
+
+    @abstractmethod
+    async def put(self, user_id: int, state: UserState, expires_at: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, user_id: int) -> bool:
+        ...
+
+    @abstractmethod
+    async def sweep(self, now: float) -> int:
+        ...
+
+    @abstractmethod
+    async def count(self) -> int:
+        ...
+
+    async def stats(self) -> Dict[str, Any]:
+        return {"states": await self.count()}
+
+    async def close(self) -> None:
+        pass
+
+
+def _approx_size(state: UserState) -> int:
+    size = sys.getsizeof(state) + sys.getsizeof(state.name) + sys.getsizeof(state.data)
+    for key, value in state.data.items():
+        size += sys.getsizeof(key) + sys.getsizeof(value)
+    return size
+
+
+class MemoryStateBackend(StateBackend):
+    def __init__(self, max_states: int = 100000):
+        self._max_states = max_states
+        self._states: "OrderedDict[int, Tuple[float, UserState, int]]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, int]] = []
+        self._bytes = 0
+        self.evicted = 0
+
+    async def get(self, user_id: int) -> Optional[UserState]:
+        entry = self._states.get(user_id)
+        if entry is None:
+            return None
+        self._states.move_to_end(user_id)
+        return entry[1]
+
+    async def put(self, user_id: int, state: UserState, expires_at: float) -> None:
+        self._remove(user_id)
+        size = _approx_size(state)
+        self._states[user_id] = (expires_at, state, size)
+        self._bytes += size
+        heapq.heappush(self._expiry_heap, (expires_at, user_id))
+
+        while len(self._states) > self._max_states:
+            oldest = next(iter(self._states))
+            self._remove(oldest)
+            self.evicted += 1
+
+        if len(self._expiry_heap) > 2 * len(self._states) + 64:
+            self._expiry_heap = [(entry[0], uid) for uid, entry in self._states.items()]
+            heapq.heapify(self._expiry_heap)
+
+    def _remove(self, user_id: int) -> bool:
+        entry = self._states.pop(user_id, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[2]
+        return True
+
+    async def delete(self, user_id: int) -> bool:
+        return self._remove(user_id)
+
+    async def sweep(self, now: float) -> int:
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, user_id = heapq.heappop(heap)
+            entry = self._states.get(user_id)
+            if entry is not None and entry[0] == expires_at:
+                self._remove(user_id)
+                removed += 1
+        return removed
+
+    async def count(self) -> int:
+        return len(self._states)
+
+    async def stats(self) -> Dict[str, Any]:
+        return {
+            "states": len(self._states),
+            "max_states": self._max_states,
+            "approx_bytes": self._bytes + sys.getsizeof(self._states) + sys.getsizeof(self._expiry_heap),
+            "evicted": self.evicted,
+        }
+
+
+class SqliteStateBackend(StateBackend):
+    """SQLite-backed states; every statement runs on one dedicated worker thread
+    so lock waits (``timeout``) never block the event loop."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-sqlite")
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS user_states ("
+            "user_id INTEGER PRIMARY KEY, "
+            "name TEXT NOT NULL, "
+            "data TEXT NOT NULL, "
+            "previous_state TEXT, "
+            "created_at REAL NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_user_states_expires_at ON user_states (expires_at)"
+        )
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _fetchone(self, sql: str, params: Tuple[Any, ...] = ()) -> Any:
+        return self._conn.execute(sql, params).fetchone()
+
+    def _rowcount(self, sql: str, params: Tuple[Any, ...] = ()) -> int:
+        return self._conn.execute(sql, params).rowcount
+
+    async def get(self, user_id: int) -> Optional[UserState]:
+        row = await self._run(
+            self._fetchone,
+            "SELECT name, data, previous_state, created_at FROM user_states WHERE user_id = ?",
+            (user_id,),
+        )
+        if row is None:
+            return None
+        name, data, previous_state, created_at = row
+        return UserState(name=name, data=json.loads(data), created_at=created_at, previous_state=previous_state)
+
+    async def put(self, user_id: int, state: UserState, expires_at: float) -> None:
+        payload = json.dumps(state.data, ensure_ascii=False)
+        await self._run(
+            self._rowcount,
+            "INSERT OR REPLACE INTO user_states "
+            "(user_id, name, data, previous_state, created_at, expires_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (user_id, state.name, payload, state.previous_state, state.created_at, expires_at),
+        )
+
+    async def delete(self, user_id: int) -> bool:
+        return await self._run(self._rowcount, "DELETE FROM user_states WHERE user_id = ?", (user_id,)) > 0
+
+    async def sweep(self, now: float) -> int:
+        return await self._run(self._rowcount, "DELETE FROM user_states WHERE expires_at <= ?", (now,))
+
+    async def count(self) -> int:
+        return (await self._run(self._fetchone, "SELECT COUNT(*) FROM user_states"))[0]
+
+    async def stats(self) -> Dict[str, Any]:
+        page_count = (await self._run(self._fetchone, "PRAGMA page_count"))[0]
+        page_size = (await self._run(self._fetchone, "PRAGMA page_size"))[0]
+        return {"states": await self.count(), "approx_bytes": page_count * page_size}
+
+    async def close(self) -> None:
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=True)
+
+
+def create_state_backend(kind: str, path: str = "", max_states: int = 100000) -> StateBackend:
+    if kind == "sqlite":
+        return SqliteStateBackend(path)
+    return MemoryStateBackend(max_states=max_states)
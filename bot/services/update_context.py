@@ -0,0 +1,58 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.models.user import UserRole
+from bot.services.settings_manager import SettingsSnapshot, settings_manager
+from bot.services.user import user_service
+
+
+@dataclass(frozen=True)
+class UpdateContext:
+    user_id: int
+    registered: bool = False
+    is_blocked: bool = False
+    role: UserRole = UserRole.USER
+    subscription_enabled: bool = False
+    subscription_channels: List[str] = field(default_factory=list)
+    maintenance_enabled: bool = False
+    maintenance_message: Optional[str] = None
+
+
+def _build(
+    user_id: int, registered: bool, role: UserRole, is_blocked: bool, settings: SettingsSnapshot
+) -> UpdateContext:
+    return UpdateContext(
+        user_id=user_id,
+        registered=registered,
+        is_blocked=is_blocked,
+        role=role,
+        subscription_enabled=settings.subscription_enabled,
+        subscription_channels=list(settings.subscription_channels),
+        maintenance_enabled=settings.maintenance_enabled,
+        maintenance_message=settings.maintenance_message,
+    )
+
+
+def get_cached_update_context(user_id: int) -> Optional[UpdateContext]:
+    settings = settings_manager.snapshot
+    if settings is None:
+        return None
+    attributes = user_service.cache.get(user_id)
+    if attributes is None:
+        return None
+
+    role, is_blocked = attributes
+    return _build(user_id, True, role, is_blocked, settings)
+
+
+async def load_update_context(session: AsyncSession, user_id: int) -> UpdateContext:
+    """Read-only: the user row is written by UserTrackingMiddleware once gating passes."""
+    attributes = await user_service.get_attributes(session, user_id)
+    settings = await settings_manager.get_snapshot(session)
+
+    if attributes is None:
+        return _build(user_id, False, UserRole.USER, False, settings)
+    role, is_blocked = attributes
+    return _build(user_id, True, role, is_blocked, settings)
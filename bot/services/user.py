@@ -1,16 +1,87 @@
 import logging
-from typing import List, Optional, Tuple
-from sqlalchemy import select, update
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import event, select, update, func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from bot.models.user import User, UserRole
 from bot.core.constants import LogMessages
 
 logger = logging.getLogger("bot")
 
+STALE_USERS = "user_cache_stale"
+
+
+class UserAttributeCache:
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 300.0):
+        self._max_size = max_size
+        self._ttl = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, UserRole, bool]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[Tuple[UserRole, bool]]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, role, is_blocked = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[user_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return role, is_blocked
+
+    def put(self, user_id: int, role: UserRole, is_blocked: bool) -> None:
+        self._entries[user_id] = (time.monotonic() + self._ttl, role, is_blocked)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def _as_role(role: Any) -> Optional[UserRole]:
+    if role is None:
+        return None
+    return UserRole(role) if isinstance(role, str) else role
+
 
 class UserService:
+    def __init__(self):
+        self.cache = UserAttributeCache()
+
+    def configure_cache(self, max_size: int, ttl_seconds: float) -> None:
+        self.cache = UserAttributeCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def _mark_stale(self, session: AsyncSession, user_id: int) -> None:
+        # Evicted again after commit: a reader racing the transaction may
+        # have cached the old row in between.
+        self.cache.invalidate(user_id)
+        session.info.setdefault(STALE_USERS, set()).add(user_id)
+
     async def get_or_create(
         self,
         session: AsyncSession,
@@ -36,11 +107,10 @@ class UserService:
             last_name=last_name,
             username=username,
         )
-        session.add(user)
         try:
-            await session.flush()
+            async with session.begin_nested():
+                session.add(user)
         except IntegrityError:
-            await session.rollback()
             stmt = select(User).where(User.id == user_id)
             result = await session.execute(stmt)
             user = result.scalar_one_or_none()
@@ -50,34 +120,102 @@ class UserService:
         logger.info(LogMessages.USER_CREATED.format(user_id=user_id))
         return user, True
 
+    async def upsert_and_load(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        first_name: str,
+        last_name: Optional[str] = None,
+        username: Optional[str] = None,
+    ) -> Any:
+        stmt = pg_insert(User).values(
+            id=user_id,
+            first_name=first_name,
+            last_name=last_name,
+            username=username,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.id],
+            set_={
+                "first_name": stmt.excluded.first_name,
+                "last_name": stmt.excluded.last_name,
+                "username": stmt.excluded.username,
+                "last_active_at": func.now(),
+                "bot_blocked": False,
+            },
+        ).returning(
+            User.is_blocked,
+            User.role,
+            literal_column("(xmax = 0)").label("inserted"),
+        )
+        result = await session.execute(stmt)
+        row = result.one()
+        self.cache.put(user_id, _as_role(row.role) or UserRole.USER, row.is_blocked is True)
+        if row.inserted:
+            logger.info(LogMessages.USER_CREATED.format(user_id=user_id))
+        return row
+
+    async def bulk_touch(self, session: AsyncSession, profiles: List[Dict[str, Any]]) -> None:
+        if not profiles:
+            return
+        stmt = pg_insert(User).values(profiles)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.id],
+            set_={
+                "first_name": stmt.excluded.first_name,
+                "last_name": stmt.excluded.last_name,
+                "username": stmt.excluded.username,
+                "last_active_at": stmt.excluded.last_active_at,
+                "bot_blocked": False,
+            },
+        )
+        await session.execute(stmt)
+
     async def get_by_id(self, session: AsyncSession, user_id: int) -> Optional[User]:
         stmt = select(User).where(User.id == user_id)
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def is_blocked(self, session: AsyncSession, user_id: int) -> bool:
-        stmt = select(User.is_blocked).where(User.id == user_id)
+    async def get_attributes(
+        self, session: AsyncSession, user_id: int
+    ) -> Optional[Tuple[UserRole, bool]]:
+        cached = self.cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        stmt = select(User.role, User.is_blocked).where(User.id == user_id)
         result = await session.execute(stmt)
-        blocked = result.scalar_one_or_none()
-        return blocked is True
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        attributes = (_as_role(row.role) or UserRole.USER, row.is_blocked is True)
+        self.cache.put(user_id, *attributes)
+        return attributes
+
+    async def is_blocked(self, session: AsyncSession, user_id: int) -> bool:
+        attributes = await self.get_attributes(session, user_id)
+        if attributes is None:
+            return False
+        return attributes[1]
 
     async def get_role(self, session: AsyncSession, user_id: int) -> Optional[UserRole]:
-        stmt = select(User.role).where(User.id == user_id)
-        result = await session.execute(stmt)
-        role = result.scalar_one_or_none()
-        if role is None:
+        attributes = await self.get_attributes(session, user_id)
+        if attributes is None:
             return None
-        return UserRole(role) if isinstance(role, str) else role
+        return attributes[0]
 
     async def set_role(self, session: AsyncSession, user_id: int, role: UserRole) -> None:
         stmt = update(User).where(User.id == user_id).values(role=role)
         await session.execute(stmt)
         await session.flush()
+        self._mark_stale(session, user_id)
 
     async def set_blocked(self, session: AsyncSession, user_id: int, blocked: bool) -> None:
         stmt = update(User).where(User.id == user_id).values(is_blocked=blocked)
         await session.execute(stmt)
         await session.flush()
+        self._mark_stale(session, user_id)
 
 
     async def list_moderators(self, session: AsyncSession) -> List[User]:
@@ -95,6 +233,26 @@ class UserService:
         result = await session.execute(stmt)
         return [int(v) for v in result.scalars().all()]
 
+    async def list_recipient_ids_after(self, session: AsyncSession, after_id: int, limit: int) -> List[int]:
+        stmt = (
+            select(User.id)
+            .where(User.id > after_id, User.bot_blocked == False)
+            .order_by(User.id.asc())
+            .limit(limit)
+        )
+        result = await session.execute(stmt)
+        return [int(v) for v in result.scalars().all()]
+
+    async def count_recipients(self, session: AsyncSession, after_id: int = 0) -> int:
+        stmt = select(func.count()).select_from(User).where(User.id > after_id, User.bot_blocked == False)
+        result = await session.execute(stmt)
+        return int(result.scalar_one())
+
+    async def mark_bot_blocked(self, session: AsyncSession, user_ids: List[int]) -> None:
+        if not user_ids:
+            return
+        await session.execute(update(User).where(User.id.in_(user_ids)).values(bot_blocked=True))
+
     async def search_by_id_or_username(
         self, session: AsyncSession, query: str
     ) -> Optional[User]:
@@ -112,3 +270,9 @@ class UserService:
 
 
 user_service = UserService()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for user_id in session.info.pop(STALE_USERS, ()):
+        user_service.cache.invalidate(user_id)
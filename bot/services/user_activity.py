@@ -0,0 +1,94 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from bot.core.constants import LogMessages
+from bot.core.database import get_db
+from bot.services.user import user_service
+
+logger = logging.getLogger("bot")
+
+FLUSH_BATCH_SIZE = 1000
+
+
+class UserActivityBuffer:
+    def __init__(self, flush_interval: float = 10.0):
+        self._flush_interval = flush_interval
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self.recorded = 0
+        self.flushed_rows = 0
+        self.flushes = 0
+
+    def record(
+        self,
+        user_id: int,
+        first_name: str,
+        last_name: Optional[str] = None,
+        username: Optional[str] = None,
+    ) -> None:
+        self._pending[user_id] = {
+            "id": user_id,
+            "first_name": first_name,
+            "last_name": last_name,
+            "username": username,
+            "last_active_at": datetime.now(timezone.utc),
+        }
+        self.recorded += 1
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            pending, self._pending = self._pending, {}
+            profiles: List[Dict[str, Any]] = list(pending.values())
+            try:
+                db = await get_db()
+                async for session in db.get_session():
+                    for start in range(0, len(profiles), FLUSH_BATCH_SIZE):
+                        await user_service.bulk_touch(session, profiles[start:start + FLUSH_BATCH_SIZE])
+            except Exception as e:
+                for profile in profiles:
+                    self._pending.setdefault(profile["id"], profile)
+                logger.error(LogMessages.USER_ACTIVITY_FLUSH_FAIL.format(count=len(profiles), error=str(e)))
+                return 0
+
+            self.flushes += 1
+            self.flushed_rows += len(profiles)
+            logger.debug(LogMessages.USER_ACTIVITY_FLUSHED.format(count=len(profiles)))
+            return len(profiles)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+    def start(self, flush_interval: Optional[float] = None) -> None:
+        if flush_interval is not None:
+            self._flush_interval = flush_interval
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "flushed_rows": self.flushed_rows,
+            "flushes": self.flushes,
+        }
+
+
+user_activity = UserActivityBuffer()
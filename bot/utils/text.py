@@ -0,0 +1,21 @@
+import re
+
+ARABIC_DIACRITICS = re.compile("[\u064b-\u0652\u0670\u0640]")
+WHITESPACE = re.compile(r"\s+")
+
+ARABIC_LETTER_FOLDS = str.maketrans({
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+    "ٱ": "ا",
+    "ى": "ي",
+    "ة": "ه",
+    "ؤ": "و",
+    "ئ": "ي",
+})
+
+
+def normalize_arabic(text: str) -> str:
+    text = ARABIC_DIACRITICS.sub("", text.lower())
+    text = text.translate(ARABIC_LETTER_FOLDS)
+    return WHITESPACE.sub(" ", text).strip()
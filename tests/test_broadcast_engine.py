@@ -0,0 +1,184 @@
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+
+from bot.services.broadcast import BroadcastEngine
+
+
+class FakeDatabase:
+    async def get_session(self, standalone=False):
+        yield object()
+
+
+class FakeJobService:
+    def __init__(self):
+        self.jobs = {}
+        self.deliveries = {}
+        self.checkpoints = []
+
+    async def create(self, session, admin_id, payload, total, chat_id=None, message_id=None):
+        job = SimpleNamespace(
+            id=len(self.jobs) + 1, admin_id=admin_id, payload=json.dumps(payload), status="running",
+            cursor=0, total=total, sent=0, failed=0, chat_id=chat_id, message_id=message_id,
+        )
+        self.jobs[job.id] = job
+        return job
+
+    async def get(self, session, job_id):
+        return self.jobs.get(job_id)
+
+    async def list_by_status(self, session, status):
+        return [job for job in self.jobs.values() if job.status == status]
+
+    async def set_status(self, session, job_id, status):
+        self.jobs[job_id].status = status
+
+    async def delivered_user_ids(self, session, job_id, after_id):
+        return {uid for (jid, uid) in self.deliveries if jid == job_id and uid > after_id}
+
+    async def checkpoint(self, session, job_id, cursor, sent, failed, deliveries, status=None):
+        self.checkpoints.append((cursor, len(deliveries), status))
+        for row in deliveries:
+            self.deliveries[(row["job_id"], row["user_id"])] = row["status"]
+        job = self.jobs[job_id]
+        job.cursor, job.sent, job.failed = cursor, sent, failed
+        if status is not None:
+            job.status = status
+
+
+class FakeBot:
+    def __init__(self, flooded=None, blocked=(), on_send=None):
+        self.sent = []
+        self.edits = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._flooded = flooded
+        self._blocked = set(blocked)
+        self._on_send = on_send
+
+    async def send_message(self, chat_id, text):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if chat_id == self._flooded:
+                raise TelegramRetryAfter(method=MagicMock(), message="flood", retry_after=0)
+            if chat_id in self._blocked:
+                raise TelegramForbiddenError(method=MagicMock(), message="blocked")
+            self.sent.append(chat_id)
+            if self._on_send is not None:
+                self._on_send(chat_id)
+        finally:
+            self.in_flight -= 1
+
+    async def edit_message_text(self, text, chat_id=None, message_id=None, reply_markup=None):
+        self.edits.append(text)
+
+
+class FakeI18n:
+    def get(self, key, **kwargs):
+        return f"{key}:{kwargs}"
+
+
+class BroadcastEngineTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.jobs = FakeJobService()
+        self.user_ids = []
+        self.engine = BroadcastEngine(concurrency=4, chunk_size=3, progress_interval=60)
+
+        async def list_after(session, after_id, limit):
+            return [uid for uid in self.user_ids if uid > after_id][:limit]
+
+        self.pages = AsyncMock(side_effect=list_after)
+        self.log_action = AsyncMock()
+        patchers = [
+            patch("bot.services.broadcast.get_db", AsyncMock(return_value=FakeDatabase())),
+            patch("bot.services.broadcast.broadcast_job_service", self.jobs),
+            patch("bot.services.broadcast.user_service.list_recipient_ids_after", self.pages),
+            patch("bot.services.broadcast.user_service.count_recipients",
+                  AsyncMock(side_effect=lambda session: len(self.user_ids))),
+            patch("bot.services.broadcast.audit_service.log_action", self.log_action),
+            patch("bot.services.broadcast.get_i18n", return_value=FakeI18n()),
+            patch("bot.services.broadcast.InlineKeyboardMarkup", MagicMock()),
+            patch("bot.services.broadcast.InlineKeyboardButton", MagicMock()),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def _start(self, bot):
+        job_id = await self.engine.start(bot, 1, {"type": "text", "text": "hi"}, chat_id=1, message_id=2)
+        self.assertIsNotNone(job_id)
+        self.assertIsNone(await self.engine.start(bot, 1, {"type": "text", "text": "hi"}))
+        await self.engine._task
+        return job_id
+
+    async def test_streams_recipients_in_keyset_pages_and_checkpoints(self):
+        self.user_ids = list(range(1, 11))
+        bot = FakeBot()
+        job_id = await self._start(bot)
+
+        self.assertEqual(sorted(bot.sent), self.user_ids)
+        self.assertEqual([c.args[1] for c in self.pages.await_args_list], [0, 3, 6, 9, 10])
+        self.assertLessEqual(bot.max_in_flight, 4)
+        self.assertEqual(self.jobs.checkpoints, [(3, 3, None), (6, 3, None), (9, 3, None), (10, 1, None), (10, 0, "completed")])
+        self.assertEqual(self.jobs.jobs[job_id].status, "completed")
+        self.assertEqual(self.engine.progress.sent, 10)
+        self.log_action.assert_awaited_once()
+        self.assertTrue(bot.edits[-1].startswith("admin.broadcast.done"))
+
+    async def test_forbidden_is_recorded_as_blocked_and_exhausted_flood_as_failed(self):
+        self.user_ids = [1, 2, 3, 4]
+        bot = FakeBot(flooded=2, blocked={3})
+        job_id = await self._start(bot)
+
+        self.assertEqual(sorted(bot.sent), [1, 4])
+        self.assertEqual(self.engine.progress.sent, 2)
+        self.assertEqual(self.engine.progress.failed, 2)
+        self.assertEqual(self.jobs.deliveries[(job_id, 3)], "blocked")
+        self.assertEqual(self.jobs.deliveries[(job_id, 2)], "failed")
+
+    async def test_sends_run_with_bulk_priority(self):
+        from bot.services.send_scheduler import Priority, current_priority
+
+        seen = []
+        self.user_ids = [1]
+        bot = FakeBot(on_send=lambda uid: seen.append(current_priority()))
+        await self._start(bot)
+        self.assertEqual(seen, [Priority.BULK])
+        self.assertEqual(current_priority(), Priority.INTERACTIVE)
+
+    async def test_paused_job_resumes_without_resending(self):
+        self.user_ids = list(range(1, 11))
+        bot = FakeBot(on_send=lambda uid: uid == 5 and self.engine.pause(1))
+        job_id = await self._start(bot)
+
+        job = self.jobs.jobs[job_id]
+        self.assertEqual(job.status, "paused")
+        self.assertEqual(job.cursor, 3)
+        self.assertLess(len(bot.sent), 10)
+
+        self.assertTrue(await self.engine.resume(bot, job_id))
+        await self.engine._task
+        self.assertEqual(sorted(bot.sent), self.user_ids)
+        self.assertEqual(job.status, "completed")
+        self.assertEqual(job.sent, 10)
+
+    async def test_interrupted_job_is_resumed_on_startup(self):
+        self.user_ids = [1, 2, 3, 4]
+        job = await self.jobs.create(None, 1, {"type": "text", "text": "hi"}, total=4)
+        job.cursor = 3
+        bot = FakeBot()
+
+        self.assertEqual(await self.engine.resume_interrupted(bot), job.id)
+        await self.engine._task
+        self.assertEqual(bot.sent, [4])
+        self.assertEqual(job.status, "completed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+from types import SimpleNamespace
+
+from bot.core.constants import CallbackPrefixes
+from bot.modules.callback_codec import decode_args, encode_callback
+from bot.modules.central_router import CentralRouter
+
+ROUTES = {
+    name: value for name, value in vars(CallbackPrefixes).items()
+    if not name.startswith("_") and isinstance(value, str)
+}
+
+SAMPLE_CALLBACKS = [
+    "home", "sec:12", "sec_back:3", "fpage:4:2", "file:88", "sr_sec:5", "search",
+    "adm_bc_txt", "adm_ban_block", "adm_maint_tog", "adm_fp:2", "adm_mtp:9:upload",
+    "adm_sub_rm:1", "back", "unknown_cb",
+]
+
+
+def _handler(name):
+    async def handler(callback, kwargs):
+        return name
+    handler.__name__ = name
+    return handler
+
+
+def _longest_prefix(routes, data):
+    matches = [prefix for prefix in routes if data.startswith(prefix)]
+    return max(matches, key=len) if matches else None
+
+
+class CentralRouterDispatchTests(unittest.TestCase):
+    def setUp(self):
+        self.router = CentralRouter()
+        for name, prefix in ROUTES.items():
+            self.router.register(prefix, _handler(name))
+        self.router.compile()
+
+    def test_longest_prefix_wins_regardless_of_registration_order(self):
+        self.assertEqual(self.router.resolve("adm_bc_txt")[1].__name__, "ADMIN_BROADCAST_TEXT")
+        self.assertEqual(self.router.resolve("adm_bc")[1].__name__, "ADMIN_BROADCAST")
+        self.assertEqual(self.router.resolve("sr_sec:4")[1].__name__, "SEARCH_RESULT_SECTION")
+        self.assertEqual(self.router.resolve("sec_ccopy:7")[1].__name__, "SECTION_ADMIN_CONFIRM_COPY")
+        self.assertEqual(self.router.resolve("adm_maint_msg")[1].__name__, "ADMIN_MAINT_SET_MESSAGE")
+        self.assertIsNone(self.router.resolve("unknown_cb"))
+
+    def test_conflicting_registration_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.router.register(CallbackPrefixes.HOME, _handler("other"))
+        with self.assertRaises(ValueError):
+            self.router.register("", _handler("empty"))
+
+    def test_resolve_matches_longest_registered_prefix(self):
+        routes = dict(self.router._routes)
+        for data in SAMPLE_CALLBACKS + list(routes):
+            expected = _longest_prefix(routes, data)
+            match = self.router.resolve(data)
+            if expected is None:
+                self.assertIsNone(match, data)
+            else:
+                self.assertEqual(match, (expected, routes[expected]), data)
+
+
+class CallbackCodecTests(unittest.IsolatedAsyncioTestCase):
+    def test_encode_decode_round_trip(self):
+        data = encode_callback(CallbackPrefixes.ADMIN_MOD_TOGGLE_PERM, 42, "can_upload")
+        self.assertEqual(data, "adm_mtp:42:can_upload")
+        raw = data[len(CallbackPrefixes.ADMIN_MOD_TOGGLE_PERM):]
+        self.assertEqual(decode_args(raw, (int, str)), (42, "can_upload"))
+        self.assertEqual(decode_args("home.welcome:x", (str,)), ("home.welcome:x",))
+        with self.assertRaises(ValueError):
+            decode_args("42", (int, int))
+        with self.assertRaises(ValueError):
+            encode_callback(CallbackPrefixes.ADMIN_TEXT_EDIT, "k" * 64)
+
+    async def test_router_decodes_once_and_redispatches_without_mutation(self):
+        router = CentralRouter()
+        seen = []
+
+        async def page(callback, kwargs):
+            seen.append(("page", kwargs["callback_args"]))
+            await router.redispatch(callback, CallbackPrefixes.FILE_VIEW, kwargs, 9)
+
+        async def view(callback, kwargs):
+            seen.append(("view", kwargs["callback_args"]))
+
+        router.register(CallbackPrefixes.FILE_PAGE, page, args=(int, int))
+        router.register(CallbackPrefixes.FILE_VIEW, view, args=(int,))
+
+        async def answer(*args, **kwargs):
+            seen.append(("answer",))
+
+        callback = SimpleNamespace(data="fpage:3:2", answer=answer)
+        await router._handle_callback(callback)
+        self.assertEqual(seen, [("page", (3, 2)), ("view", (9,))])
+        self.assertEqual(callback.data, "fpage:3:2")
+
+        seen.clear()
+        await router._handle_callback(SimpleNamespace(data="fpage:x", answer=answer))
+        self.assertEqual(seen, [("answer",)])
+
+
+if __name__ == "__main__":
+    unittest.main()
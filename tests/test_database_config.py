@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import MagicMock
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from bot.core.config import DatabaseConfig
+from bot.core.database import Database, MeteredQueuePool, _install_idle_pre_ping, _split_url
+
+
+class DatabaseUrlTests(unittest.TestCase):
+    def test_libpq_options_become_connect_args(self):
+        url, connect_args = _split_url(
+            "postgresql://u:p@db:5432/app?sslmode=require&application_name=bot"
+            "&options=-c%20statement_timeout%3D5000"
+        )
+        self.assertEqual(url, "postgresql+asyncpg://u:p@db:5432/app")
+        self.assertEqual(connect_args, {
+            "ssl": "require",
+            "server_settings": {"application_name": "bot", "statement_timeout": "5000"},
+        })
+
+    def test_plain_url(self):
+        self.assertEqual(_split_url("postgres://u:p@db/app"), ("postgresql+asyncpg://u:p@db/app", {}))
+
+    def test_engine_uses_config(self):
+        options = DatabaseConfig(
+            url="", pool_size=3, max_overflow=2, statement_cache_size=0,
+            statement_timeout_ms=2000, application_name="worker", pre_ping="never",
+        )
+        db = Database("postgresql://u:p@db/app?application_name=from-url", options)
+        pool = db.engine.sync_engine.pool
+        self.assertIsInstance(pool, MeteredQueuePool)
+        self.assertEqual((pool.size(), pool._max_overflow), (3, 2))
+        self.assertEqual(db.engine.url.query["prepared_statement_cache_size"], "0")
+        self.assertEqual(db.pool_stats()["checked_out"], 0)
+
+
+class MeteredPoolTests(unittest.IsolatedAsyncioTestCase):
+    async def test_counts_waits_and_timeouts(self):
+        pool = MeteredQueuePool(MagicMock, pool_size=1, max_overflow=0, timeout=0.02)
+        connection = await greenlet_spawn(pool.connect)
+        with self.assertRaises(PoolTimeoutError):
+            await greenlet_spawn(pool.connect)
+        stats = pool.stats()
+        self.assertEqual((stats["checked_out"], stats["checkouts"], stats["timeouts"]), (1, 1, 1))
+        self.assertGreaterEqual(stats["wait_ms_max"], 15)
+        connection.close()
+        self.assertEqual(pool.stats()["checked_in"], 1)
+
+    async def test_idle_pre_ping_replaces_dead_connection(self):
+        dead = MagicMock()
+        dead.cursor.return_value.execute.side_effect = OSError("connection reset")
+        creator = MagicMock(side_effect=[dead, MagicMock()])
+        pool = MeteredQueuePool(creator, pool_size=1, max_overflow=0)
+        _install_idle_pre_ping(pool, idle_seconds=0)
+
+        (await greenlet_spawn(pool.connect)).close()
+        connection = await greenlet_spawn(pool.connect)
+        self.assertEqual(creator.call_count, 2)
+        self.assertIsNot(connection.dbapi_connection, dead)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aiogram.exceptions import TelegramRetryAfter
+
+from bot.services.file_delivery import FileDeliveryService, plan_batches
+
+
+def _file(file_id, file_type):
+    return SimpleNamespace(id=file_id, file_id=f"tg{file_id}", file_type=file_type, caption=None)
+
+
+class FakeDatabase:
+    async def get_session(self, read_only=False):
+        yield object()
+
+
+class FakeBot:
+    def __init__(self, flood_once=False, broken_groups=False):
+        self.calls = []
+        self.edits = []
+        self._flood_once = flood_once
+        self._broken_groups = broken_groups
+
+    async def send_media_group(self, chat_id, media):
+        if self._flood_once:
+            self._flood_once = False
+            raise TelegramRetryAfter(method=MagicMock(), message="flood", retry_after=0)
+        if self._broken_groups:
+            raise RuntimeError("bad file")
+        self.calls.append(("group", [m.media for m in media]))
+
+    async def send_document(self, chat_id, document, caption=None):
+        self.calls.append(("document", document))
+
+    async def send_photo(self, chat_id, photo, caption=None):
+        self.calls.append(("photo", photo))
+
+    async def send_voice(self, chat_id, voice, caption=None):
+        self.calls.append(("voice", voice))
+
+    async def edit_message_text(self, text, chat_id=None, message_id=None):
+        self.edits.append(text)
+
+
+class FakeI18n:
+    def get(self, key, **kwargs):
+        return f"{key}:{kwargs}"
+
+
+class PlanBatchesTests(unittest.TestCase):
+    def test_groups_compatible_runs_up_to_ten(self):
+        files = (
+            [_file(i, "photo") for i in range(1, 4)]
+            + [_file(4, "video")]
+            + [_file(i, "document") for i in range(5, 17)]
+            + [_file(17, "voice"), _file(18, "audio")]
+        )
+        batches = [[f.id for f in b] for b in plan_batches(files)]
+        self.assertEqual(batches, [
+            [1, 2, 3, 4],
+            list(range(5, 15)),
+            [15, 16],
+            [17],
+            [18],
+        ])
+
+
+class FileDeliveryServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def _deliver(self, bot, files, page_size=50):
+        async def page(session, section_id, after_id, limit):
+            return [f for f in files if f.id > after_id][:limit]
+
+        pages = AsyncMock(side_effect=page)
+        service = FileDeliveryService(page_size=page_size)
+        with patch("bot.services.file_delivery.get_db", AsyncMock(return_value=FakeDatabase())), \
+                patch("bot.services.file_delivery.file_service.list_files_by_section_after", pages), \
+                patch("bot.services.file_delivery.get_i18n", return_value=FakeI18n()):
+            sent = await service._run(bot, 7, 1, status_message_id=99)
+        return sent, pages
+
+    async def test_streams_pages_and_keeps_groups_across_page_boundaries(self):
+        files = [_file(i, "document") for i in range(1, 26)]
+        bot = FakeBot()
+        sent, pages = await self._deliver(bot, files, page_size=8)
+
+        self.assertEqual(sent, 25)
+        self.assertEqual([len(ids) for kind, ids in bot.calls], [10, 10, 5])
+        self.assertEqual([c.args[2] for c in pages.await_args_list], [0, 8, 16, 24])
+        self.assertTrue(bot.edits[-1].startswith("files.delivery.done"))
+
+    async def test_rejected_group_falls_back_to_single_sends(self):
+        bot = FakeBot(broken_groups=True)
+        sent, _ = await self._deliver(bot, [_file(1, "photo"), _file(2, "photo")])
+        self.assertEqual(sent, 2)
+        self.assertEqual(bot.calls, [("photo", "tg1"), ("photo", "tg2")])
+
+        bot = FakeBot(flood_once=True)
+        sent, _ = await self._deliver(bot, [_file(1, "photo"), _file(2, "photo"), _file(3, "voice")])
+        self.assertEqual(sent, 1)
+        self.assertEqual(bot.calls, [("voice", "tg3")])
+
+    async def test_new_request_cancels_previous_delivery(self):
+        service = FileDeliveryService()
+        started = asyncio.Event()
+
+        async def slow_run(bot, chat_id, section_id, status_message_id):
+            started.set()
+            await asyncio.sleep(10)
+
+        with patch.object(service, "_run", slow_run):
+            service.start(None, 7, 1)
+            first = service._tasks[7]
+            await started.wait()
+            service.start(None, 7, 2)
+            await asyncio.sleep(0)
+            self.assertTrue(first.cancelled())
+            self.assertTrue(service.is_active(7))
+            self.assertTrue(service.cancel(7))
+            await service.stop()
+        self.assertFalse(service.is_active(7))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from aiogram.types import InlineQueryResultCachedDocument, InlineQueryResultCachedPhoto, Update
+
+from bot.handlers import inline
+from bot.middlewares.maintenance_check import MaintenanceCheckMiddleware
+from bot.services.search import HIT_FILE, HIT_SECTION, SearchHit, SearchResults
+
+
+class FakeDatabase:
+    async def get_session(self, read_only=False):
+        yield object()
+
+
+def _file(file_id, file_type="document"):
+    return SimpleNamespace(
+        id=file_id, file_id=f"tg{file_id}", file_type=file_type, name=f"ملف {file_id}", caption=None,
+    )
+
+
+class InlineSearchTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        inline.configure_inline_search(cache_time=120, page_size=2)
+        self.addCleanup(inline.configure_inline_search, 300, 20)
+        hits = [SearchHit(HIT_SECTION, 9, "قسم")] + [SearchHit(HIT_FILE, i, f"ملف {i}") for i in range(1, 6)]
+        self.results = SearchResults(token=1, query="ملف", generation=0, hits=hits, sections=1, files=5)
+        self.files = {1: _file(1, "photo"), 2: _file(2), 3: _file(3, "video_note"), 4: _file(4), 5: _file(5)}
+
+        async def by_ids(session, ids):
+            return [self.files[i] for i in ids]
+
+        self.by_ids = AsyncMock(side_effect=by_ids)
+        patchers = [
+            patch("bot.handlers.inline.search_service.search", AsyncMock(return_value=self.results)),
+            patch("bot.handlers.inline.file_service.get_published_files_by_ids", self.by_ids),
+            patch("bot.handlers.inline.get_db", AsyncMock(return_value=FakeDatabase())),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _query(self, text, offset=""):
+        return SimpleNamespace(query=text, offset=offset, from_user=SimpleNamespace(id=7), answer=AsyncMock())
+
+    async def test_pages_file_hits_as_cached_results(self):
+        query = self._query("ملف")
+        await inline.handle_inline_query(query)
+        items = query.answer.await_args.args[0]
+        self.assertIsInstance(items[0], InlineQueryResultCachedPhoto)
+        self.assertEqual(items[0].photo_file_id, "tg1")
+        self.assertIsInstance(items[1], InlineQueryResultCachedDocument)
+        self.assertEqual(query.answer.await_args.kwargs, {"cache_time": 120, "is_personal": True, "next_offset": "2"})
+
+        query = self._query("ملف", offset="2")
+        await inline.handle_inline_query(query)
+        self.assertEqual([item.id for item in query.answer.await_args.args[0]], ["4"])
+        self.assertEqual(self.by_ids.await_args.args[1], [3, 4])
+        self.assertEqual(query.answer.await_args.kwargs["next_offset"], "4")
+
+        query = self._query("ملف", offset="4")
+        await inline.handle_inline_query(query)
+        self.assertEqual(query.answer.await_args.kwargs["next_offset"], "")
+
+    async def test_short_query_answers_empty_without_searching(self):
+        query = self._query(" م ")
+        await inline.handle_inline_query(query)
+        query.answer.assert_awaited_once_with([], cache_time=120, is_personal=True)
+        self.by_ids.assert_not_awaited()
+
+    async def test_gated_query_is_answered_empty_and_uncached(self):
+        query = self._query("ملف")
+        update = Update.model_construct(update_id=1, inline_query=query)
+        context = SimpleNamespace(maintenance_enabled=True, maintenance_message="")
+        handler = AsyncMock()
+        with patch("bot.middlewares.maintenance_check.get_i18n", return_value=SimpleNamespace(get=str)):
+            await MaintenanceCheckMiddleware()(handler, update, {
+                "event_from_user": query.from_user, "update_context": context,
+            })
+        handler.assert_not_awaited()
+        query.answer.assert_awaited_once_with([], cache_time=0, is_personal=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from aiogram.enums import ChatMemberStatus
+
+from bot.services.membership import MembershipService
+
+
+class FakeBot:
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.calls = 0
+
+    async def get_chat_member(self, channel_id, user_id):
+        self.calls += 1
+        status = self.statuses[channel_id]
+        for _ in range(3):
+            await asyncio.sleep(0)
+        if isinstance(status, Exception):
+            raise status
+        return SimpleNamespace(status=status)
+
+
+class MembershipServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_checks_are_coalesced_and_cached(self):
+        service = MembershipService()
+        bot = FakeBot({"@a": "member", "@b": ChatMemberStatus.LEFT})
+
+        results = await asyncio.gather(*(
+            service.get_missing_channels(bot, 1, ["@a", "@b"]) for _ in range(5)
+        ))
+        self.assertEqual(results, [["@b"]] * 5)
+        self.assertEqual(bot.calls, 2)
+        self.assertEqual(service.stats()["coalesced"], 8)
+
+        await service.get_missing_channels(bot, 1, ["@a", "@b"])
+        self.assertEqual(bot.calls, 2)
+
+    async def test_negative_ttl_and_invalidation(self):
+        service = MembershipService(positive_ttl=600, negative_ttl=0)
+        bot = FakeBot({"@a": ChatMemberStatus.LEFT})
+
+        await service.is_member(bot, 1, "@a")
+        bot.statuses["@a"] = "member"
+        self.assertTrue(await service.is_member(bot, 1, "@a"))
+        self.assertEqual(bot.calls, 2)
+
+        bot.statuses["@a"] = ChatMemberStatus.KICKED
+        self.assertTrue(await service.is_member(bot, 1, "@a"))
+        service.invalidate(1, ["@a"])
+        self.assertFalse(await service.is_member(bot, 1, "@a"))
+        self.assertEqual(bot.calls, 3)
+
+    async def test_lookup_errors_are_not_cached(self):
+        service = MembershipService(positive_ttl=600, negative_ttl=600)
+        bot = FakeBot({"@a": RuntimeError("Too Many Requests: retry after 5")})
+
+        self.assertEqual(await service.get_missing_channels(bot, 1, ["@a"]), ["@a"])
+        bot.statuses["@a"] = "member"
+        self.assertEqual(await service.get_missing_channels(bot, 1, ["@a"]), [])
+        self.assertEqual(bot.calls, 2)
+
+    async def test_lookup_in_flight_during_invalidation_is_not_cached(self):
+        service = MembershipService(positive_ttl=600, negative_ttl=600)
+        bot = FakeBot({"@a": ChatMemberStatus.LEFT})
+
+        stale = asyncio.ensure_future(service.is_member(bot, 1, "@a"))
+        while bot.calls == 0:
+            await asyncio.sleep(0)
+        bot.statuses["@a"] = "member"
+        service.invalidate(1, ["@a"])
+        self.assertFalse(await stale)
+
+        self.assertTrue(await service.is_member(bot, 1, "@a"))
+        self.assertEqual(bot.calls, 2)
+        self.assertEqual(service.stats()["inflight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from bot.models.file import File
+from bot.services.pagination import SEEK_NEWER, SEEK_OLDER, CountCache, seek_page
+
+
+class _Session:
+    def __init__(self, ids):
+        self.ids = sorted(ids)
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )))
+        where = stmt.whereclause
+        ids = self.ids
+        if where is not None:
+            op = where.operator.__name__
+            bound = where.right.value
+            ids = [i for i in ids if (i < bound if op == "lt" else i > bound)]
+        newest_first = "DESC" in self.statements[-1]
+        ids = sorted(ids, reverse=newest_first)[:stmt._limit]
+        rows = [SimpleNamespace(id=i) for i in ids]
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: rows))
+
+
+class SeekPageTests(unittest.IsolatedAsyncioTestCase):
+    async def test_walks_forward_and_back(self):
+        session = _Session(range(1, 13))
+        stmt = select(File)
+
+        first = await seek_page(session, stmt, File.id, total=12, per_page=5)
+        self.assertEqual([f.id for f in first.items], [12, 11, 10, 9, 8])
+        self.assertEqual((first.page, first.total_pages, first.has_prev, first.has_next), (1, 3, False, True))
+        self.assertNotIn("OFFSET", session.statements[-1])
+
+        second = await seek_page(session, stmt, File.id, 12, first.last_id, SEEK_OLDER, 2, 5)
+        self.assertIn("files.id < 8", session.statements[-1])
+        self.assertEqual([f.id for f in second.items], [7, 6, 5, 4, 3])
+
+        last = await seek_page(session, stmt, File.id, 12, second.last_id, SEEK_OLDER, 3, 5)
+        self.assertEqual([f.id for f in last.items], [2, 1])
+        self.assertEqual((last.page, last.total_pages, last.has_next), (3, 3, False))
+
+        back = await seek_page(session, stmt, File.id, 12, second.first_id, SEEK_NEWER, 1, 5)
+        self.assertEqual([f.id for f in back.items], [12, 11, 10, 9, 8])
+        self.assertEqual((back.page, back.has_prev, back.has_next), (1, False, True))
+
+    async def test_stale_cursor_restarts_from_first_page(self):
+        session = _Session([1, 2, 3])
+        page = await seek_page(session, select(File), File.id, 3, cursor=1, page=4, per_page=5)
+        self.assertEqual([f.id for f in page.items], [3, 2, 1])
+        self.assertEqual((page.page, page.has_prev), (1, False))
+
+    async def test_approximate_total_never_hides_next_page(self):
+        session = _Session(range(1, 13))
+        page = await seek_page(session, select(File), File.id, total=0, per_page=5)
+        self.assertEqual(page.total_pages, 2)
+
+
+class CountCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def test_caches_until_invalidated(self):
+        cache = CountCache(ttl_seconds=60)
+        loader = AsyncMock(return_value=7)
+        self.assertEqual(await cache.get("files", loader), 7)
+        self.assertEqual(await cache.get("files", loader), 7)
+        loader.assert_awaited_once()
+
+        cache.invalidate("files")
+        await cache.get("files", loader)
+        self.assertEqual(loader.await_count, 2)
+        self.assertEqual(cache.stats(), {"cached": 1, "hits": 1, "misses": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -29,6 +29,37 @@ if "aiogram" not in sys.modules:
     enums.ChatMemberStatus = ChatMemberStatus
     sys.modules["aiogram.enums"] = enums
 
+    exceptions = types.ModuleType("aiogram.exceptions")
+    class TelegramRetryAfter(Exception):
+        def __init__(self, method=None, message="", retry_after=0):
+            super().__init__(message)
+            self.retry_after = retry_after
+    class TelegramForbiddenError(Exception):
+        def __init__(self, method=None, message=""):
+            super().__init__(message)
+    exceptions.TelegramRetryAfter = TelegramRetryAfter
+    exceptions.TelegramForbiddenError = TelegramForbiddenError
+    sys.modules["aiogram.exceptions"] = exceptions
+
+    class BaseRequestMiddleware:
+        pass
+    class _Generic:
+        def __class_getitem__(cls, item):
+            return cls
+    for name in ["aiogram.client", "aiogram.client.session", "aiogram.client.session.middlewares"]:
+        sys.modules[name] = types.ModuleType(name)
+    request_mw = types.ModuleType("aiogram.client.session.middlewares.base")
+    request_mw.BaseRequestMiddleware = BaseRequestMiddleware
+    request_mw.NextRequestMiddlewareType = _Generic
+    sys.modules["aiogram.client.session.middlewares.base"] = request_mw
+    methods = types.ModuleType("aiogram.methods")
+    methods_base = types.ModuleType("aiogram.methods.base")
+    methods_base.Response = _Generic
+    methods_base.TelegramMethod = _Generic
+    methods_base.TelegramType = object
+    sys.modules["aiogram.methods"] = methods
+    sys.modules["aiogram.methods.base"] = methods_base
+
     types_mod = types.ModuleType("aiogram.types")
     class _Obj:
         def __init__(self, **kwargs):
@@ -49,6 +80,14 @@ if "aiogram" not in sys.modules:
         pass
     class ErrorEvent(_Obj):
         pass
+    class InputMediaPhoto(_Obj):
+        pass
+    class InputMediaVideo(_Obj):
+        pass
+    class InputMediaDocument(_Obj):
+        pass
+    class InputMediaAudio(_Obj):
+        pass
     types_mod.InlineKeyboardButton = InlineKeyboardButton
     types_mod.InlineKeyboardMarkup = InlineKeyboardMarkup
     types_mod.Update = Update
@@ -57,6 +96,10 @@ if "aiogram" not in sys.modules:
     types_mod.FSInputFile = FSInputFile
     types_mod.TelegramObject = TelegramObject
     types_mod.ErrorEvent = ErrorEvent
+    types_mod.InputMediaPhoto = InputMediaPhoto
+    types_mod.InputMediaVideo = InputMediaVideo
+    types_mod.InputMediaDocument = InputMediaDocument
+    types_mod.InputMediaAudio = InputMediaAudio
     sys.modules["aiogram.types"] = types_mod
 
 import asyncio
@@ -66,11 +109,15 @@ if "sqlalchemy" not in sys.modules:
     sa.select = lambda *a, **k: None
     sa.update = lambda *a, **k: None
     sa.delete = lambda *a, **k: None
+    sa.Select = object
     sa.func = types.SimpleNamespace(count=lambda *a, **k: 0, now=lambda: None)
+    sa.literal_column = lambda *a, **k: None
+    sa.text = lambda *a, **k: None
+    sa.event = types.SimpleNamespace(listens_for=lambda *a, **k: (lambda fn: fn))
     class _T:
         def __init__(self, *a, **k):
             pass
-    for n in ["BigInteger","Integer","Boolean","String","DateTime","Enum","Text","UniqueConstraint","ForeignKey"]:
+    for n in ["BigInteger","Integer","Boolean","String","DateTime","Enum","Text","UniqueConstraint","ForeignKey","Index"]:
         setattr(sa, n, _T)
     sys.modules["sqlalchemy"] = sa
 
@@ -78,8 +125,18 @@ if "sqlalchemy" not in sys.modules:
     class IntegrityError(Exception):
         pass
     exc.IntegrityError = IntegrityError
+    exc.DisconnectionError = type("DisconnectionError", (Exception,), {})
+    exc.TimeoutError = type("TimeoutError", (Exception,), {})
     sys.modules["sqlalchemy.exc"] = exc
 
+    engine_mod = types.ModuleType("sqlalchemy.engine")
+    engine_mod.make_url = lambda *a, **k: None
+    sys.modules["sqlalchemy.engine"] = engine_mod
+
+    pool_mod = types.ModuleType("sqlalchemy.pool")
+    pool_mod.AsyncAdaptedQueuePool = object
+    sys.modules["sqlalchemy.pool"] = pool_mod
+
     orm = types.ModuleType("sqlalchemy.orm")
     class DeclarativeBase:
         pass
@@ -89,6 +146,9 @@ if "sqlalchemy" not in sys.modules:
             return cls
     orm.Mapped = _Mapped
     orm.mapped_column = lambda *a, **k: None
+    class Session:
+        pass
+    orm.Session = Session
     sys.modules["sqlalchemy.orm"] = orm
 
     ext = types.ModuleType("sqlalchemy.ext")
@@ -97,6 +157,7 @@ if "sqlalchemy" not in sys.modules:
     class AsyncSession:
         pass
     async_mod.AsyncSession = AsyncSession
+    async_mod.AsyncEngine = object
     async_mod.async_sessionmaker = lambda *a, **k: (lambda: None)
     sys.modules["sqlalchemy.ext"] = ext
     sys.modules["sqlalchemy.ext.asyncio"] = async_mod
@@ -105,6 +166,12 @@ if "sqlalchemy" not in sys.modules:
     sql.func = types.SimpleNamespace(now=lambda: None)
     sys.modules["sqlalchemy.sql"] = sql
 
+    dialects = types.ModuleType("sqlalchemy.dialects")
+    postgresql = types.ModuleType("sqlalchemy.dialects.postgresql")
+    postgresql.insert = lambda *a, **k: None
+    sys.modules["sqlalchemy.dialects"] = dialects
+    sys.modules["sqlalchemy.dialects.postgresql"] = postgresql
+
 import unittest
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
@@ -176,14 +243,14 @@ class FakeStateService:
         self.cleared = []
         self.states = {}
 
-    def clear_state(self, uid):
+    async def clear_state(self, uid):
         self.cleared.append(uid)
         self.states.pop(uid, None)
 
-    def set_state(self, uid, name, data=None):
+    async def set_state(self, uid, name, data=None):
         self.states[uid] = SimpleNamespace(name=name, data=data or {})
 
-    def get_state(self, uid):
+    async def get_state(self, uid):
         return self.states.get(uid)
 
 
@@ -251,7 +318,7 @@ class BehavioralE2ETest(unittest.IsolatedAsyncioTestCase):
 
     async def test_04_moderator_assignment_updates_db_and_notification_non_blocking(self):
         fake_state = FakeStateService()
-        fake_state.set_state(1, admin_handlers.STATES["MOD_ADD"])
+        await fake_state.set_state(1, admin_handlers.STATES["MOD_ADD"])
         sent = []
 
         class FakeBot:
@@ -270,7 +337,7 @@ class BehavioralE2ETest(unittest.IsolatedAsyncioTestCase):
              patch("bot.handlers.admin.user_service.set_role", AsyncMock()) as set_role, \
              patch("bot.handlers.admin.moderator_service.create_permissions", AsyncMock()) as create_perm, \
              patch("bot.handlers.admin.audit_service.log_action", AsyncMock()):
-            await admin_handlers._handle_mod_add_input(msg, fake_state.get_state(1), {"user_role": UserRole.ADMIN})
+            await admin_handlers._handle_mod_add_input(msg, await fake_state.get_state(1), {"user_role": UserRole.ADMIN})
 
         set_role.assert_awaited()
         create_perm.assert_awaited()
@@ -0,0 +1,118 @@
+import json
+import os
+import unittest
+from typing import Any, List, Set
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from bot.core.database import Base
+from bot.models import File, FileSection, Section  # noqa: F401
+from bot.services.files import file_service
+from bot.services.pagination import SEEK_OLDER
+from bot.services.sections import section_service
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+PLAN_SCHEMA = "query_plan_test"
+
+SEED_SECTIONS = text(
+    """
+    INSERT INTO sections (name, parent_id, "order", is_active)
+    SELECT 'section ' || g,
+           CASE WHEN g <= 20 THEN NULL ELSE (g % 20) + 1 END,
+           g % 7,
+           g % 10 <> 0
+    FROM generate_series(1, 2000) AS g
+    """
+)
+SEED_FILES = text(
+    """
+    INSERT INTO files (file_id, file_unique_id, name, file_type, status, uploaded_by, is_active)
+    SELECT 'f' || g, 'u' || g, 'file ' || g, 'document',
+           CASE WHEN g % 20 = 0 THEN 'pending' WHEN g % 20 = 1 THEN 'draft' ELSE 'published' END,
+           1,
+           g % 50 <> 0
+    FROM generate_series(1, 100000) AS g
+    """
+)
+SEED_LINKS = text(
+    """
+    INSERT INTO file_sections (file_id, section_id)
+    SELECT g, (g % 2000) + 1 FROM generate_series(1, 100000) AS g
+    """
+)
+
+
+def _index_names(plan: Any) -> Set[str]:
+    names: Set[str] = set()
+    if isinstance(plan, dict):
+        if "Index Name" in plan:
+            names.add(plan["Index Name"])
+        for value in plan.values():
+            names |= _index_names(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            names |= _index_names(value)
+    return names
+
+
+class _ExplainingSession:
+    def __init__(self, session: Any):
+        self._session = session
+        self.plans: List[Any] = []
+
+    async def execute(self, stmt: Any, params: Any = None) -> Any:
+        sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        plan = (await self._session.execute(text("EXPLAIN (FORMAT JSON) " + sql))).scalar()
+        self.plans.append(json.loads(plan) if isinstance(plan, str) else plan)
+        return await self._session.execute(stmt, params)
+
+    def indexes(self) -> Set[str]:
+        return _index_names(self.plans)
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "TEST_DATABASE_URL is not set")
+class QueryPlanTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+        url = TEST_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+        self.engine = create_async_engine(url)
+        self.conn = await self.engine.connect()
+        self.transaction = await self.conn.begin()
+        await self.conn.execute(text(f"CREATE SCHEMA {PLAN_SCHEMA}"))
+        await self.conn.execute(text(f"SET LOCAL search_path TO {PLAN_SCHEMA}"))
+        await self.conn.run_sync(Base.metadata.create_all)
+        for stmt in (SEED_SECTIONS, SEED_FILES, SEED_LINKS):
+            await self.conn.execute(stmt)
+        await self.conn.execute(text("ANALYZE"))
+        self.session = AsyncSession(bind=self.conn)
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.transaction.rollback()
+        await self.conn.close()
+        await self.engine.dispose()
+
+    async def test_section_file_list_uses_composite_link_index(self):
+        session = _ExplainingSession(self.session)
+        first = await file_service.list_files_by_section(session, 42)
+        self.assertIn("ix_file_sections_section_file", session.indexes())
+
+        session.plans.clear()
+        await file_service.list_files_by_section(session, 42, cursor=first.last_id, direction=SEEK_OLDER, page=2)
+        self.assertIn("ix_file_sections_section_file", session.indexes())
+
+    async def test_pending_list_uses_partial_index(self):
+        session = _ExplainingSession(self.session)
+        await file_service.get_pending_files(session, per_page=10)
+        self.assertIn("ix_files_pending_id", session.indexes())
+
+    async def test_child_sections_use_partial_parent_order_index(self):
+        session = _ExplainingSession(self.session)
+        await section_service.list_sections(session, parent_id=3)
+        self.assertIn("ix_sections_active_parent_order", session.indexes())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import create_engine, select, text, update
+from sqlalchemy.orm import Session
+
+from bot.core.config import DatabaseConfig
+from bot.core.database import (
+    READ_ONLY_KEY,
+    REPLICA_BIND_KEY,
+    WROTE_KEY,
+    Database,
+    RoutingSession,
+)
+from bot.models.file import File
+
+
+class RoutingSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.primary = create_engine("sqlite://")
+        self.replica = create_engine("sqlite://")
+        self.session = RoutingSession(bind=self.primary, info={REPLICA_BIND_KEY: self.replica})
+
+    def test_reads_go_to_primary_unless_marked_read_only(self):
+        self.assertIs(self.session.get_bind(clause=select(File)), self.primary)
+        self.session.info[READ_ONLY_KEY] = True
+        self.assertIs(self.session.get_bind(clause=select(File)), self.replica)
+
+    def test_writes_and_post_write_reads_stay_on_primary(self):
+        self.session.info[READ_ONLY_KEY] = True
+        self.assertIs(self.session.get_bind(clause=update(File).values(name="x")), self.primary)
+        self.session.info[WROTE_KEY] = True
+        self.assertIs(self.session.get_bind(clause=select(File)), self.primary)
+
+
+class WriteTrackingTests(unittest.TestCase):
+    def setUp(self):
+        self.session = Session(bind=create_engine("sqlite://"))
+        self.addCleanup(self.session.close)
+
+    def test_raw_reads_do_not_mark_the_session_written(self):
+        self.session.execute(text("SELECT 1"))
+        self.session.execute(text("  select count(*) from sqlite_master"))
+        self.session.execute(select(text("1")))
+        self.assertNotIn(WROTE_KEY, self.session.info)
+
+    def test_raw_ddl_and_dml_mark_the_session_written(self):
+        self.session.execute(text("CREATE TABLE t (x INTEGER)"))
+        self.assertTrue(self.session.info.pop(WROTE_KEY))
+        self.session.execute(text("INSERT INTO t (x) VALUES (1)"))
+        self.assertTrue(self.session.info.pop(WROTE_KEY))
+        self.session.execute(text("WITH v AS (SELECT 2 AS x) INSERT INTO t (x) SELECT x FROM v"))
+        self.assertTrue(self.session.info.pop(WROTE_KEY))
+
+
+def _fake_session():
+    session = MagicMock()
+    session.info = {}
+    session.in_transaction.return_value = True
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    session.close = AsyncMock()
+    return session
+
+
+class ReplicaPinTests(unittest.IsolatedAsyncioTestCase):
+    def _database(self, replica_url="postgresql://u:p@replica/app"):
+        db = Database(
+            "postgresql://u:p@primary/app",
+            DatabaseConfig(url="", replica_url=replica_url, replica_pin_seconds=30),
+        )
+        db.session_factory = MagicMock(side_effect=_fake_session)
+        return db
+
+    async def _read(self, db, user_id):
+        async with db.unit_of_work(user_id):
+            async for session in db.get_session(read_only=True):
+                return session.info[READ_ONLY_KEY]
+
+    async def test_writer_is_pinned_to_primary(self):
+        db = self._database()
+        self.assertTrue(await self._read(db, 7))
+
+        async with db.unit_of_work(7):
+            async for session in db.get_session():
+                session.info[WROTE_KEY] = True
+        self.assertTrue(db.is_pinned(7))
+        self.assertFalse(await self._read(db, 7))
+        self.assertTrue(await self._read(db, 8))
+        self.assertEqual(db.replica_stats()["routed_reads"], 2)
+
+    async def test_without_replica_nothing_is_routed(self):
+        db = self._database(replica_url="")
+        self.assertFalse(await self._read(db, 7))
+        self.assertIsNone(db.replica_stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from bot.services.search_index import (
+    SearchIndex,
+    SearchIndexService,
+    _discard_after_rollback,
+    _sync_after_commit,
+)
+from bot.utils.text import normalize_arabic
+
+
+def _file(file_id, name, caption=None, status="published", is_active=True):
+    return SimpleNamespace(id=file_id, name=name, caption=caption, status=status, is_active=is_active)
+
+
+class SearchIndexTests(unittest.TestCase):
+    def test_matches_across_arabic_spelling_variants(self):
+        index = SearchIndex()
+        index.upsert(1, "مُحاضرة الفيزياء الأولى")
+        index.upsert(2, "ملخص إحصاء")
+        index.upsert(3, "Physics Notes")
+
+        self.assertEqual([d.id for d in index.search("محاضره")[0]], [1])
+        self.assertEqual([d.id for d in index.search("الاولي")[0]], [1])
+        self.assertEqual([d.id for d in index.search("احصاء")[0]], [2])
+        self.assertEqual([d.id for d in index.search("physics")[0]], [3])
+        self.assertEqual(index.search("كيمياء"), ([], 0))
+
+    def test_ranks_exact_then_prefix_then_word_then_infix_then_caption(self):
+        index = SearchIndex()
+        index.upsert(1, "الجبر الخطي")
+        index.upsert(2, "جبر")
+        index.upsert(3, "مراجعة جبر شاملة")
+        index.upsert(4, "جبرية")
+        index.upsert(5, "تمارين", extra="حلول جبر")
+
+        docs, total = index.search("جبر")
+        self.assertEqual(total, 5)
+        self.assertEqual([d.id for d in docs], [2, 4, 3, 1, 5])
+
+    def test_paginates_with_total(self):
+        index = SearchIndex()
+        for i in range(1, 26):
+            index.upsert(i, f"درس {i}", sort_key=(i,))
+
+        first, total = index.search("درس", offset=0, limit=10)
+        last, _ = index.search("درس", offset=20, limit=10)
+        self.assertEqual(total, 25)
+        self.assertEqual([d.id for d in first], list(range(1, 11)))
+        self.assertEqual([d.id for d in last], list(range(21, 26)))
+
+    def test_upsert_and_remove_keep_postings_consistent(self):
+        index = SearchIndex()
+        index.upsert(1, "كتاب النحو")
+        index.upsert(1, "كتاب الصرف")
+        self.assertEqual(index.search("النحو"), ([], 0))
+        self.assertEqual([d.id for d in index.search("الصرف")[0]], [1])
+
+        index.remove(1)
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.gram_count, 0)
+
+    def test_candidates_are_pruned_on_a_large_corpus(self):
+        index = SearchIndex()
+        words = ["رياضيات", "فيزياء", "كيمياء", "تاريخ", "ملخص", "اختبار", "الفصل", "شرح"]
+        for i in range(20000):
+            index.upsert(i, f"{words[i % 8]} {words[(i * 3) % 8]} {i}", sort_key=(-i,))
+
+        matching = [i for i in range(20000) if i % 8 == 1]
+        self.assertEqual(len(index._candidates(normalize_arabic("فيزياء تاريخ"))), len(matching))
+        docs, total = index.search("فيزياء تاريخ", limit=20)
+        self.assertEqual(total, len(matching))
+        self.assertEqual([d.id for d in docs], sorted(matching, key=lambda i: (len(str(i)), -i))[:20])
+
+
+class SearchIndexServiceTests(unittest.TestCase):
+    def test_queued_changes_apply_only_after_commit(self):
+        service = SearchIndexService()
+        session = SimpleNamespace(info={})
+        with patch("bot.services.search_index.search_index", service):
+            service.queue_file(session, _file(1, "ملف منشور"))
+            service.queue_section(session, SimpleNamespace(id=2, name="قسم", order=0, is_active=True))
+            self.assertEqual((len(service.files), len(service.sections)), (0, 0))
+            _sync_after_commit(session)
+            self.assertEqual([d.id for d in service.search_files("ملف")[0]], [1])
+            self.assertEqual(len(service.sections), 1)
+
+            service.queue_file(session, _file(1, "ملف منشور", is_active=False))
+            _discard_after_rollback(session)
+            _sync_after_commit(session)
+            self.assertEqual(len(service.files), 1)
+
+    def test_sync_follows_visibility(self):
+        service = SearchIndexService()
+        service.sync_file(_file(1, "ملف مسودة", status="pending"))
+        service.sync_file(_file(2, "ملف منشور", caption="وصف اضافي"))
+        self.assertEqual([d.id for d in service.search_files("ملف")[0]], [2])
+        self.assertEqual([d.id for d in service.search_files("اضافي")[0]], [2])
+
+        service.sync_file(_file(2, "ملف منشور", is_active=False))
+        self.assertEqual(service.search_files("ملف"), ([], 0))
+
+        section = SimpleNamespace(id=7, name="قسم العلوم", order=0, is_active=True)
+        service.sync_section(section)
+        self.assertEqual([d.id for d in service.search_sections("العلوم")[0]], [7])
+        section.is_active = False
+        service.sync_section(section)
+        self.assertEqual(service.stats()["sections"], 0)
+
+
+class SearchIndexRebuildTests(unittest.IsolatedAsyncioTestCase):
+    async def test_changes_committed_during_a_rebuild_survive_the_swap(self):
+        service = SearchIndexService()
+
+        async def load(db):
+            files = SearchIndex()
+            files.upsert(1, "ملف قديم", sort_key=(-1,))
+            files.upsert(2, "ملف محذوف", sort_key=(-2,))
+            await asyncio.sleep(0)
+            service.sync_file(_file(3, "ملف جديد"))
+            service.sync_file(_file(2, "ملف محذوف", is_active=False))
+            return files, SearchIndex()
+
+        with patch.object(service, "_load", load):
+            await service.rebuild(db=None)
+
+        self.assertEqual(sorted(d.id for d in service.search_files("ملف")[0]), [1, 3])
+        self.assertEqual(service._build_buffers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
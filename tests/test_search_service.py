@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from bot.services.search import HIT_FILE, HIT_SECTION, SearchService
+from bot.services.search_index import SearchIndexService
+
+
+class SearchServiceTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.index = SearchIndexService()
+        self.index.ready = True
+        self.index.sync_section(SimpleNamespace(id=1, name="قسم الرياضيات", order=0, is_active=True))
+        for i in range(1, 13):
+            self.index.sync_file(SimpleNamespace(
+                id=i, name=f"رياضيات {i}", caption=None, status="published", is_active=True,
+            ))
+        patcher = patch("bot.services.search.search_index", self.index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = SearchService(page_size=5, max_results=100, cache_size=2, debounce_seconds=0.05)
+
+    async def test_results_are_paged_and_cached_by_normalised_query(self):
+        results = await self.service.search("الرياضيات")
+        self.assertEqual((results.sections, results.files), (1, 0))
+
+        results = await self.service.search("رياضيات")
+        self.assertEqual(results.total, 13)
+        self.assertEqual(results.page_count(5), 3)
+        self.assertEqual(results.page(1, 5)[0].kind, HIT_SECTION)
+        self.assertEqual([hit.kind for hit in results.page(3, 5)], [HIT_FILE] * 3)
+
+        again = await self.service.search("رِياضيّات")
+        self.assertIs(again, results)
+        self.assertEqual(self.service.stats()["hits"], 1)
+        self.assertIs(await self.service.results_for_token(results.token), results)
+
+    async def test_mutation_invalidates_but_keeps_token(self):
+        results = await self.service.search("رياضيات")
+        self.index.sync_file(SimpleNamespace(
+            id=3, name="رياضيات 3", caption=None, status="published", is_active=False,
+        ))
+        self.assertIsNone(self.service.cached("رياضيات"))
+
+        fresh = await self.service.results_for_token(results.token)
+        self.assertEqual(fresh.token, results.token)
+        self.assertEqual(fresh.total, 12)
+
+    async def test_lru_eviction_expires_tokens(self):
+        first = await self.service.search("قسم")
+        await self.service.search("رياضيات 1")
+        await self.service.search("رياضيات 2")
+        self.assertIsNone(await self.service.results_for_token(first.token))
+        self.assertEqual(self.service.stats()["cached_queries"], 2)
+
+    async def test_rapid_queries_from_one_user_collapse_to_the_last(self):
+        outcomes = await asyncio.gather(
+            self.service.settle(7),
+            self.service.settle(7),
+            self.service.settle(8),
+        )
+        self.assertEqual(outcomes, [False, True, True])
+        self.assertEqual(self.service.stats()["debounced"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
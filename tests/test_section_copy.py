@@ -0,0 +1,188 @@
+import os
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from bot.core.database import Base
+from bot.models import FileSection, Section
+from bot.services import sections as sections_module
+from bot.services.section_counters import section_counters
+from bot.services.sections import SectionService, section_service
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+COPY_SCHEMA = "section_copy_test"
+
+COPIED_SUBTREE = text(
+    """
+    WITH RECURSIVE t AS (
+        SELECT id, parent_id, name, is_active, subtree_file_count FROM sections WHERE id = :root_id
+        UNION ALL
+        SELECT s.id, s.parent_id, s.name, s.is_active, s.subtree_file_count
+        FROM sections s JOIN t ON s.parent_id = t.id
+    )
+    SELECT id, parent_id, name, is_active, subtree_file_count FROM t
+    """
+)
+
+
+class FakeResult:
+    def __init__(self, rowcount=0, rows=(), scalar=None):
+        self.rowcount = rowcount
+        self._rows = list(rows)
+        self._scalar = scalar
+
+    def all(self):
+        return self._rows
+
+    def scalar_one(self):
+        return self._scalar
+
+
+class FakeSession:
+    def __init__(self, total):
+        self.total = total
+        self.calls = []
+        self.info = {}
+
+    async def execute(self, stmt, params=None):
+        self.calls.append((stmt, params))
+        if stmt is sections_module.COPY_MAP_FILL:
+            return FakeResult(rowcount=self.total)
+        if stmt is sections_module.COPY_MAP_ROOT:
+            return FakeResult(scalar=1000)
+        if stmt is sections_module.COPY_SECTIONS_BATCH:
+            rows = [
+                SimpleNamespace(id=1000 + i, name=f"s{i} (نسخة)", order=0, is_active=True)
+                for i in range(params["first"], params["last"] + 1)
+            ]
+            return FakeResult(rows=rows)
+        return FakeResult()
+
+
+class SectionCopyTests(unittest.IsolatedAsyncioTestCase):
+    async def test_copies_the_subtree_in_set_based_batches(self):
+        session = FakeSession(total=1200)
+        service = SectionService()
+        progress = AsyncMock()
+        root = SimpleNamespace(id=1000, name="root (نسخة)", subtree_file_count=40)
+        adjust = AsyncMock()
+        with patch.object(service, "get_section", AsyncMock(side_effect=[SimpleNamespace(id=5), root])), \
+                patch("bot.services.sections.section_counters.adjust", adjust), \
+                patch("bot.services.sections.search_index.queue_section") as sync:
+            copied = await service.copy_section_tree(session, 5, target_parent_id=2, progress=progress)
+
+        self.assertIs(copied, root)
+        batches = [p for s, p in session.calls if s is sections_module.COPY_SECTIONS_BATCH]
+        links = [p for s, p in session.calls if s is sections_module.COPY_FILE_LINKS_BATCH]
+        self.assertEqual([(b["first"], b["last"]) for b in batches], [(1, 500), (501, 1000), (1001, 1200)])
+        self.assertTrue(all(b["target_parent_id"] == 2 for b in batches))
+        self.assertEqual(links, [{"first": b["first"], "last": b["last"]} for b in batches])
+        self.assertEqual([c.args for c in progress.await_args_list], [(500, 1200), (1000, 1200), (1200, 1200)])
+        self.assertEqual(sync.call_count, 1200)
+        adjust.assert_awaited_once_with(session, {2: 40}, own=False)
+        self.assertEqual(len(session.calls), 4 + 2 * 3)
+
+    async def test_missing_source_issues_no_writes(self):
+        session = FakeSession(total=0)
+        service = SectionService()
+        with patch.object(service, "get_section", AsyncMock(return_value=None)):
+            self.assertIsNone(await service.copy_section_tree(session, 5))
+        self.assertEqual(session.calls, [])
+
+    def test_statements_compile_for_postgresql(self):
+        for stmt in (sections_module.COPY_MAP_FILL, sections_module.COPY_SECTIONS_BATCH):
+            sql = str(stmt.compile(dialect=postgresql.dialect()))
+            self.assertIn("section_copy_map", sql)
+        self.assertIn("WITH RECURSIVE", str(sections_module.COPY_MAP_FILL))
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "TEST_DATABASE_URL is not set")
+class SectionCopyDatabaseTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+        url = TEST_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+        self.engine = create_async_engine(url)
+        self.conn = await self.engine.connect()
+        self.transaction = await self.conn.begin()
+        await self.conn.execute(text(f"CREATE SCHEMA {COPY_SCHEMA}"))
+        await self.conn.execute(text(f"SET LOCAL search_path TO {COPY_SCHEMA}"))
+        await self.conn.run_sync(Base.metadata.create_all)
+        self.session = AsyncSession(bind=self.conn)
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.transaction.rollback()
+        await self.conn.close()
+        await self.engine.dispose()
+
+    async def _seed(self):
+        session = self.session
+        target, root = Section(name="target"), Section(name="root")
+        session.add_all([target, root])
+        await session.flush()
+        branch = Section(name="branch", parent_id=root.id, order=1)
+        child = Section(name="child", parent_id=root.id, order=2)
+        session.add_all([branch, child])
+        await session.flush()
+        leaf = Section(name="leaf", parent_id=branch.id, is_active=False)
+        session.add(leaf)
+        await session.flush()
+
+        await session.execute(text(
+            "INSERT INTO files (file_id, file_unique_id, name, file_type, status, uploaded_by, is_active) "
+            "SELECT 'f' || g, 'u' || g, 'file ' || g, 'document', 'published', 1, true "
+            "FROM generate_series(1, 3) AS g"
+        ))
+        file_ids = (await session.execute(text("SELECT id FROM files ORDER BY id"))).scalars().all()
+        session.add_all([
+            FileSection(file_id=file_ids[0], section_id=root.id),
+            FileSection(file_id=file_ids[1], section_id=branch.id),
+            FileSection(file_id=file_ids[2], section_id=branch.id),
+        ])
+        await session.flush()
+        await section_counters.reconcile(session)
+        return target, root, file_ids
+
+    async def test_copy_preserves_structure_links_and_counters(self):
+        target, root, file_ids = await self._seed()
+        originals = set((await self.session.execute(text("SELECT id FROM sections"))).scalars().all())
+        progress = AsyncMock()
+
+        with patch.object(sections_module, "COPY_BATCH_SIZE", 2):
+            copied = await section_service.copy_section_tree(
+                self.session, root.id, target_parent_id=target.id, progress=progress,
+            )
+
+        rows = (await self.session.execute(COPIED_SUBTREE, {"root_id": copied.id})).all()
+        by_name = {row.name: row for row in rows}
+        self.assertEqual(set(by_name), {"root (نسخة)", "branch (نسخة)", "child (نسخة)", "leaf (نسخة)"})
+        self.assertTrue(originals.isdisjoint(row.id for row in rows))
+        self.assertEqual(copied.parent_id, target.id)
+        self.assertEqual(by_name["branch (نسخة)"].parent_id, copied.id)
+        self.assertEqual(by_name["leaf (نسخة)"].parent_id, by_name["branch (نسخة)"].id)
+        self.assertFalse(by_name["leaf (نسخة)"].is_active)
+        self.assertEqual([c.args for c in progress.await_args_list], [(2, 4), (4, 4)])
+
+        links = (await self.session.execute(
+            text("SELECT section_id, file_id FROM file_sections WHERE section_id = ANY(:ids) ORDER BY file_id"),
+            {"ids": [row.id for row in rows]},
+        )).all()
+        branch_copy = by_name["branch (نسخة)"].id
+        self.assertEqual(
+            [tuple(link) for link in links],
+            [(copied.id, file_ids[0]), (branch_copy, file_ids[1]), (branch_copy, file_ids[2])],
+        )
+
+        target_count = (await self.session.execute(
+            text("SELECT subtree_file_count FROM sections WHERE id = :id"), {"id": target.id},
+        )).scalar_one()
+        self.assertEqual(by_name["root (نسخة)"].subtree_file_count, 3)
+        self.assertEqual(target_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
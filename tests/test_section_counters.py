@@ -0,0 +1,87 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.models.file import FileStatus
+from bot.services.files import FileService
+from bot.services.section_counters import SectionCounterService
+
+
+class SectionCounterServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def test_adjust_skips_zero_deltas(self):
+        service = SectionCounterService()
+        session = SimpleNamespace(execute=AsyncMock(), info={})
+        await service.adjust(session, {1: 0})
+        session.execute.assert_not_awaited()
+
+        await service.adjust(session, {1: 2, 2: 0, 3: -1}, own=False)
+        params = session.execute.await_args.args[1]
+        self.assertEqual(params, {"section_ids": [1, 3], "amounts": [2, -1], "own": False})
+        self.assertTrue(session.info["section_tree_dirty"])
+        self.assertEqual(service.stats()["adjustments"], 1)
+
+    async def test_reconcile_counts_corrections(self):
+        service = SectionCounterService()
+        session = SimpleNamespace(execute=AsyncMock(return_value=SimpleNamespace(rowcount=3)), info={})
+        self.assertEqual(await service.reconcile(session), 3)
+        self.assertEqual(session.execute.await_args.args[1], {"published": FileStatus.PUBLISHED.value})
+        self.assertEqual(service.stats()["corrected"], 3)
+
+    async def test_start_is_noop_when_disabled(self):
+        service = SectionCounterService()
+        service.start(0)
+        self.assertIsNone(service._task)
+        await service.stop()
+
+
+class FileCounterHookTests(unittest.IsolatedAsyncioTestCase):
+    def _service(self, f):
+        service = FileService()
+        service.get_file = AsyncMock(return_value=f)
+        service.get_file_section_ids = AsyncMock(return_value=[4, 7])
+        return service
+
+    async def test_publishing_increments_linked_sections(self):
+        f = SimpleNamespace(id=1, name="x", status=FileStatus.PENDING.value, is_active=True)
+        service = self._service(f)
+        session = SimpleNamespace(flush=AsyncMock())
+        with patch("bot.services.files.section_counters.adjust", AsyncMock()) as adjust, \
+                patch("bot.services.files.search_index.queue_file"):
+            await service.set_file_status(session, 1, FileStatus.PUBLISHED.value)
+            adjust.assert_awaited_once_with(session, {4: 1, 7: 1})
+
+            adjust.reset_mock()
+            await service.set_file_status(session, 1, FileStatus.PUBLISHED.value)
+            adjust.assert_not_awaited()
+
+    async def test_soft_delete_only_counts_published_files(self):
+        f = SimpleNamespace(id=1, name="x", status=FileStatus.PENDING.value, is_active=True)
+        service = self._service(f)
+        session = SimpleNamespace(flush=AsyncMock())
+        with patch("bot.services.files.section_counters.adjust", AsyncMock()) as adjust, \
+                patch("bot.services.files.search_index.queue_file"):
+            await service.soft_delete_file(session, 1)
+            adjust.assert_not_awaited()
+
+            f.status = FileStatus.PUBLISHED.value
+            f.is_active = True
+            await service.soft_delete_file(session, 1)
+            adjust.assert_awaited_once_with(session, {4: -1, 7: -1})
+
+            adjust.reset_mock()
+            await service.soft_delete_file(session, 1)
+            adjust.assert_not_awaited()
+
+    async def test_link_adjusts_for_published_file(self):
+        f = SimpleNamespace(id=1, status=FileStatus.PUBLISHED.value, is_active=True)
+        service = self._service(f)
+        session = MagicMock(flush=AsyncMock(), execute=AsyncMock(
+            return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=None))
+        ))
+        with patch("bot.services.files.section_counters.adjust", AsyncMock()) as adjust:
+            await service.link_file_to_section(session, 1, 9)
+        adjust.assert_awaited_once_with(session, {9: 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy.orm import Session
+
+from bot.services.section_tree import SectionNode, SectionTree, SectionTreeCache
+
+
+def _tree():
+    nodes = {
+        1: SectionNode(1, "root b", None, None, 2, True, 0),
+        2: SectionNode(2, "root a", None, None, 1, True, 4),
+        3: SectionNode(3, "hidden", None, 2, 0, False, 0),
+        4: SectionNode(4, "child", None, 2, 1, True, 1),
+        5: SectionNode(5, "leaf", None, 4, 0, True, 2),
+    }
+    return SectionTree(nodes)
+
+
+class SectionTreeTests(unittest.TestCase):
+    def test_children_are_ordered_and_hide_inactive(self):
+        tree = _tree()
+        self.assertEqual([n.id for n in tree.children(None)], [2, 1])
+        self.assertEqual([n.id for n in tree.children(2)], [4])
+        self.assertEqual([n.id for n in tree.children(2, include_inactive=True)], [3, 4])
+        self.assertTrue(tree.has_children(2))
+        self.assertFalse(tree.has_children(5))
+        self.assertEqual(tree.get(2).file_count, 4)
+
+    def test_breadcrumb_and_subtree(self):
+        tree = _tree()
+        self.assertEqual([n.id for n in tree.breadcrumb(5)], [2, 4, 5])
+        self.assertEqual(tree.breadcrumb(99), [])
+        self.assertEqual(tree.subtree_ids(2), [2, 3, 4, 5])
+
+
+class SectionTreeCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def test_loads_once_until_invalidated(self):
+        cache = SectionTreeCache(ttl_seconds=60)
+        loads = []
+
+        async def load():
+            loads.append(1)
+            await asyncio.sleep(0)
+            return _tree()
+
+        with patch.object(cache, "_load", load):
+            first, second = await asyncio.gather(cache.get(), cache.get())
+            self.assertIs(first, second)
+            self.assertEqual(len(loads), 1)
+
+            cache.invalidate()
+            self.assertIsNot(await cache.get(), first)
+            self.assertEqual(len(loads), 2)
+
+    async def test_tree_loaded_during_a_write_is_not_cached(self):
+        cache = SectionTreeCache(ttl_seconds=60)
+
+        async def load():
+            cache.invalidate()
+            return _tree()
+
+        with patch.object(cache, "_load", load):
+            await cache.get()
+        self.assertFalse(cache.stats()["cached"])
+
+    async def test_commit_of_a_dirty_session_invalidates_the_shared_tree(self):
+        from bot.services import section_tree as module
+
+        session = Session()
+        session.info[module.DIRTY_FLAG] = True
+        module.section_tree._tree = _tree()
+        session.commit()
+        self.assertFalse(module.section_tree.stats()["cached"])
+        self.assertNotIn(module.DIRTY_FLAG, session.info)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from aiogram.exceptions import TelegramRetryAfter
+
+from bot.services.send_scheduler import PriorityTokenBucket, SendScheduler, bulk_priority
+
+
+def _method(api_method, chat_id=None):
+    return SimpleNamespace(__api_method__=api_method, chat_id=chat_id)
+
+
+class SendSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_interactive_requests_overtake_queued_bulk_traffic(self):
+        scheduler = SendScheduler(global_rate=50, private_chat_rate=1000, private_chat_burst=1000)
+        scheduler._global = PriorityTokenBucket(50, capacity=1)
+        order = []
+
+        async def make_request(bot, method):
+            order.append(method.chat_id)
+            return True
+
+        async def send(chat_id):
+            await scheduler(make_request, None, _method("sendMessage", chat_id))
+
+        with bulk_priority():
+            bulk = [asyncio.create_task(send(100 + i)) for i in range(5)]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(send(1))
+        await asyncio.gather(interactive, *bulk)
+
+        self.assertEqual(order[0], 100)
+        self.assertLess(order.index(1), 3)
+        stats = scheduler.stats()
+        self.assertEqual(stats["requests"], 6)
+        self.assertEqual(stats["wait"]["bulk"]["count"], 5)
+        self.assertEqual(stats["wait"]["interactive"]["count"], 1)
+
+    async def test_retry_after_is_retried_centrally(self):
+        scheduler = SendScheduler(max_retries=2)
+        calls = []
+
+        async def flaky(bot, method):
+            calls.append(method.chat_id)
+            if len(calls) == 1:
+                raise TelegramRetryAfter(method=MagicMock(), message="flood", retry_after=0)
+            return "ok"
+
+        self.assertEqual(await scheduler(flaky, None, _method("sendMessage", 5)), "ok")
+        self.assertEqual(calls, [5, 5])
+        self.assertEqual(scheduler.stats()["retry_after"], 1)
+
+        async def always_flooded(bot, method):
+            raise TelegramRetryAfter(method=MagicMock(), message="flood", retry_after=0)
+
+        with self.assertRaises(TelegramRetryAfter):
+            await scheduler(always_flooded, None, _method("sendMessage", 6))
+
+    async def test_per_chat_limit_paces_a_single_chat(self):
+        scheduler = SendScheduler(global_rate=1000, private_chat_rate=20, private_chat_burst=2)
+
+        async def make_request(bot, method):
+            return True
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(4):
+            await scheduler(make_request, None, _method("sendMessage", 7))
+        self.assertGreaterEqual(loop.time() - started, 0.09)
+
+        started = loop.time()
+        await scheduler(make_request, None, _method("sendMessage", 8))
+        self.assertLess(loop.time() - started, 0.02)
+
+    async def test_unlimited_methods_bypass_the_scheduler(self):
+        scheduler = SendScheduler()
+
+        async def make_request(bot, method):
+            return "answered"
+
+        result = await scheduler(make_request, None, _method("answerCallbackQuery"))
+        self.assertEqual(result, "answered")
+        self.assertEqual(scheduler.stats()["requests"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
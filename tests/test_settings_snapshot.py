@@ -0,0 +1,109 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.core.constants import SettingKeys
+from bot.services.settings_manager import (
+    SettingsManager,
+    SettingsSnapshot,
+    _apply_after_commit,
+    _discard_after_rollback,
+)
+
+
+@patch("bot.services.settings_manager.select", MagicMock())
+class SettingsSnapshotTests(unittest.IsolatedAsyncioTestCase):
+    def _session(self, rows):
+        result = MagicMock()
+        result.all.return_value = rows
+        result.scalar_one_or_none.return_value = None
+        session = MagicMock()
+        session.info = {}
+        session.execute = AsyncMock(return_value=result)
+        session.flush = AsyncMock()
+        return session
+
+    async def test_reads_are_served_from_one_snapshot_load(self):
+        row = MagicMock(key=SettingKeys.SUBSCRIPTION_CHANNELS, value='["@a", " ", "@b"]')
+        session = self._session([row])
+        manager = SettingsManager()
+
+        self.assertEqual(await manager.get_subscription_channels(session), ["@a", "@b"])
+        self.assertFalse(await manager.get_maintenance_enabled(session))
+        self.assertEqual(await manager.get_maintenance_message(session, "x"), "x")
+        self.assertEqual(session.execute.await_count, 1)
+
+    async def test_set_raw_swaps_snapshot_only_after_commit(self):
+        manager = SettingsManager()
+        session = self._session([])
+        before = await manager.get_snapshot(session)
+
+        with patch("bot.services.settings_manager.Setting", MagicMock()):
+            await manager.set_bool(session, SettingKeys.MAINTENANCE_ENABLED, True)
+
+        self.assertIs(manager.snapshot, before)
+        self.assertTrue(await manager.get_maintenance_enabled(session))
+
+        with patch("bot.services.settings_manager.settings_manager", manager):
+            _apply_after_commit(MagicMock(info=session.info))
+
+        after = manager.snapshot
+        self.assertIsInstance(after, SettingsSnapshot)
+        self.assertGreater(after.version, before.version)
+        self.assertFalse(before.maintenance_enabled)
+        self.assertTrue(after.maintenance_enabled)
+        with self.assertRaises(TypeError):
+            after.values["x"] = "y"
+
+    async def test_rolled_back_write_never_reaches_the_snapshot(self):
+        manager = SettingsManager()
+        session = self._session([])
+        before = await manager.get_snapshot(session)
+
+        with patch("bot.services.settings_manager.Setting", MagicMock()):
+            await manager.set_bool(session, SettingKeys.MAINTENANCE_ENABLED, True)
+
+        self.assertIs(manager.snapshot, before)
+        self.assertFalse(await manager.get_maintenance_enabled(self._session([])))
+
+    async def test_caught_rollback_is_not_published_by_a_later_commit(self):
+        manager = SettingsManager()
+        session = self._session([])
+        before = await manager.get_snapshot(session)
+
+        with patch("bot.services.settings_manager.Setting", MagicMock()):
+            await manager.set_bool(session, SettingKeys.MAINTENANCE_ENABLED, True)
+        manager.reload_after_commit(session)
+        manager.request_reload = MagicMock()
+
+        with patch("bot.services.settings_manager.settings_manager", manager):
+            _discard_after_rollback(MagicMock(info=session.info))
+            self.assertFalse(await manager.get_maintenance_enabled(session))
+            _apply_after_commit(MagicMock(info=session.info))
+
+        self.assertIs(manager.snapshot, before)
+        manager.request_reload.assert_not_called()
+
+    async def test_notification_during_reload_triggers_another_reload(self):
+        manager = SettingsManager()
+        loads = []
+
+        async def load_snapshot(session):
+            loads.append(session)
+            if len(loads) == 1:
+                manager._on_notify(None, 0, "settings_changed", "k")
+            await asyncio.sleep(0)
+
+        class FakeDatabase:
+            async def get_session(self, **kwargs):
+                yield object()
+
+        manager.load_snapshot = load_snapshot
+        with patch("bot.core.database.get_db", AsyncMock(return_value=FakeDatabase())):
+            manager.request_reload()
+            await manager._reload_task
+        self.assertEqual(len(loads), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from bot.services.state import StateService, UserState
+from bot.services.state_backends import MemoryStateBackend, SqliteStateBackend
+
+
+class MemoryStateBackendTests(unittest.IsolatedAsyncioTestCase):
+    async def test_sweep_removes_only_expired_states(self):
+        service = StateService(timeout_seconds=10, backend=MemoryStateBackend())
+        with patch("bot.services.state.time.time", return_value=100.0):
+            await service.set_state(1, "a")
+            await service.set_state(2, "b")
+        with patch("bot.services.state.time.time", return_value=105.0):
+            await service.set_state(2, "c")
+
+        with patch("bot.services.state.time.time", return_value=111.0):
+            self.assertEqual(await service.cleanup_expired(), 1)
+            self.assertIsNone(await service.get_state(1))
+            self.assertEqual((await service.get_state(2)).name, "c")
+        self.assertEqual(await service.backend.count(), 1)
+
+    async def test_lru_eviction_and_memory_report(self):
+        service = StateService(timeout_seconds=300, backend=MemoryStateBackend(max_states=2))
+        await service.set_state(1, "a", data={"k": "v"})
+        await service.set_state(2, "b")
+        await service.get_state(1)
+        await service.set_state(3, "c")
+
+        self.assertIsNone(await service.get_state(2))
+        self.assertIsNotNone(await service.get_state(1))
+        report = await service.memory_report()
+        self.assertEqual(report["states"], 2)
+        self.assertEqual(report["evicted"], 1)
+        self.assertGreater(report["approx_bytes"], 0)
+
+        await service.clear_state(1)
+        await service.clear_state(3)
+        self.assertEqual((await service.backend.stats())["states"], 0)
+
+    async def test_payload_is_capped_and_state_is_slotted(self):
+        service = StateService(timeout_seconds=300, max_payload_bytes=64)
+        with self.assertLogs("bot", level="WARNING"):
+            self.assertIsNone(await service.set_state(1, "a", data={"text": "x" * 100}))
+        self.assertIsNone(await service.get_state(1))
+        await service.set_state(1, "a", data={"text": "ok"})
+        with self.assertLogs("bot", level="WARNING"):
+            self.assertFalse(await service.update_state_data(1, "text", "x" * 100))
+        self.assertEqual((await service.get_state(1)).data, {"text": "ok"})
+        self.assertFalse(hasattr(UserState(name="a"), "__dict__"))
+
+
+class SqliteStateBackendTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "state.sqlite3")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    async def test_state_is_shared_between_services(self):
+        first = StateService(timeout_seconds=300, backend=SqliteStateBackend(self.path))
+        second = StateService(timeout_seconds=300, backend=SqliteStateBackend(self.path))
+
+        await first.set_state(7, "upload", data={"section_id": 3})
+        await first.update_state_data(7, "uploaded_count", 2)
+        state = await second.get_state(7)
+        self.assertEqual(state.name, "upload")
+        self.assertEqual(state.data, {"section_id": 3, "uploaded_count": 2})
+
+        await second.set_state(7, "confirm")
+        self.assertEqual(await first.go_back(7), "upload")
+        await second.clear_state(7)
+        self.assertFalse(await first.has_state(7))
+
+        with patch("bot.services.state.time.time", return_value=0.0):
+            await first.set_state(8, "old")
+        self.assertEqual(await second.cleanup_expired(), 1)
+        for service in (first, second):
+            await service.backend.close()
+
+    async def test_lock_wait_does_not_block_event_loop(self):
+        backend = SqliteStateBackend(self.path)
+        blocker = sqlite3.connect(self.path, isolation_level=None)
+        blocker.execute("BEGIN EXCLUSIVE")
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        put = asyncio.ensure_future(backend.put(1, UserState(name="a"), 10.0))
+        await asyncio.sleep(0.2)
+        self.assertFalse(put.done())
+        self.assertGreater(ticks, 0)
+
+        blocker.execute("ROLLBACK")
+        blocker.close()
+        await put
+        ticker.cancel()
+        self.assertEqual((await backend.get(1)).name, "a")
+        await backend.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
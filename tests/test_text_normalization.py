@@ -0,0 +1,29 @@
+import unittest
+
+from sqlalchemy.dialects import postgresql
+
+from bot.utils.text import normalize_arabic
+
+
+class NormalizeArabicTests(unittest.TestCase):
+    def test_folds_letter_variants_and_strips_diacritics(self):
+        self.assertEqual(normalize_arabic("أَحْمَد"), "احمد")
+        self.assertEqual(normalize_arabic("إسلام  آمنة"), "اسلام امنه")
+        self.assertEqual(normalize_arabic("مستشفى"), "مستشفي")
+        self.assertEqual(normalize_arabic("الـــكتاب"), "الكتاب")
+        self.assertEqual(normalize_arabic("  Math\tNotes "), "math notes")
+
+    def test_search_filter_uses_the_indexed_expression(self):
+        from sqlalchemy import func, select
+
+        from bot.models.file import File
+
+        name = func.normalize_ar(File.name)
+        stmt = select(File.id).where(name.contains(normalize_arabic("مُذكّرة_1"), autoescape=True))
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.assertIn("WHERE (normalize_ar(files.name) LIKE ", sql)
+        self.assertIn("ESCAPE '/'", sql)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.core.database import Database
+from bot.middlewares.unit_of_work import UnitOfWorkMiddleware, UnitOfWorkReleaseMiddleware
+
+
+class FakeSession:
+    """Starts a transaction (a pool checkout) on the first statement after a commit."""
+
+    def __init__(self):
+        self.info = {}
+        self.active = False
+        self.checkouts = 0
+        self.commit = AsyncMock(side_effect=self._end)
+        self.rollback = AsyncMock(side_effect=self._end)
+        self.close = AsyncMock()
+
+    async def _end(self):
+        self.active = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def in_transaction(self):
+        return self.active
+
+    async def execute(self, stmt):
+        if not self.active:
+            self.active = True
+            self.checkouts += 1
+
+
+def _database():
+    db = Database("postgresql://u:p@db/app")
+    db.session_factory = MagicMock(side_effect=FakeSession)
+    return db
+
+
+async def _use_session(db, **kwargs):
+    async for session in db.get_session(**kwargs):
+        await session.execute("SELECT 1")
+    return session
+
+
+class UnitOfWorkTests(unittest.IsolatedAsyncioTestCase):
+    async def test_session_blocks_share_one_checkout_and_commit(self):
+        db = _database()
+        async with db.unit_of_work():
+            first = await _use_session(db)
+            second = await _use_session(db)
+            third = await _use_session(db, read_only=True)
+        self.assertIs(first, second)
+        self.assertIs(first, third)
+        db.session_factory.assert_called_once()
+        self.assertEqual(first.checkouts, 1)
+        first.commit.assert_awaited_once()
+        first.close.assert_awaited_once()
+        self.assertEqual(
+            db.unit_of_work_stats(),
+            {"scopes": 1, "sessions": 1, "commits": 1, "rollbacks": 0, "releases": 0},
+        )
+
+    async def test_unused_scope_never_opens_a_session(self):
+        db = _database()
+        async with db.unit_of_work():
+            pass
+        db.session_factory.assert_not_called()
+        self.assertEqual(db.unit_of_work_stats()["commits"], 0)
+
+    async def test_error_rolls_back(self):
+        db = _database()
+        session = None
+        with self.assertRaises(RuntimeError):
+            async with db.unit_of_work():
+                session = await _use_session(db)
+                raise RuntimeError("boom")
+        session.commit.assert_not_awaited()
+        session.rollback.assert_awaited_once()
+
+    async def test_outbound_call_commits_first_and_survives_a_failed_send(self):
+        db = _database()
+        release = UnitOfWorkReleaseMiddleware()
+        sent = []
+
+        async def make_request(bot, method):
+            sent.append(db.unit_of_work_stats()["commits"])
+            raise RuntimeError("telegram call failed")
+
+        with patch("bot.middlewares.unit_of_work.get_db", AsyncMock(return_value=db)):
+            with self.assertRaises(RuntimeError):
+                async with db.unit_of_work():
+                    session = await _use_session(db)
+                    await _use_session(db)
+                    await release(make_request, object(), object())
+
+            async def in_spawned_task():
+                await release(AsyncMock(), object(), object())
+
+            async with db.unit_of_work():
+                other = await _use_session(db)
+                await asyncio.create_task(in_spawned_task())
+                self.assertTrue(other.in_transaction())
+
+        self.assertEqual(sent, [1])
+        self.assertEqual(session.checkouts, 1)
+        session.rollback.assert_not_awaited()
+        self.assertEqual(
+            db.unit_of_work_stats(),
+            {"scopes": 2, "sessions": 2, "commits": 2, "rollbacks": 0, "releases": 1},
+        )
+
+    async def test_spawned_tasks_and_standalone_get_their_own_session(self):
+        db = _database()
+        async with db.unit_of_work():
+            scoped = await _use_session(db)
+            spawned = await asyncio.create_task(_use_session(db))
+            standalone = await _use_session(db, standalone=True)
+        self.assertIsNot(spawned, scoped)
+        self.assertIsNot(standalone, scoped)
+        self.assertEqual(db.session_factory.call_count, 3)
+
+    async def test_middleware_exposes_scope(self):
+        db = _database()
+        seen = {}
+
+        async def handler(event, data):
+            seen["session"] = await _use_session(db)
+            return data["uow"].session
+
+        with patch("bot.middlewares.unit_of_work.get_db", AsyncMock(return_value=db)):
+            result = await UnitOfWorkMiddleware()(handler, object(), {})
+        self.assertIs(result, seen["session"])
+        result.commit.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
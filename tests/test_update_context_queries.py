@@ -0,0 +1,169 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from bot.middlewares.update_context import UpdateContextMiddleware
+from bot.middlewares.ban_check import BanCheckMiddleware
+from bot.middlewares.subscription_check import SubscriptionCheckMiddleware
+from bot.middlewares.user_tracking import UserTrackingMiddleware
+from bot.middlewares.role_check import RoleMiddleware
+from bot.middlewares.maintenance_check import MaintenanceCheckMiddleware
+from bot.models.user import UserRole
+from bot.services.settings_manager import SettingsSnapshot
+from bot.services.user import UserAttributeCache
+from bot.services.user_activity import UserActivityBuffer
+
+
+class FakeDatabase:
+    def __init__(self, yields=True):
+        self._yields = yields
+
+    async def get_session(self, **kwargs):
+        if self._yields:
+            yield object()
+
+
+class FakeI18n:
+    default_language = "ar"
+
+    def get(self, key, **kwargs):
+        return str(key)
+
+
+class RecordingLoginLogger:
+    logged = []
+
+    def __init__(self, bot, channel_id):
+        pass
+
+    async def log_login(self, user_id, **kwargs):
+        RecordingLoginLogger.logged.append(user_id)
+
+
+MIDDLEWARE_MODULES = [
+    "bot.middlewares.update_context",
+    "bot.middlewares.ban_check",
+    "bot.middlewares.subscription_check",
+    "bot.middlewares.user_tracking",
+    "bot.middlewares.role_check",
+    "bot.middlewares.maintenance_check",
+]
+
+
+class UpdateContextGatingTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        RecordingLoginLogger.logged = []
+        self.activity = UserActivityBuffer()
+        self.cache = UserAttributeCache()
+        self.attributes = AsyncMock(return_value=None)
+        self.upsert = AsyncMock(return_value=SimpleNamespace(inserted=True, role=UserRole.USER, is_blocked=False))
+        self.missing = AsyncMock(return_value=[])
+        self.tracking = UserTrackingMiddleware(log_channel_id=-100)
+        self.handled = 0
+
+    async def _dispatch(self, db=None, settings=None):
+        db = db or FakeDatabase()
+
+        async def fake_get_db():
+            return db
+
+        patchers = [patch(f"{m}.get_db", fake_get_db) for m in MIDDLEWARE_MODULES]
+        patchers += [
+            patch("bot.services.user.user_service.cache", self.cache),
+            patch("bot.services.user.user_service.get_attributes", self.attributes),
+            patch("bot.services.user.user_service.upsert_and_load", self.upsert),
+            patch("bot.services.user.user_service.is_blocked", AsyncMock(return_value=False)),
+            patch("bot.services.user.user_service.get_role", AsyncMock(return_value=UserRole.USER)),
+            patch(
+                "bot.services.settings_manager.settings_manager.get_snapshot",
+                AsyncMock(return_value=settings or SettingsSnapshot()),
+            ),
+            patch("bot.services.settings_manager.settings_manager.get_subscription_enabled", AsyncMock(return_value=False)),
+            patch("bot.services.settings_manager.settings_manager.get_subscription_channels", AsyncMock(return_value=[])),
+            patch("bot.services.settings_manager.settings_manager.get_maintenance_enabled", AsyncMock(return_value=False)),
+            patch("bot.services.settings_manager.settings_manager._snapshot", None),
+            patch("bot.middlewares.subscription_check.membership_service.get_missing_channels", self.missing),
+            patch("bot.middlewares.user_tracking.user_activity", self.activity),
+            patch("bot.middlewares.user_tracking.LoginLogger", RecordingLoginLogger),
+            patch("bot.middlewares.ban_check.get_i18n", return_value=FakeI18n()),
+            patch("bot.middlewares.subscription_check.get_i18n", return_value=FakeI18n()),
+            patch("bot.middlewares.maintenance_check.get_i18n", return_value=FakeI18n()),
+        ]
+        chain = [
+            UpdateContextMiddleware(),
+            BanCheckMiddleware(),
+            SubscriptionCheckMiddleware(),
+            self.tracking,
+            RoleMiddleware(),
+            MaintenanceCheckMiddleware(),
+        ]
+
+        async def final(event, data):
+            self.handled += 1
+            return "ok"
+
+        handler = final
+        for mw in reversed(chain):
+            handler = (lambda m, h: (lambda e, d: m(h, e, d)))(mw, handler)
+        user = SimpleNamespace(id=7, first_name="U", last_name=None, username=None)
+        data = {"event_from_user": user, "bot": SimpleNamespace()}
+        for p in patchers:
+            p.start()
+        try:
+            result = await handler(SimpleNamespace(message=None, callback_query=None), data)
+            await asyncio.gather(*self.tracking._pending)
+        finally:
+            for p in reversed(patchers):
+                p.stop()
+        return result
+
+    async def test_new_user_is_created_and_logged_once_gating_passes(self):
+        self.assertEqual(await self._dispatch(), "ok")
+        self.upsert.assert_awaited_once()
+        self.assertEqual(RecordingLoginLogger.logged, [7])
+
+    async def test_unsubscribed_new_user_is_not_created_until_subscribed(self):
+        gated = SettingsSnapshot(subscription_enabled=True, subscription_channels=("@c",))
+        self.missing.return_value = ["@c"]
+        self.assertIsNone(await self._dispatch(settings=gated))
+        self.upsert.assert_not_awaited()
+        self.assertEqual(RecordingLoginLogger.logged, [])
+
+        self.missing.return_value = []
+        self.assertEqual(await self._dispatch(settings=gated), "ok")
+        self.upsert.assert_awaited_once()
+        self.assertEqual(RecordingLoginLogger.logged, [7])
+
+    async def test_blocked_user_row_is_not_written(self):
+        self.attributes.return_value = (UserRole.USER, True)
+        self.assertIsNone(await self._dispatch())
+        self.upsert.assert_not_awaited()
+        self.assertEqual(self.activity.stats()["pending"], 0)
+        self.assertEqual(self.handled, 0)
+
+    async def test_registered_user_activity_is_buffered(self):
+        self.attributes.return_value = (UserRole.USER, False)
+        self.assertEqual(await self._dispatch(), "ok")
+        self.upsert.assert_not_awaited()
+        self.assertEqual(self.activity.stats()["pending"], 1)
+        self.assertEqual(RecordingLoginLogger.logged, [])
+
+    async def test_login_notices_are_shed_when_backlog_is_full(self):
+        tracking = UserTrackingMiddleware(log_channel_id=-100, max_pending=1)
+        user = SimpleNamespace(id=7, first_name="U", last_name=None, username=None)
+        with patch("bot.middlewares.user_tracking.LoginLogger", RecordingLoginLogger):
+            with self.assertLogs("bot", level="WARNING"):
+                tracking._notify_login(SimpleNamespace(), user)
+                tracking._notify_login(SimpleNamespace(), user)
+            self.assertEqual((len(tracking._pending), tracking.dropped), (1, 1))
+            await asyncio.gather(*tracking._pending)
+        self.assertEqual(RecordingLoginLogger.logged, [7])
+
+    async def test_missing_session_falls_back_without_context(self):
+        self.assertEqual(await self._dispatch(db=FakeDatabase(yields=False)), "ok")
+        self.attributes.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
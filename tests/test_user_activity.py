@@ -0,0 +1,40 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from bot.services.user_activity import UserActivityBuffer
+
+
+class FakeDatabase:
+    async def get_session(self):
+        yield object()
+
+
+class UserActivityBufferTests(unittest.IsolatedAsyncioTestCase):
+    async def test_updates_are_coalesced_into_one_batch(self):
+        buffer = UserActivityBuffer()
+        for _ in range(3):
+            buffer.record(1, "A")
+        buffer.record(2, "B", username="b")
+        buffer.record(1, "A2")
+
+        bulk_touch = AsyncMock()
+        with patch("bot.services.user_activity.get_db", AsyncMock(return_value=FakeDatabase())), \
+                patch("bot.services.user_activity.user_service.bulk_touch", bulk_touch):
+            self.assertEqual(await buffer.flush(), 2)
+            self.assertEqual(await buffer.flush(), 0)
+
+        bulk_touch.assert_awaited_once()
+        profiles = bulk_touch.await_args.args[1]
+        self.assertEqual([p["first_name"] for p in profiles], ["A2", "B"])
+        self.assertEqual(buffer.stats()["pending"], 0)
+
+    async def test_failed_flush_keeps_pending_rows(self):
+        buffer = UserActivityBuffer()
+        buffer.record(1, "A")
+        with patch("bot.services.user_activity.get_db", AsyncMock(side_effect=RuntimeError("down"))):
+            self.assertEqual(await buffer.flush(), 0)
+        self.assertEqual(buffer.stats()["pending"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
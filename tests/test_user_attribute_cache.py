@@ -0,0 +1,72 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.models.user import UserRole
+from bot.services.user import UserAttributeCache, UserService, _invalidate_after_commit
+
+
+class UserAttributeCacheTests(unittest.TestCase):
+    def test_lru_eviction_and_counters(self):
+        cache = UserAttributeCache(max_size=2, ttl_seconds=60)
+        cache.put(1, UserRole.USER, False)
+        cache.put(2, UserRole.ADMIN, False)
+        self.assertEqual(cache.get(1), (UserRole.USER, False))
+        cache.put(3, UserRole.USER, True)
+
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(3), (UserRole.USER, True))
+        stats = cache.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_expired_entry_is_a_miss(self):
+        cache = UserAttributeCache(max_size=10, ttl_seconds=30)
+        with patch("bot.services.user.time.monotonic", return_value=100.0):
+            cache.put(1, UserRole.USER, False)
+        with patch("bot.services.user.time.monotonic", return_value=131.0):
+            self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.stats()["size"], 0)
+
+
+@patch("bot.services.user.update", MagicMock())
+@patch("bot.services.user.select", MagicMock())
+class UserServiceCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def test_reads_hit_cache_and_writers_invalidate(self):
+        service = UserService()
+        session = MagicMock()
+        result = MagicMock()
+        result.one_or_none.return_value = SimpleNamespace(role=UserRole.USER, is_blocked=False)
+        session.execute = AsyncMock(return_value=result)
+        session.flush = AsyncMock()
+
+        self.assertFalse(await service.is_blocked(session, 5))
+        self.assertEqual(await service.get_role(session, 5), UserRole.USER)
+        self.assertEqual(session.execute.await_count, 1)
+
+        await service.set_blocked(session, 5, True)
+        result.one_or_none.return_value = SimpleNamespace(role=UserRole.USER, is_blocked=True)
+        self.assertTrue(await service.is_blocked(session, 5))
+        self.assertEqual(session.execute.await_count, 3)
+
+    async def test_entry_reloaded_before_commit_is_evicted_on_commit(self):
+        service = UserService()
+        session = MagicMock()
+        session.info = {}
+        result = MagicMock()
+        result.one_or_none.return_value = SimpleNamespace(role=UserRole.USER, is_blocked=False)
+        session.execute = AsyncMock(return_value=result)
+        session.flush = AsyncMock()
+
+        await service.set_blocked(session, 5, True)
+        self.assertFalse(await service.is_blocked(session, 5))
+
+        with patch("bot.services.user.user_service", service):
+            _invalidate_after_commit(SimpleNamespace(info=session.info))
+        self.assertIsNone(service.cache.get(5))
+        self.assertNotIn("user_cache_stale", session.info)
+
+
+if __name__ == "__main__":
+    unittest.main()